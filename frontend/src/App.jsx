@@ -39,7 +39,8 @@ const RepositoryDetail = lazy(
  */
 function App() {
   // Data fetching with custom hook
-  const { data, loading, error, refetch } = useRepositoryData();
+  const { data, loading, error, refetch, loadRepositoryDetail } =
+    useRepositoryData();
 
   // Toast notifications state
   const [toasts, setToasts] = useState([]);
@@ -133,12 +134,28 @@ function App() {
     clearFilter,
   } = useTableSort(data?.repositories || [], "stars", "desc");
 
+  /**
+   * Show a repository in the detail modal
+   *
+   * Opens immediately with the index fields; with sharded data the detail
+   * fields are merged in once their file has loaded.
+   * @param {Object} repository - Repository object to display details for
+   */
+  const openDetail = (repository) => {
+    setDetailModalRepo(repository);
+    loadRepositoryDetail(repository).then((fullRepository) => {
+      setDetailModalRepo((current) =>
+        current?.name === fullRepository?.name ? fullRepository : current,
+      );
+    });
+  };
+
   /**
    * Handle repository drill-down
    * @param {Object} repository - Repository object to display details for
    */
   const handleRepoClick = (repository) => {
-    setDetailModalRepo(repository);
+    openDetail(repository);
   };
 
   /**
@@ -165,7 +182,7 @@ function App() {
       (r) => r.name === detailModalRepo.name,
     );
     if (currentIndex < processedRepositories.length - 1) {
-      setDetailModalRepo(processedRepositories[currentIndex + 1]);
+      openDetail(processedRepositories[currentIndex + 1]);
     }
   };
 
@@ -178,7 +195,7 @@ function App() {
       (r) => r.name === detailModalRepo.name,
     );
     if (currentIndex > 0) {
-      setDetailModalRepo(processedRepositories[currentIndex - 1]);
+      openDetail(processedRepositories[currentIndex - 1]);
     }
   };
 
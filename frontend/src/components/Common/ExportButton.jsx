@@ -31,7 +31,8 @@ function ExportButton({
       return "";
     }
 
-    // Define CSV columns
+    // Define CSV columns (a list of keys is tried in order; sharded output
+    // keeps commit sizes at the top level instead of under commit_metrics)
     const columns = [
       { key: "name", label: "Repository Name" },
       { key: "language", label: "Language" },
@@ -47,9 +48,18 @@ function ExportButton({
       { key: "commit_history.recent_365d", label: "Commits (365d)" },
       { key: "commit_history.first_commit_date", label: "First Commit" },
       { key: "commit_history.last_commit_date", label: "Last Commit" },
-      { key: "commit_metrics.avg_size", label: "Avg Commit Size" },
-      { key: "commit_metrics.largest_commit.size", label: "Largest Commit" },
-      { key: "commit_metrics.smallest_commit.size", label: "Smallest Commit" },
+      {
+        key: ["commit_metrics.avg_size", "avg_commit_size"],
+        label: "Avg Commit Size",
+      },
+      {
+        key: ["commit_metrics.largest_commit.size", "largest_commit.size"],
+        label: "Largest Commit",
+      },
+      {
+        key: ["commit_metrics.smallest_commit.size", "smallest_commit.size"],
+        label: "Smallest Commit",
+      },
       { key: "commit_velocity", label: "Commit Velocity" },
       { key: "age_days", label: "Age (days)" },
       { key: "days_since_last_push", label: "Days Since Push" },
@@ -71,7 +81,10 @@ function ExportButton({
     const rows = repositories.map((repo) => {
       return columns
         .map((col) => {
-          const value = getNestedValue(repo, col.key);
+          const value = []
+            .concat(col.key)
+            .map((path) => getNestedValue(repo, path))
+            .find((candidate) => candidate !== null && candidate !== undefined);
 
           // Handle null/undefined
           if (value === null || value === undefined) return '""';
@@ -1,5 +1,8 @@
-import { useState, useEffect } from "react";
-import { fetchDashboardData } from "@/services/dataService";
+import { useState, useEffect, useCallback } from "react";
+import {
+  fetchDashboardData,
+  fetchRepositoryDetail,
+} from "@/services/dataService";
 
 /**
  * Custom hook for fetching and managing repository dashboard data
@@ -12,6 +15,8 @@ import { fetchDashboardData } from "@/services/dataService";
  *   - loading: Boolean indicating if data is currently being fetched
  *   - error: Error object if fetch failed (null otherwise)
  *   - refetch: Function to manually trigger data refetch
+ *   - loadRepositoryDetail: Function resolving a repository with its detail
+ *     fields (fetched on demand when the data is sharded)
  *
  * @example
  * function MyComponent() {
@@ -67,10 +72,38 @@ export default function useRepositoryData() {
     return fetchData(options);
   };
 
+  /**
+   * Resolve a repository with its detail fields
+   *
+   * With a single repositories.json every repository is already complete.
+   * With sharded data the detail file is fetched (once per content hash)
+   * and merged over the index entry; on failure the index entry is returned.
+   *
+   * @param {Object} repository - Repository object from data.repositories
+   * @returns {Promise<Object>} Repository with detail fields
+   */
+  const loadRepositoryDetail = useCallback(
+    async (repository) => {
+      const manifest = data?._manifest;
+      if (!manifest || !repository) {
+        return repository;
+      }
+      try {
+        const detail = await fetchRepositoryDetail(repository.name, manifest);
+        return detail ? { ...repository, ...detail } : repository;
+      } catch (err) {
+        console.warn(`Failed to load details for ${repository.name}:`, err);
+        return repository;
+      }
+    },
+    [data],
+  );
+
   return {
     data,
     loading,
     error,
     refetch,
+    loadRepositoryDetail,
   };
 }
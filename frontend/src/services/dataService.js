@@ -16,6 +16,9 @@ import { offlineStorage } from "./offlineStorage";
 // Cache keys
 const CACHE_KEY_REPOSITORIES = "repositories-data";
 
+// Detail files already fetched this session, keyed by path and content hash
+const detailCache = new Map();
+
 /**
  * Get the base URL for data fetching based on environment
  * @returns {string} Base URL for data files
@@ -30,6 +33,91 @@ const getDataBaseUrl = () => {
   return `${import.meta.env.BASE_URL}data`;
 };
 
+/**
+ * Fetch the sharded data manifest (manifest.json), if the generator wrote one
+ *
+ * The manifest lists the compact index and the per-repository detail files
+ * with their SHA-256 content hashes. It is always fetched uncached; the
+ * files it lists are requested with their hash as the cache key.
+ *
+ * @returns {Promise<Object|null>} Manifest object, or null when the data is
+ *   only available as a single repositories.json
+ */
+export async function fetchDataManifest() {
+  const baseUrl = getDataBaseUrl();
+
+  try {
+    const response = await fetch(`${baseUrl}/manifest.json?v=${Date.now()}`, {
+      cache: "no-store",
+    });
+    if (!response.ok) {
+      return null;
+    }
+    const manifest = await response.json();
+    return manifest?.index?.path ? manifest : null;
+  } catch (error) {
+    console.warn("[DataService] No data manifest, using repositories.json:", error);
+    return null;
+  }
+}
+
+/**
+ * Fetch the detail fields of one repository on demand (sharded data only)
+ *
+ * @param {string} name - Repository name
+ * @param {Object} manifest - Manifest returned by fetchDataManifest
+ * @returns {Promise<Object|null>} Detail fields (summary, tech_stack,
+ *   commit_metrics, ...), or null if the repository has no detail file
+ *
+ * @example
+ * const detail = await fetchRepositoryDetail(repo.name, data._manifest)
+ * const fullRepo = { ...repo, ...detail }
+ */
+export async function fetchRepositoryDetail(name, manifest) {
+  const entry = manifest?.details?.[name];
+  if (!entry) {
+    return null;
+  }
+
+  const cacheKey = `${entry.path}@${entry.sha256}`;
+  if (!detailCache.has(cacheKey)) {
+    const url = `${getDataBaseUrl()}/${entry.path}?v=${entry.sha256.slice(0, 16)}`;
+    const request = fetch(url).then((response) => {
+      if (!response.ok) {
+        throw new Error(
+          `Failed to fetch details for ${name}: ${response.status} ${response.statusText}`,
+        );
+      }
+      return response.json();
+    });
+    detailCache.set(cacheKey, request);
+    // Let a failed request be retried
+    request.catch(() => detailCache.delete(cacheKey));
+  }
+  return detailCache.get(cacheKey);
+}
+
+/**
+ * Resolve the URL of the dashboard data
+ *
+ * With a manifest, first paint only needs the compact index; otherwise the
+ * full repositories.json is loaded.
+ *
+ * @param {string} baseUrl - Data base URL
+ * @param {boolean} cacheBust - Add a timestamp to bypass HTTP caches
+ * @returns {Promise<{url: string, manifest: Object|null}>}
+ */
+async function resolveDataUrl(baseUrl, cacheBust) {
+  const manifest = await fetchDataManifest();
+  if (manifest) {
+    // The content hash changes whenever the index does
+    const url = `${baseUrl}/${manifest.index.path}?v=${manifest.index.sha256.slice(0, 16)}`;
+    return { url, manifest };
+  }
+  const cacheToken = cacheBust ? `?v=${Date.now()}` : "";
+  return { url: `${baseUrl}/repositories.json${cacheToken}`, manifest: null };
+}
+
 /**
  * Fetch dashboard data from repositories.json with offline cache support
  *
@@ -44,11 +132,16 @@ const getDataBaseUrl = () => {
  * @param {boolean} [options.forceRefresh=false] - Force network fetch ignoring cache
  * @param {number} [options.maxRetries=3] - Maximum number of retry attempts
  * @param {number} [options.retryDelay=2000] - Delay between retries in ms
+ * When the generator wrote sharded data (manifest.json), only the compact
+ * index is loaded: repositories then lack the detail fields, which are
+ * fetched with fetchRepositoryDetail when a repository is opened.
+ *
  * @returns {Promise<Object>} Dashboard data object containing:
  *   - repositories: Array of repository objects with metrics
  *   - profile: User profile information
  *   - metadata: Generation metadata and schema version
  *   - _fromCache: Boolean indicating if data came from cache
+ *   - _manifest: Data manifest when the data is sharded (null otherwise)
  *
  * @throws {Error} If fetch fails after all retries and no cache available
  *
@@ -65,8 +158,6 @@ export async function fetchDashboardData({
   cacheBust = true,
 } = {}) {
   const baseUrl = getDataBaseUrl();
-  const cacheToken = cacheBust ? `?v=${Date.now()}` : "";
-  const url = `${baseUrl}/repositories.json${cacheToken}`;
   const isOnline = navigator.onLine;
 
   // Try cache first if enabled and not forcing refresh
@@ -92,7 +183,11 @@ export async function fetchDashboardData({
 
   for (let attempt = 0; attempt <= maxRetries; attempt++) {
     try {
-      const response = await fetch(url, { cache: "no-store" });
+      const { url, manifest } = await resolveDataUrl(baseUrl, cacheBust);
+      // Hash-keyed index URLs may come from the HTTP cache
+      const response = await fetch(url, {
+        cache: manifest ? "default" : "no-store",
+      });
 
       if (!response.ok) {
         throw new Error(
@@ -100,7 +195,7 @@ export async function fetchDashboardData({
         );
       }
 
-      const data = await response.json();
+      const data = { ...(await response.json()), _manifest: manifest };
 
       // Validate data structure
       if (!data || typeof data !== "object") {
@@ -409,6 +504,8 @@ export async function clearCache() {
 
 export default {
   fetchDashboardData,
+  fetchDataManifest,
+  fetchRepositoryDetail,
   fetchUserProfile,
   extractLanguages,
   filterByLanguage,
@@ -0,0 +1,586 @@
+"""Asyncio fetch backend (``fetcher.backend: async``).
+
+``GitHubFetcher`` goes through PyGithub, whose clients hold one synchronous
+connection each, so a thread has at most one request in flight.
+``AsyncGitHubFetcher`` sends the same REST requests through an
+``httpx.AsyncClient`` (pooled keep-alive connections) running on a private
+event loop, so independent requests for many repositories and commits
+overlap:
+
+- repository listing pages after the first are revalidated concurrently
+- per-commit stats in ``fetch_commits_with_stats`` are fetched concurrently
+- commit window counts issue their aggregate requests concurrently
+- ``prefetch_repository_data`` fills the languages, readme and commit_counts
+  cache categories for every stale repository at once, so the per-category
+  refresh in ``CacheManager`` only finds cache hits
+
+The public methods keep ``GitHubFetcher``'s signatures, return values and
+cache behaviour, so the class is a drop-in replacement. Each of them has an
+``*_async`` coroutine for callers already running an event loop. Methods not
+listed above (dependency files, profile, rate-limit status) are inherited and
+still use PyGithub. Every request goes through the shared rate governor.
+
+httpx is optional and only needed for this backend (``pip install httpx``).
+"""
+
+import asyncio
+import base64
+import functools
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Dict, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+from urllib.parse import parse_qs, urlparse
+
+from github import GithubException
+
+from spark.cache import APICache
+from spark.commit_counts import WINDOWS, activity_windows, window_counts
+from spark.conditional_requests import GITHUB_API_URL
+from spark.fetcher import REPOS_PER_PAGE, GitHubFetcher, _iso_timestamp, _repository_from_api
+from spark.graphql_fetcher import _parse_timestamp
+from spark.time_utils import sanitize_timestamp_for_filename
+
+T = TypeVar("T")
+
+# Cache categories filled by prefetch_repository_data
+ASYNC_CATEGORIES = ("languages", "readme", "commit_counts")
+
+# Requests in flight at once (also the connection pool size)
+DEFAULT_CONCURRENCY = 16
+
+# Page size for commit listings (GitHub maximum)
+COMMITS_PER_PAGE = 100
+
+
+class ListedCommit(NamedTuple):
+    """Commit from a listing page, before its stats are fetched."""
+
+    sha: str
+    data: Dict[str, Any]
+
+
+class AsyncGitHubFetcher(GitHubFetcher):
+    """GitHubFetcher whose REST requests run concurrently on an asyncio loop."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        cache: Optional[APICache] = None,
+        max_repos: int = 500,
+        use_cache_status: bool = True,
+        mode: str = "rest",
+        graphql_batch_size: int = 50,
+        commit_count_engine: str = "stats",
+        commit_stats_workers: int = 1,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        base_url: str = GITHUB_API_URL,
+    ):
+        """Initialize the async fetcher.
+
+        Args:
+            token: GitHub Personal Access Token (uses GITHUB_TOKEN env var if not provided)
+            cache: API cache instance (creates new if not provided)
+            max_repos: Maximum number of repositories to process
+            use_cache_status: Whether to use cache status tracking to skip cached repos
+            mode: "rest" or "graphql" (graphql batches run before the async prefetch)
+            graphql_batch_size: Repositories per GraphQL query in graphql mode
+            commit_count_engine: "stats" or "paginate" (paginate uses PyGithub)
+            commit_stats_workers: Kept for signature compatibility; concurrency
+                is bounded by ``concurrency`` instead
+            concurrency: Maximum requests in flight at once
+            base_url: REST API base URL (tests point this at a local server)
+
+        Raises:
+            RuntimeError: If httpx is not installed
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise RuntimeError(
+                "httpx is required for fetcher.backend: async. Install with:\n"
+                "  pip install httpx"
+            )
+
+        super().__init__(
+            token=token,
+            cache=cache,
+            max_repos=max_repos,
+            use_cache_status=use_cache_status,
+            mode=mode,
+            graphql_batch_size=graphql_batch_size,
+            commit_count_engine=commit_count_engine,
+            commit_stats_workers=commit_stats_workers,
+        )
+        self.concurrency = max(1, int(concurrency))
+        self.base_url = base_url.rstrip("/")
+        self.async_requests = 0
+
+        headers = {"Accept": "application/vnd.github+json", "Authorization": f"token {self.token}"}
+        self._http = httpx.AsyncClient(
+            headers=headers,
+            timeout=30,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # One long-lived loop keeps the connection pool alive between calls and
+        # lets synchronous callers on any thread share it
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="async-fetcher", daemon=True)
+        self._loop_thread.start()
+
+    # ------------------------------------------------------------------
+    # Event loop and HTTP plumbing
+    # ------------------------------------------------------------------
+
+    def _run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the fetcher's loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        """Close pooled connections and stop the event loop."""
+        if not self._loop.is_running():
+            return
+        super().close()
+        self._run(self._http.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=5)
+        self._loop.close()
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None):
+        """GET a REST path under the rate governor and concurrency limit.
+
+        Returns:
+            httpx.Response with status 200, 202 or 304
+
+        Raises:
+            GithubException: For any other status
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        async with self._semaphore:
+            return await self.governor.call_async(self._send, url, params, headers)
+
+    async def _send(self, url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]]):
+        response = await self._http.get(url, params=params, headers=headers)
+        self.async_requests += 1
+        if response.status_code not in (200, 202, 304):
+            try:
+                data = response.json()
+            except ValueError:
+                data = {"message": response.text}
+            raise GithubException(response.status_code, data, dict(response.headers))
+        self.governor.observe_headers(response.headers, status=response.status_code)
+        return response
+
+    async def _count(self, path: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """Count list items with one per_page=1 request (the last page number)."""
+        response = await self._get(path, params={**(params or {}), "per_page": 1})
+        last = response.links.get("last", {}).get("url")
+        if last:
+            return int(parse_qs(urlparse(last).query).get("page", ["1"])[0])
+        return len(response.json() or [])
+
+    # ------------------------------------------------------------------
+    # Repository listing
+    # ------------------------------------------------------------------
+
+    def _fetch_repository_pages(self, username: str) -> List[Dict[str, Any]]:
+        """Fetch the unfiltered repository listing, revalidating pages concurrently."""
+        return self._run(self._fetch_repository_pages_async(username))
+
+    async def _fetch_repository_pages_async(self, username: str) -> List[Dict[str, Any]]:
+        stored_pages = (self.cache.get("repository_pages", username) or {}).get("pages", [])
+        stored_validators = (self.cache.get_metadata("repository_pages", username) or {}).get("validators", [])
+
+        async def fetch_page(index: int) -> Tuple[List[Dict[str, Any]], Dict[str, Optional[str]], bool, Any]:
+            prior = stored_validators[index] if index < len(stored_validators) and index < len(stored_pages) else {}
+            headers = {}
+            if prior.get("etag"):
+                headers["If-None-Match"] = prior["etag"]
+            if prior.get("last_modified"):
+                headers["If-Modified-Since"] = prior["last_modified"]
+
+            response = await self._get(
+                f"/users/{username}/repos",
+                params={"per_page": REPOS_PER_PAGE, "page": index + 1},
+                headers=headers,
+            )
+            # A 304 may omit validators; keep the ones we sent
+            validators = {
+                "etag": response.headers.get("ETag") or prior.get("etag"),
+                "last_modified": response.headers.get("Last-Modified") or prior.get("last_modified"),
+            }
+
+            if response.status_code == 304 and prior:
+                self.request_stats["not_modified"] += 1
+                return stored_pages[index], validators, False, response
+            self.request_stats["fetched"] += 1
+            page = [_repository_from_api(raw) for raw in response.json() or []]
+            return page, validators, True, response
+
+        first = await fetch_page(0)
+        results = [first]
+
+        # The first page says how many follow (Link rel="last"); a 304 may omit
+        # the header, in which case the previous page count is revalidated
+        last = first[3].links.get("last", {}).get("url")
+        if last:
+            page_count = int(parse_qs(urlparse(last).query).get("page", ["1"])[0])
+        elif first[3].status_code == 304:
+            page_count = len(stored_pages)
+        else:
+            page_count = 1
+        if len(first[0]) == REPOS_PER_PAGE and page_count > 1:
+            results.extend(await asyncio.gather(*(fetch_page(index) for index in range(1, page_count))))
+
+        # Listing grew beyond the expected page count
+        while len(results[-1][0]) == REPOS_PER_PAGE:
+            results.append(await fetch_page(len(results)))
+
+        pages = [page for page, _, _, _ in results]
+        validators = [page_validators for _, page_validators, _, _ in results]
+        changed = any(page_changed for _, _, page_changed, _ in results)
+
+        if changed or len(pages) != len(stored_pages):
+            self.cache.set(
+                "repository_pages",
+                username,
+                {"pages": pages},
+                metadata={"validators": validators, "per_page": REPOS_PER_PAGE},
+            )
+
+        return [repo for page in pages for repo in page]
+
+    # ------------------------------------------------------------------
+    # Per-repository categories
+    # ------------------------------------------------------------------
+
+    def fetch_languages(self, username: str, repo_name: str, repo_pushed_at: Optional[datetime] = None) -> Dict[str, int]:
+        """Fetch language statistics for a repository (see GitHubFetcher.fetch_languages)."""
+        push_key = sanitize_timestamp_for_filename(repo_pushed_at)
+        cached = self.cache.get("languages", username, repo=repo_name, week=push_key)
+        if cached:
+            return cached
+
+        try:
+            return self._run(self.fetch_languages_async(username, repo_name))
+        except GithubException as e:
+            self.logger.debug(f"Could not fetch languages for {repo_name}: {e}")
+            return {}
+
+    async def fetch_languages_async(self, username: str, repo_name: str) -> Dict[str, int]:
+        """Language byte counts from ``/repos/{owner}/{repo}/languages``."""
+        response = await self._get(f"/repos/{username}/{repo_name}/languages")
+        return response.json() or {}
+
+    def fetch_readme(self, username: str, repo_name: str, repo_pushed_at: Optional[datetime] = None) -> Optional[str]:
+        """Fetch README content for a repository (see GitHubFetcher.fetch_readme)."""
+        push_key = sanitize_timestamp_for_filename(repo_pushed_at)
+        cached = self.cache.get("readme", username, repo=repo_name, week=push_key)
+        if cached is not None:
+            return cached
+
+        try:
+            return self._run(self.fetch_readme_async(username, repo_name))
+        except GithubException as e:
+            self.logger.debug(f"Could not fetch README for {repo_name}: {e}")
+            return None
+        except Exception as e:
+            self.logger.debug(f"Error decoding README for {repo_name}: {e}")
+            return None
+
+    async def fetch_readme_async(self, username: str, repo_name: str) -> Optional[str]:
+        """README text, or None when the repository has no README."""
+        try:
+            response = await self._get(f"/repos/{username}/{repo_name}/readme")
+        except GithubException as e:
+            if getattr(e, "status", None) == 404:
+                return None
+            raise
+        data = response.json() or {}
+        return base64.b64decode(data.get("content") or "").decode("utf-8")
+
+    def fetch_commit_counts(
+        self, username: str, repo_name: str, repo_pushed_at: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Fetch time-windowed commit counts (see GitHubFetcher.fetch_commit_counts)."""
+        if self.commit_counter.engine != "stats":
+            return super().fetch_commit_counts(username, repo_name, repo_pushed_at)
+
+        push_key = sanitize_timestamp_for_filename(repo_pushed_at)
+        cached = self.cache.get("commit_counts", username, repo=repo_name, week=push_key)
+        if cached:
+            return cached
+
+        try:
+            return self._run(self.fetch_commit_counts_async(username, repo_name))
+        except (GithubException, IndexError, AttributeError) as e:
+            self.logger.debug(f"Could not fetch commit counts for {repo_name}: {e}")
+            return window_counts(0, {days: 0 for days in WINDOWS}, None)
+
+    async def fetch_commit_counts_async(self, username: str, repo_name: str) -> Dict[str, Any]:
+        """Commit window counts from aggregate endpoints (CommitCounter's "stats" engine).
+
+        Uses the first commits page when it already covers every window,
+        otherwise the total and weekly commit activity (polled while GitHub
+        answers 202), falling back to ``since=`` totals per window.
+        """
+        path = f"/repos/{username}/{repo_name}/commits"
+        now = datetime.now(timezone.utc)
+        cutoffs = {days: now - timedelta(days=days) for days in WINDOWS}
+
+        try:
+            first = await self._get(path, params={"per_page": COMMITS_PER_PAGE})
+        except GithubException as e:
+            # 409: empty repository
+            if getattr(e, "status", None) == 409:
+                return window_counts(0, {days: 0 for days in WINDOWS}, None)
+            raise
+
+        commits = first.json() or []
+        dates = [date for date in (_api_commit_date(commit) for commit in commits) if date]
+        last_commit_date = max(dates) if dates else None
+        page_windows = {days: sum(1 for date in dates if date >= cutoff) for days, cutoff in cutoffs.items()}
+
+        if "next" not in first.links:
+            # The first page is the whole history
+            return window_counts(len(commits), page_windows, last_commit_date)
+
+        if dates and min(dates) < cutoffs[365]:
+            # Page already reaches past every window boundary
+            return window_counts(await self._count(path), page_windows, last_commit_date)
+
+        total, windows = await asyncio.gather(
+            self._count(path),
+            self._activity_windows(username, repo_name, cutoffs),
+        )
+        if windows is None:
+            counts = await asyncio.gather(
+                *(self._count(path, {"since": cutoff.isoformat()}) for cutoff in cutoffs.values())
+            )
+            windows = dict(zip(cutoffs, counts))
+        return window_counts(total, windows, last_commit_date)
+
+    async def _activity_windows(
+        self, username: str, repo_name: str, cutoffs: Dict[int, datetime]
+    ) -> Optional[Dict[int, int]]:
+        """Window counts from ``/stats/commit_activity``, or None if not ready or unavailable."""
+        weeks = None
+        try:
+            for attempt in range(self.commit_counter.poll_attempts + 1):
+                response = await self._get(f"/repos/{username}/{repo_name}/stats/commit_activity")
+                if response.status_code == 200:
+                    weeks = response.json()
+                    break
+                if attempt < self.commit_counter.poll_attempts:
+                    # 202: statistics are being computed in the background
+                    await asyncio.sleep(self.commit_counter.poll_interval)
+        except GithubException as e:
+            self.logger.debug(f"Commit activity unavailable for {repo_name}: {e}")
+            return None
+        if not weeks:
+            return None
+        return activity_windows(
+            ((datetime.fromtimestamp(week["week"], tz=timezone.utc), week.get("days")) for week in weeks),
+            cutoffs,
+        )
+
+    # ------------------------------------------------------------------
+    # Commits with stats
+    # ------------------------------------------------------------------
+
+    def _list_new_commits(self, repo: Any, known_shas: set, max_commits: int) -> Tuple[List[Any], Optional[str]]:
+        """Stage 1: list commits newer than the cached history over the async client."""
+        return self._run(self._list_new_commits_async(repo.full_name, known_shas, max_commits))
+
+    async def _list_new_commits_async(
+        self, full_name: str, known_shas: set, max_commits: int
+    ) -> Tuple[List[ListedCommit], Optional[str]]:
+        listed: List[ListedCommit] = []
+        path: Optional[str] = f"/repos/{full_name}/commits"
+        params: Optional[Dict[str, Any]] = {"per_page": COMMITS_PER_PAGE}
+        while path:
+            response = await self._get(path, params=params)
+            for data in response.json() or []:
+                sha = data.get("sha")
+                if sha in known_shas:
+                    # Everything from here on is already cached
+                    return listed, sha
+                if len(listed) >= max_commits:
+                    return listed, None
+                listed.append(ListedCommit(sha=sha, data=data))
+            # The next link already carries the query string
+            path = response.links.get("next", {}).get("url")
+            params = None
+        return listed, None
+
+    def _fetch_commit_details(
+        self,
+        username: str,
+        repo_name: str,
+        listed: List[Any],
+        records: Dict[str, Dict[str, Any]],
+        push_key: str,
+    ) -> None:
+        """Stage 2: fetch per-commit stats concurrently on the event loop."""
+        self._run(self._fetch_commit_details_async(username, repo_name, listed, records, push_key))
+
+    async def _fetch_commit_details_async(
+        self,
+        username: str,
+        repo_name: str,
+        listed: List[Any],
+        records: Dict[str, Dict[str, Any]],
+        push_key: str,
+    ) -> None:
+        todo = [commit for commit in listed if commit.sha not in records]
+        total = len(listed)
+        if records:
+            self.logger.info(f"Resuming {repo_name}: {total - len(todo)}/{total} commits already fetched")
+        if not todo:
+            return
+
+        record_done = self._commit_progress(username, repo_name, records, push_key, total, total - len(todo))
+
+        async def fetch(sha: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+            try:
+                response = await self._get(f"/repos/{username}/{repo_name}/commits/{sha}")
+            except GithubException as e:
+                self.logger.warn(f"Failed to fetch stats for commit {sha}: {e}")
+                return sha, None
+            return sha, _commit_stats_from_api(response.json(), username, repo_name)
+
+        tasks = [asyncio.ensure_future(fetch(commit.sha)) for commit in todo]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                sha, record = await next_done
+                record_done(sha, record)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # ------------------------------------------------------------------
+    # Batch prefetch for CacheManager
+    # ------------------------------------------------------------------
+
+    def prefetch_repository_data(self, username: str, repos: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Fill languages, readme and commit_counts for all stale repositories concurrently.
+
+        In graphql mode the GraphQL batches run first; only entries they left
+        missing are requested here.
+
+        Args:
+            username: Repository owner
+            repos: Repository dicts with 'name' and 'pushed_at'
+
+        Returns:
+            Dict mapping category to number of cache entries written
+        """
+        written = dict(super().prefetch_repository_data(username, repos))
+        for category, count in self._run(self._prefetch_async(username, repos)).items():
+            written[category] = written.get(category, 0) + count
+        return written
+
+    async def _prefetch_async(self, username: str, repos: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        written = {category: 0 for category in ASYNC_CATEGORIES}
+        fetchers = {
+            "languages": self.fetch_languages_async,
+            "readme": self.fetch_readme_async,
+            "commit_counts": self.fetch_commit_counts_async,
+        }
+        if self.commit_counter.engine != "stats":
+            del fetchers["commit_counts"]
+
+        jobs = []
+        for repo in repos:
+            pushed_at = _parse_timestamp(repo.get("pushed_at"))
+            if not pushed_at:
+                continue
+            cache_key = sanitize_timestamp_for_filename(pushed_at)
+            for category, fetch in fetchers.items():
+                if not self.cache.has_entry(category, username, repo=repo["name"], week=cache_key):
+                    jobs.append((category, repo["name"], pushed_at, cache_key, fetch))
+
+        if not jobs:
+            return written
+
+        self.logger.info(f"Async prefetch: {len(jobs)} cache entries, up to {self.concurrency} requests in flight")
+
+        loop = asyncio.get_running_loop()
+
+        async def run(job):
+            category, name, pushed_at, cache_key, fetch = job
+            # Failed entries are left for CacheManager's per-category refresh
+            try:
+                value = await fetch(username, name)
+            except GithubException as e:
+                self.logger.debug(f"Async prefetch of {category} for {name} failed: {e}")
+                return
+            except Exception as e:
+                self.logger.warn(f"Async prefetch of {category} for {name} failed: {e}")
+                return
+            if category == "readme" and value is None:
+                value = ""
+            metadata = {
+                "repository": {"owner": username, "name": name},
+                "category": category,
+                "pushed_at": pushed_at.isoformat(),
+                "ttl_enforced": False,
+                "source": "async",
+            }
+            # Cache writes block on disk and locks; keep them off the event loop
+            store = functools.partial(
+                self.cache.set, category, username, value, repo=name, week=cache_key, metadata=metadata
+            )
+            try:
+                await loop.run_in_executor(None, store)
+            except Exception as e:
+                self.logger.warn(f"Async prefetch could not cache {category} for {name}: {e}")
+                return
+            written[category] += 1
+
+        await asyncio.gather(*(run(job) for job in jobs))
+        self.logger.info(
+            "Async prefetch wrote "
+            + ", ".join(f"{category}={count}" for category, count in written.items())
+            + f" ({self.async_requests} requests)"
+        )
+        return written
+
+
+def _api_commit_date(data: Dict[str, Any]) -> Optional[datetime]:
+    """Author date of a commit from the REST API, or None if unavailable."""
+    date = ((data.get("commit") or {}).get("author") or {}).get("date")
+    return _parse_timestamp(date)
+
+
+def _commit_stats_from_api(data: Dict[str, Any], username: str, repo_name: str) -> Dict[str, Any]:
+    """Build the cached commits_stats record from a ``/commits/{sha}`` response.
+
+    Matches ``GitHubFetcher._commit_stats_record`` for PyGithub commits.
+    """
+    commit = data.get("commit") or {}
+    author = commit.get("author")
+    stats = data.get("stats") or {}
+    return {
+        "sha": data.get("sha"),
+        "commit": {
+            "author": {
+                "name": author.get("name") if author else username,
+                "date": _iso_timestamp(author.get("date")) if author else None,
+            },
+            "message": commit.get("message") or "",
+        },
+        "stats": {
+            "total": stats.get("total", 0),
+            "additions": stats.get("additions", 0),
+            "deletions": stats.get("deletions", 0),
+        },
+        "repo": repo_name,
+    }
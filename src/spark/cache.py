@@ -2,150 +2,398 @@
 
 from __future__ import annotations
 
+import copy
 import json
-import os
-import shutil
 import hashlib
 import logging
-from datetime import datetime, timedelta, timezone
+import random
+import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional, Dict, List, Union
+from typing import Any, Optional, Dict, Iterator, List, Set, Tuple
 
+from spark.cache_backends import (  # noqa: F401 - re-exported
+    CacheBackend,
+    CacheManifest,
+    _CacheFileLock,
+    create_backend,
+    migrate_backend,
+)
+from spark.cache_codecs import DEFAULT_CODEC, CodecSelector, PayloadCodec, get_codec
+from spark.commit_columns import CommitColumns, write_columns
 from spark.config import SparkConfig
 
+# Default byte budget of the in-memory read layer (cache.memory_budget_mb)
+DEFAULT_MEMORY_BUDGET_MB = 64
 
-class _CacheFileLock:
-    """Cross-platform file lock to coordinate cache access."""
+# Encoded values at least this large go to the blob store (cache.blob_min_bytes)
+DEFAULT_BLOB_MIN_BYTES = 1024
 
-    def __init__(self, lock_path: Path):
-        self.lock_path = lock_path
-        self._handle = None
+# Blobs written this recently are never collected, covering other processes'
+# writes in flight and coarse filesystem timestamps
+BLOB_GC_GRACE_SECONDS = 5
 
-    def __enter__(self):
-        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
-        # Binary append avoids truncation
-        self._handle = open(self.lock_path, "a+b")
-        if os.name == "nt":
-            import msvcrt
+# Weeks kept per key by prune unless cache.eviction.keep_weeks says otherwise
+DEFAULT_KEEP_WEEKS = 2
 
-            self._handle.seek(0)
-            msvcrt.locking(self._handle.fileno(), msvcrt.LK_LOCK, 1)
-        else:
-            import fcntl
+# Directory of commits_stats column sidecars (see commit_columns), mirroring keys
+COLUMNS_DIRNAME = ".columns"
+COLUMNS_CATEGORY = "commits_stats"
 
-            fcntl.flock(self._handle, fcntl.LOCK_EX)
-        return self
+# Stored entry format 2: b"SPARK2 sha256=<hex>[ codec=<spec>]\n" followed by
+# the payload encoded with that codec (JSON when absent, see cache_codecs).
+# The digest covers the stored body bytes, so checking it needs no
+# re-serialization. Entries without the header are legacy JSON payloads whose
+# "hash" field covers json.dumps(value, sort_keys=True).
+# A " blob=<sha256>" header field means the value lives in the backend's
+# content-addressed blob store (encoded with the header's codec) and the body
+# is compact JSON of the rest of the payload.
+STORAGE_MAGIC = b"SPARK2"
 
-    def __exit__(self, exc_type, exc, tb):
-        if not self._handle:
-            return False
-        if os.name == "nt":
-            import msvcrt
+# Values for cache.integrity: when reads verify the stored digest
+INTEGRITY_MODES = ("always", "sampled", "first_read", "sweep")
 
-            self._handle.seek(0)
-            try:
-                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
-            except OSError:
-                pass
-        else:
-            import fcntl
 
-            try:
-                fcntl.flock(self._handle, fcntl.LOCK_UN)
-            except OSError:
-                pass
-        self._handle.close()
-        self._handle = None
-        return False
+def encode_entry(payload: Dict[str, Any], codec: Optional[PayloadCodec] = None, blob: Optional[str] = None) -> bytes:
+    """Serialize a payload in the format-2 layout (header + encoded body).
 
+    The header names the codec unless it is plain JSON. With ``blob`` (the
+    digest of the value encoded with ``codec``), ``payload`` holds no
+    "value" and is stored as compact JSON.
+    """
+    codec = codec or get_codec(DEFAULT_CODEC)
+    if blob:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    else:
+        body = codec.encode(payload)
+    header = STORAGE_MAGIC + b" sha256=" + hashlib.sha256(body).hexdigest().encode("ascii")
+    if blob:
+        header += b" blob=" + blob.encode("ascii")
+    if codec.name != DEFAULT_CODEC:
+        header += b" codec=" + codec.name.encode("ascii")
+    return header + b"\n" + body
 
-class CacheManifest:
-    """Manages the cache index file for quick lookups."""
 
-    def __init__(self, cache_dir: Path):
-        self.manifest_path = cache_dir / "index.json"
-        self.data: Dict[str, Any] = {"entries": {}}
-        self._dirty = False
-        self._last_mtime = 0
+def split_entry(raw: bytes) -> Tuple[Optional[Dict[str, str]], int]:
+    """Parse the format-2 header of stored bytes.
 
-    def load(self):
-        """Load manifest from disk."""
-        if self.manifest_path.exists():
-            try:
-                mtime = self.manifest_path.stat().st_mtime
-                if mtime > self._last_mtime:
-                    with open(self.manifest_path, "r", encoding="utf-8") as f:
-                        self.data = json.load(f)
-                    self._last_mtime = mtime
-            except (json.JSONDecodeError, OSError):
-                # If corrupt, start fresh
-                self.data = {"entries": {}}
-
-    def save(self):
-        """Save manifest to disk if modified."""
-        if self._dirty:
-            with open(self.manifest_path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2)
-            self._dirty = False
-            try:
-                self._last_mtime = self.manifest_path.stat().st_mtime
-            except OSError:
-                pass
+    Returns:
+        (header fields, body offset), or (None, 0) for legacy entries
+
+    Raises:
+        ValueError: If the header is truncated or malformed
+    """
+    if not raw.startswith(STORAGE_MAGIC + b" "):
+        return None, 0
+    end = raw.find(b"\n")
+    if end < 0:
+        raise ValueError("truncated cache entry header")
+    fields = raw[len(STORAGE_MAGIC) + 1:end].decode("ascii").split()
+    return dict(field.split("=", 1) for field in fields), end + 1
+
+
+# Sentinel for a value that could not be loaded (None is a valid cached value)
+_MISSING = object()
+
+
+def _read_only(self, *args: Any, **kwargs: Any) -> None:
+    raise TypeError("cached values are shared and read-only; copy.deepcopy() before modifying")
+
+
+class FrozenDict(dict):
+    """Read-only dict handed out by APICache (shared between readers).
+
+    ``copy.deepcopy`` returns plain, mutable containers; ``copy.copy``,
+    ``dict(value)`` and ``value.copy()`` give a mutable shallow copy, and
+    pickling yields a plain dict.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> Dict[Any, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[Any, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """Read-only list handed out by APICache (see FrozenDict)."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
 
-    def update_entry(self, key: str, week: str):
-        """Update an entry in the manifest."""
-        if key not in self.data["entries"]:
-            self.data["entries"][key] = {
-                "latest_week": week,
-                "weeks": [week],
-                "updated_at": datetime.now(timezone.utc).isoformat()
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return list, (list(self),)
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only version of a decoded payload (dicts and lists, recursively)."""
+    if type(value) is dict:
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if type(value) is list:
+        return FrozenList(_freeze(item) for item in value)
+    return value
+
+
+class _MemoryLRU:
+    """Bounded LRU of verified, frozen payloads, keyed by (cache key, week).
+
+    Sizes are the stored byte length of each entry, which tracks the parsed
+    payload's footprint closely enough for a budget. A ``None`` week stands
+    for "latest" and is invalidated with every other week of its key.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._weeks: Dict[str, Set[Optional[str]]] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, week: Optional[str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get((key, week))
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((key, week))
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: str, week: Optional[str], payload: Dict[str, Any], size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove((key, week))
+            self._entries[(key, week)] = (payload, size)
+            self._weeks.setdefault(key, set()).add(week)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Drop every week of a key."""
+        with self._lock:
+            for week in list(self._weeks.get(key, ())):
+                self._remove((key, week))
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._weeks if key.startswith(prefix)]:
+                for week in list(self._weeks[key]):
+                    self._remove((key, week))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._weeks.clear()
+            self.bytes = 0
+
+    def _remove(self, item_key: Tuple[str, Optional[str]]) -> None:
+        item = self._entries.pop(item_key, None)
+        if item is None:
+            return
+        self.bytes -= item[1]
+        key, week = item_key
+        weeks = self._weeks.get(key)
+        if weeks is not None:
+            weeks.discard(week)
+            if not weeks:
+                del self._weeks[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
             }
-            self._dirty = True
-        else:
-            entry = self.data["entries"][key]
-            if week not in entry["weeks"]:
-                entry["weeks"].append(week)
-                entry["weeks"].sort(reverse=True) # Keep newest first
-                self._dirty = True
-            
-            if entry.get("latest_week") != week:
-                # Only update latest_week if the new one is "newer" or we just treat the last written as latest?
-                # For now, let's assume the caller knows what they are doing.
-                # But usually we want the lexically largest week (e.g. 2026W02 > 2026W01)
-                if week > entry.get("latest_week", ""):
-                    entry["latest_week"] = week
-                    self._dirty = True
-            
-            entry["updated_at"] = datetime.now(timezone.utc).isoformat()
-
-    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
-        return self.data["entries"].get(key)
-
-    def remove_week(self, key: str, week: str):
-        """Remove a week from an entry."""
-        if key in self.data["entries"]:
-            entry = self.data["entries"][key]
-            if week in entry["weeks"]:
-                entry["weeks"].remove(week)
-                self._dirty = True
-                # If we removed the latest week, update it
-                if entry["latest_week"] == week:
-                    entry["latest_week"] = entry["weeks"][0] if entry["weeks"] else None
-
-            if not entry["weeks"]:
-                del self.data["entries"][key]
-                self._dirty = True
+
+
+def _megabytes(value: Any) -> int:
+    return int(float(value or 0) * 1024 * 1024)
+
+
+def _epoch(timestamp: Optional[str]) -> float:
+    """Epoch seconds of an ISO timestamp (0 if missing or unparsable)."""
+    try:
+        return datetime.fromisoformat(timestamp).timestamp() if timestamp else 0.0
+    except ValueError:
+        return 0.0
+
+
+class _EvictionPlan:
+    """Chooses entries to evict while tracking the bytes that remain.
+
+    A blob counts toward usage while any remaining entry references it, so
+    evicting an entry frees its blob only with the blob's last reference.
+    Usage excludes blobs nothing references (prune collects those anyway).
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], blob_sizes: Dict[str, int]):
+        self.items = items
+        self.blob_sizes = blob_sizes
+        self.evicted: List[Dict[str, Any]] = []
+        self.entry_bytes = 0
+        self.over_budget = False
+        self._refs: Dict[str, int] = {}
+        self._category_refs: Dict[Tuple[str, str], int] = {}
+        self.total = 0
+        self.by_category: Dict[str, int] = {}
+        for item in items:
+            self._charge(item, 1)
+
+    def _charge(self, item: Dict[str, Any], sign: int) -> int:
+        """Add (sign=1) or remove (sign=-1) an item's bytes. Returns bytes changed."""
+        category = item["category"]
+        size = item["bytes"]
+        blob = item["blob"]
+        if blob and blob in self.blob_sizes:
+            blob_size = self.blob_sizes[blob]
+            refs = self._refs.get(blob, 0) + sign
+            self._refs[blob] = refs
+            if (sign > 0 and refs == 1) or (sign < 0 and refs == 0):
+                self.total += sign * blob_size
+                size += blob_size
+            category_refs = self._category_refs.get((category, blob), 0) + sign
+            self._category_refs[(category, blob)] = category_refs
+            if (sign > 0 and category_refs == 1) or (sign < 0 and category_refs == 0):
+                self.by_category[category] = self.by_category.get(category, 0) + sign * blob_size
+        self.total += sign * item["bytes"]
+        self.by_category[category] = self.by_category.get(category, 0) + sign * item["bytes"]
+        return size
+
+    def _evict(self, item: Dict[str, Any], reason: str) -> None:
+        item["evicted"] = True
+        freed = self._charge(item, -1)
+        self.entry_bytes += item["bytes"]
+        self.evicted.append({
+            "key": item["key"],
+            "week": item["week"],
+            "bytes": freed,
+            "reason": reason,
+            "last_used": item["last_used"],
+        })
+
+    def trim_weeks(self, keep_weeks: int) -> None:
+        """Evict weeks beyond the newest ``keep_weeks`` of each key."""
+        for item in self.items:
+            if item["rank"] >= max(keep_weeks, 1) and not item["nested"] and not item.get("evicted"):
+                self._evict(item, "keep_weeks")
+
+    def fit(self, budget: int, category: Optional[str] = None) -> None:
+        """Evict least recently read entries until usage fits ``budget`` (0 = unlimited)."""
+        if budget <= 0:
+            return
+        reason = f"category_budget:{category}" if category else "total_budget"
+        candidates = sorted(
+            (
+                item for item in self.items
+                if item["rank"] > 0 and not item.get("evicted") and (category is None or item["category"] == category)
+            ),
+            key=lambda item: item["last_used"],
+        )
+        for item in candidates:
+            if self._usage(category) <= budget:
+                return
+            self._evict(item, reason)
+        if self._usage(category) > budget:
+            self.over_budget = True
+
+    def _usage(self, category: Optional[str]) -> int:
+        return self.by_category.get(category, 0) if category else self.total
+
+    def report(self) -> Dict[str, Any]:
+        unreferenced = [digest for digest in self.blob_sizes if not self._refs.get(digest)]
+        return {
+            "entries": len(self.evicted),
+            "entry_bytes": self.entry_bytes,
+            "blobs": len(unreferenced),
+            "blob_bytes": sum(self.blob_sizes[digest] for digest in unreferenced),
+            "bytes": self.total,
+            "over_budget": self.over_budget,
+            "evicted": list(self.evicted),
+        }
+
+
+class ManifestIndex:
+    """Point-in-time copy of the cache manifest for existence checks.
+
+    Built from one backend manifest read; ``has`` is a dictionary probe with
+    no locking or I/O, for validating many (repository, category) pairs.
+    """
+
+    def __init__(self, entries: Dict[str, Dict[str, Any]]):
+        self._weeks = {key: frozenset(entry.get("weeks", ())) for key, entry in entries.items()}
+
+    def has(self, category: str, owner: str, repo: Optional[str] = None, week: Optional[str] = None) -> bool:
+        """Same answer as APICache.has_entry at the time of the snapshot."""
+        weeks = self._weeks.get(f"{owner}/{repo or '_global_'}/{category}")
+        if not weeks:
+            return False
+        return week in weeks if week else True
 
 
 class APICache:
-    """Manages cached API responses with repository-aware invalidation."""
+    """Manages cached API responses with repository-aware invalidation.
+
+    Payloads are stored through a pluggable backend selected by
+    ``cache.backend`` in spark.yml ("files" or "sqlite", see cache_backends).
+    Verified payloads are kept in a bounded in-memory LRU
+    (``cache.memory_budget_mb``, 0 disables) so repeated reads within a run
+    skip the backend read, JSON parse and hash check. Writes through this
+    instance invalidate it; changes made by other processes are not seen
+    until the entry is evicted.
+
+    ``cache.integrity`` controls when backend reads check the stored digest:
+    ``always``, ``sampled`` (``cache.integrity_sample_rate`` of reads),
+    ``first_read`` (once per entry per process) or ``sweep`` (never on read;
+    run ``spark cache --verify`` instead).
+
+    Values whose encoding is at least ``cache.blob_min_bytes`` are stored in
+    the backend's content-addressed blob store, so a README or language map
+    that is unchanged across pushes (or identical across repositories) is
+    stored once. ``prune`` deletes blobs no entry references.
 
-    def __init__(self, cache_dir: str = ".cache", config: Optional[SparkConfig] = None):
+    Reads are timestamped in memory and persisted by ``flush_reads`` (also
+    on ``prune`` and ``close``), so ``prune`` can evict least recently read
+    entries to meet the ``cache.eviction`` byte budgets.
+
+    ``get_commit_columns`` serves commits_stats entries as memory-mapped
+    columns from a sidecar file under ``.columns/``, built on first use and
+    rebuilt whenever the entry's value changes.
+    """
+
+    def __init__(self, cache_dir: str = ".cache", config: Optional[SparkConfig] = None, backend: Optional[str] = None):
         """Initialize the cache.
 
         Args:
             cache_dir: Directory to store cache files
             config: SparkConfig instance for configuration
+            backend: Storage backend name (overrides cache.backend)
         """
         self.cache_dir = Path(cache_dir)
         self.config = config or SparkConfig()
@@ -153,16 +401,55 @@ class APICache:
         if not self.config.config and Path("config/spark.yml").exists():
              self.config.load()
 
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self._lock_path = self.cache_dir / ".cache.lock"
         self.logger = logging.getLogger(__name__)
-        
-        self.manifest = CacheManifest(self.cache_dir)
-        with self._acquire_lock():
-            self.manifest.load()
+        self.backend: CacheBackend = create_backend(
+            backend or self.config.get("cache.backend", "files"),
+            self.cache_dir,
+        )
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_guard = threading.Lock()
+        budget_mb = self.config.get("cache.memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB)
+        self.memory = _MemoryLRU(int(float(budget_mb or 0) * 1024 * 1024))
+
+        self.integrity = self.config.get("cache.integrity", "always")
+        if self.integrity not in INTEGRITY_MODES:
+            raise ValueError(
+                f"Unknown cache integrity mode '{self.integrity}' (expected one of {', '.join(INTEGRITY_MODES)})"
+            )
+        self.integrity_sample_rate = float(self.config.get("cache.integrity_sample_rate", 0.1))
+        self._verified: Set[Tuple[str, str, str]] = set()
+        self.codecs = CodecSelector(self.config.get("cache.codecs", {}))
+        self.blob_min_bytes = int(self.config.get("cache.blob_min_bytes", DEFAULT_BLOB_MIN_BYTES))
+        # Last read per (key, week); week None means "latest" and is resolved on flush
+        self._reads: Dict[Tuple[str, Optional[str]], float] = {}
+        self._reads_lock = threading.Lock()
 
     def _acquire_lock(self):
-        return _CacheFileLock(self._lock_path)
+        """Lock for whole-cache operations (prune, clear, migration)."""
+        return self.backend.lock()
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        """Lock serializing reads and writes of one cache key.
+
+        Operations on different keys run concurrently; the backend keeps
+        its manifest consistent on its own.
+        """
+        with self._key_locks_guard:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group writes so manifest changes are persisted once at the end.
+
+        Entries written inside the batch are readable immediately through
+        this instance; other processes see them after the outermost batch
+        exits. Batches may be nested and shared by several threads.
+        """
+        with self.backend.batch():
+            yield
 
     def _get_key_path(self, category: str, owner: str, repo: Optional[str]) -> str:
         """Generate the logical key for manifest lookup."""
@@ -170,20 +457,18 @@ class APICache:
             return f"{owner}/{repo}/{category}"
         return f"{owner}/_global_/{category}"
 
-    def _get_fs_path(self, category: str, owner: str, repo: Optional[str], week: str) -> Path:
-        """Generate the filesystem path."""
-        if repo:
-            return self.cache_dir / owner / repo / category / f"{week}.json"
-        return self.cache_dir / owner / "_global_" / category / f"{week}.json"
-
     def _calculate_hash(self, data: Any) -> str:
-        """Calculate SHA256 hash of the data."""
+        """Calculate SHA256 hash of the data (legacy entry format)."""
         serialized = json.dumps(data, sort_keys=True)
         return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
 
     def get(self, category: str, owner: str, repo: Optional[str] = None, week: Optional[str] = None) -> Optional[Any]:
         """Retrieve a cached value.
 
+        With the memory layer enabled the value is shared with other readers
+        and read-only (FrozenDict / FrozenList); callers that modify it must
+        ``copy.deepcopy`` it first.
+
         Args:
             category: Cache category
             owner: Repository owner
@@ -193,70 +478,359 @@ class APICache:
         Returns:
             Cached value or None
         """
+        payload = self._read_payload(category, owner, repo, week)
+        if payload is None:
+            return None
+        return payload.get("value")
+
+    def get_metadata(self, category: str, owner: str, repo: Optional[str] = None, week: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve the metadata stored alongside a cached value.
+
+        Args:
+            category: Cache category
+            owner: Repository owner
+            repo: Repository name (optional)
+            week: Specific week to retrieve (optional, defaults to latest)
+
+        Returns:
+            Metadata dict (empty if none was stored, read-only like ``get``
+            values) or None if no valid entry exists
+        """
+        payload = self._read_payload(category, owner, repo, week)
+        if payload is None:
+            return None
+        return payload.get("metadata") or {}
+
+    def _read_payload(self, category: str, owner: str, repo: Optional[str], week: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Verified payload from the memory layer or the backend (not copied;
+        frozen when the memory layer is enabled)."""
         key = self._get_key_path(category, owner, repo)
-        
-        with self._acquire_lock():
-            self.manifest.load()
-            # If week not specified, look up latest in manifest
-            if not week:
-                entry = self.manifest.get_entry(key)
-                if not entry or not entry.get("latest_week"):
+        if self.memory.max_bytes > 0:
+            payload = self.memory.get(key, week)
+            if payload is not None:
+                self._note_read(key, week)
+                return payload
+
+        with self._key_lock(key):
+            loaded = self._load_payload(category, owner, repo, week, with_size=True)
+            if loaded is None:
+                return None
+            payload, size = loaded
+            # Populated under the lock so a concurrent set() cannot be overtaken
+            if self.memory.max_bytes > 0:
+                payload = _freeze(payload)
+                self.memory.put(key, week, payload, size)
+        self._note_read(key, week)
+        return payload
+
+    def _load_payload(self, category: str, owner: str, repo: Optional[str], week: Optional[str], with_size: bool = False) -> Any:
+        """Read and verify a cache payload. Caller must hold the key lock.
+
+        Returns the payload dict (or ``(payload, serialized_bytes)`` with
+        ``with_size``), or None.
+        """
+        key = self._get_key_path(category, owner, repo)
+
+        # If week not specified, look up latest in manifest
+        if not week:
+            entry = self.backend.entry(key)
+            if not entry or not entry.get("latest_week"):
+                return None
+            week = entry["latest_week"]
+
+        raw = self.backend.read(key, week)
+        if raw is None:
+            return None
+
+        decoded = self._decode(key, week, raw)
+        if decoded is None:
+            return None
+
+        # No TTL check - cache is valid until data changes on GitHub
+        # Higher-level logic (cache_status.py) compares pushed_at timestamps
+        # to determine if refresh is needed
+
+        return decoded if with_size else decoded[0]
+
+    def _should_verify(self, key: str, week: str, digest: str) -> bool:
+        """Whether this read checks the stored digest (per cache.integrity)."""
+        if self.integrity == "always":
+            return True
+        if self.integrity == "sampled":
+            return random.random() < self.integrity_sample_rate
+        if self.integrity == "first_read":
+            return (key, week, digest) not in self._verified
+        return False
+
+    def _decode(self, key: str, week: str, raw: bytes, verify: Optional[bool] = None, discard: bool = True) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Parse stored bytes into a payload, checking integrity when required.
+
+        Args:
+            verify: Force (True) or skip (False) the digest check instead of
+                applying cache.integrity
+            discard: Delete the entry if it is corrupt
+
+        Returns:
+            (payload dict, serialized size before compression), or None if
+            the entry is corrupt or its codec is unavailable
+        """
+        try:
+            header, offset = split_entry(raw)
+            digest = header.get("sha256", "") if header is not None else ""
+            check = bool(digest) and (self._should_verify(key, week, digest) if verify is None else verify)
+            # Digest of the stored body bytes (memoryview avoids a copy)
+            if check and hashlib.sha256(memoryview(raw)[offset:]).hexdigest() != digest:
+                self.logger.error(f"Cache integrity failure for {key}/{week}")
+                if discard:
+                    self._discard(key, week)
+                return None
+            codec = get_codec(header.get("codec", DEFAULT_CODEC) if header is not None else DEFAULT_CODEC)
+            blob = header.get("blob") if header is not None else None
+            if blob:
+                data = json.loads(raw[offset:])
+                value, size = self._decode_blob(key, week, blob, codec, check, discard)
+                if value is _MISSING:
                     return None
-                week = entry["latest_week"]
+                data["value"] = value
+                size += len(raw) - offset
+            else:
+                data, size = codec.decode(raw[offset:] if offset else raw)
+        except RuntimeError as exc:
+            # Written with a codec whose package is not installed here
+            self.logger.warning(f"Cannot decode cache entry {key}/{week}: {exc}")
+            return None
+        except (ValueError, TypeError, OSError, EOFError) as exc:
+            # Includes JSON, gzip and codec decoding errors
+            self.logger.warning(f"Corrupt cache entry {key}/{week}: {exc}")
+            if discard:
+                self._discard(key, week)
+            return None
+
+        if not isinstance(data, dict):
+            self.logger.warning(f"Corrupt cache entry {key}/{week}: payload is not an object")
+            if discard:
+                self._discard(key, week)
+            return None
 
-            cache_path = self._get_fs_path(category, owner, repo, week)
-            
-            if not cache_path.exists():
+        if header is None:
+            # Legacy entry: the hash covers a re-serialization of the value
+            digest = data.get("hash") or ""
+            check = bool(digest) and (self._should_verify(key, week, digest) if verify is None else verify)
+            if check and self._calculate_hash(data.get("value")) != digest:
+                self.logger.error(f"Cache integrity failure for {key}/{week}")
+                if discard:
+                    self._discard(key, week)
                 return None
 
-            try:
-                with open(cache_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except (json.JSONDecodeError, OSError) as exc:
-                self.logger.warning(f"Corrupt cache file {cache_path}: {exc}")
+        if check and self.integrity == "first_read":
+            self._verified.add((key, week, digest))
+        return data, size
+
+    def _decode_blob(self, key: str, week: str, digest: str, codec: PayloadCodec, check: bool, discard: bool) -> Tuple[Any, int]:
+        """Value stored in a blob, or ``_MISSING`` if the blob is gone or corrupt.
+
+        A corrupt blob is deleted along with the entry (when ``discard``),
+        since an existing blob is never rewritten.
+        """
+        blob = self.backend.read_blob(digest)
+        if blob is None:
+            self.logger.warning(f"Cache entry {key}/{week} references missing blob {digest}")
+        else:
+            corrupt = check and hashlib.sha256(blob).hexdigest() != digest
+            if not corrupt:
                 try:
-                    cache_path.unlink(missing_ok=True)
-                except OSError:
-                    pass
+                    return codec.decode(blob)
+                except (ValueError, TypeError, OSError, EOFError):
+                    corrupt = True
+            self.logger.error(f"Cache integrity failure for blob {digest} ({key}/{week})")
+            if discard:
+                self.backend.delete_blob(digest, written_before=float("inf"))
+        if discard:
+            self._discard(key, week)
+        return _MISSING, 0
+
+    def verify(self, repair: bool = True) -> Dict[str, int]:
+        """Check the stored digest of every entry (the ``cache --verify`` sweep).
+
+        Only one key is locked at a time, so the sweep can run alongside
+        other cache users.
+
+        Args:
+            repair: Delete corrupt entries so the next refresh fetches them again
+
+        Returns:
+            Dict with "checked", "corrupt" and "legacy" (pre-format-2) counts
+        """
+        results = {"checked": 0, "corrupt": 0, "legacy": 0}
+        weeks_by_key = {key: entry.get("weeks", []) for key, entry in self.backend.entries().items()}
+
+        for key, weeks in weeks_by_key.items():
+            for week in weeks:
+                with self._key_lock(key):
+                    raw = self.backend.read(key, week)
+                    if raw is None:
+                        continue
+                    results["checked"] += 1
+                    if not raw.startswith(STORAGE_MAGIC + b" "):
+                        results["legacy"] += 1
+                    if self._decode(key, week, raw, verify=True, discard=repair) is None:
+                        results["corrupt"] += 1
+        return results
+
+    def _discard(self, key: str, week: str) -> None:
+        """Drop an unreadable entry. Caller must hold the key lock."""
+        self.memory.invalidate(key)
+        self._drop_columns(key, week)
+        try:
+            self.backend.delete(key, week)
+        except OSError:
+            pass
+
+    def _columns_path(self, key: str, week: str) -> Path:
+        return self.cache_dir / COLUMNS_DIRNAME / key / f"{week}.cols"
+
+    def _drop_columns(self, key: str, week: str) -> None:
+        """Remove a column sidecar (the digest check makes stale ones harmless)."""
+        if key.endswith("/" + COLUMNS_CATEGORY):
+            try:
+                self._columns_path(key, week).unlink(missing_ok=True)
+            except OSError:
+                # Still mapped by a reader (Windows); replaced on next use
+                pass
+
+    @staticmethod
+    def _value_digest(raw: bytes) -> Optional[str]:
+        """Digest identifying a stored entry's value (blob or body digest)."""
+        try:
+            header, _ = split_entry(raw)
+        except ValueError:
+            return None
+        if header is None:
+            return hashlib.sha256(raw).hexdigest()
+        return header.get("blob") or header.get("sha256")
+
+    def get_commit_columns(self, owner: str, repo: str, week: Optional[str] = None) -> Optional[CommitColumns]:
+        """Columns (sha, timestamp, additions, deletions, files) of a commits_stats entry.
+
+        The sidecar is memory-mapped, so scanning it decodes no JSON and
+        builds no per-commit dicts. It is (re)built from the entry when
+        missing or when its digest no longer matches the entry's value.
+        Close the result when done.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            week: Specific week (optional, defaults to latest)
+
+        Returns:
+            CommitColumns, or None if there is no valid entry
+        """
+        key = self._get_key_path(COLUMNS_CATEGORY, owner, repo)
+        with self._key_lock(key):
+            if not week:
+                entry = self.backend.entry(key)
+                if not entry or not entry.get("latest_week"):
+                    return None
+                week = entry["latest_week"]
+            raw = self.backend.read(key, week)
+            digest = self._value_digest(raw) if raw is not None else None
+            if not digest:
                 return None
 
-            # Integrity check
-            stored_hash = data.get("hash")
-            value = data.get("value")
-            if stored_hash:
-                current_hash = self._calculate_hash(value)
-                if current_hash != stored_hash:
-                    self.logger.error(f"Cache integrity failure for {cache_path}")
-                    try:
-                        cache_path.unlink(missing_ok=True)
-                    except OSError:
-                        pass
+            path = self._columns_path(key, week)
+            columns = CommitColumns.open(path)
+            if columns is None or columns.digest != digest:
+                if columns is not None:
+                    columns.close()
+                payload = self._load_payload(COLUMNS_CATEGORY, owner, repo, week)
+                commits = payload.get("value") if payload else None
+                if not isinstance(commits, list):
                     return None
+                try:
+                    write_columns(path, commits, digest)
+                    columns = CommitColumns.open(path)
+                except OSError as exc:
+                    self.logger.warning(f"Failed to write commit columns for {key}/{week}: {exc}")
+                    columns = None
+                if columns is None:
+                    columns = CommitColumns.from_commits(commits, digest)
+        self._note_read(key, week)
+        return columns
 
-            # No TTL check - cache is valid until data changes on GitHub
-            # Higher-level logic (cache_status.py) compares pushed_at timestamps
-            # to determine if refresh is needed
+    def _note_read(self, key: str, week: Optional[str]) -> None:
+        """Record a last-read time for flush_reads (under the lock it swaps the dict with)."""
+        read_at = time.time()
+        with self._reads_lock:
+            self._reads[(key, week)] = read_at
 
-            return value
+    def flush_reads(self) -> int:
+        """Persist last-read times recorded since the previous flush.
+
+        Returns:
+            Number of (key, week) read times written
+        """
+        with self._reads_lock:
+            reads, self._reads = self._reads, {}
+        if not reads:
+            return 0
+        resolved: Dict[Tuple[str, str], float] = {}
+        latest = self.backend.entries() if any(week is None for _, week in reads) else {}
+        for (key, week), read_at in reads.items():
+            if week is None:
+                week = latest.get(key, {}).get("latest_week")
+                if not week:
+                    continue
+            resolved[(key, week)] = max(read_at, resolved.get((key, week), 0))
+        self.backend.record_reads(resolved)
+        return len(resolved)
 
     def has_entry(self, category: str, owner: str, repo: Optional[str] = None, week: Optional[str] = None) -> bool:
         """Check if a cache entry exists."""
         key = self._get_key_path(category, owner, repo)
-        with self._acquire_lock():
-            self.manifest.load()
-            entry = self.manifest.get_entry(key)
-            if not entry:
+        entry = self.backend.entry(key)
+        if not entry:
+            return False
+        if week:
+            return week in entry.get("weeks", [])
+        return bool(entry.get("latest_week"))
+
+    def has_content(self, category: str, owner: str, repo: Optional[str] = None, week: Optional[str] = None) -> bool:
+        """Check if a cache entry holds a non-empty value, without loading large values.
+
+        Values in the blob store are at least ``blob_min_bytes`` when encoded,
+        so they are never empty and only the entry header is read. Smaller
+        values are decoded as usual.
+        """
+        key = self._get_key_path(category, owner, repo)
+        if self.memory.max_bytes > 0:
+            payload = self.memory.get(key, week)
+            if payload is not None:
+                return bool(payload.get("value"))
+
+        if not week:
+            entry = self.backend.entry(key)
+            if not entry or not entry.get("latest_week"):
                 return False
-            if week:
-                return week in entry.get("weeks", [])
-            return bool(entry.get("latest_week"))
+            week = entry["latest_week"]
+        raw = self.backend.read(key, week)
+        if raw is None:
+            return False
+        try:
+            header, _ = split_entry(raw)
+        except ValueError:
+            header = None
+        if header is not None and header.get("blob"):
+            return True
+        return bool(self.get(category, owner, repo=repo, week=week))
+
+    def manifest_index(self) -> ManifestIndex:
+        """Snapshot the manifest for bulk existence checks (see ManifestIndex)."""
+        return ManifestIndex(self.backend.entries())
 
     def get_entry_info(self, category: str, owner: str, repo: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get info about a cache entry from manifest."""
         key = self._get_key_path(category, owner, repo)
-        with self._acquire_lock():
-            self.manifest.load()
-            return self.manifest.get_entry(key)
+        return self.backend.entry(key)
 
     def set(self, category: str, owner: str, value: Any, repo: Optional[str] = None, week: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> None:
         """Store a value in the cache."""
@@ -266,134 +840,308 @@ class APICache:
             if repo and not repo.startswith("list_"):
                 # This is repo-specific data - week parameter is required
                 raise ValueError(f"week parameter is required for repo-specific data (category: {category}, repo: {repo}). Cache keys must be based on repo_pushed_at, not time-based.")
-            
+
             # User-level data: use a simple cache key (refreshed when list changes)
             week = "current"
-            
+
         key = self._get_key_path(category, owner, repo)
-        cache_path = self._get_fs_path(category, owner, repo, week)
-        
+
         payload = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "value": value,
-            "hash": self._calculate_hash(value),
             "metadata": metadata or {},
             "category": category,
             "owner": owner,
             "repo": repo,
             "week": week
         }
+        codec = self.codecs.for_category(category)
+        value_bytes = codec.encode(value)
+        blob = None
+        if len(value_bytes) >= self.blob_min_bytes:
+            blob = hashlib.sha256(value_bytes).hexdigest()
+            del payload["value"]
+            data = encode_entry(payload, codec, blob=blob)
+        else:
+            data = encode_entry(payload, codec)
 
-        with self._acquire_lock():
-            self.manifest.load()
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._key_lock(key):
+            self.memory.invalidate(key)
             try:
-                # Atomic write
-                import tempfile
-                with tempfile.NamedTemporaryFile("w", delete=False, dir=self.cache_dir, encoding="utf-8") as tmp:
-                    json.dump(payload, tmp, indent=2)
-                    temp_name = tmp.name
-                
-                # Move to final location
-                if os.path.exists(cache_path):
-                    os.remove(cache_path)
-                shutil.move(temp_name, cache_path)
-                
-                # Update manifest
-                self.manifest.update_entry(key, week)
-                self.manifest.save()
-                
+                # Blob first: a stored entry never references a missing blob
+                if blob:
+                    self.backend.write_blob(blob, value_bytes)
+                self.backend.write(key, week, data)
+                self._drop_columns(key, week)
             except Exception as exc:
-                self.logger.error(f"Failed to write cache file {cache_path}: {exc}")
-                if "temp_name" in locals() and os.path.exists(temp_name):
-                    os.remove(temp_name)
+                self.logger.error(f"Failed to write cache entry {key}/{week}: {exc}")
                 raise
 
-    def prune(self, keep_weeks: int = 2):
-        """Prune old cache entries."""
+    def delete(self, category: str, owner: str, repo: Optional[str] = None, week: Optional[str] = None) -> bool:
+        """Delete a single cache entry (``week`` defaults to "current").
+
+        Returns:
+            True if an entry was removed
+        """
+        week = week or "current"
+        key = self._get_key_path(category, owner, repo)
+
+        with self._key_lock(key):
+            self.memory.invalidate(key)
+            self._drop_columns(key, week)
+            try:
+                return self.backend.delete(key, week)
+            except OSError as e:
+                self.logger.warning(f"Failed to delete {key}/{week}: {e}")
+                return False
+
+    def prune(
+        self,
+        keep_weeks: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        category_max_bytes: Optional[Dict[str, int]] = None,
+        dry_run: bool = False,
+    ) -> Dict[str, Any]:
+        """Evict cache entries, then garbage-collect unreferenced blobs.
+
+        Entries are evicted in three steps: weeks beyond the newest
+        ``keep_weeks`` of each key, then least recently read entries of each
+        category over its budget, then least recently read entries until the
+        whole cache fits ``max_bytes``. The newest week of every key (the one
+        for the repository's current pushed_at) is never evicted. Arguments
+        left as None come from ``cache.eviction`` in spark.yml; a byte budget
+        of 0 means unlimited.
+
+        Args:
+            keep_weeks: Weeks kept per key
+            max_bytes: Total budget for entries and the blobs they reference
+            category_max_bytes: Budget per category
+            dry_run: Only report what would be evicted
+
+        Returns:
+            Dict with "entries" evicted, "entry_bytes" freed by them, "blobs"
+            collected, "blob_bytes" freed, "bytes" (usage afterwards),
+            "over_budget" (protected entries alone exceed a budget) and
+            "evicted" (one dict per entry in eviction order: "key", "week",
+            "bytes" freed including a blob it last referenced, "reason",
+            "last_used" epoch seconds)
+        """
         self.logger.info("Running cache janitor...")
-        
-        with self._acquire_lock():
-            # Reload manifest to be safe
-            self.manifest.load()
-            
-            entries_to_remove = []
-            
-            for key, entry in self.manifest.data["entries"].items():
-                weeks = entry.get("weeks", [])
-                if len(weeks) > keep_weeks:
-                    # Sort weeks descending
-                    weeks.sort(reverse=True)
-                    weeks_to_keep = weeks[:keep_weeks]
-                    weeks_to_remove = weeks[keep_weeks:]
-                    
-                    parts = key.split("/")
-                    if len(parts) == 3:
-                        owner, repo, category = parts
-                        if repo == "_global_":
-                            repo = None
-                    else:
-                        continue
+        if keep_weeks is None:
+            keep_weeks = int(self.config.get("cache.eviction.keep_weeks", DEFAULT_KEEP_WEEKS))
+        if max_bytes is None:
+            max_bytes = _megabytes(self.config.get("cache.eviction.max_mb", 0))
+        if category_max_bytes is None:
+            category_max_bytes = {
+                category: _megabytes(mb)
+                for category, mb in (self.config.get("cache.eviction.category_max_mb", {}) or {}).items()
+            }
 
-                    for week in weeks_to_remove:
-                        path = self._get_fs_path(category, owner, repo, week)
+        with self._acquire_lock(), self.batch():
+            self.flush_reads()
+            plan = _EvictionPlan(self._inventory(), self.backend.blob_sizes())
+            plan.trim_weeks(keep_weeks)
+            for category, budget in sorted(category_max_bytes.items()):
+                plan.fit(budget, category=category)
+            plan.fit(max_bytes)
+            results = plan.report()
+
+            if dry_run:
+                return results
+
+            for item in plan.evicted:
+                key, week = item["key"], item["week"]
+                self.memory.invalidate(key)
+                self._drop_columns(key, week)
+                try:
+                    self.backend.delete(key, week)
+                except OSError as e:
+                    self.logger.warning(f"Failed to delete {key}/{week}: {e}")
+
+            results["blobs"], results["blob_bytes"] = self._collect_blobs()
+        return results
+
+    def _inventory(self) -> List[Dict[str, Any]]:
+        """One record per stored entry for eviction planning: "key", "week",
+        "category", "bytes" (entry only), "blob", "last_used", "rank" (0 for
+        the newest week of its key) and "nested" (keys keep_weeks skips)."""
+        items = []
+        for key, entry in self.backend.entries().items():
+            updated = _epoch(entry.get("updated_at"))
+            read_at = entry.get("read_at", {})
+            for rank, week in enumerate(sorted(entry.get("weeks", []), reverse=True)):
+                raw = self.backend.read(key, week)
+                if raw is None:
+                    continue
+                try:
+                    header, _ = split_entry(raw)
+                except ValueError:
+                    header = None
+                items.append({
+                    "key": key,
+                    "week": week,
+                    "category": key.rsplit("/", 1)[-1],
+                    "bytes": len(raw),
+                    "blob": header.get("blob") if header else None,
+                    "last_used": read_at.get(week) or updated,
+                    "rank": rank,
+                    "nested": len(key.split("/")) != 3,
+                })
+        return items
+
+    def _collect_blobs(self) -> Tuple[int, int]:
+        """Delete blobs no entry references (mark and sweep).
+
+        Writers are not stopped: set() stores the blob and its entry under
+        the key lock, which marking takes per key, and blobs written or
+        re-referenced shortly before or after the sweep started are kept.
+
+        Returns:
+            (blobs deleted, bytes freed)
+        """
+        started = time.time() - BLOB_GC_GRACE_SECONDS
+        referenced: Set[str] = set()
+        scanned: Set[str] = set()
+        # A second pass picks up keys created while the first one ran
+        for _ in range(2):
+            for key in self.backend.entries():
+                if key in scanned:
+                    continue
+                scanned.add(key)
+                with self._key_lock(key):
+                    entry = self.backend.entry(key)
+                    for week in entry["weeks"] if entry else ():
+                        raw = self.backend.read(key, week)
                         try:
-                            if path.exists():
-                                path.unlink()
-                            self.manifest.remove_week(key, week)
-                        except OSError as e:
-                            self.logger.warning(f"Failed to delete {path}: {e}")
-            
-            self.manifest.save()
+                            header, _ = split_entry(raw) if raw else (None, 0)
+                        except ValueError:
+                            continue
+                        if header and header.get("blob"):
+                            referenced.add(header["blob"])
+
+        deleted = freed = 0
+        for digest in self.backend.blob_digests():
+            if digest in referenced:
+                continue
+            try:
+                size = self.backend.delete_blob(digest, written_before=started)
+            except OSError as e:
+                self.logger.warning(f"Failed to delete blob {digest}: {e}")
+                continue
+            if size:
+                deleted += 1
+                freed += size
+        return deleted, freed
 
     def clear(self) -> None:
         """Clear all cached values."""
         with self._acquire_lock():
-            # Remove all files in cache dir except lock and index?
-            # Or just recreate the dir
-            for item in self.cache_dir.iterdir():
-                if item.name == ".cache.lock":
-                    continue
-                try:
-                    if item.is_dir():
-                        shutil.rmtree(item)
-                    else:
-                        item.unlink()
-                except OSError as e:
-                    self.logger.warning(f"Failed to delete {item}: {e}")
-            
-            # Reset manifest
-            self.manifest.data = {"entries": {}}
-            self.manifest.save()
+            self.memory.clear()
+            shutil.rmtree(self.cache_dir / COLUMNS_DIRNAME, ignore_errors=True)
+            try:
+                self.backend.clear()
+            except OSError as e:
+                self.logger.warning(f"Failed to clear cache: {e}")
 
     def clear_repository_cache(self, username: str, repo_name: str) -> int:
         """Clear all cache entries related to a specific repository."""
-        count = 0
-        repo_dir = self.cache_dir / username / repo_name
-        
+        prefix = f"{username}/{repo_name}/"
         with self._acquire_lock():
-            self.manifest.load()
-            if repo_dir.exists():
-                # Count files
-                for _ in repo_dir.rglob("*.json"):
-                    count += 1
-                shutil.rmtree(repo_dir)
-                
-                # Update manifest
-                keys_to_remove = []
-                prefix = f"{username}/{repo_name}/"
-                for key in self.manifest.data["entries"]:
-                    if key.startswith(prefix):
-                        keys_to_remove.append(key)
-                
-                for key in keys_to_remove:
-                    del self.manifest.data["entries"][key]
-                
-                if keys_to_remove:
-                    self.manifest._dirty = True
-                    self.manifest.save()
-                    
-        return count
+            self.memory.invalidate_prefix(prefix)
+            shutil.rmtree(self.cache_dir / COLUMNS_DIRNAME / prefix, ignore_errors=True)
+            return self.backend.delete_prefix(prefix)
+
+    def info(self) -> Dict[str, Any]:
+        """Backend name and storage counts for ``spark cache --info``."""
+        stats = self.backend.stats()
+        return {"backend": self.backend.name, **stats, "memory": self.memory.stats()}
+
+    def codec_report(self, sample_per_category: int = 20) -> Dict[str, Dict[str, Any]]:
+        """Compare stored size and decode time against plain pretty JSON.
+
+        Samples up to ``sample_per_category`` entries of each category.
+
+        Returns:
+            Dict keyed by category with "codec" (configured for new writes),
+            "entries", "stored_bytes", "json_bytes", "decode_ms" and
+            "json_decode_ms"
+        """
+        plain = get_codec(DEFAULT_CODEC)
+        samples: Dict[str, List[Tuple[str, str]]] = {}
+        for key, entry in self.backend.entries().items():
+            category = key.rsplit("/", 1)[-1]
+            picked = samples.setdefault(category, [])
+            for week in entry.get("weeks", []):
+                if len(picked) >= sample_per_category:
+                    break
+                picked.append((key, week))
+
+        report: Dict[str, Dict[str, Any]] = {}
+        for category, items in sorted(samples.items()):
+            row = {
+                "codec": self.codecs.for_category(category).name,
+                "entries": 0,
+                "stored_bytes": 0,
+                "json_bytes": 0,
+                "decode_ms": 0.0,
+                "json_decode_ms": 0.0,
+            }
+            for key, week in items:
+                raw = self.backend.read(key, week)
+                if raw is None:
+                    continue
+                try:
+                    header, offset = split_entry(raw)
+                    codec = get_codec(header.get("codec", DEFAULT_CODEC) if header else DEFAULT_CODEC)
+                    # Blob entries: compare the stored value (the envelope is tiny)
+                    body = self.backend.read_blob(header["blob"]) if header and header.get("blob") else raw[offset:]
+                    if body is None:
+                        continue
+                    start = time.perf_counter()
+                    payload, _ = codec.decode(body)
+                    decode_s = time.perf_counter() - start
+                    json_body = plain.encode(payload)
+                    start = time.perf_counter()
+                    plain.decode(json_body)
+                    json_decode_s = time.perf_counter() - start
+                except (RuntimeError, ValueError, TypeError, OSError, EOFError):
+                    continue
+                row["entries"] += 1
+                row["stored_bytes"] += len(body)
+                row["json_bytes"] += len(json_body)
+                row["decode_ms"] += decode_s * 1000
+                row["json_decode_ms"] += json_decode_s * 1000
+            report[category] = row
+        return report
+
+    def memory_stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and usage of the in-memory read layer."""
+        return self.memory.stats()
+
+    def migrate_to(self, backend: str) -> Dict[str, int]:
+        """Copy every entry into another backend in the same cache directory.
+
+        Switch ``cache.backend`` in spark.yml afterwards; the source entries
+        are left in place.
+
+        Returns:
+            Counts from migrate_backend ("keys", "entries", "missing")
+        """
+        if backend == self.backend.name:
+            raise ValueError(f"Cache already uses the '{backend}' backend")
+        target = create_backend(backend, self.cache_dir)
+        try:
+            return migrate_backend(self.backend, target)
+        finally:
+            target.close()
+
+    def close(self) -> None:
+        """Persist pending read times and release backend handles (database connections)."""
+        try:
+            self.flush_reads()
+        except (OSError, sqlite3.Error) as exc:
+            self.logger.warning(f"Failed to record cache read times: {exc}")
+        self.backend.close()
 
     def migrate_ai_summary_cache_keys(self) -> Dict[str, int]:
         """Migrate ai_summary cache keys from timestamp_hash to timestamp-only."""
@@ -404,20 +1152,17 @@ class APICache:
             "errors": 0,
         }
 
-        with self._acquire_lock():
-            self.manifest.load()
-
-            for key, entry in list(self.manifest.data["entries"].items()):
+        with self._acquire_lock(), self.batch():
+            self.memory.clear()
+            for key, entry in self.backend.entries().items():
                 if not key.endswith("/ai_summary"):
                     continue
 
-                parts = key.split("/")
-                if len(parts) != 3:
+                if len(key.split("/")) != 3:
                     continue
 
-                owner, repo, category = parts
-                repo_name = None if repo == "_global_" else repo
                 weeks = list(entry.get("weeks", []))
+                existing = set(weeks)
 
                 for week in weeks:
                     if "_" not in week:
@@ -426,29 +1171,23 @@ class APICache:
                     if new_week == week:
                         continue
 
-                    old_path = self._get_fs_path(category, owner, repo_name, week)
-                    new_path = self._get_fs_path(category, owner, repo_name, new_week)
-
                     try:
-                        if not old_path.exists():
+                        data = self.backend.read(key, week)
+                        if data is None:
                             results["missing"] += 1
-                            self.manifest.remove_week(key, week)
+                            self.backend.delete(key, week)
                             continue
 
-                        new_path.parent.mkdir(parents=True, exist_ok=True)
-                        if new_path.exists():
+                        if new_week in existing:
                             results["skipped_exists"] += 1
-                            old_path.unlink(missing_ok=True)
-                            self.manifest.remove_week(key, week)
+                            self.backend.delete(key, week)
                             continue
 
-                        os.replace(old_path, new_path)
+                        self.backend.write(key, new_week, data)
+                        self.backend.delete(key, week)
+                        existing.add(new_week)
                         results["moved"] += 1
-                        self.manifest.update_entry(key, new_week)
-                        self.manifest.remove_week(key, week)
                     except OSError:
                         results["errors"] += 1
 
-            self.manifest.save()
-
         return results
@@ -0,0 +1,814 @@
+"""Storage backends for APICache.
+
+``APICache`` builds and verifies cache payloads; a backend only stores the
+serialized bytes of each (key, week) pair and the manifest of which weeks
+exist per key. Keys are ``owner/repo/category`` (``owner/_global_/category``
+for user-level data). Backends also hold a content-addressed blob store:
+values shared by several entries are stored once under their SHA-256 digest
+and referenced from the entries (see ``APICache.set``).
+
+- ``files`` (default): one JSON file per entry under
+  ``owner/repo/category/week.json`` plus an ``index.json`` manifest, guarded
+  by a process-wide file lock. Blobs live under ``.blobs/<ab>/<digest>``.
+- ``sqlite``: a single ``cache.sqlite3`` database in WAL mode. Readers never
+  block the writer, the manifest is an indexed query instead of a JSON file
+  that is re-read and re-written on every change, and there are no per-entry
+  files or lock-file round-trips.
+
+``migrate_backend`` copies every blob and entry (with its manifest timestamp)
+from one backend to another.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Values for the cache.backend setting
+CACHE_BACKENDS = ("files", "sqlite")
+
+SQLITE_FILENAME = "cache.sqlite3"
+
+# Directory of the files backend's blob store (GitHub owners cannot start with ".")
+BLOB_DIRNAME = ".blobs"
+
+
+class _CacheFileLock:
+    """Cross-platform file lock to coordinate cache access.
+
+    The file lock coordinates processes; the optional thread lock serializes
+    threads of one process sharing an APICache (e.g. concurrent refresh workers).
+    """
+
+    def __init__(self, lock_path: Path, thread_lock: Optional[threading.Lock] = None):
+        self.lock_path = lock_path
+        self.thread_lock = thread_lock
+        self._handle = None
+
+    def __enter__(self):
+        if self.thread_lock is not None:
+            self.thread_lock.acquire()
+        try:
+            self._lock_file()
+        except BaseException:
+            if self.thread_lock is not None:
+                self.thread_lock.release()
+            raise
+        return self
+
+    def _lock_file(self):
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        # Binary append avoids truncation
+        self._handle = open(self.lock_path, "a+b")
+        if os.name == "nt":
+            import msvcrt
+
+            self._handle.seek(0)
+            msvcrt.locking(self._handle.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(self._handle, fcntl.LOCK_EX)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._unlock_file()
+        finally:
+            if self.thread_lock is not None:
+                self.thread_lock.release()
+        return False
+
+    def _unlock_file(self):
+        if not self._handle:
+            return
+        if os.name == "nt":
+            import msvcrt
+
+            self._handle.seek(0)
+            try:
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+        else:
+            import fcntl
+
+            try:
+                fcntl.flock(self._handle, fcntl.LOCK_UN)
+            except OSError:
+                pass
+        self._handle.close()
+        self._handle = None
+
+
+class CacheManifest:
+    """Manages the cache index file for quick lookups."""
+
+    def __init__(self, cache_dir: Path):
+        self.manifest_path = cache_dir / "index.json"
+        self.data: Dict[str, Any] = {"entries": {}}
+        self._dirty = False
+        self._last_mtime = 0
+
+    def load(self) -> bool:
+        """Load manifest from disk if it changed. Returns True if reloaded."""
+        if self.manifest_path.exists():
+            try:
+                mtime = self.manifest_path.stat().st_mtime_ns
+                if mtime != self._last_mtime:
+                    with open(self.manifest_path, "r", encoding="utf-8") as f:
+                        self.data = json.load(f)
+                    self._last_mtime = mtime
+                    return True
+            except (json.JSONDecodeError, OSError):
+                # If corrupt, start fresh
+                self.data = {"entries": {}}
+                return True
+        return False
+
+    def save(self):
+        """Save manifest to disk if modified (atomically, so readers never see a partial file)."""
+        if self._dirty:
+            temp_name = None
+            try:
+                with tempfile.NamedTemporaryFile(
+                    "w", delete=False, dir=self.manifest_path.parent, encoding="utf-8"
+                ) as tmp:
+                    json.dump(self.data, tmp, indent=2)
+                    temp_name = tmp.name
+                os.replace(temp_name, self.manifest_path)
+            except Exception:
+                if temp_name and os.path.exists(temp_name):
+                    os.remove(temp_name)
+                raise
+            self._dirty = False
+            try:
+                self._last_mtime = self.manifest_path.stat().st_mtime_ns
+            except OSError:
+                pass
+
+    def update_entry(self, key: str, week: str, updated_at: Optional[str] = None):
+        """Update an entry in the manifest."""
+        updated_at = updated_at or datetime.now(timezone.utc).isoformat()
+        if key not in self.data["entries"]:
+            self.data["entries"][key] = {
+                "latest_week": week,
+                "weeks": [week],
+                "updated_at": updated_at
+            }
+            self._dirty = True
+        else:
+            entry = self.data["entries"][key]
+            if week not in entry["weeks"]:
+                entry["weeks"].append(week)
+                entry["weeks"].sort(reverse=True) # Keep newest first
+                self._dirty = True
+
+            if entry.get("latest_week") != week:
+                # Only update latest_week if the new one is "newer" or we just treat the last written as latest?
+                # For now, let's assume the caller knows what they are doing.
+                # But usually we want the lexically largest week (e.g. 2026W02 > 2026W01)
+                if week > entry.get("latest_week", ""):
+                    entry["latest_week"] = week
+                    self._dirty = True
+
+            entry["updated_at"] = updated_at
+
+    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.data["entries"].get(key)
+
+    def remove_week(self, key: str, week: str):
+        """Remove a week from an entry."""
+        if key in self.data["entries"]:
+            entry = self.data["entries"][key]
+            if week in entry["weeks"]:
+                entry["weeks"].remove(week)
+                entry.get("read_at", {}).pop(week, None)
+                self._dirty = True
+                # If we removed the latest week, update it
+                if entry["latest_week"] == week:
+                    entry["latest_week"] = entry["weeks"][0] if entry["weeks"] else None
+
+            if not entry["weeks"]:
+                del self.data["entries"][key]
+                self._dirty = True
+
+    def mark_read(self, key: str, week: str, read_at: float):
+        """Record when a week of an entry was last read (epoch seconds)."""
+        entry = self.data["entries"].get(key)
+        if entry is not None and week in entry["weeks"]:
+            read_times = entry.setdefault("read_at", {})
+            if read_at > read_times.get(week, 0):
+                read_times[week] = read_at
+                self._dirty = True
+
+    def remove_key(self, key: str):
+        """Remove an entry and all of its weeks."""
+        if self.data["entries"].pop(key, None) is not None:
+            self._dirty = True
+
+
+class CacheBackend:
+    """Interface implemented by APICache storage backends.
+
+    Every method must be safe to call from several threads at once; APICache
+    serializes operations on the same key itself and takes ``lock()`` only
+    for whole-cache operations (prune, clear, migration).
+    """
+
+    name = "base"
+
+    def lock(self):
+        """Reentrant context manager excluding other whole-cache operations."""
+        raise NotImplementedError
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer manifest persistence until the outermost batch exits."""
+        yield
+
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """Group many writes from one thread (one transaction where supported)."""
+        yield
+
+    def read(self, key: str, week: str) -> Optional[bytes]:
+        """Stored bytes for (key, week), or None."""
+        raise NotImplementedError
+
+    def write(self, key: str, week: str, data: bytes, updated_at: Optional[str] = None) -> None:
+        """Store bytes for (key, week) and record the week in the manifest."""
+        raise NotImplementedError
+
+    def delete(self, key: str, week: str) -> bool:
+        """Remove (key, week). Returns True if stored bytes existed."""
+        raise NotImplementedError
+
+    def entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry: {"latest_week", "weeks" (newest first), "updated_at",
+        "read_at" (last read per week, epoch seconds, for weeks read since written)}."""
+        raise NotImplementedError
+
+    def record_reads(self, reads: Dict[Tuple[str, str], float]) -> None:
+        """Record last-read times (epoch seconds) of (key, week) pairs."""
+        raise NotImplementedError
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """All manifest entries keyed by cache key."""
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove every key starting with ``prefix``. Returns entries removed.
+
+        Blobs referenced by the removed entries stay until the next prune.
+        """
+        raise NotImplementedError
+
+    def read_blob(self, digest: str) -> Optional[bytes]:
+        """Stored bytes of a blob, or None."""
+        raise NotImplementedError
+
+    def write_blob(self, digest: str, data: bytes) -> bool:
+        """Store a blob unless it exists; an existing blob's write time is refreshed.
+
+        Returns:
+            True if the blob was new
+        """
+        raise NotImplementedError
+
+    def blob_digests(self) -> List[str]:
+        """Digests of every stored blob."""
+        raise NotImplementedError
+
+    def blob_sizes(self) -> Dict[str, int]:
+        """Stored size of every blob keyed by digest."""
+        raise NotImplementedError
+
+    def delete_blob(self, digest: str, written_before: float) -> int:
+        """Remove a blob unless it was written (or refreshed) at or after
+        ``written_before`` (epoch seconds). Returns bytes freed."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove every entry and blob."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Counts for reporting: {"keys", "entries", "blobs", "blob_bytes",
+        "bytes" (entries and blobs)}."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release open handles."""
+
+
+class FileCacheBackend(CacheBackend):
+    """One JSON file per entry plus an ``index.json`` manifest.
+
+    Entry files are replaced atomically and need no lock. Manifest changes
+    are applied to the in-memory view at once and recorded in a journal;
+    the journal is merged into ``index.json`` under the process-wide file
+    lock (re-reading changes made by other processes first) after every
+    change, or once when the outermost ``batch()`` exits.
+    """
+
+    name = "files"
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.cache_dir / ".cache.lock"
+        # Excludes whole-cache operations of this process from each other
+        self._lock = threading.RLock()
+        # Guards the manifest view, journal and file-lock depth; only held
+        # briefly, so entry writes never wait on a whole-cache operation
+        self._state_lock = threading.RLock()
+        self._file_lock: Optional[_CacheFileLock] = None
+        self._file_lock_depth = 0
+        self._batch_depth = 0
+        self._journal: List[tuple] = []
+        self.manifest = CacheManifest(self.cache_dir)
+        self.manifest_writes = 0
+        with self.lock():
+            self.manifest.load()
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        # Lock order: lock() -> APICache key locks -> _state_lock -> file lock
+        with self._lock, self._file_locked():
+            yield
+
+    @contextmanager
+    def _file_locked(self) -> Iterator[None]:
+        """Hold the process-wide file lock (shared by this process's threads)."""
+        with self._state_lock:
+            if self._file_lock_depth == 0:
+                self._file_lock = _CacheFileLock(self._lock_path)
+                self._file_lock.__enter__()
+            self._file_lock_depth += 1
+        try:
+            yield
+        finally:
+            with self._state_lock:
+                self._file_lock_depth -= 1
+                if self._file_lock_depth == 0:
+                    self._file_lock.__exit__(None, None, None)
+                    self._file_lock = None
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        with self._state_lock:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._state_lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._flush()
+
+    def _apply(self, change: tuple) -> None:
+        kind = change[0]
+        if kind == "update":
+            self.manifest.update_entry(change[1], change[2], change[3])
+        elif kind == "remove_week":
+            self.manifest.remove_week(change[1], change[2])
+        elif kind == "read":
+            self.manifest.mark_read(change[1], change[2], change[3])
+        else:
+            self.manifest.remove_key(change[1])
+
+    def _record(self, change: tuple) -> None:
+        """Apply a manifest change and persist it now or at batch end."""
+        with self._state_lock:
+            self._refresh_view()
+            self._apply(change)
+            self._journal.append(change)
+            if self._batch_depth == 0:
+                self._flush()
+
+    def _refresh_view(self) -> None:
+        """Pick up manifest changes from other processes, keeping unflushed ones."""
+        if self.manifest.load():
+            for change in self._journal:
+                self._apply(change)
+
+    def _flush(self) -> None:
+        if not self._journal:
+            return
+        with self._file_locked():
+            self._refresh_view()
+            self.manifest._dirty = True
+            self.manifest.save()
+            self.manifest_writes += 1
+            self._journal.clear()
+
+    def path(self, key: str, week: str) -> Path:
+        """Filesystem path of an entry (``owner/repo/category/week.json``)."""
+        return self.cache_dir / key / f"{week}.json"
+
+    def read(self, key: str, week: str) -> Optional[bytes]:
+        try:
+            return self.path(key, week).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def write(self, key: str, week: str, data: bytes, updated_at: Optional[str] = None) -> None:
+        cache_path = self.path(key, week)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_name = None
+        try:
+            # Atomic write
+            with tempfile.NamedTemporaryFile("wb", delete=False, dir=self.cache_dir) as tmp:
+                tmp.write(data)
+                temp_name = tmp.name
+            os.replace(temp_name, cache_path)
+        except Exception:
+            if temp_name and os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+        self._record(("update", key, week, updated_at or datetime.now(timezone.utc).isoformat()))
+
+    def delete(self, key: str, week: str) -> bool:
+        cache_path = self.path(key, week)
+        existed = cache_path.exists()
+        cache_path.unlink(missing_ok=True)
+        self._record(("remove_week", key, week))
+        return existed
+
+    @staticmethod
+    def _copy_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(entry, weeks=list(entry["weeks"]), read_at=dict(entry.get("read_at", {})))
+
+    def entry(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._state_lock:
+            self._refresh_view()
+            entry = self.manifest.get_entry(key)
+            return self._copy_entry(entry) if entry else None
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._state_lock:
+            self._refresh_view()
+            return {key: self._copy_entry(entry) for key, entry in self.manifest.data["entries"].items()}
+
+    def record_reads(self, reads: Dict[Tuple[str, str], float]) -> None:
+        with self.batch():
+            for (key, week), read_at in reads.items():
+                self._record(("read", key, week, read_at))
+
+    def delete_prefix(self, prefix: str) -> int:
+        count = 0
+        with self.lock(), self._state_lock:
+            prefix_dir = self.cache_dir / prefix
+            if prefix_dir.is_dir():
+                count = sum(1 for _ in prefix_dir.rglob("*.json"))
+                shutil.rmtree(prefix_dir)
+            self._refresh_view()
+            for key in [key for key in self.manifest.data["entries"] if key.startswith(prefix)]:
+                self._apply(("remove_key", key))
+                self._journal.append(("remove_key", key))
+            if self._batch_depth == 0:
+                self._flush()
+        return count
+
+    def blob_path(self, digest: str) -> Path:
+        return self.cache_dir / BLOB_DIRNAME / digest[:2] / digest
+
+    def read_blob(self, digest: str) -> Optional[bytes]:
+        try:
+            return self.blob_path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def write_blob(self, digest: str, data: bytes) -> bool:
+        blob_path = self.blob_path(digest)
+        try:
+            # Refresh the mtime so a concurrent prune keeps the blob
+            os.utime(blob_path)
+            return False
+        except FileNotFoundError:
+            pass
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_name = None
+        try:
+            with tempfile.NamedTemporaryFile("wb", delete=False, dir=self.cache_dir) as tmp:
+                tmp.write(data)
+                temp_name = tmp.name
+            os.replace(temp_name, blob_path)
+        except Exception:
+            if temp_name and os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+        return True
+
+    def blob_digests(self) -> List[str]:
+        blob_dir = self.cache_dir / BLOB_DIRNAME
+        if not blob_dir.is_dir():
+            return []
+        return [path.name for path in blob_dir.glob("*/*")]
+
+    def blob_sizes(self) -> Dict[str, int]:
+        sizes = {}
+        for digest in self.blob_digests():
+            try:
+                sizes[digest] = self.blob_path(digest).stat().st_size
+            except OSError:
+                continue
+        return sizes
+
+    def delete_blob(self, digest: str, written_before: float) -> int:
+        blob_path = self.blob_path(digest)
+        try:
+            stat = blob_path.stat()
+            if stat.st_mtime >= written_before:
+                return 0
+            blob_path.unlink()
+        except FileNotFoundError:
+            return 0
+        return stat.st_size
+
+    def clear(self) -> None:
+        with self.lock(), self._state_lock:
+            for item in self.cache_dir.iterdir():
+                if item.name == ".cache.lock" or item.name.startswith(SQLITE_FILENAME):
+                    continue
+                if item.is_dir():
+                    shutil.rmtree(item)
+                else:
+                    item.unlink()
+            # Reset manifest
+            self._journal.clear()
+            self.manifest.data = {"entries": {}}
+            self.manifest._dirty = True
+            self.manifest.save()
+            self.manifest_writes += 1
+
+    def stats(self) -> Dict[str, int]:
+        entries = self.entries()
+        total_bytes = 0
+        count = 0
+        for key, entry in entries.items():
+            for week in entry.get("weeks", []):
+                try:
+                    total_bytes += self.path(key, week).stat().st_size
+                    count += 1
+                except OSError:
+                    continue
+        blob_sizes = self.blob_sizes()
+        blob_count = len(blob_sizes)
+        blob_bytes = sum(blob_sizes.values())
+        return {
+            "keys": len(entries),
+            "entries": count,
+            "blobs": blob_count,
+            "blob_bytes": blob_bytes,
+            "bytes": total_bytes + blob_bytes,
+        }
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """All entries in one SQLite database using write-ahead logging."""
+
+    name = "sqlite"
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / SQLITE_FILENAME
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT NOT NULL,"
+            " week TEXT NOT NULL,"
+            " data BLOB NOT NULL,"
+            " updated_at TEXT NOT NULL,"
+            " PRIMARY KEY (key, week)"
+            ") WITHOUT ROWID"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(cache_entries)")}
+        if "read_at" not in columns:
+            # Databases created before last-read tracking
+            conn.execute("ALTER TABLE cache_entries ADD COLUMN read_at REAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_blobs ("
+            " digest TEXT PRIMARY KEY,"
+            " data BLOB NOT NULL,"
+            " written_at REAL NOT NULL"
+            ")"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        """Connection for the calling thread (sqlite3 connections are per thread)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can release every thread's connection
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        # Statements are atomic in SQLite; this only serializes APICache's
+        # whole-cache operations within this process. batch() needs nothing:
+        # each write is one statement with no manifest to rewrite.
+        with self._lock:
+            yield
+
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        conn = self._conn()
+        if conn.in_transaction:
+            # Nested: part of the enclosing transaction
+            yield
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def read(self, key: str, week: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            "SELECT data FROM cache_entries WHERE key = ? AND week = ?", (key, week)
+        ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def write(self, key: str, week: str, data: bytes, updated_at: Optional[str] = None) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, week, data, updated_at) VALUES (?, ?, ?, ?)",
+            (key, week, sqlite3.Binary(data), updated_at or datetime.now(timezone.utc).isoformat()),
+        )
+
+    def delete(self, key: str, week: str) -> bool:
+        cursor = self._conn().execute("DELETE FROM cache_entries WHERE key = ? AND week = ?", (key, week))
+        return cursor.rowcount > 0
+
+    def entry(self, key: str) -> Optional[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT week, updated_at, read_at FROM cache_entries WHERE key = ? ORDER BY week DESC", (key,)
+        ).fetchall()
+        if not rows:
+            return None
+        return {
+            "latest_week": rows[0][0],
+            "weeks": [week for week, _, _ in rows],
+            "updated_at": max(updated_at for _, updated_at, _ in rows),
+            "read_at": {week: read_at for week, _, read_at in rows if read_at is not None},
+        }
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        entries: Dict[str, Dict[str, Any]] = {}
+        rows = self._conn().execute(
+            "SELECT key, week, updated_at, read_at FROM cache_entries ORDER BY key, week DESC"
+        )
+        for key, week, updated_at, read_at in rows:
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = {"latest_week": week, "weeks": [week], "updated_at": updated_at, "read_at": {}}
+            else:
+                entry["weeks"].append(week)
+                entry["updated_at"] = max(entry["updated_at"], updated_at)
+            if read_at is not None:
+                entry["read_at"][week] = read_at
+        return entries
+
+    def record_reads(self, reads: Dict[Tuple[str, str], float]) -> None:
+        with self.bulk():
+            self._conn().executemany(
+                "UPDATE cache_entries SET read_at = MAX(COALESCE(read_at, 0), ?) WHERE key = ? AND week = ?",
+                [(read_at, key, week) for (key, week), read_at in reads.items()],
+            )
+
+    def delete_prefix(self, prefix: str) -> int:
+        cursor = self._conn().execute(
+            "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+        return cursor.rowcount
+
+    def read_blob(self, digest: str) -> Optional[bytes]:
+        row = self._conn().execute("SELECT data FROM cache_blobs WHERE digest = ?", (digest,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def write_blob(self, digest: str, data: bytes) -> bool:
+        conn = self._conn()
+        now = time.time()
+        if conn.execute("UPDATE cache_blobs SET written_at = ? WHERE digest = ?", (now, digest)).rowcount:
+            return False
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO cache_blobs (digest, data, written_at) VALUES (?, ?, ?)",
+            (digest, sqlite3.Binary(data), now),
+        )
+        return cursor.rowcount > 0
+
+    def blob_digests(self) -> List[str]:
+        return [row[0] for row in self._conn().execute("SELECT digest FROM cache_blobs")]
+
+    def blob_sizes(self) -> Dict[str, int]:
+        return dict(self._conn().execute("SELECT digest, LENGTH(data) FROM cache_blobs"))
+
+    def delete_blob(self, digest: str, written_before: float) -> int:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT LENGTH(data) FROM cache_blobs WHERE digest = ? AND written_at < ?", (digest, written_before)
+        ).fetchone()
+        if row is None:
+            return 0
+        cursor = conn.execute(
+            "DELETE FROM cache_blobs WHERE digest = ? AND written_at < ?", (digest, written_before)
+        )
+        return row[0] if cursor.rowcount else 0
+
+    def clear(self) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries")
+        conn.execute("DELETE FROM cache_blobs")
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._conn()
+        keys, count, entry_bytes = conn.execute(
+            "SELECT COUNT(DISTINCT key), COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM cache_entries"
+        ).fetchone()
+        blob_count, blob_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM cache_blobs"
+        ).fetchone()
+        return {
+            "keys": keys,
+            "entries": count,
+            "blobs": blob_count,
+            "blob_bytes": blob_bytes,
+            "bytes": entry_bytes + blob_bytes,
+        }
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def create_backend(name: str, cache_dir: Path) -> CacheBackend:
+    """Create the backend selected by the ``cache.backend`` setting.
+
+    Raises:
+        ValueError: For an unknown backend name
+    """
+    if name == "files":
+        return FileCacheBackend(cache_dir)
+    if name == "sqlite":
+        return SQLiteCacheBackend(cache_dir)
+    raise ValueError(f"Unknown cache backend '{name}' (expected one of {', '.join(CACHE_BACKENDS)})")
+
+
+def migrate_backend(source: CacheBackend, target: CacheBackend) -> Dict[str, int]:
+    """Copy every blob and entry from ``source`` into ``target``.
+
+    Manifest ``updated_at`` timestamps are preserved, so cache ages (used to
+    decide refreshes) are unchanged. Existing target entries are overwritten.
+    Blobs are copied first so no copied entry references a missing blob.
+
+    Returns:
+        Dict with "keys", "entries" and "blobs" copied and "missing"
+        (manifest weeks without stored bytes)
+    """
+    results = {"keys": 0, "entries": 0, "blobs": 0, "missing": 0}
+    with source.lock(), target.lock(), target.batch(), target.bulk():
+        for digest in source.blob_digests():
+            data = source.read_blob(digest)
+            if data is not None:
+                target.write_blob(digest, data)
+                results["blobs"] += 1
+        for key, entry in source.entries().items():
+            copied = 0
+            for week in entry.get("weeks", []):
+                data = source.read(key, week)
+                if data is None:
+                    results["missing"] += 1
+                    continue
+                target.write(key, week, data, updated_at=entry.get("updated_at"))
+                copied += 1
+            if entry.get("read_at"):
+                target.record_reads({(key, week): read_at for week, read_at in entry["read_at"].items()})
+            if copied:
+                results["keys"] += 1
+                results["entries"] += copied
+    return results
@@ -0,0 +1,130 @@
+"""Micro-benchmark comparing APICache storage backends.
+
+Each backend gets a fresh temporary cache directory and the same workload,
+shaped like a refresh run: one entry per (repository, category) at the
+repository's pushed_at week, then reads of the latest entry, existence
+checks and manifest lookups. Used by ``spark cache --benchmark``.
+"""
+
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+from spark.cache import APICache
+from spark.cache_backends import CACHE_BACKENDS
+
+# Categories written per repository, as in a full refresh
+BENCHMARK_CATEGORIES = ("repository", "languages", "readme", "commit_counts", "commits_stats")
+
+BENCHMARK_OPERATIONS = ("set", "batched_set", "get", "has_entry", "get_entry_info")
+
+
+def _sample_value(category: str, index: int) -> Any:
+    """Payload roughly the size of real cache values for a category."""
+    if category == "commits_stats":
+        return [
+            {
+                "sha": f"{index:08x}{n:032x}",
+                "commit": {"author": {"name": "dev", "date": "2025-12-28T15:30:00+00:00"}, "message": f"commit {n}"},
+                "stats": {"total": n, "additions": n, "deletions": 0},
+            }
+            for n in range(50)
+        ]
+    if category == "readme":
+        return "# Project\n" + "Lorem ipsum dolor sit amet. " * 80
+    if category == "languages":
+        return {"Python": 12000 + index, "Shell": 300, "Dockerfile": 120}
+    if category == "commit_counts":
+        return {"total": index, "recent_90d": 3, "recent_180d": 7, "recent_365d": 12}
+    return {"name": f"repo{index}", "stars": index, "description": "Sample repository " * 4}
+
+
+def _timed(operation: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    operation()
+    return time.perf_counter() - start
+
+
+def benchmark_backend(backend: str, repositories: int = 100) -> Dict[str, Any]:
+    """Run the workload against one backend.
+
+    Args:
+        backend: Backend name ("files" or "sqlite")
+        repositories: Number of repositories (entries = repositories x categories)
+
+    Returns:
+        Dict with "backend", "entries", "bytes" and "ops_per_sec" per operation
+        ("batched_set" writes a second week inside ``cache.batch()``)
+    """
+    temp_dir = tempfile.mkdtemp(prefix=f"spark-cache-{backend}-")
+    cache = APICache(cache_dir=temp_dir, backend=backend)
+    week = "20251228T153000Z"
+    items = [
+        (category, f"repo{index}", _sample_value(category, index))
+        for index in range(repositories)
+        for category in BENCHMARK_CATEGORIES
+    ]
+
+    def write_all():
+        for category, repo, value in items:
+            cache.set(category, "bench", value, repo=repo, week=week)
+
+    def write_batched():
+        with cache.batch():
+            for category, repo, value in items:
+                cache.set(category, "bench", value, repo=repo, week="20260104T090000Z")
+
+    def read_all():
+        for category, repo, _ in items:
+            cache.get(category, "bench", repo=repo)
+
+    def check_all():
+        for category, repo, _ in items:
+            cache.has_entry(category, "bench", repo=repo, week=week)
+
+    def info_all():
+        for category, repo, _ in items:
+            cache.get_entry_info(category, "bench", repo=repo)
+
+    try:
+        timings = {
+            "set": _timed(write_all),
+            "batched_set": _timed(write_batched),
+            "get": _timed(read_all),
+            "has_entry": _timed(check_all),
+            "get_entry_info": _timed(info_all),
+        }
+        stats = cache.info()
+    finally:
+        cache.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        "backend": backend,
+        "entries": len(items),
+        "bytes": stats["bytes"],
+        "ops_per_sec": {
+            name: (len(items) / elapsed if elapsed > 0 else float("inf"))
+            for name, elapsed in timings.items()
+        },
+    }
+
+
+def run_benchmark(repositories: int = 100, backends: Iterable[str] = CACHE_BACKENDS) -> List[Dict[str, Any]]:
+    """Benchmark each backend with the same workload."""
+    return [benchmark_backend(backend, repositories) for backend in backends]
+
+
+def format_benchmark(results: List[Dict[str, Any]]) -> List[str]:
+    """Render benchmark results as aligned table lines."""
+    header = f"{'backend':<8}" + "".join(f"{name:>16}" for name in BENCHMARK_OPERATIONS) + f"{'size KB':>12}"
+    lines = [header]
+    for result in results:
+        ops = result["ops_per_sec"]
+        lines.append(
+            f"{result['backend']:<8}"
+            + "".join(f"{ops[name]:>12,.0f} op/s" for name in BENCHMARK_OPERATIONS)
+            + f"{result['bytes'] / 1024:>12.1f}"
+        )
+    return lines
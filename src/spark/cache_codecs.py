@@ -0,0 +1,142 @@
+"""Payload codecs for APICache entries.
+
+A codec is a serializer optionally followed by a compressor, written as
+``serializer[+compression]`` (e.g. ``json``, ``orjson+zstd``,
+``msgpack+gzip``) and chosen per cache category under ``cache.codecs`` in
+spark.yml. The codec name is recorded in each entry's header, so entries
+written with any codec (or before codecs existed) stay readable.
+
+Serializers: ``json`` (stdlib; pretty-printed unless compressed),
+``orjson`` and ``msgpack`` (optional packages).
+Compression: ``none``, ``gzip`` (stdlib) and ``zstd`` (optional
+``zstandard`` package).
+"""
+
+import gzip
+import json
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+SERIALIZERS = ("json", "orjson", "msgpack")
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+DEFAULT_CODEC = "json"
+
+
+def _missing(package: str) -> RuntimeError:
+    return RuntimeError(
+        f"The {package} package is required for this cache codec. Install with:\n"
+        f"  pip install {package}"
+    )
+
+
+def _serializer(name: str, compressed: bool) -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    if name == "json":
+        if compressed:
+            return (lambda payload: json.dumps(payload, separators=(",", ":")).encode("utf-8")), json.loads
+        # Uncompressed JSON stays readable (and diffable) on disk
+        return (lambda payload: json.dumps(payload, indent=2).encode("utf-8")), json.loads
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            raise _missing("orjson")
+        return (lambda payload: orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)), orjson.loads
+    if name == "msgpack":
+        try:
+            import msgpack
+        except ImportError:
+            raise _missing("msgpack")
+        return (
+            lambda payload: msgpack.packb(payload, use_bin_type=True),
+            lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+        )
+    raise ValueError(f"Unknown cache serializer '{name}' (expected one of {', '.join(SERIALIZERS)})")
+
+
+def _compressor(name: str) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    if name == "none":
+        return (lambda data: data), (lambda data: data)
+    if name == "gzip":
+        # mtime=0 keeps output deterministic for unchanged payloads
+        return (lambda data: gzip.compress(data, compresslevel=6, mtime=0)), gzip.decompress
+    if name == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise _missing("zstandard")
+        # zstandard contexts must not be used by two threads at once: one per thread
+        contexts = threading.local()
+
+        def compress(data: bytes) -> bytes:
+            compressor = getattr(contexts, "compressor", None)
+            if compressor is None:
+                compressor = contexts.compressor = zstandard.ZstdCompressor(level=3)
+            return compressor.compress(data)
+
+        def decompress(data: bytes) -> bytes:
+            decompressor = getattr(contexts, "decompressor", None)
+            if decompressor is None:
+                decompressor = contexts.decompressor = zstandard.ZstdDecompressor()
+            return decompressor.decompress(data)
+
+        return compress, decompress
+    raise ValueError(f"Unknown cache compression '{name}' (expected one of {', '.join(COMPRESSIONS)})")
+
+
+class PayloadCodec:
+    """Serializes cache payloads to bytes and back."""
+
+    def __init__(self, spec: str = DEFAULT_CODEC):
+        """Create a codec from a ``serializer[+compression]`` spec.
+
+        Raises:
+            ValueError: For unknown serializers or compressions
+            RuntimeError: If the codec's optional package is not installed
+        """
+        serializer, _, compression = spec.strip().partition("+")
+        compression = compression or "none"
+        self._dumps, self._loads = _serializer(serializer, compressed=compression != "none")
+        self._compress, self._decompress = _compressor(compression)
+        self.name = serializer if compression == "none" else f"{serializer}+{compression}"
+
+    def encode(self, payload: Any) -> bytes:
+        return self._compress(self._dumps(payload))
+
+    def decode(self, data: bytes) -> Tuple[Any, int]:
+        """Decode stored bytes.
+
+        Returns:
+            (payload, serialized size before compression)
+        """
+        serialized = self._decompress(data)
+        return self._loads(serialized), len(serialized)
+
+
+_codecs: Dict[str, PayloadCodec] = {}
+
+
+def get_codec(spec: str) -> PayloadCodec:
+    """Shared codec instance for a spec (safe to use from several threads)."""
+    codec = _codecs.get(spec)
+    if codec is None:
+        codec = PayloadCodec(spec)
+        _codecs[spec] = codec
+    return codec
+
+
+class CodecSelector:
+    """Maps cache categories to codecs from the ``cache.codecs`` setting.
+
+    The setting is a mapping of category to codec spec, with ``default``
+    for categories not listed.
+    """
+
+    def __init__(self, settings: Optional[Mapping[str, str]] = None):
+        settings = dict(settings or {})
+        self.default = get_codec(settings.pop("default", DEFAULT_CODEC))
+        # Resolve every configured codec now so a missing package fails early
+        self.by_category = {category: get_codec(spec) for category, spec in settings.items()}
+
+    def for_category(self, category: str) -> PayloadCodec:
+        return self.by_category.get(category, self.default)
@@ -8,16 +8,23 @@ This module provides a clean separation between:
 NO cache writes happen during data reading/assembly.
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set, Any
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from github import GithubException
 
-from spark.cache import APICache
+from spark.cache import APICache, ManifestIndex
+from spark.cache_status import CacheStatusTracker
+from spark.commit_counts import CommitCounter
 from spark.dependencies.analyzer import RepositoryDependencyAnalyzer
+from spark.dependencies.discovery import DependencyFileDiscovery, cached_blob_contents
 from spark.time_utils import sanitize_timestamp_for_filename
 from spark.logger import get_logger
+from spark.rate_limit import get_rate_governor
+from spark.repo_handles import RepositoryHandleCache
 from spark.models.commit import CommitHistory
 from spark.models.repository import Repository
 from spark.models.tech_stack import TechnologyStack, DependencyInfo
@@ -45,6 +52,37 @@ class RefreshSummary:
     api_calls_made: int
 
 
+@dataclass
+class WarmSummary:
+    """Summary of a cache warm-up (``spark cache --warm``)."""
+    total_repos: int
+    missing_repos: int  # Repositories with at least one missing entry
+    warmed_repos: int  # Repositories refreshed within the budget
+    deferred: List[str]  # Repositories left for a later run (over budget)
+    estimated_calls: int
+    budget: Optional[int]  # None = unlimited
+    refresh: Optional[RefreshSummary]
+
+
+# Categories refreshed by default, in result order
+BASE_CATEGORIES = ("commit_counts", "languages", "quality_indicators")
+
+# Extra categories refreshed when AI summaries are requested
+AI_SUMMARY_CATEGORIES = ("readme", "dependency_files", "ai_summary")
+
+# Estimated GitHub requests to refresh one category (warm-up budgeting); a
+# repository lookup adds one more, so the base categories sum to
+# refresh.CALLS_PER_REPOSITORY
+CATEGORY_CALL_ESTIMATES = {
+    "commit_counts": 3,  # first page, total count, commit activity
+    "languages": 1,
+    "quality_indicators": 3,  # license, workflows, root listing
+    "readme": 1,
+    "dependency_files": 4,  # tree listing plus a few manifest blobs
+    "ai_summary": 0,  # reads the other categories from cache
+}
+
+
 class CacheManager:
     """Manages cache validation and refresh operations."""
     
@@ -53,6 +91,12 @@ class CacheManager:
         github_client,
         cache: APICache,
         summarizer: Optional[RepositorySummarizer] = None,
+        prefetcher: Optional[Callable[[str, List[Dict[str, Any]]], Dict[str, int]]] = None,
+        max_workers: int = 1,
+        client_factory: Optional[Callable[[], Any]] = None,
+        repo_handles: Optional[RepositoryHandleCache] = None,
+        commit_counter: Optional[CommitCounter] = None,
+        deep_validate: bool = False,
     ):
         """Initialize cache manager.
         
@@ -60,28 +104,75 @@ class CacheManager:
             github_client: PyGithub client instance
             cache: APICache instance
             summarizer: Optional RepositorySummarizer for AI summary refresh
+            prefetcher: Optional batch loader called with (username, repos_to_refresh)
+                before per-repository refresh (e.g. GitHubFetcher.prefetch_repository_data)
+            max_workers: Maximum concurrent refresh tasks in refresh_user_data
+            client_factory: Creates a PyGithub client for each worker thread. PyGithub
+                clients are not safe to share between threads, so refresh stays
+                sequential unless a factory is provided.
+            repo_handles: Per-run repository handle cache, shared with GitHubFetcher
+                so each repository is resolved at most once
+            commit_counter: Commit window counting engine (shared with GitHubFetcher)
+            deep_validate: Load and hash-verify every cached payload when checking
+                freshness, instead of consulting only the cache manifest
         """
         self.github = github_client
         self.cache = cache
         self.logger = get_logger()
         self.api_calls = 0
         self.summarizer = summarizer
+        self.prefetcher = prefetcher
+        self.client_factory = client_factory
+        self.max_workers = max(1, int(max_workers)) if client_factory else 1
+        self._api_calls_lock = threading.Lock()
+        self._thread_state = threading.local()
+        self.governor = get_rate_governor()
+        self.repo_handles = repo_handles or RepositoryHandleCache(self.governor)
+        self.commit_counter = commit_counter or CommitCounter(governor=self.governor)
+        self.dependency_discovery = DependencyFileDiscovery(self.governor)
         self.dependency_analyzer = RepositoryDependencyAnalyzer()
+        self.deep_validate = deep_validate
     
+    def _client(self):
+        """Return the PyGithub client for the current thread."""
+        if self.client_factory is None or threading.current_thread() is threading.main_thread():
+            return self.github
+        client = getattr(self._thread_state, "client", None)
+        if client is None:
+            client = self.client_factory()
+            self._thread_state.client = client
+        return client
+
+    def _count_api_call(self) -> None:
+        """Increment the API call counter (safe across worker threads)."""
+        with self._api_calls_lock:
+            self.api_calls += 1
+
+    def _get_repo(self, username: str, repo_name: str):
+        """Get a repository handle for this thread's client (resolved once per run)."""
+        self._count_api_call()
+        return self.repo_handles.get(self._client(), username, repo_name)
+
     def needs_refresh(
         self,
         username: str,
         repo_name: str,
         category: str,
-        current_pushed_at: datetime
+        current_pushed_at: datetime,
+        index: Optional[ManifestIndex] = None,
     ) -> bool:
         """Check if a cache entry needs refresh based on repo's pushed_at.
+
+        By default this only asks the cache manifest whether an entry exists
+        for the current pushed_at key. With ``deep_validate`` the payload is
+        loaded and hash-verified, so corrupt entries also count as stale.
         
         Args:
             username: Repository owner
             repo_name: Repository name
             category: Cache category (e.g., "commit_counts")
             current_pushed_at: Current pushed_at timestamp from GitHub
+            index: Manifest snapshot to probe instead of the live manifest
             
         Returns:
             True if cache is missing or stale
@@ -91,11 +182,14 @@ class CacheManager:
         
         # Generate cache key for this repo's current state
         cache_key = sanitize_timestamp_for_filename(current_pushed_at)
+
+        if self.deep_validate:
+            return self.cache.get(category, username, repo=repo_name, week=cache_key) is None
         
         # Check if cache exists for this exact pushed_at
-        cached = self.cache.get(category, username, repo=repo_name, week=cache_key)
-        
-        return cached is None
+        if index is not None:
+            return not index.has(category, username, repo=repo_name, week=cache_key)
+        return not self.cache.has_entry(category, username, repo=repo_name, week=cache_key)
     
     def refresh_commit_counts(
         self,
@@ -128,52 +222,8 @@ class CacheManager:
         
         try:
             # Fetch from GitHub
-            self.api_calls += 1
-            repo = self.github.get_repo(f"{username}/{repo_name}")
-            
-            from datetime import timedelta
-            now = datetime.now(timezone.utc)
-            day_90_ago = now - timedelta(days=90)
-            day_180_ago = now - timedelta(days=180)
-            day_365_ago = now - timedelta(days=365)
-            
-            total_commits = 0
-            commits_90d = 0
-            commits_180d = 0
-            commits_365d = 0
-            last_commit_date = None
-            
-            for commit in repo.get_commits():
-                if total_commits >= 1000:  # Limit for rate limiting
-                    break
-                
-                total_commits += 1
-                
-                try:
-                    commit_date = commit.commit.author.date if commit.commit and commit.commit.author else None
-                except (AttributeError, IndexError):
-                    continue
-                
-                if not commit_date:
-                    continue
-                
-                if not last_commit_date or commit_date > last_commit_date:
-                    last_commit_date = commit_date
-                
-                if commit_date >= day_90_ago:
-                    commits_90d += 1
-                if commit_date >= day_180_ago:
-                    commits_180d += 1
-                if commit_date >= day_365_ago:
-                    commits_365d += 1
-            
-            result = {
-                "total": total_commits,
-                "recent_90d": commits_90d,
-                "recent_180d": commits_180d,
-                "recent_365d": commits_365d,
-                "last_commit_date": last_commit_date.isoformat() if last_commit_date else None,
-            }
+            repo = self._get_repo(username, repo_name)
+            result = self.commit_counter.count(repo)
             
             # Write to cache
             metadata = {
@@ -221,8 +271,7 @@ class CacheManager:
             )
         
         try:
-            self.api_calls += 1
-            repo = self.github.get_repo(f"{username}/{repo_name}")
+            repo = self._get_repo(username, repo_name)
             languages = repo.get_languages()
             
             metadata = {
@@ -270,8 +319,7 @@ class CacheManager:
             )
 
         try:
-            self.api_calls += 1
-            repo = self.github.get_repo(f"{username}/{repo_name}")
+            repo = self._get_repo(username, repo_name)
             content = ""
             try:
                 readme = repo.get_readme()
@@ -332,8 +380,7 @@ class CacheManager:
             )
 
         try:
-            self.api_calls += 1
-            repo = self.github.get_repo(f"{username}/{repo_name}")
+            repo = self._get_repo(username, repo_name)
             
             # Check for license
             has_license = False
@@ -425,48 +472,21 @@ class CacheManager:
                 refreshed=False
             )
 
-        dependency_files: Dict[str, str] = {}
-        target_files = [
-            "package.json",
-            "requirements.txt",
-            "pyproject.toml",
-            "Gemfile",
-            "go.mod",
-            "pom.xml",
-            "*.csproj",
-            "Cargo.toml",
-            "composer.json",
-        ]
-
         try:
-            self.api_calls += 1
-            repo = self.github.get_repo(f"{username}/{repo_name}")
-
-            for filename in target_files:
-                try:
-                    if "*" in filename:
-                        contents = repo.get_contents("")
-                        pattern = filename.replace("*", "")
-                        for item in contents:
-                            if item.name.endswith(pattern):
-                                content = item.decoded_content.decode("utf-8")
-                                dependency_files[item.name] = content
-                    else:
-                        file_content = repo.get_contents(filename)
-                        content = file_content.decoded_content.decode("utf-8")
-                        dependency_files[filename] = content
-                except GithubException as e:
-                    if getattr(e, "status", None) == 404:
-                        continue
-                    raise
-                except Exception:
-                    continue
+            repo = self._get_repo(username, repo_name)
+            known_blobs = cached_blob_contents(self.cache, username, repo_name, exclude_week=cache_key)
+            discovered = self.dependency_discovery.discover(repo, known_blobs)
+            dependency_files = discovered.files
 
             metadata = {
                 "repository": {"owner": username, "name": repo_name},
                 "category": category,
                 "pushed_at": pushed_at.isoformat(),
                 "ttl_enforced": False,
+                # Blob SHA per manifest, so unchanged manifests are reused next push
+                "blobs": discovered.blobs,
+                "blobs_downloaded": discovered.downloaded,
+                "blobs_reused": discovered.reused,
             }
             self.cache.set(category, username, dependency_files, repo=repo_name, week=cache_key, metadata=metadata)
 
@@ -553,8 +573,9 @@ class CacheManager:
             repo.language_count = len(repo.language_stats)
             repo.has_readme = bool(readme_content)
 
-            commit_data["repository_name"] = repo_name
-            commit_history = CommitHistory.from_dict(commit_data) if commit_data else None
+            commit_history = (
+                CommitHistory.from_dict({**commit_data, "repository_name": repo_name}) if commit_data else None
+            )
 
             summary = self.summarizer.summarize_repository(
                 repo=repo,
@@ -636,32 +657,117 @@ class CacheManager:
         Returns:
             List of RefreshResult for each category
         """
-        if categories is None:
-            categories = {"commit_counts", "languages", "quality_indicators"}
-
-        if include_ai_summaries:
-            categories = set(categories) | {"readme", "dependency_files", "ai_summary"}
+        categories = self._resolve_categories(categories, include_ai_summaries)
         
         results = []
+        for category in self._ordered_categories(categories):
+            result = self._refresh_category(username, repo_name, category, pushed_at, repo_data)
+            if result is not None:
+                results.append(result)
         
-        if "commit_counts" in categories:
-            results.append(self.refresh_commit_counts(username, repo_name, pushed_at))
-        
-        if "languages" in categories:
-            results.append(self.refresh_languages(username, repo_name, pushed_at))
-        
-        if "quality_indicators" in categories:
-            results.append(self.refresh_quality_indicators(username, repo_name, pushed_at))
+        return results
 
-        if "readme" in categories:
-            results.append(self.refresh_readme(username, repo_name, pushed_at))
+    @staticmethod
+    def _resolve_categories(categories: Optional[Set[str]], include_ai_summaries: bool) -> Set[str]:
+        """Apply defaults and AI summary extras to a category selection."""
+        if categories is None:
+            categories = set(BASE_CATEGORIES)
+        if include_ai_summaries:
+            categories = set(categories) | set(AI_SUMMARY_CATEGORIES)
+        return set(categories)
 
-        if "dependency_files" in categories:
-            results.append(self.refresh_dependency_files(username, repo_name, pushed_at))
+    @staticmethod
+    def _ordered_categories(categories: Set[str]) -> List[str]:
+        """Return categories in refresh order (ai_summary last, it reads the others)."""
+        order = BASE_CATEGORIES + AI_SUMMARY_CATEGORIES
+        return [category for category in order if category in categories]
 
-        if "ai_summary" in categories and repo_data:
-            results.append(self.refresh_ai_summary(username, repo_data, pushed_at))
-        
+    def _refresh_category(
+        self,
+        username: str,
+        repo_name: str,
+        category: str,
+        pushed_at: datetime,
+        repo_data: Optional[Dict[str, Any]] = None,
+    ) -> Optional[RefreshResult]:
+        """Dispatch a refresh for a single (repository, category) pair."""
+        if category == "ai_summary":
+            if not repo_data:
+                return None
+            return self.refresh_ai_summary(username, repo_data, pushed_at)
+
+        refreshers = {
+            "commit_counts": self.refresh_commit_counts,
+            "languages": self.refresh_languages,
+            "quality_indicators": self.refresh_quality_indicators,
+            "readme": self.refresh_readme,
+            "dependency_files": self.refresh_dependency_files,
+        }
+        refresher = refreshers.get(category)
+        if refresher is None:
+            return None
+        return refresher(username, repo_name, pushed_at)
+
+    def _refresh_pending_concurrently(
+        self,
+        username: str,
+        pending: List[Any],
+        include_ai_summaries: bool,
+    ) -> Dict[int, List[RefreshResult]]:
+        """Refresh (repository, category) pairs on a bounded worker pool.
+
+        Independent categories run in parallel across all repositories. The
+        ai_summary category reads the others, so it is scheduled per repository
+        only after that repository's other categories have finished.
+
+        Returns:
+            Dict mapping the repository's position in ``pending`` to its results,
+            ordered like refresh_repository would return them
+        """
+        categories = self._ordered_categories(self._resolve_categories(None, include_ai_summaries))
+        independent = [category for category in categories if category != "ai_summary"]
+
+        if "ai_summary" in categories and self.summarizer is None:
+            # Create once up front instead of racing inside worker threads
+            self.summarizer = RepositorySummarizer(cache=self.cache)
+
+        results: Dict[int, List[RefreshResult]] = {idx: [] for idx in range(len(pending))}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cache-refresh") as pool:
+            futures = {}
+            for idx, (_, repo_data, pushed_at) in enumerate(pending):
+                for category in independent:
+                    future = pool.submit(
+                        self._refresh_category, username, repo_data["name"], category, pushed_at, repo_data
+                    )
+                    futures[future] = (idx, category)
+
+            ai_futures = {}
+            remaining = {idx: len(independent) for idx in range(len(pending))}
+            for future in as_completed(futures):
+                idx, category = futures[future]
+                result = future.result()
+                if result is not None:
+                    results[idx].append(result)
+                remaining[idx] -= 1
+
+                if remaining[idx] == 0:
+                    _, repo_data, pushed_at = pending[idx]
+                    self.logger.info(f"Refreshed {repo_data['name']}")
+                    if "ai_summary" in categories:
+                        ai_future = pool.submit(
+                            self._refresh_category, username, repo_data["name"], "ai_summary", pushed_at, repo_data
+                        )
+                        ai_futures[ai_future] = idx
+
+            for future in as_completed(ai_futures):
+                result = future.result()
+                if result is not None:
+                    results[ai_futures[future]].append(result)
+
+        order = {category: position for position, category in enumerate(categories)}
+        for repo_results in results.values():
+            repo_results.sort(key=lambda r: order.get(r.category, len(order)))
         return results
     
     def refresh_user_data(
@@ -688,11 +794,15 @@ class CacheManager:
         ]
         self.logger.info(f"Starting cache refresh for {len(eligible_repos)} repositories")
         self.api_calls = 0
+        self.repo_handles.seed(username, eligible_repos)
         
         all_results = []
         repos_refreshed = 0
         repos_unchanged = 0
         repos_failed = 0
+        pending = []
+        # One manifest read covers every (repository, category) check below
+        index = None if force_refresh or self.deep_validate else self.cache.manifest_index()
         
         for i, repo_data in enumerate(eligible_repos, 1):
             repo_name = repo_data["name"]
@@ -713,28 +823,55 @@ class CacheManager:
             
             # Check if refresh needed
             if not force_refresh:
-                categories_to_check = {"commit_counts", "languages", "quality_indicators"}
-                if include_ai_summaries:
-                    categories_to_check |= {"readme", "dependency_files", "ai_summary"}
+                categories_to_check = self._resolve_categories(None, include_ai_summaries)
 
                 needs_update = any(
-                    self.needs_refresh(username, repo_name, category, pushed_at)
+                    self.needs_refresh(username, repo_name, category, pushed_at, index=index)
                     for category in categories_to_check
                 )
                 if not needs_update:
                     self.logger.debug(f"[{i}/{len(eligible_repos)}] OK {repo_name} - cache valid")
                     repos_unchanged += 1
                     continue
-            
-            # Refresh this repository
-            self.logger.info(f"[{i}/{len(eligible_repos)}] Refreshing {repo_name}")
-            repo_results = self.refresh_repository(
-                username,
-                repo_name,
-                pushed_at,
-                repo_data=repo_data,
-                include_ai_summaries=include_ai_summaries,
-            )
+
+            pending.append((i, repo_data, pushed_at))
+
+        if pending:
+            # Roughly one repository lookup plus one request per category
+            categories_per_repo = len(self._resolve_categories(None, include_ai_summaries))
+            self.governor.log_projection(len(pending) * categories_per_repo * 2, label="cache refresh")
+
+        # Persist manifest changes once for the whole refresh
+        with self.cache.batch():
+            # Batch-load what we can before falling back to per-repository calls
+            if pending and self.prefetcher is not None:
+                try:
+                    self.prefetcher(username, [repo_data for _, repo_data, _ in pending])
+                except Exception as e:
+                    self.logger.warn(f"Batch prefetch failed, continuing with per-repository refresh: {e}")
+
+            if self.max_workers > 1 and len(pending) > 1:
+                self.logger.info(
+                    f"Refreshing {len(pending)} repositories with {self.max_workers} workers"
+                )
+                results_by_repo = self._refresh_pending_concurrently(username, pending, include_ai_summaries)
+                repo_results_list = [results_by_repo[idx] for idx in range(len(pending))]
+            else:
+                repo_results_list = []
+                for i, repo_data, pushed_at in pending:
+                    repo_name = repo_data["name"]
+
+                    # Refresh this repository
+                    self.logger.info(f"[{i}/{len(eligible_repos)}] Refreshing {repo_name}")
+                    repo_results_list.append(self.refresh_repository(
+                        username,
+                        repo_name,
+                        pushed_at,
+                        repo_data=repo_data,
+                        include_ai_summaries=include_ai_summaries,
+                    ))
+
+        for repo_results in repo_results_list:
             all_results.extend(repo_results)
             
             # Count success/failures
@@ -758,6 +895,114 @@ class CacheManager:
             api_calls_made=self.api_calls
         )
 
+    def warm_user_data(
+        self,
+        username: str,
+        repo_list: List[Dict],
+        max_api_calls: Optional[int] = None,
+        include_ai_summaries: bool = False,
+    ) -> WarmSummary:
+        """Fill missing cache entries ahead of a report run.
+
+        Finds the (repository, category) pairs refresh_user_data would fetch,
+        then refreshes repositories most recently pushed first. Each costs an
+        estimated one repository lookup plus CATEGORY_CALL_ESTIMATES for its
+        missing categories. The budget is ``max_api_calls`` capped by the
+        observed rate-limit quota left above the governor's reserve. With a
+        budget, repositories are refreshed a batch (``max_workers``) at a time
+        and the next batch is only scheduled if its estimate fits next to the
+        calls the governor actually observed so far; the rest is deferred in
+        priority order.
+
+        Args:
+            username: GitHub username
+            repo_list: List of repository dicts with 'name' and 'pushed_at'
+            max_api_calls: Call budget (None = the remaining quota)
+            include_ai_summaries: Also warm the AI summary categories
+
+        Returns:
+            WarmSummary
+        """
+        eligible_repos = [repo for repo in repo_list if not self._is_excluded_repo(repo)]
+        categories = self._ordered_categories(self._resolve_categories(None, include_ai_summaries))
+        plan = CacheStatusTracker(cache=self.cache).missing_entries(username, eligible_repos, categories)
+
+        budget = max_api_calls
+        projection = self.governor.projection(0)
+        start_remaining = projection["remaining"]
+        if start_remaining is not None:
+            usable = max(start_remaining - self.governor.reserve, 0)
+            budget = usable if budget is None else min(budget, usable)
+
+        self.logger.info(
+            f"Cache warm-up: {len(plan)} of {len(eligible_repos)} repositories have missing entries"
+            + (f" (budget {budget} calls)" if budget is not None else "")
+        )
+
+        start_calls = self.governor.calls
+        batch_size = len(plan) if budget is None else max(1, self.max_workers)
+        queue = list(plan)
+        warmed = 0
+        estimated_calls = 0
+        refreshes = []
+        while queue:
+            # Estimates are a floor: requests the governor saw beyond them count too
+            used = max(estimated_calls, self._observed_calls(start_calls, start_remaining))
+            batch = []
+            batch_cost = 0
+            while queue and len(batch) < batch_size:
+                cost = 1 + sum(CATEGORY_CALL_ESTIMATES.get(category, 1) for category in queue[0]["missing"])
+                if budget is not None and used + batch_cost + cost > budget:
+                    break
+                batch.append(queue.pop(0)["repo"])
+                batch_cost += cost
+            if not batch:
+                break
+            refreshes.append(self.refresh_user_data(username, batch, include_ai_summaries=include_ai_summaries))
+            warmed += len(batch)
+            estimated_calls += batch_cost
+        deferred = [item["repo"]["name"] for item in queue]
+
+        self.logger.info(
+            f"Cache warm-up: warmed {warmed} repositories (~{estimated_calls} calls estimated, "
+            f"{self._observed_calls(start_calls, start_remaining)} observed)"
+        )
+        if deferred:
+            self.logger.info(f"Deferred (over budget): {', '.join(deferred)}")
+
+        refresh = None
+        if refreshes:
+            refresh = RefreshSummary(
+                total_repos=sum(r.total_repos for r in refreshes),
+                repos_refreshed=sum(r.repos_refreshed for r in refreshes),
+                repos_unchanged=sum(r.repos_unchanged for r in refreshes),
+                repos_failed=sum(r.repos_failed for r in refreshes),
+                results=[result for r in refreshes for result in r.results],
+                api_calls_made=sum(r.api_calls_made for r in refreshes),
+            )
+
+        return WarmSummary(
+            total_repos=len(eligible_repos),
+            missing_repos=len(plan),
+            warmed_repos=warmed,
+            deferred=deferred,
+            estimated_calls=estimated_calls,
+            budget=budget,
+            refresh=refresh,
+        )
+
+    def _observed_calls(self, start_calls: int, start_remaining: Optional[int]) -> int:
+        """GitHub calls made since a warm-up started, as far as the governor saw them.
+
+        Counts the requests paced by the governor and, once the quota is
+        observed, how far it dropped (which also covers unpaced requests).
+        """
+        used = self.governor.calls - start_calls
+        remaining = self.governor.projection(0)["remaining"]
+        if start_remaining is not None and remaining is not None:
+            used = max(used, start_remaining - remaining)
+        return used
+
     @staticmethod
     def _is_excluded_repo(repo_data: Dict[str, Any]) -> bool:
         is_private = repo_data.get("is_private")
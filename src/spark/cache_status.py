@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 
 from spark.cache import APICache
 from spark.time_utils import sanitize_timestamp_for_filename
@@ -12,13 +12,14 @@ from spark.time_utils import sanitize_timestamp_for_filename
 class CacheStatusTracker:
     """Tracks cache status for repositories and determines refresh needs."""
 
-    def __init__(self, cache_dir: str = ".cache"):
+    def __init__(self, cache_dir: str = ".cache", cache: Optional[APICache] = None):
         """Initialize cache status tracker.
 
         Args:
             cache_dir: Directory where cache files are stored
+            cache: Existing APICache to use instead of opening cache_dir
         """
-        self.cache = APICache(cache_dir)
+        self.cache = cache if cache is not None else APICache(cache_dir)
 
     def get_repository_cache_status(
         self,
@@ -117,6 +118,49 @@ class CacheStatusTracker:
             "cache_key": cache_key,
         }
 
+    def missing_entries(
+        self,
+        username: str,
+        repos: Iterable[Dict[str, Any]],
+        categories: Iterable[str],
+    ) -> List[Dict[str, Any]]:
+        """Find (repository, category) pairs without an entry for the current pushed_at key.
+
+        Every pair is checked against one manifest snapshot.
+
+        Args:
+            username: Repository owner
+            repos: Repository listing dicts with 'name' and 'pushed_at'
+            categories: Cache categories the report needs
+
+        Returns:
+            One dict per repository with missing entries, most recently pushed
+            first: "repo" (the listing dict), "pushed_at" (datetime),
+            "cache_key" and "missing" (categories)
+        """
+        categories = list(categories)
+        index = self.cache.manifest_index()
+        plan = []
+        for repo in repos:
+            pushed_at = repo.get("pushed_at")
+            if not pushed_at:
+                continue
+            try:
+                pushed_date = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
+            except (ValueError, AttributeError):
+                continue
+            if pushed_date.tzinfo is None:
+                pushed_date = pushed_date.replace(tzinfo=timezone.utc)
+            cache_key = sanitize_timestamp_for_filename(pushed_date)
+            missing = [
+                category for category in categories
+                if not index.has(category, username, repo=repo["name"], week=cache_key)
+            ]
+            if missing:
+                plan.append({"repo": repo, "pushed_at": pushed_date, "cache_key": cache_key, "missing": missing})
+        plan.sort(key=lambda item: item["pushed_at"], reverse=True)
+        return plan
+
     def update_repositories_cache_with_status(
         self,
         username: str,
@@ -140,16 +184,7 @@ class CacheStatusTracker:
         variant = f"list_{exclude_private}_{exclude_forks}_{exclude_archived}"
         
         if fetch_fresh:
-            # Clear cached repository list to force fresh fetch from GitHub API
-            import os
-            from pathlib import Path
-            cache_key = f"{username}/{variant}/repositories"
-            cache_dir = Path(self.cache.cache_dir) / username / variant / "repositories"
-            if cache_dir.exists():
-                import shutil
-                shutil.rmtree(cache_dir)
-            
-            # Fetch fresh repository data from GitHub (1 API call)
+            # Revalidate the repository listing with GitHub (304s cost no quota)
             from spark.fetcher import GitHubFetcher
             fetcher = GitHubFetcher(cache=self.cache)
             repos = fetcher.fetch_repositories(
@@ -157,6 +192,7 @@ class CacheStatusTracker:
                 exclude_private=exclude_private,
                 exclude_forks=exclude_forks,
                 exclude_archived=exclude_archived,
+                revalidate=True,
             )
         else:
             # Try to use cached repositories
@@ -173,8 +209,9 @@ class CacheStatusTracker:
                     exclude_archived=exclude_archived,
                 )
 
+        # Copies: cached listings are shared and read-only
         repos = [
-            repo for repo in repos
+            dict(repo) for repo in repos
             if not self._is_excluded_repo(repo, exclude_private, exclude_forks, exclude_archived)
         ]
 
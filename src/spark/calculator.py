@@ -1,10 +1,95 @@
 """Statistics calculation for GitHub activity data."""
 
-from typing import Dict, List, Any, Tuple
-from datetime import datetime, timedelta, date
-from collections import defaultdict, Counter
+from typing import Dict, List, Any, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
 import math
 
+import numpy as np
+
+from spark.commit_columns import CommitColumns
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Day numbers count from 1970-01-01, a Thursday
+_THURSDAY = 3
+_NIGHT_HOURS = [22, 23, 0, 1, 2, 3, 4]
+_EARLY_HOURS = [5, 6, 7, 8, 9]
+
+
+class _CommitTable:
+    """Dated commits as NumPy columns, parsed once per set of commits.
+
+    ``local`` is the commit time as stored, in its own UTC offset (what the
+    day, hour and week buckets use), and ``instant`` the absolute time, both
+    datetime64[us]. ``day`` holds day numbers of ``local``, ``repo`` indexes
+    ``repo_names`` (-1 for commits without a repository). Commits without a
+    parsable date are left out.
+    """
+
+    def __init__(self, commits: List[Dict[str, Any]]):
+        self.count = len(commits)
+        # Microseconds since the epoch
+        local: List[int] = []
+        instant: List[int] = []
+        repos: List[int] = []
+        repo_ids: Dict[str, int] = {}
+        for commit in commits:
+            date_str = commit.get("date")
+            if not date_str:
+                continue
+            try:
+                parsed = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            except (ValueError, AttributeError):
+                continue
+            offset = parsed.utcoffset()
+            if offset is None:
+                moment = (parsed - _EPOCH) // _MICROSECOND
+                local.append(moment)
+            else:
+                moment = (parsed - _EPOCH_UTC) // _MICROSECOND
+                local.append(moment + offset // _MICROSECOND)
+            instant.append(moment)
+            repo = commit.get("repo")
+            repos.append(repo_ids.setdefault(repo, len(repo_ids)) if repo else -1)
+
+        self.local = np.array(local, dtype=np.int64).astype("datetime64[us]")
+        self.instant = np.array(instant, dtype=np.int64).astype("datetime64[us]")
+        self.day = self.local.astype("datetime64[D]").astype(np.int64)
+        self.repo = np.array(repos, dtype=np.int64)
+        self.repo_names = list(repo_ids)
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def hours(self) -> np.ndarray:
+        """Hour of day (0-23) per commit."""
+        return (self.local - self.local.astype("datetime64[D]")) // np.timedelta64(1, "h")
+
+    def sunday_weeks(self) -> np.ndarray:
+        """Week per commit as year * 100 + strftime("%U") week number."""
+        years = self.local.astype("datetime64[Y]")
+        day_of_year = self.day - years.astype("datetime64[D]").astype(np.int64)
+        weekday_from_sunday = (self.day + _THURSDAY + 1) % 7
+        return years.astype(np.int64) * 100 + (day_of_year + 7 - weekday_from_sunday) // 7
+
+
+def _first_seen_counts(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct values and their counts, in order of first occurrence."""
+    keys, first, counts = np.unique(values, return_index=True, return_counts=True)
+    order = np.argsort(first, kind="stable")
+    return keys[order], counts[order]
+
+
+def _distinct_repos(buckets: np.ndarray, repos: np.ndarray, repo_count: int, targets: np.ndarray) -> List[int]:
+    """Number of distinct repositories in each target bucket."""
+    # Each (bucket, repo) pair as one integer; repo < repo_count keeps it reversible
+    pairs = np.unique(buckets * repo_count + repos)
+    keys, counts = np.unique(pairs // repo_count, return_counts=True)
+    positions = np.searchsorted(keys, targets).clip(max=len(keys) - 1)
+    return np.where(keys[positions] == targets, counts[positions], 0).tolist()
+
 
 class StatsCalculator:
     """Calculates comprehensive statistics from GitHub activity data."""
@@ -20,6 +105,7 @@ class StatsCalculator:
         self.repositories = repositories
         self.commits: List[Dict[str, Any]] = []
         self.languages: Dict[str, int] = {}
+        self._table: Optional[_CommitTable] = None
 
     def add_commits(self, commits: List[Dict[str, Any]]) -> None:
         """Add commits data for analysis.
@@ -28,6 +114,7 @@ class StatsCalculator:
             commits: List of commit data dictionaries
         """
         self.commits.extend(commits)
+        self._table = None
 
     def add_languages(self, languages: Dict[str, int]) -> None:
         """Add language statistics.
@@ -38,6 +125,12 @@ class StatsCalculator:
         for lang, bytes_count in languages.items():
             self.languages[lang] = self.languages.get(lang, 0) + bytes_count
 
+    def _commit_table(self) -> _CommitTable:
+        """Columnar view of self.commits, rebuilt only when commits were added."""
+        if self._table is None or self._table.count != len(self.commits):
+            self._table = _CommitTable(self.commits)
+        return self._table
+
     def calculate_statistics(self) -> Dict[str, Any]:
         """Calculate all statistics and return comprehensive results.
 
@@ -52,12 +145,9 @@ class StatsCalculator:
         release_cadence_data = self.calculate_release_cadence()
 
         # Group commits by day for heatmap
-        commits_by_day = {}
-        for commit in self.commits:
-            if commit.get("date"):
-                date = datetime.fromisoformat(commit["date"].replace("Z", "+00:00"))
-                date_key = date.strftime("%Y-%m-%d")
-                commits_by_day[date_key] = commits_by_day.get(date_key, 0) + 1
+        days, counts = _first_seen_counts(self._commit_table().day)
+        day_keys = np.datetime_as_string(days.astype("datetime64[D]")).tolist()
+        commits_by_day = dict(zip(day_keys, counts.tolist()))
 
         return {
             "spark_score": spark_score_data,
@@ -112,52 +202,30 @@ class StatsCalculator:
         if not self.commits:
             return 0.0
 
-        # Group commits by week
-        week_commits = defaultdict(int)
-        for commit in self.commits:
-            if commit.get("date"):
-                date = datetime.fromisoformat(commit["date"].replace("Z", "+00:00"))
-                week_key = date.strftime("%Y-W%U")
-                week_commits[week_key] += 1
-
-        if not week_commits:
+        table = self._commit_table()
+        if not len(table):
             return 0.0
 
-        # Calculate weekly activity metrics
-        weekly_counts = list(week_commits.values())
+        # Group commits by week
+        _, weekly_counts = np.unique(table.sunday_weeks(), return_counts=True)
         total_weeks_with_commits = len(weekly_counts)
-        mean = sum(weekly_counts) / len(weekly_counts)
-        
+
         # Calculate coefficient of variation (normalized std dev)
-        if mean == 0:
-            return 0.0
-            
-        variance = sum((x - mean) ** 2 for x in weekly_counts) / len(weekly_counts)
-        std_dev = math.sqrt(variance)
-        cv = std_dev / mean  # Coefficient of variation
-        
+        cv = float(weekly_counts.std() / weekly_counts.mean())
+
         # Calculate activity rate (weeks with commits / total weeks in period)
-        if self.commits:
-            dates = [datetime.fromisoformat(c["date"].replace("Z", "+00:00")) 
-                    for c in self.commits if c.get("date")]
-            if dates:
-                oldest = min(dates)
-                newest = max(dates)
-                total_weeks = max(1, ((newest - oldest).days + 1) / 7)
-                activity_rate = min(1.0, total_weeks_with_commits / total_weeks)
-            else:
-                activity_rate = 0.0
-        else:
-            activity_rate = 0.0
-        
+        span_days = int((table.instant.max() - table.instant.min()) // np.timedelta64(1, "D"))
+        total_weeks = max(1, (span_days + 1) / 7)
+        activity_rate = min(1.0, total_weeks_with_commits / total_weeks)
+
         # Score based on both regularity (lower CV = better) and activity rate
         # CV of 0 = perfect consistency, CV > 2 = very inconsistent
         regularity_score = max(0, min(100, 100 * (1 - min(cv / 2, 1))))
         activity_score = activity_rate * 100
-        
+
         # Combine: 60% regularity, 40% activity rate
         consistency = (regularity_score * 0.6) + (activity_score * 0.4)
-        
+
         return min(100, consistency)
 
     def _calculate_volume_score(self) -> float:
@@ -230,21 +298,15 @@ class StatsCalculator:
             }
 
         # Count commits by hour
-        hour_counts = defaultdict(int)
-        for commit in self.commits:
-            if commit.get("date"):
-                date = datetime.fromisoformat(commit["date"].replace("Z", "+00:00"))
-                hour_counts[date.hour] += 1
-
-        total_commits = sum(hour_counts.values())
+        hours = self._commit_table().hours()
+        hour_counts = np.bincount(hours, minlength=24)
+        total_commits = len(hours)
 
         # Night owl: majority commits between 22:00-4:00
-        night_hours = list(range(22, 24)) + list(range(0, 5))
-        night_commits = sum(hour_counts[h] for h in night_hours)
+        night_commits = int(hour_counts[_NIGHT_HOURS].sum())
 
         # Early bird: majority commits between 5:00-9:00
-        early_hours = list(range(5, 10))
-        early_commits = sum(hour_counts[h] for h in early_hours)
+        early_commits = int(hour_counts[_EARLY_HOURS].sum())
 
         # Categorize
         if night_commits > total_commits * 0.4:
@@ -254,12 +316,19 @@ class StatsCalculator:
         else:
             category = "balanced"
 
-        # Find most active hour
-        most_active_hour = max(hour_counts.items(), key=lambda x: x[1])[0] if hour_counts else None
+        # Hours in order of first commit, then the night and early hours
+        # without commits (always listed, with 0)
+        active_hours, counts = _first_seen_counts(hours)
+        hour_distribution = dict(zip(active_hours.tolist(), counts.tolist()))
+        for hour in _NIGHT_HOURS + _EARLY_HOURS:
+            hour_distribution.setdefault(hour, 0)
+
+        # Find most active hour (the first listed on ties)
+        most_active_hour = max(hour_distribution.items(), key=lambda x: x[1])[0]
 
         return {
             "category": category,
-            "hour_distribution": dict(hour_counts),
+            "hour_distribution": hour_distribution,
             "most_active_hour": most_active_hour,
             "night_commits_percent": round(night_commits / total_commits * 100, 1) if total_commits > 0 else 0,
             "early_commits_percent": round(early_commits / total_commits * 100, 1) if total_commits > 0 else 0,
@@ -319,52 +388,22 @@ class StatsCalculator:
                 "longest_learning_streak": 0,
             }
 
-        # Extract commit dates
-        commit_dates = []
-        for commit in self.commits:
-            if commit.get("date"):
-                date = datetime.fromisoformat(commit["date"].replace("Z", "+00:00"))
-                commit_dates.append(date.date())
+        # Sorted, distinct commit days
+        unique_days = np.unique(self._commit_table().day)
 
-        # Sort and deduplicate
-        unique_dates = sorted(set(commit_dates))
+        # Calculate coding streaks: runs of consecutive days
+        breaks = np.flatnonzero(np.diff(unique_days) != 1)
+        run_starts = np.concatenate(([0], breaks + 1))
+        run_lengths = np.diff(np.concatenate((run_starts, [len(unique_days)])))
+        # A run always counts at least one day, even without dated commits
+        longest_streak = max(1, int(run_lengths.max()))
 
-        # Calculate coding streaks
+        # Calculate current streak: the last run, if it reaches today or yesterday
         current_streak = 0
-        longest_streak = 0
-        streak = 1
-
-        for i in range(1, len(unique_dates)):
-            if (unique_dates[i] - unique_dates[i-1]).days == 1:
-                streak += 1
-            else:
-                longest_streak = max(longest_streak, streak)
-                streak = 1
-
-        longest_streak = max(longest_streak, streak)
-
-        # Calculate current streak (from today)
-        if unique_dates:
-            today = datetime.now().date()
-            last_commit = unique_dates[-1]
-            days_since = (today - last_commit).days
-
-            if days_since == 0:
-                # Count backwards from today
-                current_streak = 1
-                for i in range(len(unique_dates) - 2, -1, -1):
-                    if (unique_dates[i+1] - unique_dates[i]).days == 1:
-                        current_streak += 1
-                    else:
-                        break
-            elif days_since == 1:
-                # Yesterday counts
-                current_streak = 1
-                for i in range(len(unique_dates) - 2, -1, -1):
-                    if (unique_dates[i+1] - unique_dates[i]).days == 1:
-                        current_streak += 1
-                    else:
-                        break
+        if len(unique_days):
+            today = np.datetime64(datetime.now().date(), "D").astype(np.int64)
+            if today - unique_days[-1] in (0, 1):
+                current_streak = int(run_lengths[-1])
 
         # Learning streaks (new languages over time)
         # TODO: Implement learning streak detection based on language diversity
@@ -391,24 +430,10 @@ class StatsCalculator:
         weeks = max(1, weeks)
         months = max(1, months)
 
-        commit_records: List[Tuple[date, str]] = []
-        unique_repos = set()
-
-        for commit in self.commits:
-            repo_name = commit.get("repo")
-            date_str = commit.get("date")
-            if not repo_name or not date_str:
-                continue
-
-            try:
-                commit_dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            except ValueError:
-                continue
-
-            commit_records.append((commit_dt.date(), repo_name))
-            unique_repos.add(repo_name)
+        table = self._commit_table()
+        has_repo = table.repo >= 0
 
-        if not commit_records:
+        if not has_repo.any():
             return {
                 "weekly": [{"label": f"W{str(i + 1).zfill(2)}", "repos": 0, "start": None, "range_label": ""}
                             for i in range(weeks)],
@@ -419,70 +444,47 @@ class StatsCalculator:
                 "unique_repos": 0,
             }
 
-        latest_date = max(record[0] for record in commit_records)
+        days = table.day[has_repo]
+        repos = table.repo[has_repo]
+        repo_count = len(table.repo_names)
+        latest_day = days.max()
 
-        week_sets: Dict[date, set] = defaultdict(set)
-        month_sets: Dict[date, set] = defaultdict(set)
+        # Weeks start on Monday; series run oldest to newest, ending at the latest commit
+        week_starts = days - (days + _THURSDAY) % 7
+        week_anchor = latest_day - (latest_day + _THURSDAY) % 7
+        target_weeks = week_anchor - 7 * np.arange(weeks - 1, -1, -1)
+        weekly_counts = _distinct_repos(week_starts, repos, repo_count, target_weeks)
 
-        for commit_date, repo_name in commit_records:
-            week_start = commit_date - timedelta(days=commit_date.weekday())
-            week_sets[week_start].add(repo_name)
+        month_numbers = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        target_months = month_numbers.max() - np.arange(months - 1, -1, -1)
+        monthly_counts = _distinct_repos(month_numbers, repos, repo_count, target_months)
 
-            month_start = commit_date.replace(day=1)
-            month_sets[month_start].add(repo_name)
-
-        week_anchor = latest_date - timedelta(days=latest_date.weekday())
         weekly_series: List[Dict[str, Any]] = []
-
-        for offset in range(weeks - 1, -1, -1):
-            week_start = week_anchor - timedelta(weeks=offset)
-            repo_count = len(week_sets.get(week_start, set()))
+        for week_start, repos_touched in zip(target_weeks.astype("datetime64[D]").tolist(), weekly_counts):
             week_end = week_start + timedelta(days=6)
-            week_label = f"W{week_start.isocalendar()[1]:02d}"
             weekly_series.append({
-                "label": week_label,
-                "repos": repo_count,
+                "label": f"W{week_start.isocalendar()[1]:02d}",
+                "repos": repos_touched,
                 "start": week_start.isoformat(),
                 "range_label": f"{week_start.strftime('%b %d')} - {week_end.strftime('%b %d')}",
             })
 
-        def previous_month_start(date_val: date) -> date:
-            year = date_val.year
-            month = date_val.month - 1
-            if month == 0:
-                month = 12
-                year -= 1
-            return date_val.replace(year=year, month=month, day=1)
-
-        month_anchor = latest_date.replace(day=1)
-        month_starts = []
-        current = month_anchor
-        for _ in range(months):
-            month_starts.append(current)
-            current = previous_month_start(current)
-        month_starts.reverse()
-
         monthly_series: List[Dict[str, Any]] = []
-        for month_start in month_starts:
-            repo_count = len(month_sets.get(month_start, set()))
-            month_label = month_start.strftime("%b")
-            long_label = month_start.strftime("%b %Y")
+        month_starts = target_months.astype("datetime64[M]").astype("datetime64[D]").tolist()
+        for month_start, repos_touched in zip(month_starts, monthly_counts):
             monthly_series.append({
-                "label": month_label,
-                "repos": repo_count,
+                "label": month_start.strftime("%b"),
+                "repos": repos_touched,
                 "start": month_start.isoformat(),
-                "range_label": long_label,
+                "range_label": month_start.strftime("%b %Y"),
             })
 
-        max_weekly = max((point["repos"] for point in weekly_series), default=0)
-        max_monthly = max((point["repos"] for point in monthly_series), default=0)
-
         return {
             "weekly": weekly_series,
             "monthly": monthly_series,
-            "max_weekly": max_weekly,
-            "max_monthly": max_monthly,
-            "unique_repos": len(unique_repos),
+            "max_weekly": max(weekly_counts),
+            "max_monthly": max(monthly_counts),
+            "unique_repos": repo_count,
         }
 
     # Dashboard-specific commit metrics calculation methods
@@ -517,11 +519,13 @@ class StatsCalculator:
         return files_changed + lines_added + lines_deleted
 
     @staticmethod
-    def calculate_repository_commit_metrics(commits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def calculate_repository_commit_metrics(commits: Union[List[Dict[str, Any]], CommitColumns]) -> Dict[str, Any]:
         """Calculate aggregate commit metrics for a repository.
 
         Args:
-            commits: List of commit dictionaries with stats
+            commits: List of commit dictionaries with stats, or the
+                CommitColumns of a cached commits_stats entry (same result,
+                without per-commit dicts)
 
         Returns:
             Dictionary containing:
@@ -549,37 +553,43 @@ class StatsCalculator:
                 },
             }
 
-        commit_sizes = []
-        largest = None
-        smallest = None
-
-        for commit in commits:
-            # Calculate size for this commit
-            size = StatsCalculator.calculate_commit_size(commit)
-            commit_sizes.append(size)
-
-            # Track largest commit
-            if largest is None or size > largest["size"]:
-                largest = {
-                    "sha": commit.get("sha", ""),
-                    "date": commit.get("commit", {}).get("author", {}).get("date", ""),
-                    "size": size,
-                    "files_changed": commit.get("stats", {}).get("total", 0),
-                    "lines_added": commit.get("stats", {}).get("additions", 0),
-                    "lines_deleted": commit.get("stats", {}).get("deletions", 0),
+        if isinstance(commits, CommitColumns):
+            commit_sizes = commits.sizes()
+
+            def describe(index: int) -> Dict[str, Any]:
+                return {
+                    "sha": commits.sha(index),
+                    "date": commits.date(index),
+                    "size": commit_sizes[index],
+                    "files_changed": commits.files[index],
+                    "lines_added": commits.additions[index],
+                    "lines_deleted": commits.deletions[index],
                 }
+        else:
+            commit_sizes = [StatsCalculator.calculate_commit_size(commit) for commit in commits]
 
-            # Track smallest commit (non-zero)
-            if size > 0 and (smallest is None or size < smallest["size"]):
-                smallest = {
+            def describe(index: int) -> Dict[str, Any]:
+                commit = commits[index]
+                return {
                     "sha": commit.get("sha", ""),
                     "date": commit.get("commit", {}).get("author", {}).get("date", ""),
-                    "size": size,
+                    "size": commit_sizes[index],
                     "files_changed": commit.get("stats", {}).get("total", 0),
                     "lines_added": commit.get("stats", {}).get("additions", 0),
                     "lines_deleted": commit.get("stats", {}).get("deletions", 0),
                 }
 
+        # Largest commit, and smallest non-zero commit (first one on ties)
+        largest_index = None
+        smallest_index = None
+        for index, size in enumerate(commit_sizes):
+            if largest_index is None or size > commit_sizes[largest_index]:
+                largest_index = index
+            if size > 0 and (smallest_index is None or size < commit_sizes[smallest_index]):
+                smallest_index = index
+        largest = describe(largest_index)
+        smallest = describe(smallest_index) if smallest_index is not None else None
+
         # Calculate average
         avg_size = sum(commit_sizes) / len(commit_sizes) if commit_sizes else 0.0
 
@@ -612,6 +622,6 @@ class StatsCalculator:
             "avg_commit_size": round(avg_size, 2),
             "largest_commit": largest,
             "smallest_commit": smallest,
-            "total_commits": len(commits),
+            "total_commits": len(commit_sizes),
             "commit_size_distribution": distribution,
         }
@@ -221,7 +221,22 @@ For more information, visit: https://github.com/markhazleton/github-stats-spark
     cache_parser.add_argument(
         "--prune",
         action="store_true",
-        help="Prune old cache entries (keep last 2 weeks)",
+        help="Evict old cache entries (weeks beyond --keep-weeks, then least recently read entries over the cache.eviction budgets)",
+    )
+    cache_parser.add_argument(
+        "--keep-weeks",
+        type=int,
+        help="Weeks kept per cache key when pruning (default: cache.eviction.keep_weeks, 2)",
+    )
+    cache_parser.add_argument(
+        "--max-mb",
+        type=float,
+        help="Total cache size budget in MB when pruning (default: cache.eviction.max_mb, 0 = unlimited)",
+    )
+    cache_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --prune, report what would be evicted without deleting anything",
     )
     cache_parser.add_argument(
         "--info",
@@ -253,10 +268,46 @@ For more information, visit: https://github.com/markhazleton/github-stats-spark
         action="store_true",
         help="Migrate ai_summary cache keys to timestamp-only format",
     )
+    cache_parser.add_argument(
+        "--migrate-to",
+        choices=["files", "sqlite"],
+        help="Copy all cache entries into another storage backend (then set cache.backend in spark.yml)",
+    )
+    cache_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check the integrity hash of every cache entry and delete corrupt ones",
+    )
+    cache_parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Benchmark the files and sqlite storage backends in temporary directories",
+    )
+    cache_parser.add_argument(
+        "--benchmark-repos",
+        type=int,
+        default=100,
+        help="Repositories simulated by --benchmark (default: 100)",
+    )
+    cache_parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Fetch cache entries missing for the current pushed_at keys ahead of a report run, most recently pushed first (requires --user)",
+    )
+    cache_parser.add_argument(
+        "--warm-budget",
+        type=int,
+        help="Maximum GitHub API calls for --warm (default: the remaining rate-limit quota)",
+    )
+    cache_parser.add_argument(
+        "--include-ai-summaries",
+        action="store_true",
+        help="With --warm, also fetch READMEs, dependency files and AI summaries",
+    )
     cache_parser.add_argument(
         "--user",
         type=str,
-        help="GitHub username (required for status commands)",
+        help="GitHub username (required for status and warm commands)",
     )
     cache_parser.add_argument(
         "--dir",
@@ -531,9 +582,8 @@ def handle_unified(args, logger):
                                 logger.debug(f"Matched existing screenshot for {repo_name}")
                     
                     if updated_count > 0:
-                        # Write updated data back
-                        with open(data_output_path, 'w', encoding='utf-8') as f:
-                            json.dump(unified_data, f, indent=2, ensure_ascii=False)
+                        # Write updated data back (with its minified/compressed variants)
+                        generator.write(unified_data)
                         logger.info(f"Updated {data_output_path} with {updated_count} screenshot metadata entries")
                 else:
                     logger.info("No repositories with website URLs - skipping screenshots")
@@ -577,8 +627,7 @@ def handle_unified(args, logger):
                                 updated_count += 1
                     
                     if updated_count > 0:
-                        with open(data_output_path, 'w', encoding='utf-8') as f:
-                            json.dump(unified_data, f, indent=2, ensure_ascii=False)
+                        generator.write(unified_data)
                         logger.info(f"Matched {updated_count} existing screenshots to repositories")
 
         # ===================================================================
@@ -1169,6 +1218,8 @@ def handle_cache(args, logger):
     logger.info("Stats Spark - Cache Command")
 
     try:
+        from datetime import datetime, timezone
+
         from spark.cache import APICache
         from spark.cache_status import CacheStatusTracker
 
@@ -1182,21 +1233,116 @@ def handle_cache(args, logger):
 
         if args.prune:
             logger.info(f"Pruning cache directory: {args.dir}")
-            cache.prune(keep_weeks=2)
-            logger.info("Cache pruned successfully!")
+            results = cache.prune(
+                keep_weeks=args.keep_weeks,
+                max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None,
+                dry_run=args.dry_run,
+            )
+            if args.dry_run:
+                for item in results["evicted"][:50]:
+                    last_used = datetime.fromtimestamp(item["last_used"], timezone.utc).strftime("%Y-%m-%d") if item["last_used"] else "never"
+                    logger.info(
+                        f"  would evict {item['key']}/{item['week']} "
+                        f"({item['bytes'] / 1024:.1f} KB, {item['reason']}, last used {last_used})"
+                    )
+                if len(results["evicted"]) > 50:
+                    logger.info(f"  ... and {len(results['evicted']) - 50} more")
+            verb = "Would remove" if args.dry_run else "Removed"
+            logger.info(
+                f"{verb} {results['entries']} entries ({results['entry_bytes'] / 1024:.1f} KB) and "
+                f"{results['blobs']} unreferenced blobs ({results['blob_bytes'] / 1024:.1f} KB); "
+                f"{results['bytes'] / 1024 / 1024:.1f} MB remain"
+            )
+            if results["over_budget"]:
+                logger.warn("Entries for current pushed_at keys alone exceed the cache budget")
+            if not args.dry_run:
+                logger.info("Cache pruned successfully!")
 
         if args.info:
-            cache_path = Path(args.dir)
-            if cache_path.exists():
-                cache_files = list(cache_path.glob("*.json"))
+            if Path(args.dir).exists():
+                info = cache.info()
                 logger.info(f"Cache directory: {args.dir}")
-                logger.info(f"Cached files: {len(cache_files)}")
-
-                total_size = sum(f.stat().st_size for f in cache_files)
-                logger.info(f"Total size: {total_size / 1024:.2f} KB")
+                logger.info(f"Storage backend: {info['backend']}")
+                logger.info(f"Cached keys: {info['keys']}")
+                logger.info(f"Cached entries: {info['entries']}")
+                logger.info(f"Shared value blobs: {info['blobs']} ({info['blob_bytes'] / 1024:.2f} KB)")
+                logger.info(f"Total size: {info['bytes'] / 1024:.2f} KB")
+
+                # Savings of each category's codec over pretty-printed JSON (sampled)
+                for category, row in cache.codec_report().items():
+                    if not row["entries"]:
+                        continue
+                    saved = 100 * (1 - row["stored_bytes"] / row["json_bytes"]) if row["json_bytes"] else 0
+                    logger.info(
+                        f"  {category}: {row['codec']}, {row['entries']} sampled, "
+                        f"{row['stored_bytes'] / 1024:.1f} KB vs {row['json_bytes'] / 1024:.1f} KB JSON ({saved:.0f}% smaller), "
+                        f"decode {row['decode_ms']:.1f} ms vs {row['json_decode_ms']:.1f} ms"
+                    )
             else:
                 logger.info(f"Cache directory does not exist: {args.dir}")
 
+        if args.migrate_to:
+            logger.info(f"Migrating cache in {args.dir} from {cache.backend.name} to {args.migrate_to}...")
+            results = cache.migrate_to(args.migrate_to)
+            logger.info(
+                "Migration results: "
+                f"keys={results['keys']}, "
+                f"entries={results['entries']}, "
+                f"blobs={results['blobs']}, "
+                f"missing={results['missing']}"
+            )
+            logger.info(f"Set cache.backend: {args.migrate_to} in config/spark.yml to use the migrated cache")
+
+        if args.verify:
+            logger.info(f"Verifying cache entries in {args.dir}...")
+            results = cache.verify(repair=True)
+            logger.info(
+                "Verification results: "
+                f"checked={results['checked']}, "
+                f"corrupt={results['corrupt']} (deleted), "
+                f"legacy_format={results['legacy']}"
+            )
+
+        if args.benchmark:
+            from spark.cache_benchmark import format_benchmark, run_benchmark
+
+            logger.info(f"Benchmarking cache backends with {args.benchmark_repos} repositories...")
+            for line in format_benchmark(run_benchmark(repositories=args.benchmark_repos)):
+                logger.info(line)
+
+        if args.warm:
+            if not args.user:
+                logger.error("--user is required for cache warm-up")
+                sys.exit(1)
+            if not os.getenv("GITHUB_TOKEN"):
+                logger.error("GITHUB_TOKEN environment variable not set")
+                sys.exit(1)
+
+            from spark.unified_data_generator import UnifiedDataGenerator
+
+            config = SparkConfig()
+            if config.config_path.exists():
+                config.load()
+            generator = UnifiedDataGenerator(
+                username=args.user,
+                config=config,
+                output_dir=Path("data"),
+                cache=cache,
+                include_ai_summaries=args.include_ai_summaries,
+            )
+            summary = generator.warm(max_api_calls=args.warm_budget)
+            logger.info(
+                f"Warm-up results: {summary.warmed_repos} of {summary.missing_repos} repositories with missing "
+                f"entries warmed (~{summary.estimated_calls} calls estimated), {len(summary.deferred)} deferred"
+            )
+            if summary.refresh is not None:
+                logger.info(
+                    f"  Refreshed: {summary.refresh.repos_refreshed}, failed: {summary.refresh.repos_failed}, "
+                    f"API calls: {summary.refresh.api_calls_made}"
+                )
+            if summary.deferred:
+                logger.info("Run --warm again after the rate limit resets to fetch the deferred repositories")
+
         if args.status:
             if not args.user:
                 logger.error("--user is required for cache status")
@@ -0,0 +1,194 @@
+"""Columnar, memory-mapped sidecar for cached commits_stats entries.
+
+A commits_stats entry is a list of commit dicts (sha, author date, message,
+stats). Metrics only need the numbers, so APICache keeps a sidecar file per
+entry with packed columns that are memory-mapped and scanned without
+decoding the entry or building per-commit dicts.
+
+File layout (little-endian; the 88-byte header keeps the int64 columns
+8-byte aligned), in commit order::
+
+    b"SPKCOL1\\n"                      magic
+    uint64 count, uint32 sha_width, uint32 date_width
+    64 ASCII bytes                     digest of the entry value the file was built from
+    int64[count] timestamp             author date, epoch seconds (MISSING_TIMESTAMP if none)
+    int64[count] additions
+    int64[count] deletions
+    int64[count] files                 stats.total
+    bytes[count * sha_width]           sha, NUL-padded
+    bytes[count * date_width]          author date as stored, NUL-padded
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MAGIC = b"SPKCOL1\n"
+_HEADER = struct.Struct("<8sQII64s")
+
+# Timestamp column value for commits without a parsable author date
+MISSING_TIMESTAMP = -(2 ** 63)
+
+# Numeric columns in file order
+NUMERIC_COLUMNS = ("timestamp", "additions", "deletions", "files")
+
+
+def _timestamp(date: Optional[str]) -> int:
+    if not date:
+        return MISSING_TIMESTAMP
+    try:
+        parsed = datetime.fromisoformat(date.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return MISSING_TIMESTAMP
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _int64s(values: List[int]) -> bytes:
+    return struct.pack(f"<{len(values)}q", *values)
+
+
+def encode_columns(commits: List[Dict[str, Any]], digest: str) -> bytes:
+    """Build the sidecar bytes for a commits_stats list."""
+    shas = [(commit.get("sha") or "").encode("ascii", "replace") for commit in commits]
+    dates = [
+        (((commit.get("commit") or {}).get("author") or {}).get("date") or "").encode("ascii", "replace")
+        for commit in commits
+    ]
+    stats = [commit.get("stats") or {} for commit in commits]
+    sha_width = max((len(sha) for sha in shas), default=0)
+    date_width = max((len(date) for date in dates), default=0)
+
+    parts = [_HEADER.pack(MAGIC, len(commits), sha_width, date_width, digest.encode("ascii").ljust(64, b"\0"))]
+    parts.append(_int64s([_timestamp(date.decode("ascii")) for date in dates]))
+    parts.append(_int64s([s.get("additions") or 0 for s in stats]))
+    parts.append(_int64s([s.get("deletions") or 0 for s in stats]))
+    parts.append(_int64s([s.get("total") or 0 for s in stats]))
+    parts.append(b"".join(sha.ljust(sha_width, b"\0") for sha in shas))
+    parts.append(b"".join(date.ljust(date_width, b"\0") for date in dates))
+    return b"".join(parts)
+
+
+def write_columns(path: Path, commits: List[Dict[str, Any]], digest: str) -> None:
+    """Write a sidecar file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_name = None
+    try:
+        with tempfile.NamedTemporaryFile("wb", delete=False, dir=path.parent) as tmp:
+            tmp.write(encode_columns(commits, digest))
+            temp_name = tmp.name
+        os.replace(temp_name, path)
+    except Exception:
+        if temp_name and os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+
+class CommitColumns:
+    """Read-only columns of one commits_stats entry.
+
+    ``timestamp``, ``additions``, ``deletions`` and ``files`` are int64
+    memoryviews over the mapped file (zero-copy on little-endian hosts).
+    Strings are decoded only for the rows asked for. Use as a context
+    manager, or call ``close``, to release the mapping.
+    """
+
+    def __init__(self, buffer: Any, mapping: Optional[mmap.mmap] = None):
+        magic, count, sha_width, date_width, digest = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not a commit columns file")
+        self.count = count
+        self.digest = digest.rstrip(b"\0").decode("ascii")
+        self._mapping = mapping
+        if _HEADER.size + count * (32 + sha_width + date_width) > len(buffer):
+            raise ValueError("truncated commit columns file")
+        self._view = view = memoryview(buffer)
+        offset = _HEADER.size
+        for name in NUMERIC_COLUMNS:
+            if sys.byteorder == "little":
+                column = view[offset:offset + 8 * count].cast("q")
+            else:
+                # Stored little-endian: swap into a copy on big-endian hosts
+                swapped = array("q", view[offset:offset + 8 * count].tobytes())
+                swapped.byteswap()
+                column = memoryview(swapped)
+            setattr(self, name, column)
+            offset += 8 * count
+        self._shas = view[offset:offset + count * sha_width]
+        self._sha_width = sha_width
+        offset += count * sha_width
+        self._dates = view[offset:offset + count * date_width]
+        self._date_width = date_width
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["CommitColumns"]:
+        """Memory-map a sidecar file, or None if it is missing or unreadable."""
+        try:
+            with open(path, "rb") as handle:
+                if os.fstat(handle.fileno()).st_size < _HEADER.size:
+                    return None
+                mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+        try:
+            return cls(mapping, mapping)
+        except (ValueError, struct.error):
+            mapping.close()
+            return None
+
+    @classmethod
+    def from_commits(cls, commits: List[Dict[str, Any]], digest: str = "") -> "CommitColumns":
+        """In-memory columns (no file) for a commits_stats list."""
+        return cls(encode_columns(commits, digest))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "CommitColumns":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+    def close(self) -> None:
+        if self._mapping is None:
+            return
+        for name in NUMERIC_COLUMNS:
+            getattr(self, name).release()
+        self._shas.release()
+        self._dates.release()
+        self._view.release()
+        self._mapping.close()
+        self._mapping = None
+
+    def sha(self, index: int) -> str:
+        width = self._sha_width
+        return bytes(self._shas[index * width:(index + 1) * width]).rstrip(b"\0").decode("ascii")
+
+    def date(self, index: int) -> Optional[str]:
+        """Author date string as stored in the entry (None if it had none)."""
+        width = self._date_width
+        date = bytes(self._dates[index * width:(index + 1) * width]).rstrip(b"\0").decode("ascii")
+        return date or None
+
+    def sizes(self) -> List[int]:
+        """Commit size (files + additions + deletions) per commit."""
+        return [f + a + d for f, a, d in zip(self.files, self.additions, self.deletions)]
+
+    def earliest_date(self) -> Optional[datetime]:
+        """Earliest parsable author date."""
+        earliest = None
+        for index, timestamp in enumerate(self.timestamp):
+            if timestamp != MISSING_TIMESTAMP and (earliest is None or timestamp < self.timestamp[earliest]):
+                earliest = index
+        if earliest is None:
+            return None
+        return datetime.fromisoformat(self.date(earliest).replace("Z", "+00:00"))
@@ -0,0 +1,201 @@
+"""Time-windowed commit counting for the ranking algorithm.
+
+Both ``GitHubFetcher.fetch_commit_counts`` and
+``CacheManager.refresh_commit_counts`` need the same dict::
+
+    {"total", "recent_90d", "recent_180d", "recent_365d", "last_commit_date"}
+
+The original approach pages through up to 1000 commits (~10 requests for an
+active repository). The "stats" engine gets the same numbers from aggregate
+endpoints, cheapest first:
+
+1. The first commits page. If it holds every commit, or already reaches past
+   the 365-day boundary, the windows are exact from that page alone.
+2. ``/stats/commit_activity`` (52 weeks of daily counts) for the windows.
+   GitHub answers 202 while it computes the statistics, so the call is polled.
+3. ``get_commits(since=...).totalCount`` per window (one request each).
+4. Paginating commits, only when the aggregate endpoints fail.
+
+Totals come from ``totalCount`` and are exact rather than capped at 1000.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from github import GithubException
+
+from spark.logger import get_logger
+from spark.rate_limit import RateLimitGovernor, get_rate_governor
+
+# PyGithub default page size (Github(per_page=...))
+PAGE_SIZE = 30
+
+# Commit windows reported to the ranker, in days
+WINDOWS = (90, 180, 365)
+
+# Pagination fallback limit (matches the original behaviour)
+MAX_PAGINATED_COMMITS = 1000
+
+ENGINES = ("stats", "paginate")
+
+
+class CommitCounter:
+    """Builds commit window counts for a repository handle."""
+
+    def __init__(
+        self,
+        engine: str = "stats",
+        governor: Optional[RateLimitGovernor] = None,
+        poll_attempts: int = 3,
+        poll_interval: float = 2.0,
+        clock: Optional[Callable[[], datetime]] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        """Initialize the counter.
+
+        Args:
+            engine: "stats" for aggregate endpoints, "paginate" for the original
+                page-through-commits counting
+            governor: Rate governor for each request
+            poll_attempts: Extra commit-activity requests while GitHub returns 202
+            poll_interval: Seconds between polls
+            clock: Callable returning the current UTC time
+            sleep: Callable used to wait between polls
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown commit count engine '{engine}' (expected one of {', '.join(ENGINES)})")
+        self.engine = engine
+        self.governor = governor or get_rate_governor()
+        self.poll_attempts = max(0, int(poll_attempts))
+        self.poll_interval = poll_interval
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.sleep = sleep or time.sleep
+        self.logger = get_logger()
+        self.strategy_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def count(self, repo: Any) -> Dict[str, Any]:
+        """Count commits in each window for a PyGithub repository handle.
+
+        Raises:
+            GithubException: When the repository cannot be read at all
+        """
+        now = self.clock()
+        cutoffs = {days: now - timedelta(days=days) for days in WINDOWS}
+
+        if self.engine == "paginate":
+            return self._record("paginate", self._count_paginated(repo, cutoffs))
+
+        first_page = self.governor.call(lambda: list(repo.get_commits().get_page(0)))
+        if not first_page:
+            return self._record("empty", window_counts(0, {days: 0 for days in WINDOWS}, None))
+
+        dates = [date for date in (_commit_date(commit) for commit in first_page) if date]
+        last_commit_date = max(dates) if dates else None
+        page_windows = {days: sum(1 for date in dates if date >= cutoff) for days, cutoff in cutoffs.items()}
+
+        if len(first_page) < PAGE_SIZE:
+            # The first page is the whole history
+            return self._record("first_page", window_counts(len(first_page), page_windows, last_commit_date))
+
+        try:
+            total = self.governor.call(lambda: repo.get_commits().totalCount)
+
+            if dates and min(dates) < cutoffs[365]:
+                # Page already reaches past every window boundary
+                return self._record("first_page", window_counts(total, page_windows, last_commit_date))
+
+            windows = self._windows_from_activity(repo, cutoffs)
+            if windows is not None:
+                return self._record("commit_activity", window_counts(total, windows, last_commit_date))
+
+            windows = {
+                days: self.governor.call(lambda cutoff=cutoff: repo.get_commits(since=cutoff).totalCount)
+                for days, cutoff in cutoffs.items()
+            }
+            return self._record("since_total", window_counts(total, windows, last_commit_date))
+        except GithubException as e:
+            self.logger.debug(f"Aggregate commit counts unavailable, paginating: {e}")
+            return self._record("paginate", self._count_paginated(repo, cutoffs))
+
+    def _windows_from_activity(self, repo: Any, cutoffs: Dict[int, datetime]) -> Optional[Dict[int, int]]:
+        """Window counts from weekly commit activity, polling while GitHub computes it."""
+        weeks = None
+        for attempt in range(self.poll_attempts + 1):
+            weeks = self.governor.call(repo.get_stats_commit_activity)
+            if weeks:
+                break
+            if attempt < self.poll_attempts:
+                # 202: statistics are being computed in the background
+                self.sleep(self.poll_interval)
+        if not weeks:
+            return None
+
+        return activity_windows(((week.week, week.days) for week in weeks), cutoffs)
+
+    def _count_paginated(self, repo: Any, cutoffs: Dict[int, datetime]) -> Dict[str, Any]:
+        """Original counting: page through up to MAX_PAGINATED_COMMITS commits."""
+        total = 0
+        windows = {days: 0 for days in cutoffs}
+        last_commit_date = None
+
+        for commit in self.governor.paginate(repo.get_commits()):
+            if total >= MAX_PAGINATED_COMMITS:
+                break
+            total += 1
+
+            commit_date = _commit_date(commit)
+            if not commit_date:
+                continue
+            if not last_commit_date or commit_date > last_commit_date:
+                last_commit_date = commit_date
+            for days, cutoff in cutoffs.items():
+                if commit_date >= cutoff:
+                    windows[days] += 1
+
+        return window_counts(total, windows, last_commit_date)
+
+    def _record(self, strategy: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.strategy_counts[strategy] = self.strategy_counts.get(strategy, 0) + 1
+        return result
+
+
+def _commit_date(commit: Any) -> Optional[datetime]:
+    """Author date of a PyGithub commit, or None if unavailable."""
+    try:
+        date = commit.commit.author.date if commit.commit and commit.commit.author else None
+    except (AttributeError, IndexError):
+        return None
+    if date and date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date
+
+
+def activity_windows(weeks: Iterable[Tuple[datetime, List[int]]], cutoffs: Dict[int, datetime]) -> Dict[int, int]:
+    """Count commits per window from (week start, daily counts) pairs."""
+    windows = {days: 0 for days in cutoffs}
+    for week_start, daily in weeks:
+        if week_start.tzinfo is None:
+            week_start = week_start.replace(tzinfo=timezone.utc)
+        for offset, count in enumerate(daily or []):
+            if not count:
+                continue
+            day_end = week_start + timedelta(days=offset + 1)
+            for days, cutoff in cutoffs.items():
+                if day_end > cutoff:
+                    windows[days] += count
+    return windows
+
+
+def window_counts(total: int, windows: Dict[int, int], last_commit_date: Optional[datetime]) -> Dict[str, Any]:
+    """Build the commit_counts dict cached for the ranker."""
+    return {
+        "total": total,
+        "recent_90d": windows[90],
+        "recent_180d": windows[180],
+        "recent_365d": windows[365],
+        "last_commit_date": last_commit_date.isoformat() if last_commit_date else None,
+    }
@@ -0,0 +1,115 @@
+"""Conditional GitHub REST requests (ETag / Last-Modified revalidation).
+
+GitHub answers a request carrying ``If-None-Match`` / ``If-Modified-Since``
+with ``304 Not Modified`` when the resource is unchanged, and 304 responses
+do not count against the rate limit. ``ConditionalClient`` sends the stored
+validators and reports whether the cached copy can be reused.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import requests
+from github import GithubException
+
+from spark.rate_limit import RateLimitGovernor, get_rate_governor
+
+GITHUB_API_URL = "https://api.github.com"
+
+
+@dataclass
+class ConditionalResponse:
+    """Result of a conditional GET."""
+
+    status: int
+    data: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    @property
+    def not_modified(self) -> bool:
+        """True when GitHub confirmed the cached copy is current (304)."""
+        return self.status == 304
+
+    def validators(self) -> Dict[str, Optional[str]]:
+        """Validators to store alongside the cached value."""
+        return {"etag": self.etag, "last_modified": self.last_modified}
+
+
+class ConditionalClient:
+    """Minimal GitHub REST client that revalidates with stored validators."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        session: Optional[Any] = None,
+        base_url: str = GITHUB_API_URL,
+        governor: Optional[RateLimitGovernor] = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            token: GitHub Personal Access Token
+            session: Object with a requests-compatible ``get`` method
+            base_url: REST API base URL
+            governor: Rate governor (defaults to the shared instance)
+        """
+        self.token = token
+        self.session = session or requests.Session()
+        self.base_url = base_url.rstrip("/")
+        self.governor = governor or get_rate_governor()
+        self.requests_made = 0
+        self.not_modified = 0
+
+    def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> ConditionalResponse:
+        """GET ``path``, sending validators from a previous response if known.
+
+        Raises:
+            GithubException: For non-200/304 responses
+        """
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        self.governor.acquire()
+        response = self.session.get(f"{self.base_url}{path}", params=params, headers=headers, timeout=30)
+        self.requests_made += 1
+        self.governor.observe_headers(
+            response.headers,
+            status=response.status_code,
+            message=response.text if response.status_code in (403, 429) else "",
+        )
+
+        if response.status_code == 304:
+            self.not_modified += 1
+            # A 304 may omit validators; keep the ones we sent
+            return ConditionalResponse(
+                status=304,
+                data=None,
+                etag=response.headers.get("ETag") or etag,
+                last_modified=response.headers.get("Last-Modified") or last_modified,
+            )
+
+        if response.status_code != 200:
+            try:
+                data = response.json()
+            except ValueError:
+                data = {"message": getattr(response, "text", "")}
+            raise GithubException(response.status_code, data, dict(response.headers))
+
+        return ConditionalResponse(
+            status=200,
+            data=response.json(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
@@ -12,7 +12,7 @@ from typing import List, Optional, Dict, Any
 import os
 import json
 
-from spark.fetcher import GitHubFetcher
+from spark.fetcher import create_fetcher
 from spark.calculator import StatsCalculator
 from spark.models.dashboard_data import (
     DashboardData,
@@ -54,7 +54,14 @@ class DashboardGenerator:
         dashboard_config = config.get("dashboard", {})
         max_repos = dashboard_config.get("data_generation", {}).get("max_repositories", 200)
 
-        self.fetcher = GitHubFetcher(token=token, max_repos=max_repos)
+        fetcher_config = config.get("fetcher", {})
+        self.fetcher = create_fetcher(
+            backend=fetcher_config.get("backend", "sync"),
+            async_concurrency=fetcher_config.get("async_concurrency", 16),
+            token=token,
+            max_repos=max_repos,
+            commit_stats_workers=fetcher_config.get("commit_stats_workers", 4),
+        )
 
         # Get dashboard configuration
         dashboard_config = config.get("dashboard", {})
@@ -79,6 +86,7 @@ class DashboardGenerator:
 
         This is the main entry point for dashboard data generation. It orchestrates
         the entire process: fetch repositories, calculate metrics, build data structure.
+        The fetcher is closed afterwards.
 
         Returns:
             DashboardData object containing all dashboard information
@@ -92,11 +100,14 @@ class DashboardGenerator:
 
         logger.info("Starting dashboard data generation...")
 
-        # Fetch repository data
-        repositories = self.generate_dashboard_data()
+        try:
+            # Fetch repository data
+            repositories = self.generate_dashboard_data()
 
-        # Fetch user profile
-        profile = self.generate_user_profile()
+            # Fetch user profile
+            profile = self.generate_user_profile()
+        finally:
+            self.close()
 
         # Create metadata
         metadata = DashboardMetadata(
@@ -118,6 +129,13 @@ class DashboardGenerator:
         )
         return dashboard_data
 
+    def close(self) -> None:
+        """Release the fetcher's connections (and the async backend's event loop).
+
+        generate() calls this once everything is fetched.
+        """
+        self.fetcher.close()
+
     def generate_dashboard_data(self) -> List[DashboardRepository]:
         """Fetch all public repositories and prepare dashboard data.
 
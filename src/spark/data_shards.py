@@ -0,0 +1,132 @@
+"""Sharded dashboard data: a compact index plus per-repository detail files.
+
+Written next to repositories.json when ``dashboard.performance.sharded_output``
+is enabled::
+
+    manifest.json        content hashes of every file below (fetched first)
+    index.json           profile, metadata and one entry per repository
+                         without DETAIL_FIELDS (table, filters and charts)
+    repos/<name>.json    DETAIL_FIELDS of one repository (drill-down)
+
+The dashboard fetches the manifest uncached, then requests the index and
+detail files with their hash as the cache key, so unchanged files are
+served from the browser cache. Files are minified JSON, written
+atomically. Changed detail files are staged while repositories.json
+streams and only moved into ``repos/`` by ``finish()``, so a failed run
+leaves the published files alone; the manifest is written last.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from spark.json_writer import write_atomic
+
+MANIFEST_FILENAME = "manifest.json"
+INDEX_FILENAME = "index.json"
+SHARD_DIRNAME = "repos"
+STAGING_DIRNAME = ".repos-staging"
+
+# Bump when the layout of the manifest, index or detail files changes
+SHARD_SCHEMA_VERSION = 1
+
+# Repository fields only the detail views read (the bulk of the data)
+DETAIL_FIELDS = ("summary", "ai_summary", "tech_stack", "language_stats", "languages", "commit_metrics")
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _file_entry(path: str, data: bytes) -> Dict[str, Any]:
+    return {"path": path, "sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+
+
+class ShardWriter:
+    """Stage detail files as repositories pass through, then publish them with the index and manifest."""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.shard_dir = self.output_dir / SHARD_DIRNAME
+        self.staging_dir = self.output_dir / STAGING_DIRNAME
+        self.index_entries: List[Dict[str, Any]] = []
+        self.details: Dict[str, Dict[str, Any]] = {}
+        self.staged: List[str] = []  # Detail filenames waiting in staging_dir
+
+    def add(self, repository: Dict[str, Any]) -> None:
+        """Stage the detail file of one repository dict and keep its index entry."""
+        name = repository["name"]
+        detail = {"name": name}
+        entry = {}
+        for key, value in repository.items():
+            if key in DETAIL_FIELDS:
+                detail[key] = value
+            else:
+                entry[key] = value
+        data = _encode(detail)
+        filename = f"{name}.json"
+        target = self.shard_dir / filename
+        # Skip the write when the content is unchanged
+        if not target.exists() or target.read_bytes() != data:
+            write_atomic(self.staging_dir / filename, data)
+            self.staged.append(filename)
+        relative = f"{SHARD_DIRNAME}/{filename}"
+        self.details[name] = _file_entry(relative, data)
+        self.index_entries.append(entry)
+
+    def tee(self, repositories: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield ``repositories`` unchanged, staging each detail file on the way."""
+        for repository in repositories:
+            self.add(repository)
+            yield repository
+
+    def finish(self, profile: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Publish staged detail files, write the index and manifest, and
+        delete detail files of removed repositories.
+
+        Call only once repositories.json was written successfully.
+
+        Returns:
+            The manifest dict
+        """
+        if self.staged:
+            self.shard_dir.mkdir(parents=True, exist_ok=True)
+            for filename in self.staged:
+                os.replace(self.staging_dir / filename, self.shard_dir / filename)
+        self.discard()
+
+        index = _encode({"profile": profile, "repositories": self.index_entries, "metadata": metadata})
+        write_atomic(self.output_dir / INDEX_FILENAME, index)
+
+        manifest = {
+            "schema_version": SHARD_SCHEMA_VERSION,
+            "generated_at": metadata.get("generated_at") or datetime.now(timezone.utc).isoformat(),
+            "detail_fields": list(DETAIL_FIELDS),
+            "index": {**_file_entry(INDEX_FILENAME, index), "repositories": len(self.index_entries)},
+            "details": self.details,
+        }
+        write_atomic(self.output_dir / MANIFEST_FILENAME, json.dumps(manifest, indent=2).encode("utf-8"))
+
+        # After the manifest, so it never lists a deleted file
+        if self.shard_dir.is_dir():
+            current = {Path(entry["path"]).name for entry in self.details.values()}
+            for path in self.shard_dir.glob("*.json"):
+                if path.name not in current:
+                    path.unlink()
+        return manifest
+
+    def discard(self) -> None:
+        """Drop staged detail files (the write failed; published files stay as they are)."""
+        self.staged = []
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Detail file count and total bytes."""
+        return {
+            "details": len(self.details),
+            "detail_bytes": sum(entry["bytes"] for entry in self.details.values()),
+        }
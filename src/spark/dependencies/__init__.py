@@ -3,9 +3,11 @@
 This module provides:
 - DependencyParser: Extract dependencies from various package managers
 - RepositoryDependencyAnalyzer: Dependency parsing and ecosystem identification
+- DependencyFileDiscovery: Tree-based manifest discovery with blob-SHA reuse
 """
 
 from spark.dependencies.parser import DependencyParser
 from spark.dependencies.analyzer import RepositoryDependencyAnalyzer
+from spark.dependencies.discovery import DependencyFileDiscovery
 
-__all__ = ["DependencyParser", "RepositoryDependencyAnalyzer"]
+__all__ = ["DependencyParser", "RepositoryDependencyAnalyzer", "DependencyFileDiscovery"]
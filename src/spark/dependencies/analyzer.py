@@ -4,6 +4,7 @@ import logging
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from .discovery import DependencyFileDiscovery
 from .parser import DependencyParser, Dependency
 
 
@@ -118,47 +119,12 @@ class RepositoryDependencyAnalyzer:
         """
         from spark.models.tech_stack import TechnologyStack, DependencyInfo
 
-        # Known dependency files to check
-        dependency_files_to_check = [
-            'package.json',  # NPM
-            'requirements.txt',  # PyPI
-            'pyproject.toml',  # PyPI (modern)
-            'Gemfile',  # RubyGems
-            'go.mod',  # Go
-            'pom.xml',  # Maven
-        ]
-
-        dependency_files = {}
-
-        # Try to fetch each dependency file
-        for filename in dependency_files_to_check:
-            try:
-                file_content = github_repo.get_contents(filename)
-                if file_content and hasattr(file_content, 'decoded_content'):
-                    content = file_content.decoded_content.decode('utf-8')
-                    dependency_files[filename] = content
-                    self.logger.debug(f"Found dependency file: {filename}")
-            except Exception as e:
-                # File doesn't exist or error fetching, skip
-                self.logger.debug(f"Skipping {filename}: {e}")
-                continue
-
-        # Look for .csproj files (can be anywhere in root directory)
+        # One tree listing finds every manifest, including nested ones
         try:
-            contents = github_repo.get_contents("")
-            for item in contents:
-                if item.name.endswith('.csproj') and item.type == 'file':
-                    try:
-                        file_content = github_repo.get_contents(item.name)
-                        if file_content and hasattr(file_content, 'decoded_content'):
-                            content = file_content.decoded_content.decode('utf-8')
-                            dependency_files[item.name] = content
-                            self.logger.debug(f"Found .NET project file: {item.name}")
-                            break  # Only process first .csproj found
-                    except Exception as e:
-                        self.logger.debug(f"Error reading {item.name}: {e}")
+            dependency_files = DependencyFileDiscovery().discover(github_repo).files
         except Exception as e:
-            self.logger.debug(f"Error listing repository contents: {e}")
+            self.logger.debug(f"Error discovering dependency files: {e}")
+            dependency_files = {}
 
         if not dependency_files:
             self.logger.debug(f"No dependency files found in {github_repo.name}")
@@ -0,0 +1,170 @@
+"""Tree-based discovery of dependency manifests in a repository.
+
+Probing a fixed list of paths with ``get_contents`` costs one request per
+candidate (plus a root listing for ``*.csproj``) whether or not the file
+exists, and never sees manifests below the repository root. Discovery instead
+lists the whole tree once (``GET /git/trees/HEAD?recursive=1``), matches
+every manifest path, and downloads only the blobs that exist.
+
+Every tree entry carries its blob SHA. The SHAs are stored alongside the
+cached ``dependency_files`` so a later refresh (new push) reuses the content
+of any manifest whose blob is unchanged instead of downloading it again.
+"""
+
+import base64
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Optional
+
+from github import GithubException
+
+from spark.logger import get_logger
+from spark.rate_limit import RateLimitGovernor, get_rate_governor
+
+# Manifest filenames matched anywhere in the tree
+MANIFEST_FILES = (
+    "package.json",      # npm/JavaScript
+    "requirements.txt",  # pip/Python
+    "pyproject.toml",    # Python poetry/modern
+    "Gemfile",           # Ruby
+    "go.mod",            # Go
+    "pom.xml",           # Maven/Java
+    "Cargo.toml",        # Rust
+    "composer.json",     # PHP
+)
+
+# Manifest filename suffixes (e.g. MyApp.csproj)
+MANIFEST_SUFFIXES = (".csproj",)
+
+# Directories holding vendored or installed third-party code
+SKIPPED_DIRECTORIES = frozenset({
+    "node_modules", "vendor", "bower_components", "third_party",
+    "site-packages", ".venv", "venv", ".git",
+})
+
+# Upper bound on manifests downloaded per repository (large monorepos)
+MAX_MANIFESTS = 50
+
+
+@dataclass
+class DiscoveredFiles:
+    """Dependency manifests found in one repository."""
+
+    files: Dict[str, str] = field(default_factory=dict)
+    blobs: Dict[str, str] = field(default_factory=dict)
+    downloaded: int = 0
+    reused: int = 0
+
+
+def is_manifest_path(path: str) -> bool:
+    """Return True if a tree path names a dependency manifest outside vendored code."""
+    parts = PurePosixPath(path).parts
+    if not parts or any(part in SKIPPED_DIRECTORIES for part in parts[:-1]):
+        return False
+    name = parts[-1]
+    return name in MANIFEST_FILES or name.endswith(MANIFEST_SUFFIXES)
+
+
+def cached_blob_contents(cache: Any, owner: str, repo_name: str, exclude_week: Optional[str] = None) -> Dict[str, str]:
+    """Map blob SHA to content for manifests in earlier ``dependency_files`` entries.
+
+    Args:
+        cache: APICache instance
+        owner: Repository owner
+        repo_name: Repository name
+        exclude_week: Week key to ignore (the one being written)
+    """
+    contents: Dict[str, str] = {}
+    entry = cache.get_entry_info("dependency_files", owner, repo=repo_name) or {}
+    for week in entry.get("weeks", []):
+        if week == exclude_week:
+            continue
+        metadata = cache.get_metadata("dependency_files", owner, repo=repo_name, week=week) or {}
+        files = cache.get("dependency_files", owner, repo=repo_name, week=week) or {}
+        for key, sha in (metadata.get("blobs") or {}).items():
+            if key in files and sha not in contents:
+                contents[sha] = files[key]
+    return contents
+
+
+class DependencyFileDiscovery:
+    """Finds and downloads dependency manifests from a repository tree."""
+
+    def __init__(self, governor: Optional[RateLimitGovernor] = None, max_manifests: int = MAX_MANIFESTS):
+        """Initialize discovery.
+
+        Args:
+            governor: Rate governor for tree and blob requests
+            max_manifests: Maximum manifests downloaded per repository
+        """
+        self.governor = governor or get_rate_governor()
+        self.max_manifests = max_manifests
+        self.logger = get_logger()
+
+    def find_manifests(self, repo: Any) -> List[Any]:
+        """List manifest blobs in the default branch with one tree request.
+
+        Returns:
+            Tree elements (``path``, ``sha``) ordered root first, then by path.
+            Empty for repositories without commits.
+
+        Raises:
+            GithubException: When the tree cannot be read for other reasons
+        """
+        try:
+            tree = self.governor.call(repo.get_git_tree, "HEAD", recursive=True)
+        except GithubException as e:
+            # 409: empty repository, 404: no default branch
+            if getattr(e, "status", None) in (404, 409):
+                return []
+            raise
+
+        if getattr(tree, "truncated", False):
+            self.logger.debug(f"Tree listing truncated for {getattr(repo, 'name', repo)}; using listed entries")
+
+        manifests = [
+            element for element in tree.tree
+            if element.type == "blob" and is_manifest_path(element.path)
+        ]
+        manifests.sort(key=lambda element: (element.path.count("/"), element.path))
+        return manifests[:self.max_manifests]
+
+    def discover(self, repo: Any, known_blobs: Optional[Dict[str, str]] = None) -> DiscoveredFiles:
+        """Download every manifest in the tree, reusing content of known blobs.
+
+        Args:
+            repo: PyGithub repository handle
+            known_blobs: Blob SHA to content from earlier refreshes
+
+        Returns:
+            DiscoveredFiles with contents keyed by manifest path
+        """
+        known_blobs = known_blobs or {}
+        result = DiscoveredFiles()
+
+        for element in self.find_manifests(repo):
+            content = known_blobs.get(element.sha)
+            if content is None:
+                content = self._download_blob(repo, element)
+                if content is None:
+                    continue
+                result.downloaded += 1
+            else:
+                result.reused += 1
+
+            # Root manifests keep their bare filename, as in the probed format
+            result.files[element.path] = content
+            result.blobs[element.path] = element.sha
+
+        return result
+
+    def _download_blob(self, repo: Any, element: Any) -> Optional[str]:
+        """Fetch and decode one blob, or None if it is not UTF-8 text."""
+        blob = self.governor.call(repo.get_git_blob, element.sha)
+        raw = blob.content or ""
+        try:
+            data = base64.b64decode(raw) if blob.encoding == "base64" else raw.encode("utf-8")
+            return data.decode("utf-8")
+        except (ValueError, UnicodeDecodeError) as e:
+            self.logger.debug(f"Skipping {element.path}: {e}")
+            return None
@@ -1,8 +1,9 @@
 """GitHub API data fetching with rate limiting and caching."""
 
 import os
-import time
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 
 from github import Github, GithubException, RateLimitExceededException
@@ -10,9 +11,24 @@ from github.Repository import Repository
 
 from spark.cache import APICache
 from spark.cache_status import CacheStatusTracker
+from spark.commit_counts import CommitCounter
+from spark.conditional_requests import ConditionalClient
+from spark.dependencies.discovery import DependencyFileDiscovery, cached_blob_contents
+from spark.graphql_fetcher import GraphQLBatchFetcher
 from spark.logger import get_logger
+from spark.rate_limit import get_rate_governor
+from spark.repo_handles import RepositoryHandleCache
 from spark.time_utils import sanitize_timestamp_for_filename
 
+# Page size for conditional repository listing requests (GitHub maximum)
+REPOS_PER_PAGE = 100
+
+# Commits between progress reports / partial-result checkpoints
+COMMIT_CHECKPOINT_INTERVAL = 25
+
+# Values for the fetcher.backend setting
+FETCH_BACKENDS = ("sync", "async")
+
 
 class GitHubFetcher:
     """Fetches GitHub user data with rate limiting and caching."""
@@ -23,6 +39,10 @@ class GitHubFetcher:
         cache: Optional[APICache] = None,
         max_repos: int = 500,
         use_cache_status: bool = True,
+        mode: str = "rest",
+        graphql_batch_size: int = 50,
+        commit_count_engine: str = "stats",
+        commit_stats_workers: int = 1,
     ):
         """Initialize the GitHub API fetcher.
 
@@ -31,6 +51,13 @@ class GitHubFetcher:
             cache: API cache instance (creates new if not provided)
             max_repos: Maximum number of repositories to process
             use_cache_status: Whether to use cache status tracking to skip cached repos
+            mode: "rest" for per-repository REST calls, or "graphql" to batch
+                languages, README, commit counts and quality indicators
+            graphql_batch_size: Repositories per GraphQL query in graphql mode
+            commit_count_engine: "stats" to count commit windows from aggregate
+                endpoints, or "paginate" to page through up to 1000 commits
+            commit_stats_workers: Concurrent per-commit stats requests in
+                fetch_commits_with_stats (1 = sequential)
         """
         self.logger = get_logger()
         self.token = token or os.getenv("GITHUB_TOKEN")
@@ -38,11 +65,63 @@ class GitHubFetcher:
             raise ValueError("GitHub token required (GITHUB_TOKEN environment variable or token parameter)")
 
         self.github = Github(self.token)
+        self.governor = get_rate_governor()
+        self.conditional = ConditionalClient(token=self.token, governor=self.governor)
+        # Shared with CacheManager so each repository is resolved at most once per run
+        self.repo_handles = RepositoryHandleCache(self.governor)
+        self.commit_counter = CommitCounter(engine=commit_count_engine, governor=self.governor)
+        self.dependency_discovery = DependencyFileDiscovery(self.governor)
+        self.commit_stats_workers = max(1, int(commit_stats_workers))
+        self._thread_state = threading.local()
         self.cache = cache or APICache()
         self.cache_status_tracker = CacheStatusTracker(cache_dir=self.cache.cache_dir)
         self.max_repos = max_repos
+        # Profile/listing lookups: served from cache, revalidated (304) or fetched
+        self.request_stats = {"cache_hits": 0, "not_modified": 0, "fetched": 0}
         self.use_cache_status = use_cache_status
 
+        if mode not in ("rest", "graphql"):
+            raise ValueError(f"Unknown fetcher mode '{mode}' (expected 'rest' or 'graphql')")
+        self.mode = mode
+        self.graphql: Optional[GraphQLBatchFetcher] = None
+        if mode == "graphql":
+            self.graphql = GraphQLBatchFetcher(
+                token=self.token,
+                cache=self.cache,
+                batch_size=graphql_batch_size,
+            )
+
+    def _get_repo(self, username: str, repo_name: str) -> Repository:
+        """Get a repository handle (resolved at most once per run)."""
+        return self.repo_handles.get(self.github, username, repo_name)
+
+    def _get_user(self, username: Optional[str] = None):
+        """Fetch a user (authenticated user if None) through the shared rate governor."""
+        if username:
+            user = self.governor.call(self.github.get_user, username)
+        else:
+            user = self.governor.call(self.github.get_user)
+            # The authenticated user is lazy; complete it under the governor
+            self.governor.call(lambda: user.login)
+        self.governor.observe_github(self.github)
+        return user
+
+    def _paginate(self, items):
+        """Iterate a paginated PyGithub result, pacing each page request."""
+        return self.governor.paginate(items, client=self.github)
+
+    def create_client(self) -> Github:
+        """Create a new PyGithub client with this fetcher's token.
+
+        PyGithub clients share one HTTP connection and are not safe to use
+        from several threads, so concurrent workers each get their own.
+        """
+        return Github(self.token)
+
+    def close(self) -> None:
+        """Close the pooled connections of the conditional request client."""
+        self.conditional.session.close()
+
     def _build_repo_metadata(
         self,
         username: str,
@@ -75,7 +154,7 @@ class GitHubFetcher:
         # If no username provided, get authenticated user
         if not username:
             try:
-                user = self.github.get_user()
+                user = self._get_user()
                 return {
                     "login": user.login,
                     "name": user.name or user.login,
@@ -92,119 +171,173 @@ class GitHubFetcher:
 
         return self.fetch_user_profile(username)
 
-    def fetch_user_profile(self, username: str) -> Dict[str, Any]:
+    def fetch_user_profile(self, username: str, revalidate: bool = False) -> Dict[str, Any]:
         """Fetch GitHub user profile information.
 
         Args:
             username: GitHub username
+            revalidate: Check a cached profile with GitHub (conditional request,
+                free when unchanged) instead of returning it as-is
 
         Returns:
             User profile data dictionary
         """
         cached = self.cache.get("user_profile", username)
-        if cached:
+        if cached and not revalidate:
             self.logger.debug(f"Using cached user profile for {username}")
+            self.request_stats["cache_hits"] += 1
             return cached
 
         self.logger.info(f"Fetching user profile for {username}")
+        validators = (self.cache.get_metadata("user_profile", username) or {}) if cached else {}
 
         try:
-            user = self.github.get_user(username)
-
-            profile_data = {
-                "login": user.login,
-                "username": user.login,
-                "name": user.name or user.login,
-                "bio": user.bio,
-                "company": user.company,
-                "location": user.location,
-                "email": user.email,
-                "avatar_url": user.avatar_url,
-                "html_url": user.html_url,
-                "public_repos": user.public_repos,
-                "followers": user.followers,
-                "following": user.following,
-                "created_at": user.created_at.isoformat() if user.created_at else None,
-                "updated_at": user.updated_at.isoformat() if user.updated_at else None,
-            }
-
-            # Cache writes now handled by CacheManager
-            return profile_data
-
+            response = self.conditional.get(
+                f"/users/{username}",
+                etag=validators.get("etag"),
+                last_modified=validators.get("last_modified"),
+            )
         except GithubException as e:
             self.logger.error(f"Failed to fetch user profile for {username}", e)
             raise
 
+        if response.not_modified and cached:
+            self.logger.debug(f"User profile for {username} not modified (304)")
+            self.request_stats["not_modified"] += 1
+            return cached
+
+        self.request_stats["fetched"] += 1
+        profile_data = _profile_from_api(response.data)
+        self.cache.set("user_profile", username, profile_data, metadata=response.validators())
+        return profile_data
+
     def fetch_repositories(
         self,
         username: str,
         exclude_private: bool = True,
         exclude_forks: bool = True,
         exclude_archived: bool = True,
+        revalidate: bool = False,
     ) -> List[Dict[str, Any]]:
         """Fetch user repositories with pagination.
 
+        Listing pages are requested conditionally with the ETag/Last-Modified
+        validators from the previous run, so unchanged pages return 304 and
+        cost no quota.
+
         Args:
             username: GitHub username
             exclude_private: Exclude private repositories
             exclude_forks: Exclude forked repositories
             exclude_archived: Exclude archived repositories
+            revalidate: Revalidate the listing with GitHub even when a cached
+                list exists
 
         Returns:
             List of repository data dictionaries
         """
         variant = f"list_{exclude_private}_{exclude_forks}_{exclude_archived}"
         cached = self.cache.get("repositories", username, repo=variant)
-        if cached:
+        if cached and not revalidate:
             self.logger.debug(f"Using cached repositories for {username}")
+            self.request_stats["cache_hits"] += 1
+            self.repo_handles.seed(username, cached)
             return cached
 
         self.logger.info(f"Fetching repositories for {username}")
 
         try:
-            user = self.github.get_user(username)
-            repos = []
-
-            for repo in user.get_repos():
-                # Apply filters
-                if exclude_private and repo.private:
-                    continue
-                if exclude_forks and repo.fork:
-                    continue
-                if exclude_archived and repo.archived:
-                    continue
-
-                # Stop if we've hit the max
-                if len(repos) >= self.max_repos:
-                    self.logger.warn(f"Reached maximum repository limit ({self.max_repos})")
-                    break
-
-                repos.append({
-                    "name": repo.name,
-                    "full_name": repo.full_name,
-                    "description": repo.description,
-                    "language": repo.language,
-                    "stars": repo.stargazers_count,
-                    "forks": repo.forks_count,
-                    "watchers": repo.watchers_count,
-                    "size": repo.size,
-                    "created_at": repo.created_at.isoformat() if repo.created_at else None,
-                    "updated_at": repo.updated_at.isoformat() if repo.updated_at else None,
-                    "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
-                    "is_fork": repo.fork,
-                    "is_private": repo.private,
-                    "is_archived": repo.archived,
-                    "homepage": repo.homepage,  # Custom website URL from repo settings
-                    "has_pages": repo.has_pages,  # GitHub Pages enabled
-                })
-
-            # Cache writes now handled by CacheManager
-            self.logger.info(f"Fetched {len(repos)} repositories")
-            return repos
-
+            all_repos = self._fetch_repository_pages(username)
         except GithubException as e:
             self.logger.error(f"Failed to fetch repositories for {username}", e)
             raise
+        self.repo_handles.seed(username, all_repos)
+
+        repos = []
+        for repo in all_repos:
+            # Apply filters
+            if exclude_private and repo["is_private"]:
+                continue
+            if exclude_forks and repo["is_fork"]:
+                continue
+            if exclude_archived and repo["is_archived"]:
+                continue
+
+            # Stop if we've hit the max
+            if len(repos) >= self.max_repos:
+                self.logger.warn(f"Reached maximum repository limit ({self.max_repos})")
+                break
+
+            repos.append(repo)
+
+        # Cache writes now handled by CacheManager
+        self.logger.info(f"Fetched {len(repos)} repositories")
+        return repos
+
+    def _fetch_repository_pages(self, username: str) -> List[Dict[str, Any]]:
+        """Fetch the unfiltered repository listing page by page.
+
+        Each page is revalidated with the validators stored in the
+        ``repository_pages`` cache entry's metadata; a 304 reuses that page's
+        cached records.
+
+        Returns:
+            Repository dicts for every listed repository, in listing order
+        """
+        stored_pages = (self.cache.get("repository_pages", username) or {}).get("pages", [])
+        stored_validators = (self.cache.get_metadata("repository_pages", username) or {}).get("validators", [])
+
+        pages: List[List[Dict[str, Any]]] = []
+        validators: List[Dict[str, Optional[str]]] = []
+        changed = False
+
+        while True:
+            index = len(pages)
+            prior = stored_validators[index] if index < len(stored_validators) and index < len(stored_pages) else {}
+
+            response = self.conditional.get(
+                f"/users/{username}/repos",
+                params={"per_page": REPOS_PER_PAGE, "page": index + 1},
+                etag=prior.get("etag"),
+                last_modified=prior.get("last_modified"),
+            )
+
+            if response.not_modified and prior:
+                self.request_stats["not_modified"] += 1
+                page = stored_pages[index]
+            else:
+                self.request_stats["fetched"] += 1
+                page = [_repository_from_api(raw) for raw in response.data or []]
+                changed = True
+
+            pages.append(page)
+            validators.append(response.validators())
+            if len(page) < REPOS_PER_PAGE:
+                break
+
+        if changed or len(pages) != len(stored_pages):
+            self.cache.set(
+                "repository_pages",
+                username,
+                {"pages": pages},
+                metadata={"validators": validators, "per_page": REPOS_PER_PAGE},
+            )
+
+        return [repo for page in pages for repo in page]
+
+    def prefetch_repository_data(self, username: str, repos: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Batch-populate repository caches when running in graphql mode.
+
+        Args:
+            username: Repository owner
+            repos: Repository dicts with 'name' and 'pushed_at'
+
+        Returns:
+            Dict mapping category to number of cache entries written (empty in rest mode)
+        """
+        if self.graphql is None:
+            return {}
+        return self.graphql.prefetch(username, repos)
 
     def fetch_commits(
         self,
@@ -236,10 +369,10 @@ class GitHubFetcher:
         self.logger.debug(f"Fetching commits for {username}/{repo_name}")
 
         try:
-            repo = self.github.get_repo(f"{username}/{repo_name}")
+            repo = self._get_repo(username, repo_name)
             commits = []
 
-            for commit in repo.get_commits(author=username):
+            for commit in self._paginate(repo.get_commits(author=username)):
                 if len(commits) >= max_commits:
                     break
 
@@ -311,64 +444,251 @@ class GitHubFetcher:
             self.logger.debug(f"Using cached commit stats for {username}/{repo_name} (pushed_at: {push_key})")
             return cached
 
-        self.logger.info(f"Fetching commit statistics for {username}/{repo_name} (max: {max_commits})")
+        # Commits already ingested under an earlier pushed_at key
+        prior_commits, prior_week = self._latest_commit_stats(username, repo_name, exclude_week=push_key)
+        known_shas = {commit.get("sha") for commit in prior_commits}
+
+        if prior_commits:
+            self.logger.info(
+                f"Fetching new commit statistics for {username}/{repo_name} "
+                f"(since {prior_commits[0].get('sha', '')[:7]}, max: {max_commits})"
+            )
+        else:
+            self.logger.info(f"Fetching commit statistics for {username}/{repo_name} (max: {max_commits})")
 
         try:
-            repo = self.github.get_repo(f"{username}/{repo_name}")
-            commits_with_stats = []
+            repo = self._get_repo(username, repo_name)
+            listed, known_sha = self._list_new_commits(repo, known_shas, max_commits)
+        except GithubException as e:
+            self.logger.error(f"Could not fetch commit stats for {repo_name}: {e}")
+            return []
 
-            # Get commits - do not filter by author here as GitHub API's author parameter is flaky
-            for i, commit in enumerate(repo.get_commits()):
-                if len(commits_with_stats) >= max_commits:
-                    break
+        # Resume from a checkpoint left by an interrupted run for this push
+        records = self._load_commit_checkpoint(username, repo_name, push_key)
+        try:
+            self._fetch_commit_details(username, repo_name, listed, records, push_key)
+        except BaseException:
+            self._save_commit_checkpoint(username, repo_name, push_key, records)
+            self.logger.warn(
+                f"Commit stats for {repo_name} interrupted; kept {len(records)} completed commits for the next run"
+            )
+            raise
 
-                try:
-                    # Fetch detailed commit data with stats
-                    # Note: commit.stats may be None for some commits
-                    files_count = 0
-                    additions = 0
-                    deletions = 0
-                    
-                    if hasattr(commit, 'stats') and commit.stats:
-                        additions = commit.stats.additions
-                        deletions = commit.stats.deletions
-                        # Files count is the sum of changed files
-                        files_count = commit.stats.total if hasattr(commit.stats, 'total') else 0
-
-                    commit_data = {
-                        "sha": commit.sha,
-                        "commit": {
-                            "author": {
-                                "name": commit.commit.author.name if commit.commit.author else username,
-                                "date": commit.commit.author.date.isoformat() if commit.commit.author and commit.commit.author.date else None,
-                            },
-                            "message": commit.commit.message if commit.commit else "",
-                        },
-                        "stats": {
-                            "total": files_count,
-                            "additions": additions,
-                            "deletions": deletions,
-                        },
-                        "repo": repo_name,
-                    }
-                    commits_with_stats.append(commit_data)
-
-                    # Log progress every 10 commits
-                    if (i + 1) % 10 == 0:
-                        self.logger.debug(f"  Processed {i + 1}/{max_commits} commits for {repo_name}")
+        new_commits = [records[commit.sha] for commit in listed if commit.sha in records]
+
+        metadata = self._build_repo_metadata(username, repo_name, repo_pushed_at, "commits_stats")
+        if known_sha is not None:
+            # Cached commits listed before the matched one are no longer on the
+            # branch (rewritten history); keep only the matched commit onwards
+            matched = next(i for i, commit in enumerate(prior_commits) if commit.get("sha") == known_sha)
+            commits_with_stats = (new_commits + prior_commits[matched:])[:max_commits]
+            metadata["incremental_from"] = prior_week
+            self.logger.info(
+                f"Fetched {len(new_commits)} new commits with stats for {repo_name} "
+                f"({len(commits_with_stats) - len(new_commits)} reused from cache)"
+            )
+        else:
+            # No cached history, or it was rewritten (force push): full fetch
+            commits_with_stats = new_commits
+            self.logger.info(f"Fetched {len(commits_with_stats)} commits with stats for {repo_name}")
+        metadata["new_commits"] = len(new_commits)
 
+        self.cache.set("commits_stats", username, commits_with_stats, repo=repo_name, week=push_key, metadata=metadata)
+        self.cache.delete("commits_stats_partial", username, repo=repo_name, week=push_key)
+        return commits_with_stats
+
+    def _list_new_commits(self, repo: Any, known_shas: set, max_commits: int) -> tuple[List[Any], Optional[str]]:
+        """Stage 1: list commits newer than the cached history (no per-commit requests).
+
+        Returns:
+            Tuple of (listed commits newest first, the first cached SHA reached or None)
+        """
+        listed = []
+        # Get commits - do not filter by author here as GitHub API's author parameter is flaky
+        for commit in self._paginate(repo.get_commits()):
+            if commit.sha in known_shas:
+                # Everything from here on is already cached
+                return listed, commit.sha
+            if len(listed) >= max_commits:
+                break
+            listed.append(commit)
+        return listed, None
+
+    def _fetch_commit_details(
+        self,
+        username: str,
+        repo_name: str,
+        listed: List[Any],
+        records: Dict[str, Dict[str, Any]],
+        push_key: str,
+    ) -> None:
+        """Stage 2: fetch per-commit stats, concurrently when configured.
+
+        Completed records are added to ``records`` (keyed by SHA) as they
+        arrive and checkpointed every COMMIT_CHECKPOINT_INTERVAL commits.
+        """
+        todo = [commit for commit in listed if commit.sha not in records]
+        total = len(listed)
+        if records:
+            self.logger.info(f"Resuming {repo_name}: {total - len(todo)}/{total} commits already fetched")
+        if not todo:
+            return
+
+        record_done = self._commit_progress(username, repo_name, records, push_key, total, total - len(todo))
+
+        if self.commit_stats_workers <= 1 or len(todo) == 1:
+            for commit in todo:
+                # Each commit's stats is a separate request
+                self.governor.acquire()
+                try:
+                    record = self._commit_stats_record(commit, username, repo_name)
                 except GithubException as e:
-                    self.logger.warning(f"Failed to fetch stats for commit {commit.sha}: {e}")
-                    continue
+                    self.logger.warn(f"Failed to fetch stats for commit {commit.sha}: {e}")
+                    record = None
+                record_done(commit.sha, record)
+            return
+
+        pool = ThreadPoolExecutor(max_workers=self.commit_stats_workers, thread_name_prefix="commit-stats")
+        futures = {
+            pool.submit(self._fetch_commit_detail, username, repo_name, commit.sha): commit.sha
+            for commit in todo
+        }
+        try:
+            for future in as_completed(futures):
+                sha = futures[future]
+                try:
+                    record = future.result()
+                except GithubException as e:
+                    self.logger.warn(f"Failed to fetch stats for commit {sha}: {e}")
+                    record = None
+                record_done(sha, record)
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def _commit_progress(
+        self,
+        username: str,
+        repo_name: str,
+        records: Dict[str, Dict[str, Any]],
+        push_key: str,
+        total: int,
+        completed: int,
+    ) -> Callable[[str, Optional[Dict[str, Any]]], None]:
+        """Return a callback recording one finished commit.
+
+        The callback stores the record, logs progress and checkpoints every
+        COMMIT_CHECKPOINT_INTERVAL commits.
+        """
+        def record_done(sha: str, record: Optional[Dict[str, Any]]) -> None:
+            nonlocal completed
+            completed += 1
+            if record is not None:
+                records[sha] = record
+            if completed % COMMIT_CHECKPOINT_INTERVAL == 0 or completed == total:
+                self.logger.info(f"  Commit stats for {repo_name}: {completed}/{total} ({completed * 100 // total}%)")
+                if completed < total:
+                    self._save_commit_checkpoint(username, repo_name, push_key, records)
+
+        return record_done
+
+    def _fetch_commit_detail(self, username: str, repo_name: str, sha: str) -> Dict[str, Any]:
+        """Fetch one commit with stats using the calling thread's client."""
+        client = self._thread_client()
+        repo = self.repo_handles.get(client, username, repo_name)
+        commit = self.governor.call(repo.get_commit, sha)
+        return self._commit_stats_record(commit, username, repo_name)
+
+    def _thread_client(self) -> Github:
+        """PyGithub client for the current thread (clients are not thread-safe)."""
+        if threading.current_thread() is threading.main_thread():
+            return self.github
+        client = getattr(self._thread_state, "client", None)
+        if client is None:
+            client = self.create_client()
+            self._thread_state.client = client
+        return client
+
+    def _load_commit_checkpoint(self, username: str, repo_name: str, push_key: str) -> Dict[str, Dict[str, Any]]:
+        """Load commit records saved by an interrupted fetch for this push."""
+        partial = self.cache.get("commits_stats_partial", username, repo=repo_name, week=push_key) or []
+        return {record["sha"]: record for record in partial if record.get("sha")}
+
+    def _save_commit_checkpoint(
+        self, username: str, repo_name: str, push_key: str, records: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Persist completed commit records so a failed run can resume."""
+        if not records:
+            return
+        try:
+            self.cache.set(
+                "commits_stats_partial",
+                username,
+                list(records.values()),
+                repo=repo_name,
+                week=push_key,
+                metadata={"repository": {"owner": username, "name": repo_name}, "category": "commits_stats_partial"},
+            )
+        except Exception as e:
+            self.logger.warn(f"Could not checkpoint commit stats for {repo_name}: {e}")
 
-            self.logger.info(f"Fetched {len(commits_with_stats)} commits with stats for {repo_name}")
-            metadata = self._build_repo_metadata(username, repo_name, repo_pushed_at, "commits_stats")
-            self.cache.set("commits_stats", username, commits_with_stats, repo=repo_name, week=push_key, metadata=metadata)
-            return commits_with_stats
+    def _latest_commit_stats(
+        self, username: str, repo_name: str, exclude_week: Optional[str] = None
+    ) -> tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return the most recent cached commits_stats list and its week key.
 
-        except GithubException as e:
-            self.logger.error(f"Could not fetch commit stats for {repo_name}: {e}")
-            return []
+        Args:
+            username: Repository owner username
+            repo_name: Repository name
+            exclude_week: Week key to ignore (the one being written)
+
+        Returns:
+            Tuple of (commits, week); ([], None) when nothing usable is cached
+        """
+        entry = self.cache.get_entry_info("commits_stats", username, repo=repo_name) or {}
+        for week in entry.get("weeks", []):
+            if week == exclude_week:
+                continue
+            commits = self.cache.get("commits_stats", username, repo=repo_name, week=week)
+            if commits:
+                return commits, week
+        return [], None
+
+    def _commit_stats_record(self, commit: Any, username: str, repo_name: str) -> Dict[str, Any]:
+        """Build the cached commits_stats record for one commit.
+
+        Accessing ``commit.stats`` completes the commit (one API request).
+        """
+        # Fetch detailed commit data with stats
+        # Note: commit.stats may be None for some commits
+        files_count = 0
+        additions = 0
+        deletions = 0
+
+        stats = getattr(commit, 'stats', None)
+        if stats:
+            additions = stats.additions
+            deletions = stats.deletions
+            # Files count is the sum of changed files
+            files_count = stats.total if hasattr(stats, 'total') else 0
+
+        return {
+            "sha": commit.sha,
+            "commit": {
+                "author": {
+                    "name": commit.commit.author.name if commit.commit.author else username,
+                    "date": commit.commit.author.date.isoformat() if commit.commit.author and commit.commit.author.date else None,
+                },
+                "message": commit.commit.message if commit.commit else "",
+            },
+            "stats": {
+                "total": files_count,
+                "additions": additions,
+                "deletions": deletions,
+            },
+            "repo": repo_name,
+        }
 
     def fetch_languages(self, username: str, repo_name: str, repo_pushed_at: Optional[datetime] = None) -> Dict[str, int]:
         """Fetch language statistics for a repository.
@@ -388,7 +708,7 @@ class GitHubFetcher:
             return cached
 
         try:
-            repo = self.github.get_repo(f"{username}/{repo_name}")
+            repo = self._get_repo(username, repo_name)
             languages = repo.get_languages()
 
             # Cache writes now handled by CacheManager
@@ -416,7 +736,7 @@ class GitHubFetcher:
             return cached
 
         try:
-            repo = self.github.get_repo(f"{username}/{repo_name}")
+            repo = self._get_repo(username, repo_name)
             readme = repo.get_readme()
             
             # Decode content from base64
@@ -435,7 +755,9 @@ class GitHubFetcher:
     def fetch_dependency_files(self, username: str, repo_name: str, repo_pushed_at: Optional[datetime] = None) -> Dict[str, str]:
         """Fetch dependency files from a repository.
 
-        Looks for common dependency files like package.json, requirements.txt, etc.
+        Lists the repository tree once and downloads every dependency manifest
+        (package.json, requirements.txt, nested *.csproj, ...). Manifests whose
+        blob SHA matches an earlier cached entry are not downloaded again.
 
         Args:
             username: Repository owner username
@@ -443,7 +765,7 @@ class GitHubFetcher:
             repo_pushed_at: Last push date (for cache invalidation)
 
         Returns:
-            Dictionary mapping filename to file content
+            Dictionary mapping manifest path to file content
         """
         # Use pushed_at hash for cache key (change-based invalidation, not time-based)
         push_key = sanitize_timestamp_for_filename(repo_pushed_at)
@@ -451,45 +773,10 @@ class GitHubFetcher:
         if cached is not None:
             return cached
 
-        dependency_files = {}
-        
-        # Common dependency file names to look for
-        target_files = [
-            "package.json",           # npm/JavaScript
-            "requirements.txt",       # pip/Python
-            "pyproject.toml",         # Python poetry/modern
-            "Gemfile",                # Ruby
-            "go.mod",                 # Go
-            "pom.xml",                # Maven/Java
-            "*.csproj",               # .NET C#
-            "Cargo.toml",             # Rust
-            "composer.json",          # PHP
-        ]
-
         try:
-            repo = self.github.get_repo(f"{username}/{repo_name}")
-            
-            # Try to get each file
-            for filename in target_files:
-                try:
-                    if "*" in filename:
-                        # Handle wildcard patterns like *.csproj
-                        contents = repo.get_contents("")
-                        pattern = filename.replace("*", "")
-                        for item in contents:
-                            if item.name.endswith(pattern):
-                                content = item.decoded_content.decode('utf-8')
-                                dependency_files[item.name] = content
-                    else:
-                        file_content = repo.get_contents(filename)
-                        content = file_content.decoded_content.decode('utf-8')
-                        dependency_files[filename] = content
-                except GithubException:
-                    # File doesn't exist, continue
-                    continue
-                except Exception as e:
-                    self.logger.debug(f"Error fetching {filename} from {repo_name}: {e}")
-                    continue
+            repo = self._get_repo(username, repo_name)
+            known_blobs = cached_blob_contents(self.cache, username, repo_name, exclude_week=push_key)
+            dependency_files = self.dependency_discovery.discover(repo, known_blobs).files
 
             # Cache writes now handled by CacheManager
             return dependency_files
@@ -527,63 +814,8 @@ class GitHubFetcher:
             return cached
 
         try:
-            repo = self.github.get_repo(f"{username}/{repo_name}")
-
-            # Use timezone-aware datetime to match GitHub API
-            from datetime import timedelta, timezone
-            now = datetime.now(timezone.utc)
-
-            # Calculate time window boundaries
-            day_90_ago = now - timedelta(days=90)
-            day_180_ago = now - timedelta(days=180)
-            day_365_ago = now - timedelta(days=365)
-
-            # Fetch commits and count by time window
-            total_commits = 0
-            commits_90d = 0
-            commits_180d = 0
-            commits_365d = 0
-            last_commit_date = None
-
-            # Note: We limit to 1000 commits to stay within API limits
-            # For repos with >1000 commits, this gives us a representative sample
-            commits = repo.get_commits()
-
-            for commit in commits:
-                # Stop after 1000 commits to avoid rate limits
-                if total_commits >= 1000:
-                    break
-
-                total_commits += 1
-
-                # Safely access commit author date
-                try:
-                    commit_date = commit.commit.author.date if commit.commit and commit.commit.author else None
-                except (AttributeError, IndexError):
-                    continue
-
-                if not commit_date:
-                    continue
-
-                # Track most recent commit
-                if not last_commit_date or commit_date > last_commit_date:
-                    last_commit_date = commit_date
-
-                # Count in time windows
-                if commit_date >= day_90_ago:
-                    commits_90d += 1
-                if commit_date >= day_180_ago:
-                    commits_180d += 1
-                if commit_date >= day_365_ago:
-                    commits_365d += 1
-
-            result = {
-                "total": total_commits,
-                "recent_90d": commits_90d,
-                "recent_180d": commits_180d,
-                "recent_365d": commits_365d,
-                "last_commit_date": last_commit_date.isoformat() if last_commit_date else None,
-            }
+            repo = self._get_repo(username, repo_name)
+            result = self.commit_counter.count(repo)
 
             # Cache writes now handled by CacheManager
             return result
@@ -599,10 +831,14 @@ class GitHubFetcher:
             }
 
     def handle_rate_limit(self, max_retries: int = 3) -> None:
-        """Handle rate limiting with exponential backoff.
+        """Refresh the shared rate governor from /rate_limit and wait if needed.
+
+        Pacing normally happens per request through the governor; this
+        re-synchronizes the core budget (e.g. after another tool used quota)
+        and blocks until at least one request is allowed.
 
         Args:
-            max_retries: Maximum number of retry attempts
+            max_retries: Maximum number of retry attempts (kept for compatibility)
         """
         rate_limit = self.github.get_rate_limit()
 
@@ -612,14 +848,10 @@ class GitHubFetcher:
         else:
             core_rate = rate_limit.resources.core
 
-        if core_rate.remaining == 0:
-            reset_time = core_rate.reset
-            sleep_time = (reset_time - datetime.now()).total_seconds() + 10
-
-            self.logger.warn(
-                f"Rate limit exceeded. Sleeping for {sleep_time:.0f} seconds until reset."
-            )
-            time.sleep(sleep_time)
+        self.governor.observe_core(core_rate.remaining, core_rate.limit, core_rate.reset)
+        waited = self.governor.acquire()
+        if waited:
+            self.logger.warn(f"Rate limit budget exhausted, waited {waited:.0f} seconds")
 
     def get_rate_limit_status(self) -> Dict[str, Any]:
         """Get current rate limit status.
@@ -642,3 +874,77 @@ class GitHubFetcher:
             "reset": core_rate.reset.isoformat(),
             "used": core_rate.limit - core_rate.remaining,
         }
+
+
+def create_fetcher(backend: str = "sync", async_concurrency: int = 16, **kwargs: Any) -> GitHubFetcher:
+    """Create the fetcher selected by the ``fetcher.backend`` setting.
+
+    Args:
+        backend: "sync" for PyGithub, or "async" for AsyncGitHubFetcher
+            (concurrent requests over httpx)
+        async_concurrency: Requests in flight at once with the async backend
+        **kwargs: GitHubFetcher constructor arguments
+
+    Raises:
+        ValueError: For an unknown backend
+        RuntimeError: If the async backend is selected but httpx is missing
+    """
+    if backend not in FETCH_BACKENDS:
+        raise ValueError(f"Unknown fetcher backend '{backend}' (expected one of {', '.join(FETCH_BACKENDS)})")
+    if backend == "async":
+        from spark.async_fetcher import AsyncGitHubFetcher
+
+        return AsyncGitHubFetcher(concurrency=async_concurrency, **kwargs)
+    return GitHubFetcher(**kwargs)
+
+
+def _iso_timestamp(value: Optional[str]) -> Optional[str]:
+    """Normalize a GitHub timestamp ("...Z") to isoformat with +00:00."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        return value
+
+
+def _profile_from_api(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the cached user profile dict from a /users/{username} response."""
+    return {
+        "login": raw.get("login"),
+        "username": raw.get("login"),
+        "name": raw.get("name") or raw.get("login"),
+        "bio": raw.get("bio"),
+        "company": raw.get("company"),
+        "location": raw.get("location"),
+        "email": raw.get("email"),
+        "avatar_url": raw.get("avatar_url"),
+        "html_url": raw.get("html_url"),
+        "public_repos": raw.get("public_repos"),
+        "followers": raw.get("followers"),
+        "following": raw.get("following"),
+        "created_at": _iso_timestamp(raw.get("created_at")),
+        "updated_at": _iso_timestamp(raw.get("updated_at")),
+    }
+
+
+def _repository_from_api(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a repository dict from a /users/{username}/repos entry."""
+    return {
+        "name": raw.get("name"),
+        "full_name": raw.get("full_name"),
+        "description": raw.get("description"),
+        "language": raw.get("language"),
+        "stars": raw.get("stargazers_count", 0),
+        "forks": raw.get("forks_count", 0),
+        "watchers": raw.get("watchers_count", 0),
+        "size": raw.get("size", 0),
+        "created_at": _iso_timestamp(raw.get("created_at")),
+        "updated_at": _iso_timestamp(raw.get("updated_at")),
+        "pushed_at": _iso_timestamp(raw.get("pushed_at")),
+        "is_fork": raw.get("fork", False),
+        "is_private": raw.get("private", False),
+        "is_archived": raw.get("archived", False),
+        "homepage": raw.get("homepage"),  # Custom website URL from repo settings
+        "has_pages": raw.get("has_pages", False),  # GitHub Pages enabled
+    }
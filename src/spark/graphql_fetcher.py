@@ -0,0 +1,347 @@
+"""Batched GitHub GraphQL fetching for repository-scoped cache categories.
+
+The REST path in ``GitHubFetcher``/``CacheManager`` resolves every repository
+individually and then issues one or more requests per cache category. This
+module pulls the same information for many repositories in a single GraphQL
+query and writes it into the regular ``APICache`` categories so the rest of
+the pipeline reads it exactly as if it had come from REST:
+
+- ``languages``: language byte counts
+- ``readme``: README blob text ("" when the repository has no README)
+- ``commit_counts``: default-branch totals and 90/180/365-day windows
+- ``quality_indicators``: license, workflow, tests and docs presence
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from spark.cache import APICache
+from spark.logger import get_logger
+from spark.rate_limit import get_rate_governor
+from spark.time_utils import sanitize_timestamp_for_filename
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Categories this fetcher can populate
+GRAPHQL_CATEGORIES = ("languages", "readme", "commit_counts", "quality_indicators")
+
+# README file names probed via object(expression:) in each query
+README_CANDIDATES = (
+    "README.md",
+    "readme.md",
+    "Readme.md",
+    "README",
+    "README.rst",
+    "README.txt",
+    "README.markdown",
+)
+
+TEST_DIRS = {"test", "tests", "spec", "specs", "__tests__"}
+DOC_DIRS = {"docs", "doc", "documentation"}
+DOC_FILES = {"contributing.md", "changelog.md"}
+
+_REPOSITORY_FIELDS = """
+    name
+    languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+      edges { size node { name } }
+    }
+    licenseInfo { spdxId }
+    workflows: object(expression: "HEAD:.github/workflows") {
+      ... on Tree { entries { name } }
+    }
+    rootTree: object(expression: "HEAD:") {
+      ... on Tree { entries { name type } }
+    }
+%(readme_fields)s
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: 1) { totalCount nodes { author { date } } }
+          recent90: history(since: $since90) { totalCount }
+          recent180: history(since: $since180) { totalCount }
+          recent365: history(since: $since365) { totalCount }
+        }
+      }
+    }
+"""
+
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL request fails as a whole."""
+
+
+class GraphQLBatchFetcher:
+    """Fetches repository data for many repositories per GraphQL query."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        cache: Optional[APICache] = None,
+        batch_size: int = 50,
+        session: Optional[Any] = None,
+        endpoint: str = GRAPHQL_URL,
+        clock: Optional[Callable[[], datetime]] = None,
+    ):
+        """Initialize the GraphQL batch fetcher.
+
+        Args:
+            token: GitHub Personal Access Token (uses GITHUB_TOKEN env var if not provided)
+            cache: API cache instance (creates new if not provided)
+            batch_size: Repositories per query (clamped to 1-100)
+            session: Object with a requests-compatible ``post`` method; tests pass
+                a recorded-response stand-in here
+            endpoint: GraphQL endpoint URL
+            clock: Callable returning the current UTC time (for window boundaries)
+        """
+        self.logger = get_logger()
+        self.token = token or os.getenv("GITHUB_TOKEN")
+        self.cache = cache or APICache()
+        self.batch_size = max(1, min(100, int(batch_size)))
+        self.session = session or requests.Session()
+        self.endpoint = endpoint
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.governor = get_rate_governor()
+        self.queries_made = 0
+
+    def build_query(self, repo_count: int) -> str:
+        """Build an aliased query covering ``repo_count`` repositories."""
+        readme_fields = "\n".join(
+            f'    readme{i}: object(expression: "HEAD:{name}") {{ ... on Blob {{ text isBinary }} }}'
+            for i, name in enumerate(README_CANDIDATES)
+        )
+        fields = _REPOSITORY_FIELDS % {"readme_fields": readme_fields}
+
+        params = ["$owner: String!", "$since90: GitTimestamp!", "$since180: GitTimestamp!", "$since365: GitTimestamp!"]
+        params.extend(f"$name{i}: String!" for i in range(repo_count))
+
+        blocks = [
+            f"  repo{i}: repository(owner: $owner, name: $name{i}) {{{fields}  }}"
+            for i in range(repo_count)
+        ]
+        return "query(" + ", ".join(params) + ") {\n" + "\n".join(blocks) + "\n  rateLimit { cost remaining resetAt }\n}"
+
+    def fetch_batch(self, owner: str, repo_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch all GraphQL-backed categories for a batch of repositories.
+
+        Args:
+            owner: Repository owner
+            repo_names: Repository names (at most ``batch_size``)
+
+        Returns:
+            Dict mapping repository name to a dict of category -> value. Categories
+            that could not be determined reliably are omitted so the REST refresh
+            can fill them in.
+        """
+        if not repo_names:
+            return {}
+
+        now = self.clock()
+        variables: Dict[str, Any] = {
+            "owner": owner,
+            "since90": (now - timedelta(days=90)).isoformat(),
+            "since180": (now - timedelta(days=180)).isoformat(),
+            "since365": (now - timedelta(days=365)).isoformat(),
+        }
+        for i, name in enumerate(repo_names):
+            variables[f"name{i}"] = name
+
+        payload = self._post({"query": self.build_query(len(repo_names)), "variables": variables})
+        data = payload.get("data") or {}
+
+        for error in payload.get("errors") or []:
+            self.logger.debug(f"GraphQL error: {error.get('message')}")
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for i, name in enumerate(repo_names):
+            node = data.get(f"repo{i}")
+            if not node:
+                continue
+            results[name] = self._parse_repository(node)
+        return results
+
+    def prefetch(self, username: str, repos: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Populate cache categories for repositories missing them.
+
+        Only (repository, category) pairs without a cache entry for the
+        repository's current ``pushed_at`` key are written.
+
+        Args:
+            username: Repository owner
+            repos: Repository dicts with ``name`` and ``pushed_at``
+
+        Returns:
+            Dict mapping category name to the number of entries written
+        """
+        written = {category: 0 for category in GRAPHQL_CATEGORIES}
+        pending = []
+        for repo in repos:
+            pushed_at = _parse_timestamp(repo.get("pushed_at"))
+            if not pushed_at:
+                continue
+            cache_key = sanitize_timestamp_for_filename(pushed_at)
+            missing = [
+                category for category in GRAPHQL_CATEGORIES
+                if not self.cache.has_entry(category, username, repo=repo["name"], week=cache_key)
+            ]
+            if missing:
+                pending.append((repo["name"], pushed_at, cache_key, missing))
+
+        if not pending:
+            return written
+
+        self.logger.info(
+            f"GraphQL prefetch: {len(pending)} repositories in batches of {self.batch_size}"
+        )
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            try:
+                results = self.fetch_batch(username, [name for name, _, _, _ in batch])
+            except (GraphQLError, requests.RequestException) as e:
+                self.logger.warn(f"GraphQL batch failed, falling back to REST for {len(batch)} repositories: {e}")
+                continue
+
+            for name, pushed_at, cache_key, missing in batch:
+                repo_result = results.get(name, {})
+                for category in missing:
+                    if category not in repo_result:
+                        continue
+                    metadata = {
+                        "repository": {"owner": username, "name": name},
+                        "category": category,
+                        "pushed_at": pushed_at.isoformat(),
+                        "ttl_enforced": False,
+                        "source": "graphql",
+                    }
+                    self.cache.set(category, username, repo_result[category], repo=name, week=cache_key, metadata=metadata)
+                    written[category] += 1
+
+        self.logger.info(
+            "GraphQL prefetch wrote "
+            + ", ".join(f"{category}={count}" for category, count in written.items())
+            + f" ({self.queries_made} queries)"
+        )
+        return written
+
+    def _post(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a GraphQL request and return the decoded JSON body."""
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"bearer {self.token}"
+
+        self.governor.acquire(resource="graphql")
+        response = self.session.post(self.endpoint, json=body, headers=headers, timeout=30)
+        self.queries_made += 1
+        self.governor.observe_headers(
+            response.headers,
+            status=response.status_code,
+            message=response.text if response.status_code in (403, 429) else "",
+        )
+        if response.status_code != 200:
+            raise GraphQLError(f"GraphQL request failed with status {response.status_code}")
+
+        payload = response.json()
+        if not payload.get("data") and payload.get("errors"):
+            raise GraphQLError(payload["errors"][0].get("message", "unknown GraphQL error"))
+        return payload
+
+    def _parse_repository(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert one repository node into cache category values."""
+        result: Dict[str, Any] = {}
+
+        edges = (node.get("languages") or {}).get("edges") or []
+        result["languages"] = {edge["node"]["name"]: edge["size"] for edge in edges}
+
+        root_entries = ((node.get("rootTree") or {}).get("entries")) or []
+
+        readme = self._parse_readme(node, root_entries)
+        if readme is not None:
+            result["readme"] = readme
+
+        commit_counts = self._parse_commit_counts(node)
+        if commit_counts is not None:
+            result["commit_counts"] = commit_counts
+
+        workflow_entries = ((node.get("workflows") or {}).get("entries")) or []
+        has_tests = False
+        has_docs = False
+        for entry in root_entries:
+            name_lower = entry.get("name", "").lower()
+            if entry.get("type") == "tree":
+                has_tests = has_tests or name_lower in TEST_DIRS
+                has_docs = has_docs or name_lower in DOC_DIRS
+            elif entry.get("type") == "blob" and name_lower in DOC_FILES:
+                has_docs = True
+
+        result["quality_indicators"] = {
+            "has_license": node.get("licenseInfo") is not None,
+            "has_ci_cd": any(
+                entry.get("name", "").endswith((".yml", ".yaml")) for entry in workflow_entries
+            ),
+            "has_tests": has_tests,
+            "has_docs": has_docs,
+        }
+        return result
+
+    @staticmethod
+    def _parse_readme(node: Dict[str, Any], root_entries: List[Dict[str, Any]]) -> Optional[str]:
+        """Return README text, "" when absent, or None when undetermined."""
+        for i in range(len(README_CANDIDATES)):
+            blob = node.get(f"readme{i}")
+            if blob and not blob.get("isBinary") and blob.get("text") is not None:
+                return blob["text"]
+
+        has_readme_like = any(
+            entry.get("type") == "blob" and entry.get("name", "").lower().startswith("readme")
+            for entry in root_entries
+        )
+        if has_readme_like or not root_entries:
+            # README under a name we did not probe (or empty repository): let REST decide
+            return None
+        return ""
+
+    @staticmethod
+    def _parse_commit_counts(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build the commit_counts dict from default branch history totals."""
+        target = ((node.get("defaultBranchRef") or {}).get("target")) or {}
+        history = target.get("history")
+        if history is None:
+            if node.get("defaultBranchRef") is None:
+                # Empty repository, matches the REST result for no commits
+                return {
+                    "total": 0,
+                    "recent_90d": 0,
+                    "recent_180d": 0,
+                    "recent_365d": 0,
+                    "last_commit_date": None,
+                }
+            return None
+
+        last_commit_date = None
+        nodes = history.get("nodes") or []
+        if nodes and (nodes[0].get("author") or {}).get("date"):
+            last_commit_date = _parse_timestamp(nodes[0]["author"]["date"])
+
+        return {
+            "total": history.get("totalCount", 0),
+            "recent_90d": (target.get("recent90") or {}).get("totalCount", 0),
+            "recent_180d": (target.get("recent180") or {}).get("totalCount", 0),
+            "recent_365d": (target.get("recent365") or {}).get("totalCount", 0),
+            "last_commit_date": last_commit_date.isoformat() if last_commit_date else None,
+        }
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp (with Z or offset suffix) into an aware datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
@@ -0,0 +1,218 @@
+"""Streaming, atomic writer for top-level JSON objects such as repositories.json.
+
+Sections (top-level keys) are written in order. A list, tuple or iterator
+value is written one element at a time, so records can be emitted while they
+are being produced. The indented output is byte-identical to
+``json.dump(data, f, indent=2, ensure_ascii=False)``.
+
+Optional variants for the static site are written in the same pass:
+``minified`` (``<stem>.min.json``), ``gzip`` (``<stem>.min.json.gz``) and
+``brotli`` (``<stem>.min.json.br``, optional ``brotli`` package). Every file
+goes to a temporary file first and replaces its target only after all files
+were written.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+JSON_VARIANTS = ("minified", "gzip", "brotli")
+
+
+@dataclass
+class JsonWriteStats:
+    """Bytes written by write_json."""
+    path: Path
+    bytes: int
+    sections: Dict[str, int]  # Indented bytes per top-level key
+    variants: Dict[str, int] = field(default_factory=dict)  # Variant file name -> bytes
+    items: Dict[str, int] = field(default_factory=dict)  # Elements streamed per array section
+
+
+def variant_paths(path: Path, variants: Sequence[str]) -> Dict[str, Path]:
+    """Target path of each requested variant."""
+    unknown = [name for name in variants if name not in JSON_VARIANTS]
+    if unknown:
+        raise ValueError(
+            f"Unknown JSON variant(s) {', '.join(unknown)} (expected: {', '.join(JSON_VARIANTS)})"
+        )
+    minified = path.with_name(f"{path.stem}.min{path.suffix}")
+    suffixes = {"minified": "", "gzip": ".gz", "brotli": ".br"}
+    return {name: minified.with_name(minified.name + suffixes[name]) for name in variants}
+
+
+class _Sink:
+    """Temporary file that replaces ``target`` on commit, optionally compressed."""
+
+    def __init__(self, target: Path, compression: Optional[str] = None):
+        self.target = target
+        self.bytes = 0
+        self._handle = tempfile.NamedTemporaryFile("wb", delete=False, dir=target.parent, suffix=".tmp")
+        self._gzip = None
+        self._brotli = None
+        if compression == "gzip":
+            # mtime=0 keeps the output reproducible across runs
+            self._gzip = gzip.GzipFile(fileobj=self._handle, mode="wb", compresslevel=9, mtime=0)
+        elif compression == "brotli":
+            try:
+                import brotli
+            except ImportError:
+                self.discard()
+                raise RuntimeError(
+                    "The brotli package is required for the brotli JSON variant. Install with:\n"
+                    "  pip install brotli"
+                ) from None
+            self._brotli = brotli.Compressor(quality=11)
+
+    def write(self, data: bytes) -> None:
+        if self._gzip is not None:
+            self._gzip.write(data)
+        elif self._brotli is not None:
+            self._raw(self._brotli.process(data))
+        else:
+            self._raw(data)
+
+    def _raw(self, data: bytes) -> None:
+        self._handle.write(data)
+        self.bytes += len(data)
+
+    def close(self) -> None:
+        if self._gzip is not None:
+            self._gzip.close()
+            self.bytes = self._handle.tell()
+        elif self._brotli is not None:
+            self._raw(self._brotli.finish())
+        self._handle.close()
+
+    def commit(self) -> None:
+        # Temporary files are created private; outputs are published files
+        os.chmod(self._handle.name, 0o644)
+        os.replace(self._handle.name, self.target)
+
+    def discard(self) -> None:
+        self._handle.close()
+        if os.path.exists(self._handle.name):
+            os.remove(self._handle.name)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a temporary file and rename."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sink = _Sink(path)
+    try:
+        sink.write(data)
+        sink.close()
+    except BaseException:
+        sink.discard()
+        raise
+    sink.commit()
+
+
+def _is_stream(value: Any) -> bool:
+    return isinstance(value, (list, tuple, Iterator))
+
+
+def _indent(text: str, prefix: str) -> str:
+    # JSON strings never contain raw newlines, so every newline is structural
+    return text.replace("\n", "\n" + prefix)
+
+
+def write_json(
+    path: Path,
+    sections: Mapping[str, Any],
+    variants: Sequence[str] = (),
+) -> JsonWriteStats:
+    """Write ``sections`` as one JSON object, plus the requested variants.
+
+    Args:
+        path: Target file (indented JSON)
+        sections: Top-level keys in output order; list, tuple and iterator
+            values are streamed element by element
+        variants: Any of JSON_VARIANTS
+
+    Returns:
+        JsonWriteStats
+
+    Raises:
+        ValueError: For an unknown variant
+        RuntimeError: If the brotli variant is requested but brotli is missing
+    """
+    path = Path(path)
+    targets = variant_paths(path, variants)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    pretty = _Sink(path)
+    compact: List[_Sink] = []
+    try:
+        for name, target in targets.items():
+            compact.append(_Sink(target, None if name == "minified" else name))
+    except Exception:
+        for sink in [pretty, *compact]:
+            sink.discard()
+        raise
+    sinks = [pretty, *compact]
+
+    def emit(indented: str, minified: str) -> int:
+        data = indented.encode("utf-8")
+        pretty.write(data)
+        if compact:
+            compact_data = minified.encode("utf-8")
+            for sink in compact:
+                sink.write(compact_data)
+        return len(data)
+
+    section_bytes: Dict[str, int] = {}
+    items: Dict[str, int] = {}
+    try:
+        if not sections:
+            emit("{}", "{}")
+        for position, (key, value) in enumerate(sections.items()):
+            first = position == 0
+            head = json.dumps(key, ensure_ascii=False)
+            written = emit(
+                ("{\n  " if first else ",\n  ") + head + ": ",
+                ("{" if first else ",") + head + ":",
+            )
+            if _is_stream(value):
+                count = 0
+                for element in value:
+                    written += emit(
+                        ("[\n    " if count == 0 else ",\n    ")
+                        + _indent(json.dumps(element, indent=2, ensure_ascii=False), "    "),
+                        ("[" if count == 0 else ",")
+                        + json.dumps(element, separators=(",", ":"), ensure_ascii=False),
+                    )
+                    count += 1
+                written += emit("\n  ]" if count else "[]", "]" if count else "[]")
+                items[key] = count
+            else:
+                written += emit(
+                    _indent(json.dumps(value, indent=2, ensure_ascii=False), "  "),
+                    json.dumps(value, separators=(",", ":"), ensure_ascii=False),
+                )
+            section_bytes[key] = written
+        if sections:
+            emit("\n}", "}")
+        for sink in sinks:
+            sink.close()
+    except BaseException:
+        for sink in sinks:
+            sink.discard()
+        raise
+
+    for sink in compact:
+        sink.commit()
+    pretty.commit()
+    return JsonWriteStats(
+        path=path,
+        bytes=pretty.bytes,
+        sections=section_bytes,
+        variants={sink.target.name: sink.bytes for sink in compact},
+        items=items,
+    )
@@ -0,0 +1,425 @@
+"""Shared GitHub API rate-limit governor.
+
+Every GitHub call made by the fetcher, cache manager and refresh paths goes
+through one ``RateLimitGovernor``. It:
+
+- tracks the primary quota from ``X-RateLimit-*`` response headers (or a
+  PyGithub client's ``rate_limiting`` state) per resource (core, graphql, ...)
+- lets requests through unpaced while the planned demand (see ``plan``) fits
+  the remaining quota minus a reserve, or, with no plan, while the remaining
+  quota is well above the reserve
+- otherwise paces requests with a token bucket whose refill rate spreads the
+  remaining quota (minus the reserve) over the time left until reset, so the
+  quota is never exhausted mid-run
+- honors secondary/abuse limits: a ``Retry-After`` (or 403/429 secondary-limit
+  response) pauses every caller until the advised time has passed; other
+  403s (permissions, SSO) do not
+- projects whether a planned number of calls fits the remaining budget
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, Mapping, Optional, TypeVar
+
+from github import GithubException, RateLimitExceededException
+
+from spark.logger import get_logger
+
+T = TypeVar("T")
+
+# Default backoff for secondary limits without a Retry-After header (seconds)
+SECONDARY_LIMIT_BACKOFF = 60.0
+
+
+def is_rate_limit_response(status: Optional[int], headers: Mapping[str, Any], message: str = "") -> bool:
+    """Whether a 403/429 response is a rate limit rather than e.g. a permission error.
+
+    Args:
+        status: HTTP status code
+        headers: Response headers with lower-cased names
+        message: Error message or response body
+    """
+    if status not in (403, 429):
+        return False
+    message = message.lower()
+    return (
+        "retry-after" in headers
+        or str(headers.get("x-ratelimit-remaining")) == "0"
+        or "rate limit" in message
+        or "secondary" in message
+    )
+
+
+@dataclass
+class RateBudget:
+    """Last observed quota for one rate-limit resource."""
+
+    limit: int
+    remaining: int
+    reset_at: float  # Unix timestamp
+
+
+class RateLimitGovernor:
+    """Paces GitHub API calls against the observed rate-limit budget."""
+
+    def __init__(
+        self,
+        reserve: int = 50,
+        burst: int = 10,
+        max_retries: int = 3,
+        pace_below: float = 0.1,
+        clock: Optional[Callable[[], float]] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        """Initialize the governor.
+
+        Args:
+            reserve: Requests per resource kept back for other tools and retries
+            burst: Token bucket capacity (requests allowed back-to-back)
+            max_retries: Retries for a call rejected by a rate limit
+            pace_below: Without a plan, pace once the usable quota falls below
+                this fraction of the limit
+            clock: Callable returning the current Unix time
+            sleep: Callable used to wait (tests pass a fake)
+        """
+        self.logger = get_logger()
+        self.reserve = max(0, int(reserve))
+        self.burst = max(1, int(burst))
+        self.max_retries = max(0, int(max_retries))
+        self.pace_below = max(0.0, float(pace_below))
+        self.clock = clock or time.time
+        self.sleep = sleep or time.sleep
+
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, RateBudget] = {}
+        self._tokens: Dict[str, float] = {}
+        self._refilled_at: Dict[str, float] = {}
+        self._demand: Dict[str, int] = {}  # Planned calls not yet made
+        self._blocked_until = 0.0
+
+        self.calls = 0
+        self.throttled_seconds = 0.0
+        self.secondary_limit_hits = 0
+
+    # ------------------------------------------------------------------
+    # Observing quota
+    # ------------------------------------------------------------------
+
+    def observe_headers(
+        self, headers: Optional[Mapping[str, Any]], status: Optional[int] = None, message: str = ""
+    ) -> None:
+        """Update the budget from GitHub response headers.
+
+        Args:
+            headers: Response headers (case-insensitive lookup is applied)
+            status: HTTP status code, used to detect secondary limits
+            message: Error message or body of a 403/429 response; only a
+                rate-limit message (see is_rate_limit_response) backs off
+        """
+        if not headers:
+            return
+        lowered = {str(key).lower(): value for key, value in headers.items()}
+        resource = lowered.get("x-ratelimit-resource", "core")
+
+        try:
+            limit = int(lowered["x-ratelimit-limit"])
+            remaining = int(lowered["x-ratelimit-remaining"])
+            reset_at = float(lowered["x-ratelimit-reset"])
+        except (KeyError, TypeError, ValueError):
+            pass
+        else:
+            self._set_budget(resource, limit, remaining, reset_at)
+
+        retry_after = lowered.get("retry-after")
+        if retry_after is not None:
+            try:
+                self.block_for(float(retry_after))
+            except (TypeError, ValueError):
+                self.block_for(SECONDARY_LIMIT_BACKOFF)
+        elif (
+            is_rate_limit_response(status, lowered, message)
+            and str(lowered.get("x-ratelimit-remaining", "1")) != "0"
+        ):
+            # Secondary limit without advice: back off conservatively
+            self.block_for(SECONDARY_LIMIT_BACKOFF)
+
+    def observe_github(self, client: Any) -> None:
+        """Update the core budget from a PyGithub client's last response.
+
+        Only call this after the client has made a request; before that
+        PyGithub fetches ``/rate_limit`` to answer ``rate_limiting``.
+        """
+        try:
+            remaining, limit = client.rate_limiting
+            reset_at = float(client.rate_limiting_resettime)
+        except Exception:
+            return
+        if limit > 0:
+            self._set_budget("core", limit, remaining, reset_at)
+
+    def observe_core(self, remaining: int, limit: int, reset: datetime) -> None:
+        """Update the core budget from a ``/rate_limit`` response."""
+        if reset.tzinfo is None:
+            reset = reset.replace(tzinfo=timezone.utc)
+        self._set_budget("core", limit, remaining, reset.timestamp())
+
+    def block_for(self, seconds: float) -> None:
+        """Pause all callers for ``seconds`` (secondary limit / Retry-After)."""
+        with self._lock:
+            self.secondary_limit_hits += 1
+            self._blocked_until = max(self._blocked_until, self.clock() + max(0.0, seconds))
+        self.logger.warn(f"Secondary rate limit hit, pausing GitHub calls for {seconds:.0f}s")
+
+    def _set_budget(self, resource: str, limit: int, remaining: int, reset_at: float) -> None:
+        with self._lock:
+            self._budgets[resource] = RateBudget(limit=limit, remaining=remaining, reset_at=reset_at)
+
+    # ------------------------------------------------------------------
+    # Pacing
+    # ------------------------------------------------------------------
+
+    def plan(self, planned_calls: int, resource: str = "core") -> None:
+        """Announce ``planned_calls`` upcoming requests against ``resource``.
+
+        Requests pass unpaced while the calls still planned fit the usable
+        quota; the plan shrinks with every request and is dropped when used up.
+        """
+        with self._lock:
+            if planned_calls > 0:
+                self._demand[resource] = int(planned_calls)
+            else:
+                self._demand.pop(resource, None)
+
+    def acquire(self, resource: str = "core", cost: int = 1) -> float:
+        """Wait until ``cost`` requests may be sent against ``resource``.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self._reserve_tokens(resource, cost)
+            if delay <= 0:
+                break
+            self.sleep(delay)
+            waited += delay
+        if waited:
+            with self._lock:
+                self.throttled_seconds += waited
+        return waited
+
+    async def acquire_async(self, resource: str = "core", cost: int = 1) -> float:
+        """Asyncio variant of ``acquire``: waits without blocking the event loop."""
+        waited = 0.0
+        while True:
+            delay = self._reserve_tokens(resource, cost)
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+            waited += delay
+        if waited:
+            with self._lock:
+                self.throttled_seconds += waited
+        return waited
+
+    def _reserve_tokens(self, resource: str, cost: int) -> float:
+        """Consume tokens if available, otherwise return how long to wait."""
+        with self._lock:
+            now = self.clock()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+
+            budget = self._budgets.get(resource)
+            if budget is None:
+                # Nothing observed yet: let the first request through
+                self.calls += cost
+                return 0.0
+
+            seconds_left = max(budget.reset_at - now, 0.0)
+            if seconds_left <= 0:
+                # Window has reset since the last observation
+                budget.remaining = budget.limit
+                budget.reset_at = now + 3600
+                seconds_left = 3600.0
+
+            usable = budget.remaining - self.reserve
+            if usable < cost:
+                return seconds_left + 1.0
+
+            demand = self._demand.get(resource)
+            if demand is not None:
+                pace = demand > usable
+            else:
+                pace = usable < budget.limit * self.pace_below
+            if not pace:
+                # Start with a full bucket if pacing becomes necessary later
+                self._tokens[resource] = float(self.burst)
+                self._refilled_at[resource] = now
+                self._consume(resource, budget, cost)
+                return 0.0
+
+            rate = usable / max(seconds_left, 1.0)
+            tokens = self._tokens.get(resource, float(self.burst))
+            last = self._refilled_at.get(resource, now)
+            tokens = min(float(self.burst), tokens + (now - last) * rate)
+            self._refilled_at[resource] = now
+
+            if tokens < cost:
+                self._tokens[resource] = tokens
+                return (cost - tokens) / rate
+
+            self._tokens[resource] = tokens - cost
+            self._consume(resource, budget, cost)
+            return 0.0
+
+    def _consume(self, resource: str, budget: RateBudget, cost: int) -> None:
+        """Count ``cost`` requests as sent (caller holds the lock)."""
+        budget.remaining -= cost
+        self.calls += cost
+        demand = self._demand.get(resource)
+        if demand is not None:
+            if demand > cost:
+                self._demand[resource] = demand - cost
+            else:
+                del self._demand[resource]
+
+    def call(self, func: Callable[..., T], *args: Any, resource: str = "core", **kwargs: Any) -> T:
+        """Run ``func`` under the governor, retrying on rate-limit rejections.
+
+        Primary-limit errors wait for the reset time; secondary-limit errors
+        wait for ``Retry-After`` (or a conservative default).
+        """
+        attempt = 0
+        while True:
+            self.acquire(resource)
+            try:
+                return func(*args, **kwargs)
+            except GithubException as e:
+                if attempt >= self.max_retries or not self._handle_rejection(e):
+                    raise
+                attempt += 1
+
+    async def call_async(
+        self, func: Callable[..., Awaitable[T]], *args: Any, resource: str = "core", **kwargs: Any
+    ) -> T:
+        """Await ``func`` under the governor, retrying on rate-limit rejections."""
+        attempt = 0
+        while True:
+            await self.acquire_async(resource)
+            try:
+                return await func(*args, **kwargs)
+            except GithubException as e:
+                if attempt >= self.max_retries or not self._handle_rejection(e):
+                    raise
+                attempt += 1
+
+    def paginate(self, items: Iterable[T], client: Any = None, per_page: int = 30, resource: str = "core") -> Iterator[T]:
+        """Iterate a lazily paginated result, acquiring a token per page.
+
+        Args:
+            items: PyGithub PaginatedList (or any iterable fetched page by page)
+            client: PyGithub client whose quota state is observed after each page
+            per_page: Items per page (PyGithub default 30)
+        """
+        for index, item in enumerate(items):
+            if index and index % per_page == 0:
+                if client is not None:
+                    self.observe_github(client)
+                self.acquire(resource)
+            yield item
+
+    def _handle_rejection(self, error: GithubException) -> bool:
+        """Record a rate-limit rejection. Returns False for other errors."""
+        status = getattr(error, "status", None)
+        headers = getattr(error, "headers", None) or {}
+        if isinstance(error, RateLimitExceededException) or status in (403, 429):
+            lowered = {str(key).lower(): value for key, value in headers.items()}
+            message = str(getattr(error, "data", "") or "")
+            if isinstance(error, RateLimitExceededException):
+                # Always a rate limit, whatever the body says
+                message = "rate limit exceeded"
+            elif not is_rate_limit_response(status, lowered, message):
+                return False
+            self.observe_headers(headers, status=status, message=message)
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def projection(self, planned_calls: int, resource: str = "core") -> Dict[str, Any]:
+        """Project the budget after ``planned_calls`` requests.
+
+        Returns:
+            Dict with remaining, limit, reset_at (ISO), planned, projected_remaining,
+            sufficient (fits without waiting for a reset) and estimated_wait_seconds
+        """
+        with self._lock:
+            budget = self._budgets.get(resource)
+            now = self.clock()
+            if budget is None:
+                return {
+                    "resource": resource,
+                    "remaining": None,
+                    "limit": None,
+                    "reset_at": None,
+                    "planned": planned_calls,
+                    "projected_remaining": None,
+                    "sufficient": None,
+                    "estimated_wait_seconds": 0.0,
+                }
+            usable = budget.remaining - self.reserve
+            sufficient = planned_calls <= usable
+            wait = 0.0 if sufficient else max(budget.reset_at - now, 0.0)
+            return {
+                "resource": resource,
+                "remaining": budget.remaining,
+                "limit": budget.limit,
+                "reset_at": datetime.fromtimestamp(budget.reset_at, tz=timezone.utc).isoformat(),
+                "planned": planned_calls,
+                "projected_remaining": budget.remaining - planned_calls,
+                "sufficient": sufficient,
+                "estimated_wait_seconds": wait,
+            }
+
+    def log_projection(self, planned_calls: int, label: str = "refresh", resource: str = "core") -> Dict[str, Any]:
+        """Log a budget projection before a batch of work starts and ``plan`` it."""
+        self.plan(planned_calls, resource)
+        projection = self.projection(planned_calls, resource)
+        if projection["remaining"] is None:
+            self.logger.info(f"Rate budget for {label}: ~{planned_calls} calls planned (quota not yet observed)")
+        elif projection["sufficient"]:
+            self.logger.info(
+                f"Rate budget for {label}: ~{planned_calls} calls planned, "
+                f"{projection['remaining']}/{projection['limit']} remaining "
+                f"(~{projection['projected_remaining']} after)"
+            )
+        else:
+            self.logger.warn(
+                f"Rate budget for {label}: ~{planned_calls} calls planned but only "
+                f"{projection['remaining']} remaining; expect pauses of up to "
+                f"{projection['estimated_wait_seconds']:.0f}s until reset at {projection['reset_at']}"
+            )
+        return projection
+
+
+# Global governor instance shared by all GitHub clients in this process
+_governor: Optional[RateLimitGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_governor() -> RateLimitGovernor:
+    """Get or create the global rate-limit governor.
+
+    Returns:
+        RateLimitGovernor instance
+    """
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = RateLimitGovernor()
+        return _governor
@@ -8,8 +8,12 @@ import json
 from spark.cache import APICache
 from spark.cache_status import CacheStatusTracker
 from spark.fetcher import GitHubFetcher
+from spark.json_writer import write_json
 from spark.logger import get_logger
 
+# Rough GitHub API cost of refreshing one repository (budget projection only)
+CALLS_PER_REPOSITORY = 8
+
 
 class SmartRefresh:
     """Handle smart incremental updates - only refresh what's changed."""
@@ -101,6 +105,9 @@ class SmartRefresh:
 
         # Step 4: Fetch detailed data only for repos needing refresh
         self.logger.info(f"\n🔄 Refreshing {len(repos_to_refresh)} repositories:")
+        self.fetcher.governor.log_projection(
+            len(repos_to_refresh) * CALLS_PER_REPOSITORY, label="smart refresh"
+        )
         refreshed_repos = []
 
         for i, repo in enumerate(repos_to_refresh, 1):
@@ -140,15 +147,13 @@ class SmartRefresh:
         }
 
         output_file = Path("data/repositories.json")
-        output_file.parent.mkdir(exist_ok=True)
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        stats = write_json(output_file, output_data)
 
         self.logger.info(f"\n✨ Refresh complete!")
         self.logger.info(f"  Updated: {len(refreshed_repos)} repositories")
         self.logger.info(f"  Unchanged: {len(repos_unchanged)} repositories")
         self.logger.info(f"  Removed: {len(repos_to_remove)} repositories")
-        self.logger.info(f"  Output: {output_file}")
+        self.logger.info(f"  Output: {output_file} ({stats.bytes / 1024:.2f} KB)")
 
         return {
             "refreshed": len(refreshed_repos),
@@ -157,23 +162,20 @@ class SmartRefresh:
         }
 
     def _fetch_fresh_repo_list(self, username: str) -> List[Dict[str, Any]]:
-        """Fetch fresh repository list, clearing cache first."""
-        # Clear the repo list cache to force fresh fetch
-        import shutil
-        exclude_private = True
-        exclude_forks = True
-        exclude_archived = True
-        variant = f"list_{exclude_private}_{exclude_forks}_{exclude_archived}"
-        cache_dir = Path(self.cache.cache_dir) / username / variant / "repositories"
-        if cache_dir.exists():
-            shutil.rmtree(cache_dir)
-
-        return self.fetcher.fetch_repositories(
+        """Fetch fresh repository list, revalidating cached pages with GitHub."""
+        repos = self.fetcher.fetch_repositories(
             username=username,
-            exclude_private=exclude_private,
-            exclude_forks=exclude_forks,
-            exclude_archived=exclude_archived,
+            exclude_private=True,
+            exclude_forks=True,
+            exclude_archived=True,
+            revalidate=True,
         )
+        stats = self.fetcher.request_stats
+        self.logger.info(
+            f"Repository listing: {stats['not_modified']} page(s) not modified (304), "
+            f"{stats['fetched']} fetched"
+        )
+        return repos
 
     def _load_existing_data(self) -> Dict[str, Any]:
         """Load existing data/repositories.json."""
@@ -213,18 +215,10 @@ class SmartRefresh:
 
     def _clear_summary_caches(self, username: str, repo_name: str):
         """Clear AI summary and tech stack caches for a repository."""
-        cache_base = Path(self.cache.cache_dir) / username / repo_name
-
-        # Clear AI summary
-        ai_summary_dir = cache_base / "ai_summary"
-        if ai_summary_dir.exists():
-            import shutil
-            shutil.rmtree(ai_summary_dir)
-            self.logger.debug(f"Cleared AI summary cache for {repo_name}")
-
-        # Clear tech stack
-        tech_stack_dir = cache_base / "tech_stack"
-        if tech_stack_dir.exists():
-            import shutil
-            shutil.rmtree(tech_stack_dir)
-            self.logger.debug(f"Cleared tech stack cache for {repo_name}")
+        for category, label in (("ai_summary", "AI summary"), ("tech_stack", "tech stack")):
+            entry = self.cache.get_entry_info(category, username, repo=repo_name)
+            if not entry:
+                continue
+            for week in entry.get("weeks", []):
+                self.cache.delete(category, username, repo=repo_name, week=week)
+            self.logger.debug(f"Cleared {label} cache for {repo_name}")
@@ -0,0 +1,94 @@
+"""Per-run cache of PyGithub repository handles.
+
+Every cache category refresh needs a ``Repository`` object, and resolving one
+with ``Github.get_repo`` costs a ``GET /repos/{owner}/{repo}`` round-trip.
+Repositories from the listing are already known to exist, so their handles
+are built locally from the listing data (no request) and only the endpoint
+methods (``get_languages``, ``get_commits``, ...) hit the API. Anything not
+in the listing is resolved once per client and reused for the rest of the run.
+
+Handles are bound to the client that created them, and PyGithub clients are
+not shared between threads, so the cache keeps one handle per (client, repo).
+"""
+
+import threading
+import weakref
+from typing import Any, Dict, Iterable, Optional
+
+from github.Repository import Repository
+
+from spark.rate_limit import RateLimitGovernor, get_rate_governor
+
+
+class RepositoryHandleCache:
+    """Resolves each repository at most once per run and client."""
+
+    def __init__(self, governor: Optional[RateLimitGovernor] = None):
+        """Initialize an empty handle cache.
+
+        Args:
+            governor: Rate governor for lookups of unlisted repositories
+        """
+        self.governor = governor or get_rate_governor()
+        self._lock = threading.Lock()
+        self._known: Dict[str, Dict[str, Any]] = {}
+        self._handles: "weakref.WeakKeyDictionary[Any, Dict[str, Repository]]" = weakref.WeakKeyDictionary()
+        self.lookups = 0
+        self.reused = 0
+
+    def seed(self, owner: str, repos: Iterable[Dict[str, Any]]) -> None:
+        """Record repositories known to exist from listing data.
+
+        Args:
+            owner: Repository owner
+            repos: Repository dicts with at least ``name`` (``full_name`` optional)
+        """
+        with self._lock:
+            for repo in repos:
+                name = repo.get("name")
+                if not name:
+                    continue
+                full_name = repo.get("full_name") or f"{owner}/{name}"
+                self._known[full_name.lower()] = {
+                    "name": name,
+                    "full_name": full_name,
+                    "owner": {"login": full_name.split("/", 1)[0]},
+                    "url": f"/repos/{full_name}",
+                }
+
+    def get(self, client: Any, owner: str, repo_name: str) -> Repository:
+        """Return a repository handle bound to ``client``.
+
+        Args:
+            client: PyGithub client of the calling thread
+            owner: Repository owner
+            repo_name: Repository name
+        """
+        full_name = f"{owner}/{repo_name}"
+        key = full_name.lower()
+
+        with self._lock:
+            per_client = self._handles.setdefault(client, {})
+            handle = per_client.get(key)
+            if handle is not None:
+                self.reused += 1
+                return handle
+            seed = self._known.get(key)
+
+        if seed is not None:
+            # Built from listing data: no API request
+            handle = client.create_from_raw_data(Repository, dict(seed))
+        else:
+            handle = self.governor.call(client.get_repo, full_name)
+            self.governor.observe_github(client)
+            with self._lock:
+                self.lookups += 1
+
+        with self._lock:
+            per_client[key] = handle
+        return handle
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of listed repositories, API lookups and reused handles."""
+        with self._lock:
+            return {"known": len(self._known), "lookups": self.lookups, "reused": self.reused}
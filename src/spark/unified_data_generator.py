@@ -13,16 +13,20 @@ Constitutional Requirements:
 - Zero API calls on second run if no repos changed
 """
 
+import copy
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 from spark.cache import APICache
 from spark.calculator import StatsCalculator
-from spark.cache_manager import CacheManager
+from spark.cache_manager import CacheManager, WarmSummary
 from spark.config import SparkConfig
+from spark.data_shards import ShardWriter
 from spark.dependencies.analyzer import RepositoryDependencyAnalyzer
-from spark.fetcher import GitHubFetcher
+from spark.fetcher import create_fetcher
+from spark.json_writer import write_json
 from spark.logger import get_logger
 from spark.models import (
     CommitHistory,
@@ -37,6 +41,12 @@ from spark.time_utils import sanitize_timestamp_for_filename
 # Initialize logger
 logger = get_logger(__name__)
 
+# Cache category of finished repository dicts, keyed by pushed_at
+RECORD_CATEGORY = "unified_record"
+
+# Bump when repository dict fields or how they are derived change
+RECORD_SCHEMA_VERSION = 1
+
 
 class UnifiedDataGenerator:
     """Generates unified repository data using clean 4-phase architecture.
@@ -80,20 +90,39 @@ class UnifiedDataGenerator:
         self.max_repositories = max_repos_override or data_gen_config.get("max_repositories", 50)
         self.top_n_repos = data_gen_config.get("top_n_repos", 50)
         self.include_ai_summaries = include_ai_summaries or data_gen_config.get("include_ai_summaries", False)
+        self.assembly_workers = max(1, int(data_gen_config.get("assembly_workers", 4)))
         
         # Initialize components
         self.cache = cache if cache is not None else APICache()
-        self.fetcher = GitHubFetcher(cache=self.cache, max_repos=self.max_repositories)
+        self.fetcher = create_fetcher(
+            backend=config.get("fetcher.backend", "sync"),
+            async_concurrency=config.get("fetcher.async_concurrency", 16),
+            cache=self.cache,
+            max_repos=self.max_repositories,
+            mode=config.get("fetcher.mode", "rest"),
+            graphql_batch_size=config.get("fetcher.graphql_batch_size", 50),
+            commit_count_engine=config.get("fetcher.commit_count_engine", "stats"),
+        )
         self.ranker = RepositoryRanker(config=config)
         
         logger.info(f"UnifiedDataGenerator initialized for user: {username}")
         logger.info(f"Max repositories: {self.max_repositories}")
         logger.info(f"Include AI summaries: {self.include_ai_summaries}")
+        logger.info(f"Fetch mode: {self.fetcher.mode} ({config.get('fetcher.backend', 'sync')} backend)")
         
         # Initialize cache manager for Phase 2
-        self.cache_manager = CacheManager(self.fetcher.github, self.cache)
+        self.cache_manager = CacheManager(
+            self.fetcher.github,
+            self.cache,
+            prefetcher=self.fetcher.prefetch_repository_data,
+            max_workers=config.get("fetcher.refresh_workers", 4),
+            client_factory=self.fetcher.create_client,
+            repo_handles=self.fetcher.repo_handles,
+            commit_counter=self.fetcher.commit_counter,
+            deep_validate=config.get("cache.deep_validate", False),
+        )
 
-    def generate(self) -> Dict[str, Any]:
+    def generate(self, stream: bool = False) -> Dict[str, Any]:
         """Generate unified data using clean 4-phase architecture.
         
         Phase 1: Fetch repository list
@@ -101,6 +130,11 @@ class UnifiedDataGenerator:
         Phase 3: Assemble data from cache
         Phase 4: (handled by caller - output generation)
         
+        Args:
+            stream: Return 'repositories' as an iterator that assembles each
+                ranked repository when consumed (see save()); the Phase 3
+                summary is logged once it is exhausted
+        
         Returns:
             Dict with profile, repositories, and metadata
         """
@@ -120,6 +154,7 @@ class UnifiedDataGenerator:
         phase1_start = time()
         raw_repos = self._fetch_repository_list()
         phase1_time = time() - phase1_start
+        request_stats = self.fetcher.request_stats
         logger.info(f"Found {len(raw_repos)} repositories ({phase1_time:.2f}s)")
         
         # PHASE 2: Validate & refresh caches
@@ -135,24 +170,90 @@ class UnifiedDataGenerator:
         logger.info(f"Refreshed: {refresh_summary.repos_refreshed}, " 
                    f"Unchanged: {refresh_summary.repos_unchanged}, "
                    f"API calls: {refresh_summary.api_calls_made} ({phase2_time:.2f}s)")
+        handle_stats = self.fetcher.repo_handles.stats()
+        logger.info(f"Repository handles: {handle_stats['known']} from listing, "
+                   f"{handle_stats['lookups']} looked up, {handle_stats['reused']} reused")
         
         # PHASE 3: Assemble data from cache
         logger.info("\n[Phase 3] Assembling Data from Cache")
         phase3_start = time()
-        unified_data = self._assemble_data(raw_repos)
-        phase3_time = time() - phase3_start
-        logger.info(f"Assembled data for {len(unified_data['repositories'])} repositories ({phase3_time:.2f}s)")
+        unified_data = self._assemble_data(raw_repos, stream=stream)
+
+        def finish(assembled: int) -> None:
+            self._log_summary(
+                assembled, total_start, phase1_time, phase2_time, time() - phase3_start, request_stats
+            )
+
+        if stream:
+            unified_data["repositories"] = _then(unified_data["repositories"], finish)
+        else:
+            finish(len(unified_data["repositories"]))
+        return unified_data
+
+    def _log_summary(
+        self,
+        assembled: int,
+        total_start: float,
+        phase1_time: float,
+        phase2_time: float,
+        phase3_time: float,
+        request_stats: Dict[str, int],
+    ) -> None:
+        """Log the per-phase summary once Phase 3 is done."""
+        from time import time
+
+        logger.info(f"Assembled data for {assembled} repositories ({phase3_time:.2f}s)")
         
         total_time = time() - total_start
         logger.info("\n" + "="*70)
         logger.info(f"Data Generation Complete: {total_time:.2f}s total")
-        logger.info(f"  Phase 1 (Fetch): {phase1_time:.2f}s")
+        logger.info(f"  Phase 1 (Fetch): {phase1_time:.2f}s "
+                   f"(cache hits: {request_stats['cache_hits']}, "
+                   f"304 not modified: {request_stats['not_modified']}, "
+                   f"fetched: {request_stats['fetched']})")
         logger.info(f"  Phase 2 (Refresh): {phase2_time:.2f}s")
         logger.info(f"  Phase 3 (Assemble): {phase3_time:.2f}s")
+        memory_stats = self.cache.memory_stats()
+        logger.info(f"  Cache memory layer: {memory_stats['hits']} hits, {memory_stats['misses']} misses, "
+                   f"{memory_stats['evictions']} evictions ({memory_stats['bytes'] / 1024 / 1024:.1f} MB held)")
+        # Last-read times drive LRU eviction in `spark cache --prune`
+        self.cache.flush_reads()
         logger.info("="*70)
-        
-        return unified_data
     
+    def warm(self, max_api_calls: Optional[int] = None) -> WarmSummary:
+        """Pre-populate caches so the next generate() is served from cache.
+
+        Runs Phase 1 (a conditional listing request) and only the part of
+        Phase 2 that fits the call budget, most recently pushed repositories
+        first (see CacheManager.warm_user_data). No data is assembled.
+
+        Args:
+            max_api_calls: Call budget (None = the remaining rate-limit quota)
+
+        Returns:
+            WarmSummary
+        """
+        try:
+            raw_repos = self._fetch_repository_list()
+            logger.info(f"Found {len(raw_repos)} repositories")
+            summary = self.cache_manager.warm_user_data(
+                username=self.username,
+                repo_list=raw_repos,
+                max_api_calls=max_api_calls,
+                include_ai_summaries=self.include_ai_summaries,
+            )
+        finally:
+            self.close()
+        return summary
+
+    def close(self) -> None:
+        """Release the fetcher's connections (and the async backend's event loop).
+
+        Called by save() and warm() once they are done; the generator cannot
+        fetch afterwards.
+        """
+        self.fetcher.close()
+
     def _fetch_repository_list(self) -> List[Dict]:
         """Phase 1: Fetch current repository list from GitHub.
         
@@ -167,281 +268,54 @@ class UnifiedDataGenerator:
             exclude_private=True,
             exclude_forks=exclude_forks,
             exclude_archived=exclude_archived,
+            revalidate=True,
         )
     
-    def _assemble_data(self, raw_repos: List[Dict]) -> Dict[str, Any]:
+    def _assemble_data(self, raw_repos: List[Dict], stream: bool = False) -> Dict[str, Any]:
         """Phase 3: Assemble unified data by reading from cache.
         
-        This phase ONLY reads from cache, never writes.
+        This phase never fetches; its only cache writes are the derived
+        repository records (RECORD_CATEGORY). A first pass reads
+        what ranking needs (commit counts, languages, quality indicators,
+        README presence) for every repository; the heavy enrichment (commit
+        metrics, tech stack, summaries) then runs only for the ranked top N,
+        on ``assembly_workers`` threads, so README and dependency file
+        contents are never held for repositories that are not emitted.
         
         Args:
             raw_repos: List of repository dicts from Phase 1
+            stream: Return 'repositories' as an iterator that runs the
+                second pass lazily, in rank order
             
         Returns:
             Dict with 'profile', 'repositories', 'metadata' keys
         """
         repositories = []
         commit_histories = {}
-        repo_cache = {}
-        dependency_analyzer = RepositoryDependencyAnalyzer()
-        summarizer = RepositorySummarizer(cache=self.cache, enable_ai=False)
+        cache_keys = {}
         
         for i, repo_data in enumerate(raw_repos[:self.max_repositories], 1):
             repo_name = repo_data["name"]
             logger.debug(f"[{i}/{min(len(raw_repos), self.max_repositories)}] Assembling {repo_name}")
             
             try:
-                # Parse pushed_at
-                pushed_at_str = repo_data.get("pushed_at")
-                if pushed_at_str:
-                    pushed_at = datetime.fromisoformat(pushed_at_str.replace('Z', '+00:00'))
-                    if pushed_at.tzinfo is None:
-                        pushed_at = pushed_at.replace(tzinfo=timezone.utc)
-                else:
-                    pushed_at = None
-                
-                cache_key = sanitize_timestamp_for_filename(pushed_at) if pushed_at else None
-
-                # Read commit counts from cache
-                commit_data = self.fetcher.fetch_commit_counts(
-                    self.username,
-                    repo_name,
-                    repo_pushed_at=pushed_at
-                )
-                
-                if commit_data:
-                    commit_histories[repo_name] = CommitHistory(
-                        repository_name=repo_name,
-                        total_commits=commit_data.get("total", 0),
-                        recent_90d=commit_data.get("recent_90d", 0),
-                        recent_180d=commit_data.get("recent_180d", 0),
-                        recent_365d=commit_data.get("recent_365d", 0),
-                        last_commit_date=(
-                            datetime.fromisoformat(commit_data["last_commit_date"])
-                            if commit_data.get("last_commit_date")
-                            else None
-                        ),
-                    )
-                
-                # Read language stats from cache
-                language_stats = self.fetcher.fetch_languages(
-                    self.username,
-                    repo_name,
-                    repo_pushed_at=pushed_at
-                ) or {}
-
-                # Read cached AI summary, README, dependency files, and commit stats
-                readme_content = ""
-                dependency_files = {}
-                commit_stats = None
-                cached_summary = None
-
-                if cache_key:
-                    readme_content = self.cache.get(
-                        "readme", self.username, repo=repo_name, week=cache_key
-                    ) or ""
-                    dependency_files = self.cache.get(
-                        "dependency_files", self.username, repo=repo_name, week=cache_key
-                    ) or {}
-                    commit_stats = self.cache.get(
-                        "commits_stats", self.username, repo=repo_name, week=cache_key
-                    )
-                    cached_summary = self.cache.get(
-                        "ai_summary", self.username, repo=repo_name, week=cache_key
-                    )
-                    # Read quality indicators from cache
-                    quality_indicators = self.cache.get(
-                        "quality_indicators", self.username, repo=repo_name, week=cache_key
-                    )
-                    if quality_indicators:
-                        repo_data["has_license"] = quality_indicators.get("has_license", False)
-                        repo_data["has_ci_cd"] = quality_indicators.get("has_ci_cd", False)
-                        repo_data["has_tests"] = quality_indicators.get("has_tests", False)
-                        repo_data["has_docs"] = quality_indicators.get("has_docs", False)
-
-                if cached_summary is None:
-                    cached_summary = self.cache.get("ai_summary", self.username, repo=repo_name)
-
-                # Create Repository object
-                repo_data["language_stats"] = language_stats
-                repo_data["language_count"] = len(language_stats)
-                repo = Repository.from_dict(repo_data)
-                repo.has_readme = bool(readme_content)
-                repositories.append(repo)
-                repo_cache[repo_name] = {
-                    "readme_content": readme_content,
-                    "dependency_files": dependency_files,
-                    "commit_stats": commit_stats,
-                    "cached_summary": cached_summary,
-                }
-
+                repo, commit_history, cache_key = self._load_ranking_inputs(repo_data)
             except Exception as e:
                 logger.warn(f"Failed to assemble {repo_name}: {e}")
                 continue
+            repositories.append(repo)
+            cache_keys[repo_name] = cache_key
+            if commit_history:
+                commit_histories[repo_name] = commit_history
         
         # Rank repositories
         logger.info(f"Ranking {len(repositories)} repositories...")
         ranked_repos = self.ranker.rank_repositories(repositories, commit_histories, top_n=self.top_n_repos)
         
-        # Create repository dicts
-        unified_repos = []
-        for rank, (repo, score) in enumerate(ranked_repos, 1):
-            commit_history = commit_histories.get(repo.name)
-            repo_extras = repo_cache.get(repo.name, {})
-            readme_content = repo_extras.get("readme_content", "")
-            dependency_files = repo_extras.get("dependency_files", {})
-            commit_stats = repo_extras.get("commit_stats")
-            cached_summary = repo_extras.get("cached_summary")
-            commit_history_dict = commit_history.to_dict() if commit_history else None
-            commit_metrics = None
-            avg_commit_size = None
-            largest_commit = None
-            smallest_commit = None
-            first_commit_date = repo.created_at
-
-            if commit_stats:
-                metrics = StatsCalculator.calculate_repository_commit_metrics(commit_stats)
-                commit_metrics = {
-                    "avg_size": metrics.get("avg_commit_size", 0.0),
-                    "largest_commit": metrics.get("largest_commit"),
-                    "smallest_commit": metrics.get("smallest_commit"),
-                    "total_commits": metrics.get("total_commits", 0),
-                    "commit_size_distribution": metrics.get("commit_size_distribution"),
-                }
-                avg_commit_size = commit_metrics["avg_size"]
-                largest_commit = commit_metrics["largest_commit"]
-                smallest_commit = commit_metrics["smallest_commit"]
-
-                commit_dates = []
-                for commit in commit_stats:
-                    date_str = commit.get("commit", {}).get("author", {}).get("date")
-                    if not date_str:
-                        continue
-                    try:
-                        commit_dates.append(datetime.fromisoformat(date_str.replace("Z", "+00:00")))
-                    except ValueError:
-                        continue
-                if commit_dates:
-                    first_commit_date = min(commit_dates)
-
-            if commit_history_dict is not None:
-                commit_history_dict["first_commit_date"] = (
-                    first_commit_date.isoformat() if first_commit_date else None
-                )
-
-            tech_stack = None
-            if dependency_files:
-                dep_report = dependency_analyzer.analyze_repository(dependency_files)
-                if dep_report.total_dependencies > 0:
-                    tech_stack = TechnologyStack(
-                        repository_name=repo.name,
-                        dependencies=[
-                            DependencyInfo(
-                                name=detail.name,
-                                current_version=detail.current_version,
-                                ecosystem=detail.ecosystem,
-                            )
-                            for detail in dep_report.details
-                        ],
-                        dependency_file_type=next(iter(dependency_files.keys()), None),
-                        languages=repo.language_stats or {},
-                    )
-
-            summary_payload = None
-            if cached_summary and cached_summary.get("ai_summary"):
-                summary_payload = {
-                    "text": cached_summary.get("ai_summary"),
-                    "ai_generated": True,
-                    "generation_method": cached_summary.get("generation_method"),
-                    "generated_at": cached_summary.get("generation_timestamp"),
-                    "model_used": cached_summary.get("model_used"),
-                    "tokens_used": cached_summary.get("tokens_used"),
-                    "confidence_score": cached_summary.get("confidence_score"),
-                }
-            else:
-                fallback_summary = summarizer.summarize_repository(
-                    repo=repo,
-                    readme_content=readme_content or None,
-                    commit_history=commit_history,
-                    language_stats=repo.language_stats,
-                    tech_stack=tech_stack,
-                    repository_owner=self.username,
-                    repo_pushed_at=repo.pushed_at,
-                    write_cache=False,
-                    allow_ai=False,
-                )
-                summary_payload = {
-                    "text": fallback_summary.summary,
-                    "ai_generated": fallback_summary.is_ai_generated,
-                    "generation_method": fallback_summary.generation_method,
-                    "generated_at": (
-                        fallback_summary.generation_timestamp.isoformat()
-                        if fallback_summary.generation_timestamp
-                        else None
-                    ),
-                    "model_used": fallback_summary.model_used,
-                    "tokens_used": fallback_summary.tokens_used,
-                    "confidence_score": fallback_summary.confidence_score,
-                }
-
-            ai_summary_text = (
-                summary_payload.get("text")
-                if summary_payload and summary_payload.get("ai_generated")
-                else None
-            )
-
-            repo_dict = {
-                "name": repo.name,
-                "description": repo.description,
-                "summary": summary_payload,
-                "url": repo.url,
-                "homepage": repo.homepage,  # Custom website URL from repo settings
-                "has_pages": repo.has_pages,  # GitHub Pages enabled
-                "pages_url": repo.pages_url,  # Constructed GitHub Pages URL
-                "website_url": repo.website_url,  # Best available website (homepage or pages_url)
-                "stars": repo.stars,
-                "forks": repo.forks,
-                "watchers": repo.watchers,
-                "language": repo.primary_language,
-                "language_stats": repo.language_stats,
-                "languages": repo.language_stats,
-                "created_at": repo.created_at.isoformat() if repo.created_at else None,
-                "updated_at": repo.updated_at.isoformat() if repo.updated_at else None,
-                "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
-                "total_commits": commit_history.total_commits if commit_history else 0,
-                "recent_commits_90d": commit_history.recent_90d if commit_history else 0,
-                "first_commit_date": (
-                    first_commit_date.isoformat() if first_commit_date else None
-                ),
-                "last_commit_date": (
-                    commit_history.last_commit_date.isoformat()
-                    if commit_history and commit_history.last_commit_date
-                    else (repo.pushed_at.isoformat() if repo.pushed_at else None)
-                ),
-                "commit_history": commit_history_dict,
-                "commit_metrics": commit_metrics,
-                "avg_commit_size": avg_commit_size,
-                "largest_commit": largest_commit,
-                "smallest_commit": smallest_commit,
-                "commit_velocity": commit_history.commit_frequency if commit_history else None,
-                "tech_stack": tech_stack.to_dict() if tech_stack else None,
-                "has_readme": repo.has_readme,
-                "has_license": repo.has_license,
-                "has_ci_cd": repo.has_ci_cd,
-                "has_tests": repo.has_tests,
-                "has_docs": repo.has_docs,
-                "language_count": repo.language_count,
-                "size_kb": repo.size_kb,
-                "is_fork": repo.is_fork,
-                "is_private": repo.is_private,
-                "is_archived": repo.is_archived,
-                "age_days": repo.age_days,
-                "days_since_last_push": repo.days_since_last_push,
-                "ai_summary": ai_summary_text,
-                "rank": rank,
-                "composite_score": score,
-            }
-            unified_repos.append(repo_dict)
+        # Create repository dicts for the ranked subset, in rank order
+        unified_repos = self._ranked_records(ranked_repos, commit_histories, cache_keys)
+        if not stream:
+            unified_repos = list(unified_repos)
         
         # Create user profile
         profile = {
@@ -465,41 +339,480 @@ class UnifiedDataGenerator:
             "metadata": metadata
         }
 
+    def _ranked_records(
+        self,
+        ranked_repos: List[tuple[Repository, float]],
+        commit_histories: Dict[str, CommitHistory],
+        cache_keys: Dict[str, Optional[str]],
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield repository dicts in rank order, built on ``assembly_workers`` threads."""
+        dependency_analyzer = RepositoryDependencyAnalyzer()
+        summarizer = RepositorySummarizer(cache=self.cache, enable_ai=False)
+
+        def enrich(item):
+            rank, (repo, score) = item
+            return self._repository_record(
+                repo,
+                rank,
+                score,
+                commit_histories.get(repo.name),
+                cache_keys.get(repo.name),
+                dependency_analyzer,
+                summarizer,
+            )
+
+        items = list(enumerate(ranked_repos, 1))
+        reused = 0
+        with self.cache.batch():
+            if self.assembly_workers > 1 and len(items) > 1:
+                with ThreadPoolExecutor(max_workers=self.assembly_workers, thread_name_prefix="assemble") as pool:
+                    for repo_dict, was_reused in pool.map(enrich, items):
+                        reused += was_reused
+                        yield repo_dict
+            else:
+                for item in items:
+                    repo_dict, was_reused = enrich(item)
+                    reused += was_reused
+                    yield repo_dict
+        logger.info(f"Repository records: {reused} reused, {len(items) - reused} rebuilt")
+
+    def _load_ranking_inputs(self, repo_data: Dict) -> tuple[Repository, Optional[CommitHistory], Optional[str]]:
+        """Phase 3 first pass: read the cached data ranking needs.
+        
+        Args:
+            repo_data: Repository dict from Phase 1 (not modified)
+            
+        Returns:
+            Tuple of (Repository, CommitHistory or None, pushed_at cache key or None)
+        """
+        # Phase 1 may hand out the cached listing, which is read-only
+        repo_data = dict(repo_data)
+        repo_name = repo_data["name"]
+
+        # Parse pushed_at
+        pushed_at_str = repo_data.get("pushed_at")
+        if pushed_at_str:
+            pushed_at = datetime.fromisoformat(pushed_at_str.replace('Z', '+00:00'))
+            if pushed_at.tzinfo is None:
+                pushed_at = pushed_at.replace(tzinfo=timezone.utc)
+        else:
+            pushed_at = None
+        
+        cache_key = sanitize_timestamp_for_filename(pushed_at) if pushed_at else None
+
+        # Read commit counts from cache
+        commit_data = self.fetcher.fetch_commit_counts(
+            self.username,
+            repo_name,
+            repo_pushed_at=pushed_at
+        )
+        
+        commit_history = None
+        if commit_data:
+            commit_history = CommitHistory(
+                repository_name=repo_name,
+                total_commits=commit_data.get("total", 0),
+                recent_90d=commit_data.get("recent_90d", 0),
+                recent_180d=commit_data.get("recent_180d", 0),
+                recent_365d=commit_data.get("recent_365d", 0),
+                last_commit_date=(
+                    datetime.fromisoformat(commit_data["last_commit_date"])
+                    if commit_data.get("last_commit_date")
+                    else None
+                ),
+            )
+        
+        # Read language stats from cache
+        language_stats = self.fetcher.fetch_languages(
+            self.username,
+            repo_name,
+            repo_pushed_at=pushed_at
+        ) or {}
+
+        has_readme = False
+        if cache_key:
+            # Only presence is needed here; the content is read if the repository is ranked
+            has_readme = self.cache.has_content("readme", self.username, repo=repo_name, week=cache_key)
+            # Read quality indicators from cache
+            quality_indicators = self.cache.get(
+                "quality_indicators", self.username, repo=repo_name, week=cache_key
+            )
+            if quality_indicators:
+                repo_data["has_license"] = quality_indicators.get("has_license", False)
+                repo_data["has_ci_cd"] = quality_indicators.get("has_ci_cd", False)
+                repo_data["has_tests"] = quality_indicators.get("has_tests", False)
+                repo_data["has_docs"] = quality_indicators.get("has_docs", False)
+
+        # Create Repository object
+        repo_data["language_stats"] = language_stats
+        repo_data["language_count"] = len(language_stats)
+        repo = Repository.from_dict(repo_data)
+        repo.has_readme = has_readme
+        return repo, commit_history, cache_key
+
+    def _repository_record(
+        self,
+        repo: Repository,
+        rank: int,
+        score: float,
+        commit_history: Optional[CommitHistory],
+        cache_key: Optional[str],
+        dependency_analyzer: RepositoryDependencyAnalyzer,
+        summarizer: RepositorySummarizer,
+    ) -> tuple[Dict[str, Any], bool]:
+        """Phase 3 second pass: output dict of one ranked repository.
+        
+        The finished dict is cached per pushed_at key (RECORD_CATEGORY), so
+        commit metrics, tech stack and the fallback summary are computed once
+        per push. A reused record gets the listing fields, rank, score and
+        AI summary of this run; its fallback summary is rebuilt if the
+        listing fields it quotes changed. Safe to run on several threads.
+        
+        Returns:
+            Tuple of (repository dict for repositories.json, reused flag)
+        """
+        cached_summary = self._cached_ai_summary(repo.name, cache_key)
+        summary_inputs = [repo.description, repo.primary_language, repo.stars, repo.forks]
+
+        stored = None
+        if cache_key and not self.force_refresh:
+            stored = self.cache.get(RECORD_CATEGORY, self.username, repo=repo.name, week=cache_key)
+        if not stored or stored.get("schema_version") != RECORD_SCHEMA_VERSION:
+            repo_dict = self._enrich_repository(
+                repo, rank, score, commit_history, cache_key, cached_summary, dependency_analyzer, summarizer
+            )
+            if cache_key:
+                self._store_record(repo.name, cache_key, repo_dict, summary_inputs)
+            return repo_dict, False
+
+        # Cached values are shared and read-only; the record is handed on
+        repo_dict = copy.deepcopy(stored["record"])
+        repo_dict.update(self._listing_fields(repo, commit_history))
+        repo_dict["rank"] = rank
+        repo_dict["composite_score"] = score
+        if cached_summary and cached_summary.get("ai_summary"):
+            repo_dict["summary"] = self._summary_payload(
+                repo, commit_history, cache_key, None, cached_summary, summarizer
+            )
+        elif repo_dict["summary"].get("ai_generated") or stored.get("summary_inputs") != summary_inputs:
+            # tech_stack only feeds AI prompts, which Phase 3 never sends
+            repo_dict["summary"] = self._summary_payload(
+                repo, commit_history, cache_key, None, None, summarizer
+            )
+            self._store_record(repo.name, cache_key, repo_dict, summary_inputs)
+        repo_dict["ai_summary"] = (
+            repo_dict["summary"]["text"] if repo_dict["summary"].get("ai_generated") else None
+        )
+        return repo_dict, True
+
+    def _store_record(
+        self, repo_name: str, cache_key: str, repo_dict: Dict[str, Any], summary_inputs: List[Any]
+    ) -> None:
+        self.cache.set(
+            RECORD_CATEGORY,
+            self.username,
+            {"schema_version": RECORD_SCHEMA_VERSION, "summary_inputs": summary_inputs, "record": repo_dict},
+            repo=repo_name,
+            week=cache_key,
+        )
+
+    def _cached_ai_summary(self, repo_name: str, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Cached AI summary for the pushed_at key, else the latest one."""
+        cached_summary = None
+        if cache_key:
+            cached_summary = self.cache.get(
+                "ai_summary", self.username, repo=repo_name, week=cache_key
+            )
+        if cached_summary is None:
+            cached_summary = self.cache.get("ai_summary", self.username, repo=repo_name)
+        return cached_summary
+
+    @staticmethod
+    def _listing_fields(repo: Repository, commit_history: Optional[CommitHistory]) -> Dict[str, Any]:
+        """Fields of a repository dict that change without a push, or with time."""
+        return {
+            "description": repo.description,
+            "url": repo.url,
+            "homepage": repo.homepage,
+            "has_pages": repo.has_pages,
+            "pages_url": repo.pages_url,
+            "website_url": repo.website_url,
+            "stars": repo.stars,
+            "forks": repo.forks,
+            "watchers": repo.watchers,
+            "language": repo.primary_language,
+            "updated_at": repo.updated_at.isoformat() if repo.updated_at else None,
+            "has_readme": repo.has_readme,
+            "has_license": repo.has_license,
+            "has_ci_cd": repo.has_ci_cd,
+            "has_tests": repo.has_tests,
+            "has_docs": repo.has_docs,
+            "size_kb": repo.size_kb,
+            "is_fork": repo.is_fork,
+            "is_private": repo.is_private,
+            "is_archived": repo.is_archived,
+            "age_days": repo.age_days,
+            "days_since_last_push": repo.days_since_last_push,
+        }
+
+    def _enrich_repository(
+        self,
+        repo: Repository,
+        rank: int,
+        score: float,
+        commit_history: Optional[CommitHistory],
+        cache_key: Optional[str],
+        cached_summary: Optional[Dict[str, Any]],
+        dependency_analyzer: RepositoryDependencyAnalyzer,
+        summarizer: RepositorySummarizer,
+    ) -> Dict[str, Any]:
+        """Build the output dict of one repository from its cached data.
+        
+        Reads dependency files and commit columns (and the README only when
+        a fallback summary is needed).
+        
+        Returns:
+            Repository dict for repositories.json
+        """
+        dependency_files = {}
+        commit_stats = None
+        if cache_key:
+            dependency_files = self.cache.get(
+                "dependency_files", self.username, repo=repo.name, week=cache_key
+            ) or {}
+            # Memory-mapped columns: metrics need no per-commit dicts
+            commit_stats = self.cache.get_commit_columns(
+                self.username, repo.name, week=cache_key
+            )
+
+        commit_history_dict = commit_history.to_dict() if commit_history else None
+        commit_metrics = None
+        avg_commit_size = None
+        largest_commit = None
+        smallest_commit = None
+        first_commit_date = repo.created_at
+
+        if commit_stats is not None:
+            with commit_stats:
+                if commit_stats:
+                    metrics = StatsCalculator.calculate_repository_commit_metrics(commit_stats)
+                    commit_metrics = {
+                        "avg_size": metrics.get("avg_commit_size", 0.0),
+                        "largest_commit": metrics.get("largest_commit"),
+                        "smallest_commit": metrics.get("smallest_commit"),
+                        "total_commits": metrics.get("total_commits", 0),
+                        "commit_size_distribution": metrics.get("commit_size_distribution"),
+                    }
+                    avg_commit_size = commit_metrics["avg_size"]
+                    largest_commit = commit_metrics["largest_commit"]
+                    smallest_commit = commit_metrics["smallest_commit"]
+
+                    first_commit_date = commit_stats.earliest_date() or first_commit_date
+
+        if commit_history_dict is not None:
+            commit_history_dict["first_commit_date"] = (
+                first_commit_date.isoformat() if first_commit_date else None
+            )
+
+        tech_stack = None
+        if dependency_files:
+            dep_report = dependency_analyzer.analyze_repository(dependency_files)
+            if dep_report.total_dependencies > 0:
+                tech_stack = TechnologyStack(
+                    repository_name=repo.name,
+                    dependencies=[
+                        DependencyInfo(
+                            name=detail.name,
+                            current_version=detail.current_version,
+                            ecosystem=detail.ecosystem,
+                        )
+                        for detail in dep_report.details
+                    ],
+                    dependency_file_type=next(iter(dependency_files.keys()), None),
+                    languages=repo.language_stats or {},
+                )
+
+        summary_payload = self._summary_payload(
+            repo, commit_history, cache_key, tech_stack, cached_summary, summarizer
+        )
+        ai_summary_text = (
+            summary_payload.get("text")
+            if summary_payload and summary_payload.get("ai_generated")
+            else None
+        )
+
+        repo_dict = {
+            "name": repo.name,
+            "description": repo.description,
+            "summary": summary_payload,
+            "url": repo.url,
+            "homepage": repo.homepage,  # Custom website URL from repo settings
+            "has_pages": repo.has_pages,  # GitHub Pages enabled
+            "pages_url": repo.pages_url,  # Constructed GitHub Pages URL
+            "website_url": repo.website_url,  # Best available website (homepage or pages_url)
+            "stars": repo.stars,
+            "forks": repo.forks,
+            "watchers": repo.watchers,
+            "language": repo.primary_language,
+            "language_stats": repo.language_stats,
+            "languages": repo.language_stats,
+            "created_at": repo.created_at.isoformat() if repo.created_at else None,
+            "updated_at": repo.updated_at.isoformat() if repo.updated_at else None,
+            "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
+            "total_commits": commit_history.total_commits if commit_history else 0,
+            "recent_commits_90d": commit_history.recent_90d if commit_history else 0,
+            "first_commit_date": (
+                first_commit_date.isoformat() if first_commit_date else None
+            ),
+            "last_commit_date": (
+                commit_history.last_commit_date.isoformat()
+                if commit_history and commit_history.last_commit_date
+                else (repo.pushed_at.isoformat() if repo.pushed_at else None)
+            ),
+            "commit_history": commit_history_dict,
+            "commit_metrics": commit_metrics,
+            "avg_commit_size": avg_commit_size,
+            "largest_commit": largest_commit,
+            "smallest_commit": smallest_commit,
+            "commit_velocity": commit_history.commit_frequency if commit_history else None,
+            "tech_stack": tech_stack.to_dict() if tech_stack else None,
+            "has_readme": repo.has_readme,
+            "has_license": repo.has_license,
+            "has_ci_cd": repo.has_ci_cd,
+            "has_tests": repo.has_tests,
+            "has_docs": repo.has_docs,
+            "language_count": repo.language_count,
+            "size_kb": repo.size_kb,
+            "is_fork": repo.is_fork,
+            "is_private": repo.is_private,
+            "is_archived": repo.is_archived,
+            "age_days": repo.age_days,
+            "days_since_last_push": repo.days_since_last_push,
+            "ai_summary": ai_summary_text,
+            "rank": rank,
+            "composite_score": score,
+        }
+        return repo_dict
+
+    def _summary_payload(
+        self,
+        repo: Repository,
+        commit_history: Optional[CommitHistory],
+        cache_key: Optional[str],
+        tech_stack: Optional[TechnologyStack],
+        cached_summary: Optional[Dict[str, Any]],
+        summarizer: RepositorySummarizer,
+    ) -> Dict[str, Any]:
+        """Summary dict: the cached AI summary, else a template fallback."""
+        if cached_summary and cached_summary.get("ai_summary"):
+            summary_payload = {
+                "text": cached_summary.get("ai_summary"),
+                "ai_generated": True,
+                "generation_method": cached_summary.get("generation_method"),
+                "generated_at": cached_summary.get("generation_timestamp"),
+                "model_used": cached_summary.get("model_used"),
+                "tokens_used": cached_summary.get("tokens_used"),
+                "confidence_score": cached_summary.get("confidence_score"),
+            }
+        else:
+            readme_content = ""
+            if cache_key and repo.has_readme:
+                readme_content = self.cache.get(
+                    "readme", self.username, repo=repo.name, week=cache_key
+                ) or ""
+            fallback_summary = summarizer.summarize_repository(
+                repo=repo,
+                readme_content=readme_content or None,
+                commit_history=commit_history,
+                language_stats=repo.language_stats,
+                tech_stack=tech_stack,
+                repository_owner=self.username,
+                repo_pushed_at=repo.pushed_at,
+                write_cache=False,
+                allow_ai=False,
+            )
+            summary_payload = {
+                "text": fallback_summary.summary,
+                "ai_generated": fallback_summary.is_ai_generated,
+                "generation_method": fallback_summary.generation_method,
+                "generated_at": (
+                    fallback_summary.generation_timestamp.isoformat()
+                    if fallback_summary.generation_timestamp
+                    else None
+                ),
+                "model_used": fallback_summary.model_used,
+                "tokens_used": fallback_summary.tokens_used,
+                "confidence_score": fallback_summary.confidence_score,
+            }
+        return summary_payload
+
     def save(self, unified_data: Optional[Dict[str, Any]] = None) -> tuple[Path, bool]:
         """Generate and save unified data to repositories.json file.
         
-        Phase 4: Output generation (no cache operations).
+        Phase 4: Output generation (no cache operations). Closes the
+        fetcher when done.
         
         Args:
             unified_data: Optional pre-generated data dict.
-                         If None, will call generate().
+                         If None, will call generate() and stream each
+                         repository to the file as it is assembled.
                          
         Returns:
             Tuple of (Path to saved JSON file, generation skipped flag)
         """
-        if unified_data is None:
-            unified_data = self.generate()
+        try:
+            if unified_data is None:
+                unified_data = self.generate(stream=True)
+            return self.write(unified_data), False
+        finally:
+            self.close()
 
-        # Ensure output directory exists
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+    def write(self, unified_data: Dict[str, Any]) -> Path:
+        """Write repositories.json atomically, plus the configured variants.
         
-        # Write JSON file
+        Variants (``dashboard.performance.json_variants``) are minified and
+        pre-compressed copies for the static site; see spark.json_writer.
+        With ``dashboard.performance.sharded_output`` the dashboard index,
+        detail files and manifest are written in the same pass; see
+        spark.data_shards.
+        
+        Returns:
+            Path to the written JSON file
+        """
         output_path = self.output_dir / "repositories.json"
         logger.info(f"Writing unified data to {output_path}...")
+        variants = self.config.get("dashboard.performance.json_variants", []) or []
+        shards = ShardWriter(self.output_dir) if self.config.get("dashboard.performance.sharded_output", False) else None
 
         try:
-            import json
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(unified_data, f, indent=2, ensure_ascii=False)
-            
-            file_size = output_path.stat().st_size
-            file_size_kb = file_size / 1024
-            logger.info(f"Unified data written successfully ({file_size_kb:.2f} KB)")
-            
-            return output_path, False
-            
+            if shards is not None:
+                unified_data = {**unified_data, "repositories": shards.tee(unified_data["repositories"])}
+            stats = write_json(output_path, unified_data, variants=variants)
+            if shards is not None:
+                manifest = shards.finish(unified_data["profile"], unified_data["metadata"])
         except Exception as e:
+            if shards is not None:
+                shards.discard()
             logger.error(f"Failed to write unified data: {e}")
             raise
 
+        logger.info(f"Unified data written successfully ({stats.bytes / 1024:.2f} KB)")
+        logger.info("  Sections: " + ", ".join(
+            f"{name} {size / 1024:.1f} KB" for name, size in stats.sections.items()
+        ))
+        for name, size in stats.variants.items():
+            logger.info(f"  {name}: {size / 1024:.2f} KB")
+        if shards is not None:
+            shard_stats = shards.stats()
+            logger.info(f"  Dashboard index: {manifest['index']['bytes'] / 1024:.2f} KB, "
+                       f"{shard_stats['details']} detail files ({shard_stats['detail_bytes'] / 1024:.2f} KB)")
+        return output_path
+
 
+def _then(items: Iterable[Any], callback: Callable[[int], None]) -> Iterator[Any]:
+    """Yield ``items``, then call ``callback`` with how many were yielded."""
+    count = 0
+    for item in items:
+        count += 1
+        yield item
+    callback(count)
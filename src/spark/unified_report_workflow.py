@@ -236,7 +236,7 @@ class UnifiedReportWorkflow:
                                 repo.name,
                                 repo_pushed_at=repo.pushed_at,
                             )
-                    commits_data["repository_name"] = repo.name
+                    commits_data = {**commits_data, "repository_name": repo.name}
                     commit_histories[repo.name] = CommitHistory.from_dict(commits_data)
                 except Exception as e:
                     self.logger.warn(f"Failed to fetch commits for {repo.name}: {e}")
@@ -0,0 +1,232 @@
+"""Unit tests for the async fetch backend against a local mock GitHub server."""
+
+import base64
+import json
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from spark.async_fetcher import AsyncGitHubFetcher  # noqa: E402
+from spark.cache import APICache  # noqa: E402
+from spark.rate_limit import RateLimitGovernor  # noqa: E402
+from spark.time_utils import sanitize_timestamp_for_filename  # noqa: E402
+
+NOW = datetime.now(timezone.utc)
+PUSHED_AT = "2025-12-28T15:30:00Z"
+
+
+def _commit(index, days_ago):
+    date = (NOW - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {"sha": f"sha{index:04d}", "commit": {"author": {"name": "dev", "date": date}, "message": f"commit {index}"}}
+
+
+class MockGitHub:
+    """Routes and recorded requests for the mock REST API."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.activity_polls = 0
+        self.repos = [{"name": f"repo{i}", "full_name": f"octo/repo{i}", "pushed_at": PUSHED_AT} for i in range(150)]
+        # 150 commits, one every two days (half a day off the window boundaries)
+        self.commits = [_commit(i, days_ago=i * 2 + 0.5) for i in range(150)]
+
+    def handle(self, handler):
+        url = urlparse(handler.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with self.lock:
+            self.requests.append(url.path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return self.route(handler, url.path, query)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def route(self, handler, path, query):
+        page = int(query.get("page", 1))
+        per_page = int(query.get("per_page", 30))
+
+        if path == "/users/octo/repos":
+            if handler.headers.get("If-None-Match") == f'"page{page}"':
+                return 304, None, {"ETag": f'"page{page}"'}
+            return self.paginated(path, self.repos, page, per_page, {"ETag": f'"page{page}"'})
+        if path.endswith("/languages"):
+            return 200, {"Python": 1000, "Shell": 10}, {}
+        if path.endswith("/readme"):
+            if "/empty/" in path:
+                return 404, {"message": "Not Found"}, {}
+            return 200, {"content": base64.b64encode(b"# Proj").decode(), "encoding": "base64"}, {}
+        if path.endswith("/stats/commit_activity"):
+            self.activity_polls += 1
+            if self.activity_polls == 1:
+                return 202, {}, {}
+            return 200, self.weekly_activity(), {}
+        if path.endswith("/commits"):
+            commits = self.commits
+            if "since" in query:
+                since = datetime.fromisoformat(query["since"])
+                commits = [c for c in commits if datetime.fromisoformat(c["commit"]["author"]["date"].replace("Z", "+00:00")) >= since]
+            return self.paginated(path, commits, page, per_page, {})
+        if "/commits/" in path:
+            sha = path.rsplit("/", 1)[1]
+            # Slow enough for concurrent requests to overlap
+            time.sleep(0.02)
+            commit = next(c for c in self.commits if c["sha"] == sha)
+            return 200, {**commit, "stats": {"total": 3, "additions": 2, "deletions": 1}}, {}
+        return 404, {"message": "Not Found"}, {}
+
+    def paginated(self, path, items, page, per_page, headers):
+        body = items[(page - 1) * per_page:page * per_page]
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        if page < last:
+            links.append(f'<{self.base_url}{path}?per_page={per_page}&page={page + 1}>; rel="next"')
+        links.append(f'<{self.base_url}{path}?per_page={per_page}&page={last}>; rel="last"')
+        return 200, body, {**headers, "Link": ", ".join(links)}
+
+    def weekly_activity(self):
+        start = (NOW - timedelta(days=364)).replace(hour=0, minute=0, second=0, microsecond=0)
+        weeks = []
+        for w in range(53):
+            week_start = start + timedelta(days=7 * w)
+            days = [0] * 7
+            for commit in self.commits:
+                date = datetime.fromisoformat(commit["commit"]["author"]["date"].replace("Z", "+00:00"))
+                offset = (date - week_start).days
+                if date >= week_start and offset < 7:
+                    days[offset] += 1
+            weeks.append({"week": int(week_start.timestamp()), "days": days, "total": sum(days)})
+        return weeks
+
+
+@pytest.fixture
+def server():
+    mock = MockGitHub()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            status, body, headers = mock.handle(self)
+            payload = json.dumps(body).encode() if body is not None else b""
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    mock.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield mock
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def fetcher(server):
+    temp_dir = tempfile.mkdtemp()
+    fetcher = AsyncGitHubFetcher(
+        token="test-token",
+        cache=APICache(cache_dir=temp_dir),
+        use_cache_status=False,
+        concurrency=8,
+        base_url=server.base_url,
+    )
+    fetcher.governor = RateLimitGovernor()
+    fetcher.commit_counter.poll_interval = 0
+    yield fetcher
+    fetcher.close()
+    shutil.rmtree(temp_dir)
+
+
+class TestAsyncFetcher:
+    """Test GitHubFetcher-compatible methods over the async client."""
+
+    def test_repository_listing_and_revalidation(self, fetcher, server):
+        repos = fetcher.fetch_repositories("octo")
+
+        assert [r["name"] for r in repos] == [f"repo{i}" for i in range(150)]
+        assert fetcher.request_stats["fetched"] == 2
+
+        fetcher.fetch_repositories("octo", revalidate=True)
+        assert fetcher.request_stats["not_modified"] == 2
+
+    def test_languages_and_readme(self, fetcher):
+        assert fetcher.fetch_languages("octo", "proj") == {"Python": 1000, "Shell": 10}
+        assert fetcher.fetch_readme("octo", "proj") == "# Proj"
+        assert fetcher.fetch_readme("octo", "empty") is None
+
+    def test_commit_counts_from_activity(self, fetcher, server):
+        counts = fetcher.fetch_commit_counts("octo", "proj")
+
+        assert counts["total"] == 150
+        assert counts["recent_90d"] == 45
+        assert counts["recent_180d"] == 90
+        assert counts["recent_365d"] == 150
+        assert server.activity_polls == 2
+
+    def test_commits_with_stats_run_concurrently(self, fetcher, server):
+        pushed_at = datetime(2025, 12, 28, tzinfo=timezone.utc)
+        # Listed repositories resolve to handles without a lookup request
+        fetcher.repo_handles.seed("octo", [{"name": "proj"}])
+
+        commits = fetcher.fetch_commits_with_stats("octo", "proj", max_commits=60, repo_pushed_at=pushed_at)
+
+        assert [c["sha"] for c in commits] == [f"sha{i:04d}" for i in range(60)]
+        assert commits[0]["stats"] == {"total": 3, "additions": 2, "deletions": 1}
+        assert commits[0]["commit"]["author"]["date"].endswith("+00:00")
+        assert server.max_in_flight > 1
+        week = sanitize_timestamp_for_filename(pushed_at)
+        assert fetcher.cache.get("commits_stats", "octo", repo="proj", week=week) == commits
+
+    def test_prefetch_fills_cache_categories(self, fetcher):
+        repos = [{"name": "proj", "pushed_at": PUSHED_AT}, {"name": "empty", "pushed_at": PUSHED_AT}]
+
+        written = fetcher.prefetch_repository_data("octo", repos)
+
+        assert written == {"languages": 2, "readme": 2, "commit_counts": 2}
+        week = sanitize_timestamp_for_filename(datetime(2025, 12, 28, 15, 30, tzinfo=timezone.utc))
+        assert fetcher.cache.get("readme", "octo", repo="empty", week=week) == ""
+        assert fetcher.cache.get("languages", "octo", repo="proj", week=week) == {"Python": 1000, "Shell": 10}
+
+    def test_prefetch_survives_failing_jobs(self, fetcher):
+        repos = [{"name": "proj", "pushed_at": PUSHED_AT}, {"name": "empty", "pushed_at": PUSHED_AT}]
+        fetch_languages = fetcher.fetch_languages_async
+
+        async def flaky_languages(username, repo_name):
+            if repo_name == "empty":
+                raise ValueError("malformed response")
+            return await fetch_languages(username, repo_name)
+
+        fetcher.fetch_languages_async = flaky_languages
+
+        written = fetcher.prefetch_repository_data("octo", repos)
+
+        assert written == {"languages": 1, "readme": 2, "commit_counts": 2}
+        week = sanitize_timestamp_for_filename(datetime(2025, 12, 28, 15, 30, tzinfo=timezone.utc))
+        assert not fetcher.cache.has_entry("languages", "octo", repo="empty", week=week)
+
+    def test_close_stops_loop_and_is_idempotent(self, fetcher):
+        fetcher.close()
+        fetcher.close()
+
+        assert not fetcher._loop_thread.is_alive()
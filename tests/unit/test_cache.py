@@ -1,11 +1,21 @@
 """Unit tests for APICache."""
 
+import copy
+import json
+import pickle
 import pytest
 import tempfile
 import shutil
 from pathlib import Path
 
-from spark.cache import APICache
+from spark.cache import APICache, split_entry
+from spark.config import SparkConfig
+
+
+def _config(**cache_settings):
+    config = SparkConfig()
+    config.config = {"cache": cache_settings}
+    return config
 
 
 class TestAPICache:
@@ -87,3 +97,152 @@ class TestAPICache:
         
         entry = cache.get_entry_info("cat", "owner", repo="repo")
         assert "2026W01" not in entry["weeks"]
+
+
+class TestMemoryLayer:
+    """Test the in-memory read layer in front of the storage backend."""
+
+    @pytest.fixture
+    def temp_cache_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    def test_repeated_reads_hit_memory(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir)
+        cache.set("cat", "owner", {"a": 1}, repo="repo", week="2026W01")
+        reads = []
+        read = cache.backend.read
+        cache.backend.read = lambda *args: reads.append(args) or read(*args)
+
+        for _ in range(3):
+            assert cache.get("cat", "owner", repo="repo", week="2026W01") == {"a": 1}
+        assert cache.get_metadata("cat", "owner", repo="repo", week="2026W01") == {}
+
+        assert len(reads) == 1
+        stats = cache.memory_stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+
+    def test_returned_values_are_shared_and_read_only(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir)
+        cache.set("cat", "owner", {"items": [1, 2]}, repo="repo", week="2026W01")
+
+        value = cache.get("cat", "owner", repo="repo", week="2026W01")
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") is value
+        with pytest.raises(TypeError):
+            value["items"].append(3)
+        with pytest.raises(TypeError):
+            value["extra"] = 1
+
+        # Deep copies are plain, mutable containers
+        copied = copy.deepcopy(value)
+        copied["items"].append(3)
+        assert type(copied) is dict and type(copied["items"]) is list
+        assert json.loads(json.dumps(value)) == {"items": [1, 2]}
+
+        # Shallow copies and pickle round trips work and are plain too
+        shallow = copy.copy(value)
+        shallow["extra"] = 1
+        assert type(shallow) is dict and copy.copy(value["items"]) == [1, 2]
+        unpickled = pickle.loads(pickle.dumps(value))
+        unpickled["items"].append(3)
+        assert type(unpickled) is dict and type(unpickled["items"]) is list
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") == {"items": [1, 2]}
+
+    def test_set_prune_and_clear_invalidate(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir)
+        cache.set("cat", "owner", "v1", repo="repo", week="2026W01")
+        assert cache.get("cat", "owner", repo="repo") == "v1"
+
+        cache.set("cat", "owner", "v2", repo="repo", week="2026W02")
+        assert cache.get("cat", "owner", repo="repo") == "v2"
+
+        cache.set("cat", "owner", "v3", repo="repo", week="2026W03")
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") == "v1"
+        cache.prune(keep_weeks=2)
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") is None
+
+        cache.clear()
+        assert cache.get("cat", "owner", repo="repo") is None
+        assert cache.memory_stats()["entries"] == 0
+
+    def test_byte_budget_evicts_least_recently_used(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, config=_config(memory_budget_mb=0.001))
+        for index in range(3):
+            cache.set("cat", "owner", "x" * 300, repo=f"repo{index}", week="2026W01")
+            cache.get("cat", "owner", repo=f"repo{index}", week="2026W01")
+
+        stats = cache.memory_stats()
+        assert stats["bytes"] <= stats["max_bytes"]
+        assert stats["evictions"] >= 1
+        assert cache.get("cat", "owner", repo="repo0", week="2026W01") == "x" * 300
+
+    def test_zero_budget_disables_layer(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, config=_config(memory_budget_mb=0))
+        cache.set("cat", "owner", "v", repo="repo", week="2026W01")
+
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") == "v"
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") == "v"
+        assert cache.memory_stats()["hits"] == 0
+
+
+class TestIntegrity:
+    """Test format-2 entries and configurable verification."""
+
+    @pytest.fixture
+    def temp_cache_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    def _tamper(self, cache):
+        key, week = "owner/repo/cat", "2026W01"
+        raw = cache.backend.read(key, week)
+        cache.backend.write(key, week, raw.replace(b'"v1"', b'"v9"'))
+        cache.memory.clear()
+
+    def test_digest_covers_stored_bytes(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir)
+        cache.set("cat", "owner", "v1", repo="repo", week="2026W01")
+
+        header, offset = split_entry(cache.backend.read("owner/repo/cat", "2026W01"))
+        assert header["sha256"]
+        self._tamper(cache)
+
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") is None
+        assert not cache.has_entry("cat", "owner", repo="repo", week="2026W01")
+
+    def test_legacy_entries_still_verify(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir)
+        legacy = {"value": {"a": 1}, "hash": cache._calculate_hash({"a": 1}), "metadata": {}}
+        cache.backend.write("owner/repo/cat", "2026W01", json.dumps(legacy).encode("utf-8"))
+
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") == {"a": 1}
+
+    def test_sweep_mode_skips_read_checks_until_verify(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, config=_config(integrity="sweep"))
+        cache.set("cat", "owner", "v1", repo="repo", week="2026W01")
+        cache.set("cat", "owner", "ok", repo="repo2", week="2026W01")
+        self._tamper(cache)
+
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") == "v9"
+        assert cache.verify() == {"checked": 2, "corrupt": 1, "legacy": 0}
+        assert not cache.has_entry("cat", "owner", repo="repo", week="2026W01")
+        assert cache.get("cat", "owner", repo="repo2") == "ok"
+
+    def test_first_read_verifies_once_per_entry(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, config=_config(integrity="first_read", memory_budget_mb=0))
+        cache.set("cat", "owner", "v1", repo="repo", week="2026W01")
+        checks = []
+        should_verify = cache._should_verify
+        cache._should_verify = lambda *args: checks.append(should_verify(*args)) or checks[-1]
+
+        for _ in range(3):
+            assert cache.get("cat", "owner", repo="repo", week="2026W01") == "v1"
+
+        assert checks == [True, False, False]
+
+    def test_unknown_mode_is_rejected(self, temp_cache_dir):
+        with pytest.raises(ValueError):
+            APICache(cache_dir=temp_cache_dir, config=_config(integrity="never"))
@@ -0,0 +1,385 @@
+"""Unit tests for APICache storage backends."""
+
+import hashlib
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import spark.cache
+from spark.cache import APICache
+from spark.cache_backends import SQLITE_FILENAME
+from spark.cache_benchmark import run_benchmark
+
+
+@pytest.fixture
+def temp_cache_dir():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def cache(request, temp_cache_dir):
+    cache = APICache(cache_dir=temp_cache_dir, backend=request.param)
+    yield cache
+    cache.close()
+
+
+class TestBackendParity:
+    """The same APICache behaviour on every backend."""
+
+    def test_set_get_and_metadata(self, cache):
+        cache.set("languages", "owner", {"Python": 10}, repo="repo", week="2026W01", metadata={"source": "rest"})
+
+        assert cache.get("languages", "owner", repo="repo") == {"Python": 10}
+        assert cache.get_metadata("languages", "owner", repo="repo", week="2026W01") == {"source": "rest"}
+        assert cache.get("languages", "owner", repo="other") is None
+
+    def test_entry_info_orders_weeks_newest_first(self, cache):
+        for week in ("2026W02", "2026W03", "2026W01"):
+            cache.set("cat", "owner", week, repo="repo", week=week)
+
+        entry = cache.get_entry_info("cat", "owner", repo="repo")
+        assert entry["weeks"] == ["2026W03", "2026W02", "2026W01"]
+        assert entry["latest_week"] == "2026W03"
+        assert entry["updated_at"]
+        assert cache.has_entry("cat", "owner", repo="repo", week="2026W02")
+        assert not cache.has_entry("cat", "owner", repo="repo", week="2026W04")
+
+    def test_prune_delete_and_repository_clear(self, cache):
+        for week in ("2026W01", "2026W02", "2026W03"):
+            cache.set("cat", "owner", week, repo="repo", week=week)
+        cache.set("other", "owner", "x", repo="repo", week="2026W01")
+        cache.set("cat", "owner", "y", repo="repo2", week="2026W01")
+        cache.set("repositories", "owner", ["repo"])
+
+        cache.prune(keep_weeks=2)
+        assert cache.get_entry_info("cat", "owner", repo="repo")["weeks"] == ["2026W03", "2026W02"]
+
+        assert cache.delete("repositories", "owner")
+        assert not cache.has_entry("repositories", "owner")
+
+        assert cache.clear_repository_cache("owner", "repo") == 3
+        assert cache.get_entry_info("cat", "owner", repo="repo") is None
+        assert cache.get("cat", "owner", repo="repo2") == "y"
+
+        cache.clear()
+        assert cache.info()["entries"] == 0
+
+    def test_concurrent_writers(self, cache):
+        def write(index):
+            for week in range(10):
+                cache.set("cat", "owner", [index, week], repo=f"repo{index}", week=f"2026W{week:02d}")
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.info()["entries"] == 40
+        assert cache.get("cat", "owner", repo="repo3") == [3, 9]
+
+
+class TestSQLiteBackend:
+    """Test SQLite-specific storage."""
+
+    def test_single_database_file_in_wal_mode(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, backend="sqlite")
+        cache.set("cat", "owner", "value", repo="repo", week="2026W01")
+        cache.close()
+
+        db_path = Path(temp_cache_dir) / SQLITE_FILENAME
+        assert not (Path(temp_cache_dir) / "owner").exists()
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        reopened = APICache(cache_dir=temp_cache_dir, backend="sqlite")
+        assert reopened.get("cat", "owner", repo="repo") == "value"
+        reopened.close()
+
+    def test_corrupt_entry_is_discarded(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, backend="sqlite")
+        cache.set("cat", "owner", "value", repo="repo", week="2026W01")
+        cache.backend.write("owner/repo/cat", "2026W01", b"{not json")
+
+        assert cache.get("cat", "owner", repo="repo") is None
+        assert not cache.has_entry("cat", "owner", repo="repo")
+        cache.close()
+
+    def test_unknown_backend_is_rejected(self, temp_cache_dir):
+        with pytest.raises(ValueError):
+            APICache(cache_dir=temp_cache_dir, backend="redis")
+
+
+class TestMigration:
+    """Test copying a directory-layout cache into SQLite."""
+
+    def test_migrate_files_to_sqlite_preserves_entries(self, temp_cache_dir):
+        files_cache = APICache(cache_dir=temp_cache_dir, backend="files")
+        files_cache.set("languages", "owner", {"Go": 5}, repo="repo", week="2026W01", metadata={"source": "graphql"})
+        files_cache.set("languages", "owner", {"Go": 6}, repo="repo", week="2026W02")
+        files_cache.set("repositories", "owner", [{"name": "repo"}])
+        updated_at = files_cache.get_entry_info("languages", "owner", repo="repo")["updated_at"]
+
+        results = files_cache.migrate_to("sqlite")
+
+        assert results == {"keys": 2, "entries": 3, "blobs": 0, "missing": 0}
+        sqlite_cache = APICache(cache_dir=temp_cache_dir, backend="sqlite")
+        entry = sqlite_cache.get_entry_info("languages", "owner", repo="repo")
+        assert entry["weeks"] == ["2026W02", "2026W01"]
+        assert entry["updated_at"] == updated_at
+        assert sqlite_cache.get_metadata("languages", "owner", repo="repo", week="2026W01") == {"source": "graphql"}
+        assert sqlite_cache.get("repositories", "owner") == [{"name": "repo"}]
+        sqlite_cache.close()
+
+        # Source layout is left untouched
+        assert files_cache.get("languages", "owner", repo="repo") == {"Go": 6}
+
+    def test_migrate_to_same_backend_is_rejected(self, temp_cache_dir):
+        with pytest.raises(ValueError):
+            APICache(cache_dir=temp_cache_dir, backend="files").migrate_to("files")
+
+
+class TestBenchmark:
+    """Smoke test the backend benchmark."""
+
+    def test_benchmark_reports_every_backend(self):
+        results = run_benchmark(repositories=2)
+
+        assert [r["backend"] for r in results] == ["files", "sqlite"]
+        for result in results:
+            assert result["entries"] == 10
+            assert result["bytes"] > 0
+            assert set(result["ops_per_sec"]) == {"set", "batched_set", "get", "has_entry", "get_entry_info"}
+
+
+class TestBatchesAndKeyLocks:
+    """Test batched manifest writes and per-key locking."""
+
+    def test_batch_persists_manifest_once(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, backend="files")
+        other = APICache(cache_dir=temp_cache_dir, backend="files")
+        before = cache.backend.manifest_writes
+
+        with cache.batch():
+            for index in range(20):
+                cache.set("cat", "owner", index, repo=f"repo{index}", week="2026W01")
+            # Visible here at once, persisted only when the batch ends
+            assert cache.get("cat", "owner", repo="repo7") == 7
+            assert not other.has_entry("cat", "owner", repo="repo7")
+
+        assert cache.backend.manifest_writes - before == 1
+        assert other.get("cat", "owner", repo="repo7") == 7
+
+    def test_instances_merge_manifest_changes(self, temp_cache_dir):
+        first = APICache(cache_dir=temp_cache_dir, backend="files")
+        second = APICache(cache_dir=temp_cache_dir, backend="files")
+
+        with first.batch():
+            first.set("cat", "owner", "a", repo="a", week="2026W01")
+            second.set("cat", "owner", "b", repo="b", week="2026W01")
+
+        third = APICache(cache_dir=temp_cache_dir, backend="files")
+        assert third.get("cat", "owner", repo="a") == "a"
+        assert third.get("cat", "owner", repo="b") == "b"
+
+    def test_writes_to_other_keys_do_not_wait(self, cache):
+        done = threading.Event()
+
+        def write_other_key():
+            cache.set("cat", "owner", "b", repo="b", week="2026W01")
+            done.set()
+
+        with cache._key_lock("owner/a/cat"):
+            thread = threading.Thread(target=write_other_key)
+            thread.start()
+            assert done.wait(timeout=5)
+        thread.join()
+        assert cache.get("cat", "owner", repo="b") == "b"
+
+
+class TestBlobStore:
+    """Test content-addressed storage of large values."""
+
+    # Incompressible enough to exceed blob_min_bytes under json+gzip
+    README = "# Project\n" + "\n".join(hashlib.sha256(str(n).encode()).hexdigest() for n in range(100))
+
+    def test_has_content_does_not_read_blobs(self, cache, monkeypatch):
+        cache.set("readme", "owner", self.README, repo="a", week="2026W01")
+        cache.set("readme", "owner", "", repo="b", week="2026W01")
+        monkeypatch.setattr(cache.backend, "read_blob", lambda digest: pytest.fail("blob read"))
+
+        assert cache.has_content("readme", "owner", repo="a", week="2026W01")
+        assert not cache.has_content("readme", "owner", repo="b", week="2026W01")
+        assert not cache.has_content("readme", "owner", repo="c", week="2026W01")
+
+    def test_identical_values_share_one_blob(self, cache):
+        cache.set("readme", "owner", self.README, repo="a", week="2026W01")
+        cache.set("readme", "owner", self.README, repo="a", week="2026W02", metadata={"source": "rest"})
+        cache.set("readme", "owner", self.README, repo="b", week="2026W01")
+        cache.set("languages", "owner", {"Python": 10}, repo="a", week="2026W01")
+
+        info = cache.info()
+        assert info["entries"] == 4
+        assert info["blobs"] == 1
+        assert cache.get("readme", "owner", repo="b") == self.README
+        assert cache.get_metadata("readme", "owner", repo="a", week="2026W02") == {"source": "rest"}
+        # Small values stay inline
+        assert cache.get("languages", "owner", repo="a") == {"Python": 10}
+
+    def test_prune_collects_unreferenced_blobs(self, cache, monkeypatch):
+        for index, week in enumerate(("2026W01", "2026W02", "2026W03")):
+            cache.set("readme", "owner", self.README + str(index), repo="repo", week=week)
+
+        # Freshly written blobs are within the grace period
+        results = cache.prune(keep_weeks=2)
+        assert (results["entries"], results["blobs"]) == (1, 0)
+        assert cache.info()["blobs"] == 3
+
+        monkeypatch.setattr(spark.cache, "BLOB_GC_GRACE_SECONDS", -1)
+        results = cache.prune(keep_weeks=2)
+        assert results["blobs"] == 1 and results["blob_bytes"] > 0
+        assert cache.info()["blobs"] == 2
+        assert cache.get("readme", "owner", repo="repo", week="2026W02") == self.README + "1"
+
+    def test_prune_does_not_block_writers(self, cache):
+        cache.set("readme", "owner", self.README, repo="a", week="2026W01")
+        pruned = threading.Event()
+        written = threading.Event()
+
+        def prune():
+            cache.prune(keep_weeks=2)
+            pruned.set()
+
+        def write_other_key():
+            cache.set("readme", "owner", self.README + "b", repo="b", week="2026W01")
+            written.set()
+
+        # An in-flight write to "a" holds its key lock while prune marks blobs
+        with cache._key_lock("owner/a/readme"):
+            threading.Thread(target=prune, daemon=True).start()
+            time.sleep(0.2)
+            threading.Thread(target=write_other_key, daemon=True).start()
+            assert written.wait(timeout=5)
+        assert pruned.wait(timeout=5)
+        assert cache.get("readme", "owner", repo="b") == self.README + "b"
+
+    def test_corrupt_blob_is_discarded_and_rewritten(self, cache):
+        cache.set("readme", "owner", self.README, repo="repo", week="2026W01")
+        (digest,) = cache.backend.blob_digests()
+        cache.backend.delete_blob(digest, written_before=float("inf"))
+        cache.backend.write_blob(digest, b"garbage")
+
+        assert cache.get("readme", "owner", repo="repo") is None
+        assert not cache.has_entry("readme", "owner", repo="repo")
+        assert cache.backend.blob_digests() == []
+
+        cache.set("readme", "owner", self.README, repo="repo", week="2026W01")
+        assert cache.get("readme", "owner", repo="repo") == self.README
+
+    def test_migration_copies_blobs(self, temp_cache_dir):
+        files_cache = APICache(cache_dir=temp_cache_dir, backend="files")
+        files_cache.set("readme", "owner", self.README, repo="repo", week="2026W01")
+
+        assert files_cache.migrate_to("sqlite")["blobs"] == 1
+        sqlite_cache = APICache(cache_dir=temp_cache_dir, backend="sqlite")
+        assert sqlite_cache.get("readme", "owner", repo="repo") == self.README
+        sqlite_cache.close()
+
+
+class TestEviction:
+    """Test byte-budget eviction in prune."""
+
+    @staticmethod
+    def _fill(cache, repos=4, weeks=3):
+        for index in range(repos):
+            for week in range(1, weeks + 1):
+                value = "x" * 500 + f"{index}-{week}"
+                cache.set("languages", "owner", value, repo=f"repo{index}", week=f"2026W{week:02d}")
+
+    def test_read_times_are_recorded(self, cache):
+        self._fill(cache, repos=1, weeks=2)
+        cache.get("languages", "owner", repo="repo0")
+        cache.get("languages", "owner", repo="repo0", week="2026W01")
+
+        assert cache.flush_reads() == 2
+        read_at = cache.get_entry_info("languages", "owner", repo="repo0")["read_at"]
+        assert set(read_at) == {"2026W01", "2026W02"}
+
+    def test_read_times_survive_concurrent_flushes(self, cache):
+        self._fill(cache, repos=8, weeks=1)
+        stop = threading.Event()
+
+        def flush_repeatedly():
+            while not stop.is_set():
+                cache.flush_reads()
+
+        flusher = threading.Thread(target=flush_repeatedly)
+        flusher.start()
+        try:
+            for _ in range(50):
+                for index in range(8):
+                    cache.get("languages", "owner", repo=f"repo{index}", week="2026W01")
+        finally:
+            stop.set()
+            flusher.join()
+        cache.flush_reads()
+
+        for index in range(8):
+            assert "2026W01" in cache.get_entry_info("languages", "owner", repo=f"repo{index}")["read_at"]
+
+    def test_budget_evicts_least_recently_read_and_protects_latest(self, cache):
+        self._fill(cache)
+        # Older weeks of repo0 and repo1 were read recently
+        for index in (0, 1):
+            for week in ("2026W01", "2026W02"):
+                cache.get("languages", "owner", repo=f"repo{index}", week=week)
+
+        entry_bytes = cache.info()["bytes"] // 12
+        results = cache.prune(keep_weeks=3, max_bytes=entry_bytes * 8)
+
+        assert results["entries"] == 4
+        assert {(item["key"], item["week"]) for item in results["evicted"]} == {
+            (f"owner/repo{index}/languages", week) for index in (2, 3) for week in ("2026W01", "2026W02")
+        }
+        assert {item["reason"] for item in results["evicted"]} == {"total_budget"}
+        assert not results["over_budget"]
+        for index in range(4):
+            assert cache.has_entry("languages", "owner", repo=f"repo{index}", week="2026W03")
+
+    def test_dry_run_changes_nothing(self, cache):
+        self._fill(cache)
+        before = cache.info()["entries"]
+
+        results = cache.prune(keep_weeks=1, dry_run=True)
+
+        assert results["entries"] == 8
+        assert {item["reason"] for item in results["evicted"]} == {"keep_weeks"}
+        assert cache.info()["entries"] == before
+
+    def test_category_budget_and_protected_overflow(self, cache):
+        self._fill(cache, repos=2, weeks=2)
+        cache.set("readme", "owner", "small", repo="repo0", week="2026W01")
+
+        results = cache.prune(keep_weeks=2, category_max_bytes={"languages": 1})
+
+        assert results["entries"] == 2
+        assert {item["reason"] for item in results["evicted"]} == {"category_budget:languages"}
+        assert results["over_budget"]
+        assert cache.get("readme", "owner", repo="repo0") == "small"
+
+    def test_budgets_come_from_config(self, temp_cache_dir):
+        from spark.config import SparkConfig
+
+        config = SparkConfig()
+        config.config = {"cache": {"eviction": {"keep_weeks": 1}}}
+        cache = APICache(cache_dir=temp_cache_dir, config=config)
+        self._fill(cache, repos=1)
+
+        assert cache.prune()["entries"] == 2
@@ -0,0 +1,118 @@
+"""Unit tests for cache payload codecs."""
+
+import json
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from spark.cache import APICache, encode_entry, split_entry
+from spark.cache_codecs import CodecSelector, PayloadCodec, get_codec
+from spark.config import SparkConfig
+
+PAYLOAD = {"value": [{"sha": "abc", "stats": {"total": 3}}] * 20, "metadata": {"n": 1}}
+
+
+def _config(codecs, **cache_settings):
+    config = SparkConfig()
+    config.config = {"cache": {"codecs": codecs, **cache_settings}}
+    return config
+
+
+@pytest.fixture
+def temp_cache_dir():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+class TestPayloadCodec:
+    """Test codec round trips and spec parsing."""
+
+    @pytest.mark.parametrize("spec", ["json", "json+gzip", "orjson", "orjson+gzip", "msgpack", "json+zstd"])
+    def test_round_trip(self, spec):
+        try:
+            codec = PayloadCodec(spec)
+        except RuntimeError:
+            pytest.skip(f"optional package for {spec} not installed")
+
+        encoded = codec.encode(PAYLOAD)
+        payload, size = codec.decode(encoded)
+
+        assert payload == PAYLOAD
+        assert size >= len(encoded) or "+" not in spec
+
+    def test_shared_codec_round_trips_across_threads(self):
+        try:
+            codec = get_codec("json+zstd")
+        except RuntimeError:
+            pytest.skip("optional package for json+zstd not installed")
+        payloads = [{"value": [n] * 200, "metadata": {"n": n}} for n in range(64)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            decoded = list(pool.map(lambda payload: codec.decode(codec.encode(payload))[0], payloads))
+
+        assert decoded == payloads
+
+    def test_compression_shrinks_payload(self):
+        assert len(PayloadCodec("json+gzip").encode(PAYLOAD)) < len(PayloadCodec("json").encode(PAYLOAD)) / 4
+
+    def test_unknown_parts_are_rejected(self):
+        with pytest.raises(ValueError):
+            PayloadCodec("yaml")
+        with pytest.raises(ValueError):
+            PayloadCodec("json+lz4")
+
+    def test_selector_uses_default_for_unlisted_categories(self):
+        selector = CodecSelector({"default": "json", "readme": "json+gzip"})
+
+        assert selector.for_category("readme").name == "json+gzip"
+        assert selector.for_category("languages").name == "json"
+
+
+class TestCodecEntries:
+    """Test APICache reads and writes across codecs."""
+
+    def test_category_codec_is_recorded_in_header(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, config=_config({"commits_stats": "json+gzip"}))
+        cache.set("commits_stats", "owner", PAYLOAD["value"], repo="repo", week="2026W01")
+        cache.set("languages", "owner", {"Go": 1}, repo="repo", week="2026W01")
+
+        gz_header, _ = split_entry(cache.backend.read("owner/repo/commits_stats", "2026W01"))
+        json_header, _ = split_entry(cache.backend.read("owner/repo/languages", "2026W01"))
+        assert gz_header["codec"] == "json+gzip"
+        assert "codec" not in json_header
+
+    def test_old_and_new_formats_read_transparently(self, temp_cache_dir):
+        writer = APICache(cache_dir=temp_cache_dir, config=_config({"default": "json+gzip"}))
+        writer.set("cat", "owner", "gzipped", repo="a", week="2026W01")
+        legacy = {"value": "legacy", "hash": writer._calculate_hash("legacy"), "metadata": {}}
+        writer.backend.write("owner/b/cat", "2026W01", json.dumps(legacy, indent=2).encode("utf-8"))
+        writer.backend.write("owner/c/cat", "2026W01", encode_entry({"value": "plain", "metadata": {}}))
+
+        reader = APICache(cache_dir=temp_cache_dir, config=_config({"default": "json"}))
+
+        assert reader.get("cat", "owner", repo="a", week="2026W01") == "gzipped"
+        assert reader.get("cat", "owner", repo="b", week="2026W01") == "legacy"
+        assert reader.get("cat", "owner", repo="c", week="2026W01") == "plain"
+
+    def test_corrupt_compressed_body_is_discarded(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, config=_config({"default": "json+gzip"}, integrity="sweep"))
+        bad = encode_entry({"value": 1}, get_codec("json+gzip"))
+        cache.backend.write("owner/repo/cat", "2026W01", bad[:-8])
+
+        assert cache.get("cat", "owner", repo="repo", week="2026W01") is None
+        assert not cache.has_entry("cat", "owner", repo="repo", week="2026W01")
+
+    def test_codec_report_compares_against_json(self, temp_cache_dir):
+        cache = APICache(cache_dir=temp_cache_dir, config=_config({"commits_stats": "json+gzip"}))
+        for week in ("2026W01", "2026W02"):
+            cache.set("commits_stats", "owner", PAYLOAD["value"], repo="repo", week=week)
+
+        row = cache.codec_report()["commits_stats"]
+
+        assert row["codec"] == "json+gzip"
+        assert row["entries"] == 2
+        assert row["stored_bytes"] < row["json_bytes"]
+        assert row["decode_ms"] >= 0
@@ -0,0 +1,219 @@
+"""Unit tests for CacheManager refresh orchestration."""
+
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from github import GithubException
+
+from spark.cache import APICache
+from spark.cache_manager import CacheManager
+from spark.time_utils import sanitize_timestamp_for_filename
+
+
+class FakeCommitList(list):
+    """Minimal PyGithub PaginatedList stand-in."""
+
+    def get_page(self, page):
+        return self[page * 30:(page + 1) * 30]
+
+    @property
+    def totalCount(self):
+        return len(self)
+
+
+class FakeRepository:
+    """Minimal PyGithub Repository stand-in."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def get_commits(self):
+        date = datetime(2025, 12, 1, tzinfo=timezone.utc)
+        return FakeCommitList([SimpleNamespace(commit=SimpleNamespace(author=SimpleNamespace(date=date)))] * 3)
+
+    def get_languages(self):
+        return {"Python": 1000}
+
+    def get_license(self):
+        raise GithubException(404, {"message": "Not Found"}, None)
+
+    def get_workflows(self):
+        return SimpleNamespace(totalCount=1)
+
+    def get_contents(self, path):
+        return [SimpleNamespace(name="tests", type="dir")]
+
+
+class FakeGithub:
+    """Records which threads request repositories through this client."""
+
+    def __init__(self):
+        self.threads = set()
+        self.get_repo_calls = 0
+
+    def get_repo(self, full_name):
+        self.threads.add(threading.get_ident())
+        self.get_repo_calls += 1
+        return FakeRepository(full_name.split("/", 1)[1])
+
+    def create_from_raw_data(self, klass, raw_data):
+        self.threads.add(threading.get_ident())
+        return FakeRepository(raw_data["name"])
+
+
+@pytest.fixture
+def temp_cache():
+    temp_dir = tempfile.mkdtemp()
+    yield APICache(cache_dir=temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+def _repo_list(count):
+    return [
+        {"name": f"repo{i}", "pushed_at": "2025-12-28T15:30:00Z"}
+        for i in range(count)
+    ]
+
+
+class TestConcurrentRefresh:
+    """Test concurrent refresh in refresh_user_data."""
+
+    def test_concurrent_refresh_matches_sequential(self, temp_cache):
+        clients = []
+
+        def factory():
+            client = FakeGithub()
+            clients.append(client)
+            return client
+
+        main_client = FakeGithub()
+        manager = CacheManager(main_client, temp_cache, max_workers=4, client_factory=factory)
+
+        summary = manager.refresh_user_data("testuser", _repo_list(6))
+
+        assert summary.repos_refreshed == 6
+        assert summary.repos_failed == 0
+        assert summary.api_calls_made == 18
+        # Results stay grouped per repository in the sequential order
+        assert [r.category for r in summary.results[:3]] == ["commit_counts", "languages", "quality_indicators"]
+        assert [r.repo_name for r in summary.results[:3]] == ["repo0"] * 3
+        # Workers never touch the shared client, and each uses its own
+        assert main_client.threads == set()
+        assert clients and all(len(client.threads) == 1 for client in clients)
+
+        week = sanitize_timestamp_for_filename(datetime(2025, 12, 28, 15, 30, tzinfo=timezone.utc))
+        for i in range(6):
+            assert temp_cache.get("languages", "testuser", repo=f"repo{i}", week=week) == {"Python": 1000}
+            assert temp_cache.get("commit_counts", "testuser", repo=f"repo{i}", week=week)["total"] == 3
+
+    def test_without_client_factory_refresh_is_sequential(self, temp_cache):
+        manager = CacheManager(FakeGithub(), temp_cache, max_workers=8)
+
+        assert manager.max_workers == 1
+        summary = manager.refresh_user_data("testuser", _repo_list(2))
+
+        assert summary.repos_refreshed == 2
+        assert summary.api_calls_made == 6
+
+
+class TestRepositoryHandles:
+    """Test per-run repository handle reuse."""
+
+    def test_listed_repositories_are_never_looked_up(self, temp_cache):
+        client = FakeGithub()
+        manager = CacheManager(client, temp_cache)
+
+        manager.refresh_user_data("testuser", _repo_list(3))
+
+        assert client.get_repo_calls == 0
+        # Three categories per repository share one handle
+        assert manager.repo_handles.stats() == {"known": 3, "lookups": 0, "reused": 6}
+
+    def test_unlisted_repository_is_resolved_once(self, temp_cache):
+        client = FakeGithub()
+        manager = CacheManager(client, temp_cache)
+        pushed_at = datetime(2025, 12, 28, 15, 30, tzinfo=timezone.utc)
+
+        manager.refresh_repository("testuser", "unlisted", pushed_at)
+
+        assert client.get_repo_calls == 1
+
+
+class TestFreshnessCheck:
+    """Test manifest-only and deep validation in needs_refresh."""
+
+    def test_second_run_validates_from_manifest_without_reads(self, temp_cache):
+        manager = CacheManager(FakeGithub(), temp_cache)
+        manager.refresh_user_data("testuser", _repo_list(3))
+        reads = []
+        read = temp_cache.backend.read
+        temp_cache.backend.read = lambda *args: reads.append(args) or read(*args)
+
+        summary = manager.refresh_user_data("testuser", _repo_list(3))
+
+        assert summary.repos_unchanged == 3
+        assert reads == []
+
+    def test_deep_validate_treats_corrupt_entries_as_stale(self, temp_cache):
+        pushed_at = datetime(2025, 12, 28, 15, 30, tzinfo=timezone.utc)
+        week = sanitize_timestamp_for_filename(pushed_at)
+        temp_cache.set("languages", "testuser", {"Python": 1}, repo="repo0", week=week)
+        temp_cache.backend.write("testuser/repo0/languages", week, b"{corrupt")
+        temp_cache.memory.clear()
+
+        assert not CacheManager(FakeGithub(), temp_cache).needs_refresh("testuser", "repo0", "languages", pushed_at)
+        assert CacheManager(FakeGithub(), temp_cache, deep_validate=True).needs_refresh(
+            "testuser", "repo0", "languages", pushed_at
+        )
+
+
+class TestWarmUp:
+    """Test warm_user_data prioritisation and call budget."""
+
+    def _repos(self):
+        return [
+            {"name": "old", "pushed_at": "2025-01-05T10:00:00Z"},
+            {"name": "new", "pushed_at": "2025-12-28T15:30:00Z"},
+            {"name": "mid", "pushed_at": "2025-06-01T12:00:00Z"},
+        ]
+
+    def test_missing_entries_most_recent_first(self, temp_cache):
+        manager = CacheManager(FakeGithub(), temp_cache)
+        manager.refresh_user_data("testuser", self._repos()[2:])
+
+        summary = manager.warm_user_data("testuser", self._repos())
+
+        assert (summary.missing_repos, summary.warmed_repos, summary.deferred) == (2, 2, [])
+        assert summary.estimated_calls == 16
+        assert [r.repo_name for r in summary.refresh.results[::3]] == ["new", "old"]
+        assert manager.warm_user_data("testuser", self._repos()).missing_repos == 0
+
+    def test_budget_defers_lower_priority_repositories(self, temp_cache):
+        manager = CacheManager(FakeGithub(), temp_cache)
+
+        summary = manager.warm_user_data("testuser", self._repos(), max_api_calls=20)
+
+        assert (summary.warmed_repos, summary.estimated_calls, summary.budget) == (2, 16, 20)
+        assert summary.deferred == ["old"]
+        assert summary.refresh.repos_refreshed == 2
+
+    def test_observed_calls_stop_scheduling(self, temp_cache):
+        manager = CacheManager(FakeGithub(), temp_cache)
+        refresh_user_data = manager.refresh_user_data
+
+        def costly_refresh(*args, **kwargs):
+            # Each repository turns out to cost 20 requests, well over its estimate
+            summary = refresh_user_data(*args, **kwargs)
+            manager.governor.calls += 20
+            return summary
+
+        manager.refresh_user_data = costly_refresh
+
+        summary = manager.warm_user_data("testuser", self._repos(), max_api_calls=30)
+
+        assert summary.warmed_repos == 2
+        assert summary.deferred == ["old"]
@@ -249,3 +249,55 @@ class TestReleaseCadence:
         assert cadence["monthly"][-1]["repos"] == 2
         assert cadence["unique_repos"] == 3
         assert cadence["max_weekly"] >= cadence["weekly"][-1]["repos"]
+
+
+class TestCommitTable:
+    """Test the columnar commit table behind the statistics."""
+
+    def test_buckets_use_the_stored_offset(self):
+        """Days and hours follow the commit's own offset; the span uses absolute time."""
+        calculator = StatsCalculator({"username": "testuser"}, [])
+        calculator.add_commits([
+            {"sha": "a", "date": "2025-03-02T23:30:00-05:00", "repo": "repo-a"},
+            {"sha": "b", "date": "2025-03-03T04:30:00Z", "repo": "repo-b"},
+            {"sha": "c", "date": "2025-03-03T09:15:00+09:00", "repo": "repo-a"},
+            {"sha": "d", "date": None, "repo": "repo-c"},
+        ])
+
+        stats = calculator.calculate_statistics()
+
+        assert stats["commits_by_day"] == {"2025-03-02": 1, "2025-03-03": 2}
+        assert list(stats["time_pattern"]["hour_distribution"].items())[:3] == [(23, 1), (4, 1), (9, 1)]
+        assert stats["time_pattern"]["most_active_hour"] == 23
+        assert stats["total_commits"] == 4
+        # Sunday 2025-03-02 and Monday 2025-03-03 fall in different weeks
+        assert [point["repos"] for point in stats["release_cadence"]["weekly"][-2:]] == [1, 2]
+        assert stats["release_cadence"]["unique_repos"] == 2
+
+    def test_table_is_built_once_per_set_of_commits(self):
+        """The table is reused across methods and rebuilt after add_commits."""
+        calculator = StatsCalculator({"username": "testuser"}, [])
+        calculator.add_commits([{"sha": "a", "date": "2025-01-06T10:00:00Z", "repo": "repo-a"}])
+
+        calculator.calculate_statistics()
+        table = calculator._commit_table()
+        calculator.analyze_time_patterns()
+        assert calculator._commit_table() is table
+
+        calculator.add_commits([{"sha": "b", "date": "2025-01-07T10:00:00Z", "repo": "repo-a"}])
+        assert len(calculator._commit_table()) == 2
+        assert calculator.calculate_streaks()["longest_streak"] == 2
+
+    def test_unparsable_dates_are_skipped(self):
+        """Commits with invalid dates count towards totals but not time buckets."""
+        calculator = StatsCalculator({"username": "testuser"}, [])
+        calculator.add_commits([
+            {"sha": "a", "date": "not a date", "repo": "repo-a"},
+            {"sha": "b", "date": "2025-01-06T10:00:00Z", "repo": "repo-a"},
+        ])
+
+        stats = calculator.calculate_statistics()
+
+        assert stats["total_commits"] == 2
+        assert stats["commits_by_day"] == {"2025-01-06": 1}
+        assert stats["release_cadence"]["max_weekly"] == 1
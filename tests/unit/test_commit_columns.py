@@ -0,0 +1,98 @@
+"""Unit tests for memory-mapped commits_stats columns."""
+
+import shutil
+import tempfile
+
+import pytest
+
+from spark.cache import APICache
+from spark.calculator import StatsCalculator
+from spark.commit_columns import CommitColumns, encode_columns
+
+
+def _commit(n, date="2025-12-28T15:30:00+00:00", **stats):
+    return {
+        "sha": f"{n:040x}",
+        "commit": {"author": {"name": "dev", "date": date}, "message": f"commit {n}"},
+        "stats": stats,
+        "repo": "repo",
+    }
+
+
+COMMITS = [
+    _commit(1, total=2, additions=10, deletions=3),
+    _commit(2, "2024-01-05T08:00:00Z", total=0, additions=0, deletions=0),
+    _commit(3, None, total=1, additions=40, deletions=2),
+    _commit(4, "2025-03-01T10:00:00+00:00", total=1, additions=1, deletions=0),
+    _commit(5, total=5, additions=40, deletions=0),
+]
+
+
+@pytest.fixture
+def cache():
+    temp_dir = tempfile.mkdtemp()
+    cache = APICache(cache_dir=temp_dir, backend="files")
+    yield cache
+    cache.close()
+    shutil.rmtree(temp_dir)
+
+
+class TestCommitColumns:
+    """Test the columnar format and metrics parity."""
+
+    def test_metrics_match_commit_dicts(self):
+        columns = CommitColumns.from_commits(COMMITS)
+
+        assert StatsCalculator.calculate_repository_commit_metrics(columns) == (
+            StatsCalculator.calculate_repository_commit_metrics(COMMITS)
+        )
+        assert StatsCalculator.calculate_repository_commit_metrics(CommitColumns.from_commits([])) == (
+            StatsCalculator.calculate_repository_commit_metrics([])
+        )
+
+    def test_columns_and_dates(self):
+        columns = CommitColumns.from_commits(COMMITS)
+
+        assert len(columns) == 5
+        assert list(columns.additions) == [10, 0, 40, 1, 40]
+        assert columns.sizes() == [15, 0, 43, 2, 45]
+        assert columns.sha(2) == COMMITS[2]["sha"]
+        assert columns.date(2) is None
+        assert columns.earliest_date().isoformat() == "2024-01-05T08:00:00+00:00"
+
+
+class TestCacheColumns:
+    """Test sidecar files served by APICache."""
+
+    def test_sidecar_is_built_once_and_mapped(self, cache):
+        cache.set("commits_stats", "owner", COMMITS, repo="repo", week="2026W01")
+
+        with cache.get_commit_columns("owner", "repo") as columns:
+            assert columns.sizes() == [15, 0, 43, 2, 45]
+        path = cache._columns_path("owner/repo/commits_stats", "2026W01")
+        mtime = path.stat().st_mtime_ns
+
+        with cache.get_commit_columns("owner", "repo", week="2026W01") as columns:
+            assert len(columns) == 5
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_sidecar_follows_entry_changes(self, cache):
+        cache.set("commits_stats", "owner", COMMITS, repo="repo", week="2026W01")
+        cache.get_commit_columns("owner", "repo").close()
+
+        cache.set("commits_stats", "owner", COMMITS[:2], repo="repo", week="2026W01")
+        with cache.get_commit_columns("owner", "repo") as columns:
+            assert len(columns) == 2
+
+        cache.delete("commits_stats", "owner", repo="repo", week="2026W01")
+        assert cache.get_commit_columns("owner", "repo") is None
+        assert not cache._columns_path("owner/repo/commits_stats", "2026W01").exists()
+
+    def test_stale_sidecar_is_rebuilt(self, cache):
+        cache.set("commits_stats", "owner", COMMITS, repo="repo", week="2026W01")
+        path = cache._columns_path("owner/repo/commits_stats", "2026W01")
+        path.parent.mkdir(parents=True)
+        path.write_bytes(encode_columns(COMMITS[:1], "0" * 64))
+
+        with cache.get_commit_columns("owner", "repo") as columns:
+            assert len(columns) == 5
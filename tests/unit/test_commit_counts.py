@@ -0,0 +1,147 @@
+"""Unit tests for the commit window counting engines."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from github import GithubException
+
+from spark.commit_counts import PAGE_SIZE, CommitCounter
+from spark.rate_limit import RateLimitGovernor
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _commit(days_ago):
+    date = NOW - timedelta(days=days_ago, hours=1)
+    return SimpleNamespace(commit=SimpleNamespace(author=SimpleNamespace(date=date)))
+
+
+class FakeCommitList(list):
+    """PaginatedList stand-in that counts the requests it would make."""
+
+    def __init__(self, commits, repo):
+        super().__init__(commits)
+        self.repo = repo
+
+    def get_page(self, page):
+        self.repo.requests += 1
+        return self[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+
+    @property
+    def totalCount(self):
+        self.repo.requests += 1
+        return len(self)
+
+    def __iter__(self):
+        for index, item in enumerate(list.__iter__(self)):
+            if index % PAGE_SIZE == 0:
+                self.repo.requests += 1
+            yield item
+
+
+class FakeRepository:
+    """Repository stand-in with commit listing and commit-activity stats."""
+
+    def __init__(self, commit_ages, activity_responses=None, activity_error=False):
+        self.commit_ages = sorted(commit_ages)
+        self.activity_responses = list(activity_responses or [])
+        self.activity_error = activity_error
+        self.requests = 0
+
+    def get_commits(self, since=None):
+        ages = self.commit_ages
+        if since is not None:
+            ages = [age for age in ages if NOW - timedelta(days=age, hours=1) >= since]
+        return FakeCommitList([_commit(age) for age in ages], self)
+
+    def get_stats_commit_activity(self):
+        self.requests += 1
+        if self.activity_error:
+            raise GithubException(500, {"message": "boom"}, {})
+        return self.activity_responses.pop(0) if self.activity_responses else None
+
+
+def _weekly_activity(commit_ages):
+    """Build 52 weeks of commit activity covering the commit ages."""
+    start = (NOW - timedelta(days=364)).replace(hour=0)
+    weeks = []
+    for w in range(53):
+        week_start = start + timedelta(days=7 * w)
+        days = [0] * 7
+        for age in commit_ages:
+            day = (NOW - timedelta(days=age, hours=1)) - week_start
+            if 0 <= day.days < 7 and day.total_seconds() >= 0:
+                days[day.days] += 1
+        weeks.append(SimpleNamespace(week=week_start, days=days, total=sum(days)))
+    return weeks
+
+
+def _counter(**kwargs):
+    sleeps = []
+    counter = CommitCounter(governor=RateLimitGovernor(), clock=lambda: NOW, sleep=sleeps.append, **kwargs)
+    return counter, sleeps
+
+
+def _expected(ages, total=None):
+    return {
+        "total": total if total is not None else len(ages),
+        "recent_90d": sum(1 for age in ages if age < 90),
+        "recent_180d": sum(1 for age in ages if age < 180),
+        "recent_365d": sum(1 for age in ages if age < 365),
+        "last_commit_date": (NOW - timedelta(days=min(ages), hours=1)).isoformat(),
+    }
+
+
+class TestCommitCounter:
+    """Test strategy selection and result shape."""
+
+    def test_small_repository_uses_first_page_only(self):
+        ages = [1, 50, 100, 200, 400]
+        repo = FakeRepository(ages)
+        counter, _ = _counter()
+
+        assert counter.count(repo) == _expected(ages)
+        assert repo.requests == 1
+        assert counter.strategy_counts == {"first_page": 1}
+
+    def test_commit_activity_after_polling_202(self):
+        ages = [i * 2 for i in range(150)] + [500, 600]
+        repo = FakeRepository(ages, activity_responses=[None, _weekly_activity(ages)])
+        counter, sleeps = _counter()
+
+        result = counter.count(repo)
+
+        assert result == _expected(ages)
+        assert len(sleeps) == 1
+        assert counter.strategy_counts == {"commit_activity": 1}
+        # first page, totalCount, two activity polls
+        assert repo.requests == 4
+
+    def test_since_totals_when_activity_never_ready(self):
+        ages = list(range(0, 300)) + [700]
+        repo = FakeRepository(ages)
+        counter, sleeps = _counter(poll_attempts=2)
+
+        assert counter.count(repo) == _expected(ages)
+        assert len(sleeps) == 2
+        assert counter.strategy_counts == {"since_total": 1}
+
+    def test_falls_back_to_pagination_on_errors(self):
+        ages = list(range(0, 60))
+        repo = FakeRepository(ages, activity_error=True)
+        counter, _ = _counter()
+
+        assert counter.count(repo) == _expected(ages)
+        assert counter.strategy_counts == {"paginate": 1}
+
+    def test_paginate_engine_matches_stats_engine(self):
+        ages = list(range(0, 400, 3))
+        stats_counter, _ = _counter()
+        paginate_counter, _ = _counter(engine="paginate")
+
+        assert stats_counter.count(FakeRepository(ages)) == paginate_counter.count(FakeRepository(ages))
+
+    def test_unknown_engine_rejected(self):
+        with pytest.raises(ValueError):
+            CommitCounter(engine="guess")
@@ -0,0 +1,164 @@
+"""Unit tests for commits_stats ingestion in GitHubFetcher."""
+
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from spark.cache import APICache
+from spark.fetcher import GitHubFetcher
+from spark.time_utils import sanitize_timestamp_for_filename
+
+BASE = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+class FakeCommit:
+    """Commit stand-in that counts stats (detail) requests."""
+
+    def __init__(self, index, repo):
+        self.sha = f"sha{index:04d}"
+        self._repo = repo
+        author = SimpleNamespace(name="dev", date=BASE + timedelta(hours=index))
+        self.commit = SimpleNamespace(author=author, message=f"commit {index}")
+
+    @property
+    def stats(self):
+        self._repo.detail_requests += 1
+        return SimpleNamespace(additions=1, deletions=0, total=1)
+
+
+class FakeRepository:
+    """Repository whose history is commits 0..count-1, newest first."""
+
+    def __init__(self, count):
+        self.count = count
+        self.detail_requests = 0
+
+    def get_commits(self):
+        return [FakeCommit(i, self) for i in reversed(range(self.count))]
+
+    def get_commit(self, sha):
+        return FakeCommit(int(sha[3:]), self)
+
+
+class FakeClient:
+    """Per-thread client stand-in resolving every repository to one fake."""
+
+    def __init__(self, repo):
+        self.repo = repo
+
+    def get_repo(self, full_name):
+        return self.repo
+
+    def create_from_raw_data(self, klass, raw_data):
+        return self.repo
+
+
+@pytest.fixture
+def fetcher():
+    temp_dir = tempfile.mkdtemp()
+    fetcher = GitHubFetcher(token="test-token", cache=APICache(cache_dir=temp_dir), use_cache_status=False)
+    yield fetcher
+    shutil.rmtree(temp_dir)
+
+
+def _fetch(fetcher, repo, pushed_at, max_commits=50):
+    fetcher._get_repo = lambda username, repo_name: repo
+    return fetcher.fetch_commits_with_stats("testuser", "proj", max_commits=max_commits, repo_pushed_at=pushed_at)
+
+
+class TestIncrementalIngestion:
+    """Test that only commits newer than the cached history are fetched."""
+
+    def test_new_push_fetches_only_new_commits(self, fetcher):
+        first_push = BASE + timedelta(days=1)
+        initial = _fetch(fetcher, FakeRepository(20), first_push)
+        assert len(initial) == 20
+
+        repo = FakeRepository(22)
+        second_push = BASE + timedelta(days=2)
+        merged = _fetch(fetcher, repo, second_push)
+
+        assert repo.detail_requests == 2
+        assert [c["sha"] for c in merged[:3]] == ["sha0021", "sha0020", "sha0019"]
+        assert merged[2:] == initial
+
+        metadata = fetcher.cache.get_metadata(
+            "commits_stats", "testuser", repo="proj", week=sanitize_timestamp_for_filename(second_push)
+        )
+        assert metadata["incremental_from"] == sanitize_timestamp_for_filename(first_push)
+        assert metadata["new_commits"] == 2
+
+    def test_merged_history_respects_max_commits(self, fetcher):
+        _fetch(fetcher, FakeRepository(10), BASE + timedelta(days=1), max_commits=10)
+
+        merged = _fetch(fetcher, FakeRepository(13), BASE + timedelta(days=2), max_commits=10)
+
+        assert len(merged) == 10
+        assert merged[0]["sha"] == "sha0012"
+        assert merged[-1]["sha"] == "sha0003"
+
+    def test_commits_dropped_by_force_push_are_not_kept(self, fetcher):
+        _fetch(fetcher, FakeRepository(10), BASE + timedelta(days=1))
+
+        # sha0008 and sha0009 were replaced by sha0100 on top of sha0007
+        repo = FakeRepository(8)
+        repo.get_commits = lambda: [FakeCommit(100, repo)] + [FakeCommit(i, repo) for i in reversed(range(8))]
+        merged = _fetch(fetcher, repo, BASE + timedelta(days=2))
+
+        assert repo.detail_requests == 1
+        assert [c["sha"] for c in merged] == ["sha0100"] + [f"sha{i:04d}" for i in reversed(range(8))]
+
+    def test_rewritten_history_falls_back_to_full_fetch(self, fetcher):
+        _fetch(fetcher, FakeRepository(5), BASE + timedelta(days=1))
+
+        repo = FakeRepository(8)
+        repo.get_commits = lambda: [FakeCommit(i, repo) for i in reversed(range(100, 108))]
+        result = _fetch(fetcher, repo, BASE + timedelta(days=2))
+
+        assert repo.detail_requests == 8
+        assert {c["sha"] for c in result} == {f"sha{i:04d}" for i in range(100, 108)}
+
+
+class TestParallelCommitStats:
+    """Test the concurrent detail stage and partial-result checkpoints."""
+
+    def test_concurrent_details_keep_listing_order(self, fetcher):
+        repo = FakeRepository(60)
+        fetcher.commit_stats_workers = 4
+        fetcher.create_client = lambda: FakeClient(repo)
+
+        result = _fetch(fetcher, repo, BASE + timedelta(days=1), max_commits=60)
+
+        assert [c["sha"] for c in result] == [f"sha{i:04d}" for i in reversed(range(60))]
+        assert repo.detail_requests == 60
+
+    def test_interrupted_fetch_resumes_from_checkpoint(self, fetcher):
+        pushed_at = BASE + timedelta(days=1)
+        week = sanitize_timestamp_for_filename(pushed_at)
+        failing = FakeRepository(40)
+        original_stats = FakeCommit.stats
+
+        def flaky_stats(commit):
+            if commit.sha == "sha0005":
+                raise ConnectionError("network down")
+            return original_stats.fget(commit)
+
+        FakeCommit.stats = property(flaky_stats)
+        try:
+            with pytest.raises(ConnectionError):
+                _fetch(fetcher, failing, pushed_at)
+        finally:
+            FakeCommit.stats = original_stats
+
+        partial = fetcher.cache.get("commits_stats_partial", "testuser", repo="proj", week=week)
+        assert len(partial) == 34
+
+        repo = FakeRepository(40)
+        result = _fetch(fetcher, repo, pushed_at)
+
+        assert len(result) == 40
+        assert repo.detail_requests == 6
+        assert not fetcher.cache.has_entry("commits_stats_partial", "testuser", repo="proj", week=week)
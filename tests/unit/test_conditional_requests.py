@@ -0,0 +1,136 @@
+"""Unit tests for conditional (ETag) profile and repository listing fetches."""
+
+import shutil
+import tempfile
+
+import pytest
+from github import GithubException
+
+from spark.cache import APICache
+from spark.conditional_requests import ConditionalClient
+from spark.fetcher import REPOS_PER_PAGE, GitHubFetcher
+from spark.rate_limit import RateLimitGovernor
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+
+class ETagSession:
+    """Serves fixed resources and answers 304 when If-None-Match matches."""
+
+    def __init__(self, resources):
+        # url suffix (path?page=N) -> payload
+        self.resources = resources
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        key = url.split("api.github.com", 1)[1]
+        if params and "page" in params:
+            key = f"{key}?page={params['page']}"
+        etag = f'"{hash(repr(self.resources.get(key)))}"'
+        self.calls.append((key, headers.get("If-None-Match")))
+        if key not in self.resources:
+            return FakeResponse(404, {"message": "Not Found"})
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304, headers={"ETag": etag})
+        return FakeResponse(200, self.resources[key], {"ETag": etag})
+
+
+def _raw_repo(name, **overrides):
+    raw = {
+        "name": name,
+        "full_name": f"testuser/{name}",
+        "description": None,
+        "language": "Python",
+        "stargazers_count": 1,
+        "forks_count": 0,
+        "watchers_count": 1,
+        "size": 10,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2025-01-01T00:00:00Z",
+        "pushed_at": "2025-12-28T15:30:00Z",
+        "fork": False,
+        "private": False,
+        "archived": False,
+        "homepage": None,
+        "has_pages": False,
+    }
+    raw.update(overrides)
+    return raw
+
+
+@pytest.fixture
+def temp_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+def _fetcher(temp_dir, session):
+    fetcher = GitHubFetcher(token="test-token", cache=APICache(cache_dir=temp_dir))
+    fetcher.conditional = ConditionalClient(token="test-token", session=session, governor=RateLimitGovernor())
+    return fetcher
+
+
+class TestConditionalFetches:
+    """Test ETag revalidation of profile and listing requests."""
+
+    def test_repository_listing_revalidates_with_etags(self, temp_dir):
+        page1 = [_raw_repo(f"repo{i}") for i in range(REPOS_PER_PAGE)]
+        page2 = [_raw_repo("forked", fork=True), _raw_repo("last")]
+        session = ETagSession({
+            "/users/testuser/repos?page=1": page1,
+            "/users/testuser/repos?page=2": page2,
+        })
+
+        first = _fetcher(temp_dir, session).fetch_repositories("testuser", revalidate=True)
+        assert len(first) == REPOS_PER_PAGE + 1
+        assert first[0]["pushed_at"] == "2025-12-28T15:30:00+00:00"
+        assert all(etag is None for _, etag in session.calls)
+
+        # Next run: both pages unchanged -> 304s, identical result
+        session.calls.clear()
+        second_fetcher = _fetcher(temp_dir, session)
+        second = second_fetcher.fetch_repositories("testuser", revalidate=True)
+        assert second == first
+        assert all(etag is not None for _, etag in session.calls)
+        assert second_fetcher.request_stats == {"cache_hits": 0, "not_modified": 2, "fetched": 0}
+
+        # A changed second page is re-downloaded, the first stays 304
+        session.resources["/users/testuser/repos?page=2"] = [_raw_repo("last"), _raw_repo("new")]
+        third_fetcher = _fetcher(temp_dir, session)
+        third = third_fetcher.fetch_repositories("testuser", revalidate=True)
+        assert [r["name"] for r in third[-2:]] == ["last", "new"]
+        assert third_fetcher.request_stats["not_modified"] == 1
+        assert third_fetcher.request_stats["fetched"] == 1
+
+    def test_profile_revalidation_and_cache_hits(self, temp_dir):
+        session = ETagSession({
+            "/users/testuser": {"login": "testuser", "name": None, "created_at": "2015-03-01T00:00:00Z"},
+        })
+
+        fetcher = _fetcher(temp_dir, session)
+        profile = fetcher.fetch_user_profile("testuser")
+        assert profile["name"] == "testuser"
+        assert profile["created_at"] == "2015-03-01T00:00:00+00:00"
+        assert fetcher.cache.get_metadata("user_profile", "testuser")["etag"]
+
+        assert fetcher.fetch_user_profile("testuser") == profile
+        assert fetcher.fetch_user_profile("testuser", revalidate=True) == profile
+        assert fetcher.request_stats == {"cache_hits": 1, "not_modified": 1, "fetched": 1}
+        assert len(session.calls) == 2
+
+    def test_error_status_raises_github_exception(self, temp_dir):
+        fetcher = _fetcher(temp_dir, ETagSession({}))
+
+        with pytest.raises(GithubException):
+            fetcher.fetch_user_profile("missing")
@@ -0,0 +1,82 @@
+"""Unit tests for sharded dashboard data output."""
+
+import hashlib
+import json
+
+from spark.data_shards import DETAIL_FIELDS, ShardWriter
+
+PROFILE = {"username": "dev"}
+METADATA = {"generated_at": "2026-01-04T09:00:00+00:00", "schema_version": "2.0.0"}
+
+
+def _repository(name, rank):
+    return {
+        "name": name,
+        "summary": {"text": f"{name} summary"},
+        "stars": rank,
+        "tech_stack": {"dependencies": []},
+        "commit_metrics": {"avg_size": 1.5},
+        "rank": rank,
+        "ai_summary": None,
+    }
+
+
+class TestShardWriter:
+    """Test index, detail files and manifest."""
+
+    def test_index_details_and_manifest(self, tmp_path):
+        writer = ShardWriter(tmp_path)
+        repositories = [_repository("alpha", 1), _repository("beta", 2)]
+
+        assert list(writer.tee(iter(repositories))) == repositories
+        manifest = writer.finish(PROFILE, METADATA)
+
+        index = json.loads((tmp_path / "index.json").read_text(encoding="utf-8"))
+        assert index["profile"] == PROFILE
+        assert index["repositories"][0] == {"name": "alpha", "stars": 1, "rank": 1}
+        detail = json.loads((tmp_path / "repos" / "beta.json").read_text(encoding="utf-8"))
+        assert {**index["repositories"][1], **detail} == repositories[1]
+        assert set(detail) - {"name"} <= set(DETAIL_FIELDS)
+
+        assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+        assert manifest["index"]["repositories"] == 2
+        for entry in [manifest["index"], *manifest["details"].values()]:
+            data = (tmp_path / entry["path"]).read_bytes()
+            assert entry["sha256"] == hashlib.sha256(data).hexdigest()
+            assert entry["bytes"] == len(data)
+
+    def test_removed_repositories_lose_their_detail_files(self, tmp_path):
+        first = ShardWriter(tmp_path)
+        for repository in (_repository("alpha", 1), _repository("beta", 2)):
+            first.add(repository)
+        first.finish(PROFILE, METADATA)
+
+        second = ShardWriter(tmp_path)
+        second.add(_repository("beta", 1))
+        manifest = second.finish(PROFILE, METADATA)
+
+        assert sorted(p.name for p in (tmp_path / "repos").iterdir()) == ["beta.json"]
+        assert list(manifest["details"]) == ["beta"]
+
+    def test_detail_files_are_published_only_by_finish(self, tmp_path):
+        first = ShardWriter(tmp_path)
+        first.add(_repository("alpha", 1))
+        first.finish(PROFILE, METADATA)
+        published = (tmp_path / "repos" / "alpha.json").read_bytes()
+
+        second = ShardWriter(tmp_path)
+        changed = {**_repository("alpha", 1), "summary": {"text": "rewritten"}}
+        second.add(changed)
+        assert (tmp_path / "repos" / "alpha.json").read_bytes() == published
+
+        # repositories.json failed to write: nothing is published
+        second.discard()
+        assert (tmp_path / "repos" / "alpha.json").read_bytes() == published
+        assert not second.staging_dir.exists()
+
+        third = ShardWriter(tmp_path)
+        third.add(changed)
+        third.finish(PROFILE, METADATA)
+        detail = json.loads((tmp_path / "repos" / "alpha.json").read_text(encoding="utf-8"))
+        assert detail["summary"] == {"text": "rewritten"}
+        assert not third.staging_dir.exists()
@@ -0,0 +1,143 @@
+"""Unit tests for tree-based dependency manifest discovery."""
+
+import base64
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from github import GithubException
+
+from spark.cache import APICache
+from spark.cache_manager import CacheManager
+from spark.dependencies.discovery import DependencyFileDiscovery, is_manifest_path
+from spark.time_utils import sanitize_timestamp_for_filename
+
+CSPROJ = """<Project Sdk="Microsoft.NET.Sdk">
+  <ItemGroup>
+    <PackageReference Include="Newtonsoft.Json" Version="13.0.3" />
+  </ItemGroup>
+</Project>"""
+
+
+class FakeRepository:
+    """Repository stand-in serving a git tree and its blobs."""
+
+    def __init__(self, files, empty=False):
+        self.name = "proj"
+        self.files = dict(files)
+        self.empty = empty
+        self.tree_requests = 0
+        self.blob_requests = []
+
+    def _sha(self, path):
+        return f"sha-{abs(hash((path, self.files[path]))):x}"
+
+    def get_git_tree(self, ref, recursive=False):
+        self.tree_requests += 1
+        if self.empty:
+            raise GithubException(409, {"message": "Git Repository is empty."}, None)
+        elements = [SimpleNamespace(path=path, type="blob", sha=self._sha(path)) for path in self.files]
+        elements.append(SimpleNamespace(path="src", type="tree", sha="tree-src"))
+        return SimpleNamespace(tree=elements, truncated=False)
+
+    def get_git_blob(self, sha):
+        self.blob_requests.append(sha)
+        path = next(p for p in self.files if self._sha(p) == sha)
+        content = base64.b64encode(self.files[path].encode("utf-8")).decode("ascii")
+        return SimpleNamespace(content=content, encoding="base64")
+
+
+class FakeGithub:
+    """Client whose repository handles all resolve to one fake."""
+
+    def __init__(self, repo):
+        self.repo = repo
+
+    def get_repo(self, full_name):
+        return self.repo
+
+    def create_from_raw_data(self, klass, raw_data):
+        return self.repo
+
+
+@pytest.fixture
+def temp_cache():
+    temp_dir = tempfile.mkdtemp()
+    yield APICache(cache_dir=temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+class TestManifestMatching:
+    """Test which tree paths count as manifests."""
+
+    def test_root_nested_and_suffix_manifests(self):
+        assert is_manifest_path("package.json")
+        assert is_manifest_path("packages/web/package.json")
+        assert is_manifest_path("src/App/App.csproj")
+        assert is_manifest_path("crates/core/Cargo.toml")
+
+    def test_vendored_and_unrelated_paths_are_skipped(self):
+        assert not is_manifest_path("node_modules/react/package.json")
+        assert not is_manifest_path("web/vendor/lib/composer.json")
+        assert not is_manifest_path("README.md")
+        assert not is_manifest_path("docs/package.json.md")
+
+
+class TestDependencyFileDiscovery:
+    """Test manifest download through one tree listing."""
+
+    def test_only_existing_manifests_are_downloaded(self):
+        repo = FakeRepository({
+            "package.json": '{"dependencies": {"react": "^18.2.0"}}',
+            "README.md": "# proj",
+            "packages/api/package.json": '{"dependencies": {"express": "^4.0.0"}}',
+            "src/App/App.csproj": CSPROJ,
+            "node_modules/react/package.json": "{}",
+        })
+
+        result = DependencyFileDiscovery().discover(repo)
+
+        assert repo.tree_requests == 1
+        assert len(repo.blob_requests) == 3
+        assert list(result.files) == ["package.json", "packages/api/package.json", "src/App/App.csproj"]
+        assert result.files["src/App/App.csproj"] == CSPROJ
+        assert result.downloaded == 3
+
+    def test_known_blobs_are_not_downloaded(self):
+        repo = FakeRepository({"requirements.txt": "requests>=2.0\n", "go.mod": "module x\n"})
+        known = {repo._sha("requirements.txt"): "requests>=2.0\n"}
+
+        result = DependencyFileDiscovery().discover(repo, known)
+
+        assert result.reused == 1
+        assert repo.blob_requests == [repo._sha("go.mod")]
+        assert result.files["requirements.txt"] == "requests>=2.0\n"
+
+    def test_empty_repository_has_no_manifests(self):
+        assert DependencyFileDiscovery().discover(FakeRepository({}, empty=True)).files == {}
+
+
+class TestRefreshReusesBlobs:
+    """Test blob-SHA reuse across pushes in CacheManager."""
+
+    def test_unchanged_manifests_are_not_fetched_again(self, temp_cache):
+        repo = FakeRepository({"package.json": '{"dependencies": {"a": "1"}}', "web/package.json": "{}"})
+        manager = CacheManager(FakeGithub(repo), temp_cache)
+        first_push = datetime(2025, 12, 1, tzinfo=timezone.utc)
+        manager.refresh_dependency_files("testuser", "proj", first_push)
+        assert len(repo.blob_requests) == 2
+
+        repo.files["web/package.json"] = '{"dependencies": {"b": "2"}}'
+        repo.blob_requests.clear()
+        second_push = datetime(2025, 12, 2, tzinfo=timezone.utc)
+        result = manager.refresh_dependency_files("testuser", "proj", second_push)
+
+        week = sanitize_timestamp_for_filename(second_push)
+        assert result.refreshed
+        assert repo.blob_requests == [repo._sha("web/package.json")]
+        assert temp_cache.get("dependency_files", "testuser", repo="proj", week=week) == repo.files
+        metadata = temp_cache.get_metadata("dependency_files", "testuser", repo="proj", week=week)
+        assert metadata["blobs_reused"] == 1
+        assert metadata["blobs"]["package.json"] == repo._sha("package.json")
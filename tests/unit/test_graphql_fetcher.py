@@ -0,0 +1,139 @@
+"""Unit tests for GraphQLBatchFetcher using a recorded GraphQL response."""
+
+import json
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from spark.cache import APICache
+from spark.graphql_fetcher import GraphQLBatchFetcher, GraphQLError
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "graphql_batch_response.json"
+
+
+class RecordedResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self):
+        return self._payload
+
+
+class RecordedSession:
+    """Replays a recorded GraphQL response and records the requests made."""
+
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.requests = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.requests.append(json)
+        return RecordedResponse(self.payload, self.status_code)
+
+
+@pytest.fixture
+def recorded_payload():
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def temp_cache():
+    temp_dir = tempfile.mkdtemp()
+    yield APICache(cache_dir=temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+def _fixed_clock():
+    return datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class TestGraphQLBatchFetcher:
+    """Test batch query construction and response parsing."""
+
+    def test_build_query_aliases_each_repository(self, temp_cache):
+        fetcher = GraphQLBatchFetcher(token="t", cache=temp_cache, session=RecordedSession({}))
+        query = fetcher.build_query(3)
+
+        assert "repo0: repository(owner: $owner, name: $name0)" in query
+        assert "repo2: repository(owner: $owner, name: $name2)" in query
+        assert "$name2: String!" in query
+        assert "recent90: history(since: $since90)" in query
+
+    def test_fetch_batch_parses_categories(self, recorded_payload, temp_cache):
+        session = RecordedSession(recorded_payload)
+        fetcher = GraphQLBatchFetcher(token="t", cache=temp_cache, session=session, clock=_fixed_clock)
+
+        results = fetcher.fetch_batch("testuser", ["active-high-stars", "no-readme", "missing"])
+
+        assert len(session.requests) == 1
+        variables = session.requests[0]["variables"]
+        assert variables["name2"] == "missing"
+        assert variables["since90"].startswith("2025-10-03")
+
+        active = results["active-high-stars"]
+        assert active["languages"] == {"Python": 75000, "JavaScript": 15000}
+        assert active["readme"].startswith("# Active High Stars")
+        assert active["commit_counts"] == {
+            "total": 1450,
+            "recent_90d": 45,
+            "recent_180d": 85,
+            "recent_365d": 160,
+            "last_commit_date": "2025-12-28T15:30:00+00:00",
+        }
+        assert active["quality_indicators"] == {
+            "has_license": True,
+            "has_ci_cd": True,
+            "has_tests": True,
+            "has_docs": True,
+        }
+
+        assert results["no-readme"]["readme"] == ""
+        assert results["no-readme"]["quality_indicators"]["has_ci_cd"] is False
+        assert "missing" not in results
+
+    def test_prefetch_writes_missing_categories(self, recorded_payload, temp_cache):
+        fetcher = GraphQLBatchFetcher(
+            token="t", cache=temp_cache, session=RecordedSession(recorded_payload), clock=_fixed_clock
+        )
+        repos = [
+            {"name": "active-high-stars", "pushed_at": "2025-12-28T15:30:00Z"},
+            {"name": "no-readme", "pushed_at": "2024-02-01T08:00:00+00:00"},
+            {"name": "missing", "pushed_at": "2024-02-01T08:00:00+00:00"},
+        ]
+
+        written = fetcher.prefetch("testuser", repos)
+
+        assert written == {"languages": 2, "readme": 2, "commit_counts": 2, "quality_indicators": 2}
+        week = "2025-12-28T15-30-00+00-00"
+        assert temp_cache.get("languages", "testuser", repo="active-high-stars", week=week) == {
+            "Python": 75000,
+            "JavaScript": 15000,
+        }
+        assert not temp_cache.has_entry("languages", "testuser", repo="missing")
+
+    def test_prefetch_skips_cached_repositories(self, recorded_payload, temp_cache):
+        session = RecordedSession(recorded_payload)
+        fetcher = GraphQLBatchFetcher(token="t", cache=temp_cache, session=session, clock=_fixed_clock)
+        week = "2025-12-28T15-30-00+00-00"
+        for category in ("languages", "readme", "commit_counts", "quality_indicators"):
+            temp_cache.set(category, "testuser", {}, repo="active-high-stars", week=week)
+
+        written = fetcher.prefetch("testuser", [{"name": "active-high-stars", "pushed_at": "2025-12-28T15:30:00Z"}])
+
+        assert session.requests == []
+        assert sum(written.values()) == 0
+
+    def test_failed_request_raises(self, temp_cache):
+        fetcher = GraphQLBatchFetcher(token="t", cache=temp_cache, session=RecordedSession({}, status_code=502))
+
+        with pytest.raises(GraphQLError):
+            fetcher.fetch_batch("testuser", ["repo"])
@@ -0,0 +1,66 @@
+"""Unit tests for the streaming JSON writer."""
+
+import gzip
+import json
+
+import pytest
+
+from spark.json_writer import write_json
+
+DATA = {
+    "profile": {"username": "dev", "total_stars": 3, "languages": ["Python", "Go"]},
+    "repositories": [
+        {"name": "alpha", "summary": {"text": "Line one\nline two — café"}, "tags": []},
+        {"name": "beta", "tech_stack": None, "language_stats": {"Python": 10}},
+    ],
+    "metadata": {},
+}
+
+
+class TestWriteJson:
+    """Test output equivalence, variants and atomicity."""
+
+    def test_streamed_output_matches_json_dump(self, tmp_path):
+        path = tmp_path / "repositories.json"
+
+        stats = write_json(path, {**DATA, "repositories": iter(DATA["repositories"])})
+
+        expected = json.dumps(DATA, indent=2, ensure_ascii=False)
+        assert path.read_text(encoding="utf-8") == expected
+        assert stats.bytes == len(expected.encode("utf-8"))
+        assert list(stats.sections) == ["profile", "repositories", "metadata"]
+        assert sum(stats.sections.values()) + len("\n}") == stats.bytes
+        assert stats.items == {"repositories": 2}
+        write_json(tmp_path / "empty.json", {"repositories": []})
+        assert (tmp_path / "empty.json").read_text() == json.dumps({"repositories": []}, indent=2)
+
+    def test_minified_and_gzip_variants(self, tmp_path):
+        path = tmp_path / "repositories.json"
+
+        stats = write_json(path, DATA, variants=("minified", "gzip"))
+
+        minified = (tmp_path / "repositories.min.json").read_bytes()
+        assert json.loads(minified) == DATA
+        assert gzip.decompress((tmp_path / "repositories.min.json.gz").read_bytes()) == minified
+        assert stats.variants["repositories.min.json"] == len(minified)
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "repositories.json", "repositories.min.json", "repositories.min.json.gz",
+        ]
+
+    def test_failure_keeps_previous_output(self, tmp_path):
+        path = tmp_path / "repositories.json"
+        path.write_text("previous")
+
+        def records():
+            yield {"name": "alpha"}
+            raise RuntimeError("assembly failed")
+
+        with pytest.raises(RuntimeError):
+            write_json(path, {"repositories": records()}, variants=("minified",))
+
+        assert path.read_text() == "previous"
+        assert [p.name for p in tmp_path.iterdir()] == ["repositories.json"]
+
+    def test_unknown_variant(self, tmp_path):
+        with pytest.raises(ValueError, match="zip"):
+            write_json(tmp_path / "repositories.json", DATA, variants=("zip",))
@@ -0,0 +1,171 @@
+"""Unit tests for the shared rate-limit governor."""
+
+import pytest
+from github import GithubException, RateLimitExceededException
+
+from spark.rate_limit import RateLimitGovernor
+
+
+class FakeClock:
+    """Controllable clock; sleeping advances time."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _headers(clock, remaining, limit=5000, reset_in=3600, **extra):
+    headers = {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(clock.now + reset_in)),
+    }
+    headers.update(extra)
+    return headers
+
+
+class TestRateLimitGovernor:
+    """Test pacing, secondary limits and projections."""
+
+    def test_unobserved_budget_does_not_wait(self, clock):
+        governor = RateLimitGovernor(clock=clock, sleep=clock.sleep)
+
+        assert governor.acquire() == 0
+        assert clock.sleeps == []
+
+    def test_paces_to_spread_remaining_quota(self, clock):
+        governor = RateLimitGovernor(reserve=0, burst=2, clock=clock, sleep=clock.sleep)
+        # 100 requests left for 1000 seconds -> one request every 10 seconds
+        governor.observe_headers(_headers(clock, remaining=100, reset_in=1000))
+
+        governor.acquire()
+        governor.acquire()
+        assert clock.sleeps == []
+
+        waited = governor.acquire()
+        assert waited == pytest.approx(10.0, rel=0.05)
+
+    def test_plentiful_quota_is_not_paced(self, clock):
+        governor = RateLimitGovernor(clock=clock, sleep=clock.sleep)
+        governor.observe_headers(_headers(clock, remaining=5000, reset_in=3600))
+
+        for _ in range(600):
+            governor.acquire()
+
+        assert clock.sleeps == []
+        assert governor.calls == 600
+
+    def test_paces_planned_demand_beyond_quota(self, clock):
+        governor = RateLimitGovernor(reserve=0, burst=2, clock=clock, sleep=clock.sleep)
+        governor.observe_headers(_headers(clock, remaining=1000, reset_in=1000))
+
+        governor.plan(400)
+        for _ in range(10):
+            governor.acquire()
+        assert clock.sleeps == []
+
+        # 1400 planned calls do not fit 990 remaining: one request per second
+        governor.plan(1400)
+        governor.acquire()
+        governor.acquire()
+        assert governor.acquire() == pytest.approx(1.0, rel=0.05)
+
+    def test_waits_for_reset_when_only_reserve_left(self, clock):
+        governor = RateLimitGovernor(reserve=50, clock=clock, sleep=clock.sleep)
+        governor.observe_headers(_headers(clock, remaining=50, reset_in=600))
+
+        waited = governor.acquire()
+
+        assert waited == pytest.approx(601.0)
+
+    def test_retry_after_blocks_all_callers(self, clock):
+        governor = RateLimitGovernor(clock=clock, sleep=clock.sleep)
+        governor.observe_headers({"Retry-After": "30"}, status=403)
+
+        assert governor.acquire() == pytest.approx(30.0)
+        assert governor.secondary_limit_hits == 1
+
+    def test_permission_403_does_not_block(self, clock):
+        governor = RateLimitGovernor(clock=clock, sleep=clock.sleep)
+        governor.observe_headers(
+            _headers(clock, remaining=4000, reset_in=3600),
+            status=403,
+            message='{"message": "Resource protected by organization SAML enforcement."}',
+        )
+
+        assert governor.acquire() == 0
+        assert governor.secondary_limit_hits == 0
+
+    def test_secondary_limit_message_blocks(self, clock):
+        governor = RateLimitGovernor(clock=clock, sleep=clock.sleep)
+        governor.observe_headers(
+            _headers(clock, remaining=4000, reset_in=3600),
+            status=403,
+            message='{"message": "You have exceeded a secondary rate limit."}',
+        )
+
+        assert governor.acquire() == pytest.approx(60.0)
+
+    def test_call_retries_secondary_limit(self, clock):
+        governor = RateLimitGovernor(clock=clock, sleep=clock.sleep)
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise GithubException(
+                    403, {"message": "You have exceeded a secondary rate limit"}, {"retry-after": "5"}
+                )
+            return "ok"
+
+        assert governor.call(flaky) == "ok"
+        assert len(attempts) == 2
+        assert clock.sleeps == [pytest.approx(5.0)]
+
+    def test_call_waits_for_reset_on_primary_limit(self, clock):
+        governor = RateLimitGovernor(reserve=0, clock=clock, sleep=clock.sleep)
+        attempts = []
+
+        def exhausted():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RateLimitExceededException(403, {"message": "API rate limit exceeded"}, _headers(clock, 0, reset_in=120))
+            return "ok"
+
+        assert governor.call(exhausted) == "ok"
+        assert sum(clock.sleeps) == pytest.approx(121.0)
+
+    def test_call_does_not_retry_other_errors(self, clock):
+        governor = RateLimitGovernor(clock=clock, sleep=clock.sleep)
+
+        def missing():
+            raise GithubException(404, {"message": "Not Found"}, {})
+
+        with pytest.raises(GithubException):
+            governor.call(missing)
+
+    def test_projection(self, clock):
+        governor = RateLimitGovernor(reserve=100, clock=clock, sleep=clock.sleep)
+        assert governor.projection(10)["sufficient"] is None
+
+        governor.observe_headers(_headers(clock, remaining=600, reset_in=900))
+
+        fits = governor.projection(400)
+        assert fits["sufficient"] is True
+        assert fits["projected_remaining"] == 200
+
+        too_many = governor.projection(800)
+        assert too_many["sufficient"] is False
+        assert too_many["estimated_wait_seconds"] == pytest.approx(900.0)
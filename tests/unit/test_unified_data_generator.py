@@ -0,0 +1,172 @@
+"""Unit tests for UnifiedDataGenerator Phase 3 assembly."""
+
+import copy
+import json
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from spark.cache import APICache
+from spark.config import SparkConfig
+from spark.time_utils import sanitize_timestamp_for_filename
+from spark.unified_data_generator import UnifiedDataGenerator
+
+PUSHED_AT = "2025-12-28T15:30:00+00:00"
+WEEK = sanitize_timestamp_for_filename(datetime(2025, 12, 28, 15, 30, tzinfo=timezone.utc))
+
+
+@pytest.fixture
+def cache():
+    temp_dir = tempfile.mkdtemp()
+    cache = APICache(cache_dir=temp_dir, backend="files")
+    yield cache
+    cache.close()
+    shutil.rmtree(temp_dir)
+
+
+def _populate(cache, count):
+    repos = []
+    for i in range(count):
+        name = f"repo{i}"
+        cache.set("commit_counts", "testuser", {"total": 10 * (i + 1), "recent_90d": i}, repo=name, week=WEEK)
+        cache.set("languages", "testuser", {"Python": 1000 + i}, repo=name, week=WEEK)
+        cache.set("readme", "testuser", f"# {name}\n\nA sample project.", repo=name, week=WEEK)
+        cache.set("dependency_files", "testuser", {"requirements.txt": "requests==2.31.0\n"}, repo=name, week=WEEK)
+        cache.set(
+            "commits_stats",
+            "testuser",
+            [{"sha": f"{n:040x}", "commit": {"author": {"date": PUSHED_AT}}, "stats": {"total": 1, "additions": n, "deletions": 0}}
+             for n in range(3)],
+            repo=name,
+            week=WEEK,
+        )
+        repos.append({"name": name, "pushed_at": PUSHED_AT, "created_at": "2024-01-01T00:00:00+00:00", "updated_at": PUSHED_AT, "stars": i})
+    return repos
+
+
+def _generator(cache, monkeypatch, workers, top_n):
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+    config = SparkConfig()
+    config.config = {"dashboard": {"data_generation": {"top_n_repos": top_n, "assembly_workers": workers}}}
+    return UnifiedDataGenerator(username="testuser", config=config, output_dir=tempfile.gettempdir(), cache=cache)
+
+
+class TestAssembly:
+    """Test two-pass assembly of ranked repositories."""
+
+    def test_parallel_assembly_matches_sequential(self, cache, monkeypatch):
+        repos = _populate(cache, 6)
+
+        parallel = _generator(cache, monkeypatch, 4, 6)._assemble_data([dict(r) for r in repos])
+        sequential = _generator(cache, monkeypatch, 1, 6)._assemble_data([dict(r) for r in repos])
+
+        for data in (parallel, sequential):
+            for repo in data["repositories"]:
+                repo["summary"]["generated_at"] = None
+        assert parallel["repositories"] == sequential["repositories"]
+        assert [r["rank"] for r in parallel["repositories"]] == [1, 2, 3, 4, 5, 6]
+        assert parallel["repositories"][0]["commit_metrics"]["total_commits"] == 3
+        assert parallel["repositories"][0]["tech_stack"] is not None
+
+    def test_only_ranked_repositories_are_enriched(self, cache, monkeypatch):
+        repos = _populate(cache, 5)
+        generator = _generator(cache, monkeypatch, 2, 2)
+        reads = []
+        get = cache.get
+        cache.get = lambda category, owner, repo=None, week=None: reads.append((category, repo)) or get(
+            category, owner, repo=repo, week=week
+        )
+
+        data = generator._assemble_data(repos)
+
+        ranked = {r["name"] for r in data["repositories"]}
+        assert len(ranked) == 2
+        assert data["profile"]["total_repositories"] == 5
+        assert {repo for category, repo in reads if category == "dependency_files"} == ranked
+        assert all(r["has_readme"] for r in data["repositories"])
+
+
+class TestRecordReuse:
+    """Test reuse of cached repository records across runs."""
+
+    def test_unchanged_repositories_reuse_records(self, cache, monkeypatch):
+        repos = _populate(cache, 3)
+        generator = _generator(cache, monkeypatch, 1, 3)
+        first = generator._assemble_data([dict(r) for r in repos])
+        columns = []
+        get_columns = cache.get_commit_columns
+        cache.get_commit_columns = lambda *args, **kwargs: columns.append(args) or get_columns(*args, **kwargs)
+
+        second = generator._assemble_data([dict(r) for r in repos])
+
+        assert columns == []
+        assert second["repositories"] == first["repositories"]
+
+    def test_listing_changes_refresh_reused_records(self, cache, monkeypatch):
+        repos = _populate(cache, 2)
+        generator = _generator(cache, monkeypatch, 1, 2)
+        generator._assemble_data([dict(r) for r in repos])
+        repos[0]["stars"] = 500
+
+        data = generator._assemble_data([dict(r) for r in repos])
+
+        record = next(r for r in data["repositories"] if r["name"] == "repo0")
+        assert record["stars"] == 500
+        assert "500 stars" in record["summary"]["text"]
+        assert [r["rank"] for r in data["repositories"]] == [1, 2]
+
+    def test_schema_version_change_rebuilds_records(self, cache, monkeypatch):
+        repos = _populate(cache, 1)
+        generator = _generator(cache, monkeypatch, 1, 1)
+        generator._assemble_data([dict(r) for r in repos])
+        stored = copy.deepcopy(cache.get("unified_record", "testuser", repo="repo0", week=WEEK))
+        stored["schema_version"] = 0
+        stored["record"]["commit_metrics"] = None
+        cache.set("unified_record", "testuser", stored, repo="repo0", week=WEEK)
+
+        data = generator._assemble_data([dict(r) for r in repos])
+
+        assert data["repositories"][0]["commit_metrics"]["total_commits"] == 3
+
+
+class TestSave:
+    """Test streamed output of repositories.json."""
+
+    def test_streamed_save_matches_assembled_data(self, cache, monkeypatch, tmp_path):
+        repos = _populate(cache, 3)
+        generator = _generator(cache, monkeypatch, 2, 3)
+        generator.output_dir = tmp_path
+        generator.config.config["dashboard"]["performance"] = {"json_variants": ["minified"]}
+        expected = generator._assemble_data([dict(r) for r in repos])
+        monkeypatch.setattr(generator, "_fetch_repository_list", lambda: [dict(r) for r in repos])
+        monkeypatch.setattr(generator.cache_manager, "refresh_user_data", lambda **kwargs: SimpleNamespace(
+            repos_refreshed=0, repos_unchanged=3, api_calls_made=0
+        ))
+
+        path, skipped = generator.save()
+
+        written = json.loads(path.read_text(encoding="utf-8"))
+        assert not skipped
+        assert written["repositories"] == expected["repositories"]
+        assert written["profile"] == expected["profile"]
+        assert json.loads((tmp_path / "repositories.min.json").read_text(encoding="utf-8")) == written
+
+    def test_sharded_output_is_written_with_the_stream(self, cache, monkeypatch, tmp_path):
+        repos = _populate(cache, 2)
+        generator = _generator(cache, monkeypatch, 1, 2)
+        generator.output_dir = tmp_path
+        generator.config.config["dashboard"]["performance"] = {"sharded_output": True}
+        unified_data = generator._assemble_data([dict(r) for r in repos], stream=True)
+
+        generator.write(unified_data)
+
+        written = json.loads((tmp_path / "repositories.json").read_text(encoding="utf-8"))
+        manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+        index = json.loads((tmp_path / "index.json").read_text(encoding="utf-8"))
+        assert list(manifest["details"]) == [r["name"] for r in written["repositories"]]
+        for entry, full in zip(index["repositories"], written["repositories"]):
+            detail = json.loads((tmp_path / manifest["details"][entry["name"]]["path"]).read_text(encoding="utf-8"))
+            assert {**entry, **detail} == full